@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک پشتیبان‌گیری آنلاین در حین ثبت همزمان
+
+اجرا:
+    python benchmarks/bench_backup.py [--transactions 100000] [--max-stall-ms 250]
+
+روی کپی یک دفتر مصنوعی (در حالت WAL و rollback journal) یک thread هر چند
+میلی‌ثانیه یک تراکنش از صف commit گروهی ثبت می‌کند و همزمان snapshot گرفته
+می‌شود. زمان snapshot، اندازه فایل فشرده، تعداد ثبت‌ها و بیشترین زمان یک ثبت
+در طول پشتیبان‌گیری و زمان بازیابی اندازه گرفته می‌شود. اگر در حالت WAL یک
+ثبت بیش از --max-stall-ms منتظر بماند یا بازیابی سالم نباشد کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+MAX_STALL_MS = 250
+POST_INTERVAL = 0.002
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک پشتیبان‌گیری آنلاین")
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--max-stall-ms", type=float, default=MAX_STALL_MS)
+    args = parser.parse_args()
+    
+    from synthetic import dataset
+    from imanaccounting.backup import create_snapshot, restore_snapshot
+    from imanaccounting.events import immediate
+    from imanaccounting.ledger import DatabaseManager, Transaction
+    
+    source = dataset(args.transactions)
+    results = {}
+    healthy = True
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in ("wal", "delete"):
+            path = os.path.join(workdir, f"{mode}.db")
+            shutil.copy(source, path)
+            conn = sqlite3.connect(path)
+            conn.execute(f"PRAGMA journal_mode = {mode}")
+            conn.close()
+            db = DatabaseManager(path)
+            db.events.scheduler = immediate
+            expense = next(a.id for a in db.accounts if a.type == 'expense')
+            asset = next(a.id for a in db.accounts if a.type == 'asset')
+            
+            stop = threading.Event()
+            latencies = []
+            
+            def post():
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    db.writer.submit([Transaction(datetime(2025, 12, 31), "بنچمارک", 1000, 'هزینه',
+                                                  expense, asset)]).result()
+                    latencies.append(time.perf_counter() - started)
+                    time.sleep(POST_INTERVAL)
+            
+            poster = threading.Thread(target=post)
+            poster.start()
+            started = time.perf_counter()
+            snapshot = create_snapshot(path, os.path.join(workdir, f"{mode}-backups"))
+            snapshot_s = time.perf_counter() - started
+            stop.set()
+            poster.join()
+            
+            manifest = snapshot.manifest()
+            started = time.perf_counter()
+            restore_snapshot(db, snapshot.path)
+            restore_s = time.perf_counter() - started
+            check = db.execute_query("PRAGMA quick_check")[0][0]
+            count = db.execute_query("SELECT COUNT(*) FROM transactions")[0][0]
+            db.writer.close()
+            
+            results[mode] = {
+                "snapshot_s": round(snapshot_s, 2),
+                "restore_s": round(restore_s, 2),
+                "db_mb": round(manifest["size"] / 2**20, 1),
+                "archive_mb": round(os.path.getsize(snapshot.path) / 2**20, 1),
+                "posts_during_backup": len(latencies),
+                "max_post_ms": round(max(latencies) * 1000, 1),
+                "restored_ok": check == "ok" and count == int(manifest["fingerprint"].split(':')[1]),
+            }
+            healthy = healthy and results[mode]["restored_ok"]
+    
+    summary = {
+        "benchmark": "backup",
+        "timestamp": time.time(),
+        "transactions": args.transactions,
+        "results": results,
+        "max_stall_ms": args.max_stall_ms,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    
+    if not healthy:
+        print("❌ بازیابی سالم نبود", file=sys.stderr)
+        return 1
+    if results["wal"]["max_post_ms"] > args.max_stall_ms:
+        print(f"❌ ثبت در حین پشتیبان‌گیری: {results['wal']['max_post_ms']}ms > {args.max_stall_ms}ms",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
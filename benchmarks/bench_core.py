@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک مسیرهای اصلی روی دفتر مصنوعی
+
+اجرا:
+    python benchmarks/bench_core.py [--sizes 10000,100000] [--output core.json]
+                                    [--baseline old.json] [--tolerance 0.25]
+
+برای هر اندازه، دفتر مصنوعی (benchmarks/synthetic.py) ساخته یا از کش خوانده
+می‌شود و زمان این مسیرها اندازه گرفته می‌شود: load_data، add_transaction،
+آمار داشبورد، detect_anomaly، Dense.forward، پر کردن جدول تراکنش‌ها، وجه‌ها و
+جستجو. خواندن‌ها با کش خالی (db.cache.clear) زمان‌گیری می‌شوند. خروجی JSON
+شامل commit است تا نتایج commit های مختلف مقایسه شوند؛ با --baseline اگر
+میانه یک عملیات بیش از tolerance کندتر شده باشد کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+# تفاوت‌های کمتر از این (میلی‌ثانیه) نویز حساب می‌شوند
+NOISE_FLOOR_MS = 0.05
+
+
+def measure(func, repeat: int, setup=None) -> dict:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[max(0, round(0.95 * len(samples)) - 1)],
+        "runs": repeat,
+    }
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        return out + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_size(path: str, repeat: int, app) -> dict:
+    from imanaccounting.ai import Dense, Sequential
+    from imanaccounting.events import immediate
+    from imanaccounting.ledger import DatabaseManager, Transaction
+    from imanaccounting.query import TransactionFilter
+    from imanaccounting import reports, search
+    
+    results = {}
+    db = DatabaseManager(path, autoload=False)
+    db.events.scheduler = immediate
+    db.init_database()
+    
+    def reload():
+        db.accounts, db.transactions = [], []
+    results["load_data"] = measure(db.load_data, repeat, setup=reload)
+    db.loaded = True
+    
+    clear = db.cache.clear
+    results["dashboard_stats"] = measure(
+        lambda: (db.get_total_balance(), db.get_today_income_expense(), reports.expense_forecast(db)),
+        repeat, setup=clear
+    )
+    sample = db.get_all_transactions(50)
+    results["detect_anomaly_50"] = measure(
+        lambda: [db.detect_anomaly(t) for t in sample], repeat, setup=clear
+    )
+    results["facets"] = measure(lambda: db.query.facets(TransactionFilter().of_type('هزینه')),
+                                repeat, setup=clear)
+    results["filtered_page"] = measure(
+        lambda: db.query.select(TransactionFilter().for_account(8).in_month('2025-06')),
+        repeat, setup=clear
+    )
+    results["search"] = measure(lambda: search.search(db, 'خرید كالا'), repeat, setup=clear)
+    
+    rng = random.Random(1)
+    model = Sequential('bench')
+    model.add(Dense(32, 64, 'relu'))
+    model.add(Dense(64, 1, 'linear'))
+    inputs = [[rng.uniform(-1, 1) for _ in range(32)] for _ in range(repeat)]
+    features = iter(inputs)
+    results["dense_forward"] = measure(lambda: model.predict(next(features)), repeat)
+    
+    if app is not None:
+        from imanaccounting.gui.dialogs import TransactionsDialog
+        from imanaccounting.gui.screen import ScreenOptimizer
+        from imanaccounting.gui.theme import ThemeManager
+        themes = ThemeManager(ScreenOptimizer())
+        dialog = TransactionsDialog(db, themes.optimizer, themes.current_theme)
+        results["table_population_50"] = measure(lambda: dialog.show_rows(sample), repeat, setup=clear)
+        dialog.deleteLater()
+    
+    # نوشتن روی کپی تا دفتر کش شده تغییر نکند
+    with tempfile.TemporaryDirectory() as workdir:
+        copy = os.path.join(workdir, "ledger.db")
+        shutil.copy(path, copy)
+        writer = DatabaseManager(copy)
+        writer.events.scheduler = immediate
+        accounts = [a.id for a in writer.accounts if a.type in ('asset', 'expense')]
+        results["add_transaction"] = measure(
+            lambda: writer.add_transaction(Transaction(
+                datetime(2025, 12, 31), 'بنچمارک ثبت', rng.randint(1, 10**7) * 1000,
+                'هزینه', rng.choice(accounts), rng.choice(accounts)
+            )),
+            repeat * 4
+        )
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float):
+    """لیست (اندازه، عملیات، قبلی، فعلی) برای عملیات‌هایی که کندتر شده‌اند"""
+    regressions = []
+    for size, ops in current["results"].items():
+        for op, stats in ops.items():
+            before = baseline.get("results", {}).get(size, {}).get(op)
+            if before is None:
+                continue
+            old, new = before["median_ms"], stats["median_ms"]
+            if new > old * (1 + tolerance) and new - old > NOISE_FLOOR_MS:
+                regressions.append((size, op, old, new))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک مسیرهای اصلی")
+    parser.add_argument("--sizes", default="10000,100000",
+                        help="تعداد تراکنش‌ها، جدا شده با کاما (تا 10000000)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=25)
+    parser.add_argument("--no-gui", action="store_true", help="بدون زمان‌گیری جدول Qt")
+    parser.add_argument("--output", help="ذخیره نتیجه JSON")
+    parser.add_argument("--baseline", help="نتیجه JSON قبلی برای مقایسه")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    
+    from synthetic import dataset
+    
+    app = None
+    if not args.no_gui:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+    
+    summary = {
+        "benchmark": "core",
+        "commit": git_commit(),
+        "timestamp": time.time(),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "seed": args.seed,
+        "results": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        path = dataset(size, args.seed)
+        summary["results"][str(size)] = bench_size(path, args.repeat, app)
+    
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(summary, baseline, args.tolerance)
+        for size, op, old, new in regressions:
+            print(f"❌ {op} @ {size}: {old:.3f}ms -> {new:.3f}ms ({baseline.get('commit')} -> "
+                  f"{summary['commit']})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
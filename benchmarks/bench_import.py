@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک زمان import با `python -X importtime`
+
+اجرا:
+    python benchmarks/bench_import.py [--runs 5]
+
+برای هر ماژول غیرگرافیکی زمان تجمعی import (میانه چند اجرا) با سقف مقایسه
+می‌شود و نباید هیچ ماژول PyQt5 بارگذاری شود. در صورت تخطی کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# سقف زمان import تجمعی به میلی‌ثانیه
+BUDGETS_MS = {
+    "imanaccounting": 15,
+    "imanaccounting.ledger": 40,
+    "imanaccounting.ai": 25,
+    "imanaccounting.license": 40,
+    "imanaccounting.reports": 40,
+    "imanaccounting.gui.startup": 400,
+}
+
+# ماژول‌هایی که بدون Qt باید import شوند
+HEADLESS = [name for name in BUDGETS_MS if not name.startswith("imanaccounting.gui")]
+
+
+# با PYTHONDONTWRITEBYTECODE هر ماژول ویرایش شده در هر اجرا دوباره کامپایل می‌شود
+# و زمان کامپایل به جای زمان import اندازه گرفته می‌شود
+ENV = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+
+
+def import_profile(module: str) -> dict:
+    """اجرای import در پروسه تازه و برگرداندن {ماژول: زمان تجمعی به میکروثانیه}"""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=ENV, capture_output=True, text=True, check=True
+    )
+    profile = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if not parts[1].isdigit():
+            continue
+        profile[parts[2]] = int(parts[1])
+    return profile
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک زمان import")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    for module, budget in BUDGETS_MS.items():
+        import_profile(module)  # نوشتن bytecode؛ اندازه‌گیری با کش گرم
+        samples = []
+        for _ in range(args.runs):
+            profile = import_profile(module)
+            samples.append(profile.get(module, 0) / 1000)
+            if module in HEADLESS:
+                qt = sorted(name for name in profile if name.startswith("PyQt5"))
+                if qt:
+                    failures.append(f"{module} imports Qt: {', '.join(qt)}")
+        median = statistics.median(samples)
+        results[module] = {"median_ms": median, "budget_ms": budget}
+        if median > budget:
+            failures.append(f"{module}: {median:.1f}ms > {budget}ms")
+
+    print(json.dumps({"benchmark": "import", "results": results}, indent=2))
+    for failure in sorted(set(failures)):
+        print(f"❌ {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
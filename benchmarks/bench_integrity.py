@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک بررسی یکپارچگی و بازسازی موجودی حساب‌ها
+
+اجرا:
+    python benchmarks/bench_integrity.py [--transactions 1000000] [--max-full-s-per-million 1]
+
+روی کپی یک دفتر مصنوعی این‌ها اندازه گرفته می‌شوند: بررسی کامل، بررسی
+افزایشی از checkpoint بعد از --posts ثبت تازه، و بررسی بعد از بستن دوره مالی
+(انتقال به بایگانی نباید checkpoint را باطل کند). سپس موجودی چند حساب
+مستقیماً در پایگاه داده دست‌کاری می‌شود؛ بررسی باید دقیقاً همان حساب‌ها را
+با همان اختلاف پیدا و اصلاح کند. اگر بررسی کامل به ازای هر میلیون ردیف بیش
+از --max-full-s-per-million ثانیه طول بکشد یا اختلاف‌ها درست پیدا و اصلاح
+نشوند کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+MAX_FULL_S_PER_MILLION = 1.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک بررسی یکپارچگی دفتر")
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--close", type=date.fromisoformat, default=date(2023, 12, 31))
+    parser.add_argument("--max-full-s-per-million", type=float, default=MAX_FULL_S_PER_MILLION)
+    args = parser.parse_args()
+    
+    from synthetic import dataset
+    from imanaccounting import integrity, periods
+    from imanaccounting.events import immediate
+    from imanaccounting.ledger import DatabaseManager, Transaction
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "ledger.db")
+        shutil.copy(dataset(args.transactions), path)
+        started = time.perf_counter()
+        db = DatabaseManager(path)
+        open_s = time.perf_counter() - started
+        db.events.scheduler = immediate
+        
+        full = integrity.verify(db, full=True)
+        
+        expense = next(a.id for a in db.accounts if a.type == 'expense')
+        cash = next(a.id for a in db.accounts if a.type == 'asset')
+        db.post_transactions([
+            Transaction(datetime(2025, 12, 31), f"bench {i}", 1000 + i, 'هزینه', expense, cash)
+            for i in range(args.posts)
+        ])
+        incremental = integrity.verify(db)
+        
+        periods.close_period(db, args.close)
+        after_close = integrity.verify(db)
+        
+        # دست‌کاری مستقیم موجودی سه حساب، بیرون از دفتر
+        injected = {account.id: 1000 * (i + 1) for i, account in enumerate(db.accounts[:3])}
+        with db.get_connection() as conn:
+            conn.executemany("UPDATE accounts SET balance = balance + ? WHERE id = ?",
+                             [(amount, account) for account, amount in injected.items()])
+        detected = integrity.verify(db, repair=True)
+        repaired = integrity.verify(db, full=True)
+        db.writer.close()
+    
+    found = {drift.account_id: int(drift.difference) for drift in detected.drifts}
+    clean = full.ok and incremental.ok and after_close.ok
+    correct = found == injected and detected.repaired and repaired.ok
+    per_million = full.seconds / max(full.through, 1) * 1_000_000
+    summary = {
+        "benchmark": "integrity",
+        "timestamp": time.time(),
+        "transactions": args.transactions,
+        "open_s": round(open_s, 2),
+        "full_s": round(full.seconds, 3),
+        "full_s_per_million": round(per_million, 3),
+        "incremental_ms": round(incremental.seconds * 1000, 2),
+        "incremental_full": incremental.full,
+        "after_close_ms": round(after_close.seconds * 1000, 2),
+        "after_close_full": after_close.full,
+        "detect_repair_ms": round(detected.seconds * 1000, 2),
+        "clean": clean,
+        "drifts_found": len(found),
+        "repaired": correct,
+        "max_full_s_per_million": args.max_full_s_per_million,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    
+    if not clean:
+        print("❌ دفتر سالم اختلاف نشان داد", file=sys.stderr)
+        return 1
+    if not correct:
+        print(f"❌ اختلاف‌ها درست پیدا یا اصلاح نشدند: {found} != {injected}", file=sys.stderr)
+        return 1
+    if per_million > args.max_full_s_per_million:
+        print(f"❌ بررسی کامل: {per_million:.2f}s > {args.max_full_s_per_million}s در هر میلیون ردیف",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک سندهای چندسطری و صورتحساب حساب از جدول postings
+
+اجرا:
+    python benchmarks/bench_journal.py [--transactions 1000000] [--entries 1000] [--lines 5]
+                                       [--min-speedup 10]
+
+روی کپی یک دفتر مصنوعی این‌ها اندازه گرفته می‌شوند: ساخت دوباره postings از
+روی تراکنش‌ها (همان کاری که مهاجرت دفتر قدیمی یک بار انجام می‌دهد)، صفحه
+اول و یک صفحه عمیق تراکنش‌های پرگردش‌ترین حساب با postings و با OR روی دو
+ستون بدهکار و بستانکار (مسیر قبلی)، صفحه صورتحساب همان حساب و ثبت --entries
+سند --lines سطری. ردیف‌های هر سند باید تراز باشند و موجودی حساب‌ها با دفتر و
+با جمع postings برابر بماند. اگر صفحه postings کمتر از --min-speedup برابر
+سریع‌تر از OR باشد کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_core import measure
+
+MIN_SPEEDUP = 10
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک سندهای چندسطری")
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--min-speedup", type=float, default=MIN_SPEEDUP)
+    args = parser.parse_args()
+    
+    from synthetic import dataset
+    from imanaccounting import integrity, journal
+    from imanaccounting.events import immediate
+    from imanaccounting.ledger import DatabaseManager
+    from imanaccounting.query import TransactionFilter, compile_filter
+    
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "ledger.db")
+        shutil.copy(dataset(args.transactions), path)
+        db = DatabaseManager(path)
+        db.events.scheduler = immediate
+        
+        started = time.perf_counter()
+        with db.get_connection() as conn:
+            journal.rebuild_postings(conn)
+            conn.commit()
+        rebuild_s = time.perf_counter() - started
+        
+        account, rows = db.execute_query(
+            "SELECT account_id, COUNT(*) FROM postings GROUP BY account_id ORDER BY 2 DESC LIMIT 1"
+        )[0]
+        flt = TransactionFilter().for_account(account)
+        where, params = compile_filter(flt)
+        or_sql = (f"SELECT t.* FROM transactions t WHERE {where} "
+                  f"ORDER BY t.date DESC, t.id DESC LIMIT 50 OFFSET ?")
+        clear = db.cache.clear
+        timings = {}
+        for offset in (0, 5000):
+            timings[f"page_{offset}"] = measure(lambda: db.query.select(flt, 50, offset), args.repeat, clear)
+            timings[f"or_page_{offset}"] = measure(
+                lambda: db.execute_query(or_sql, (*params, offset)), max(3, args.repeat // 4)
+            )
+        timings["statement_page"] = measure(lambda: journal.statement(db, account), args.repeat, clear)
+        
+        expense = [a.id for a in db.accounts if a.type == 'expense']
+        funding = [a.id for a in db.accounts if a.type in ('asset', 'liability')]
+        durations, legs = [], 0
+        for i in range(args.entries):
+            debits = [(rng.choice(expense), rng.randrange(1, 1000) * 1000)
+                      for _ in range(args.lines - 2)]
+            total = sum(amount for _, amount in debits)
+            part = rng.randrange(1, total // 1000 + 1) * 1000 if total > 1000 else total
+            lines = debits + [(rng.choice(funding), -part)]
+            if total - part:
+                lines.append((rng.choice(funding), part - total))
+            started = time.perf_counter()
+            entry = journal.post_entry(db, date(2025, 12, 31), f"سند بنچمارک {i}", 'هزینه', lines)
+            durations.append((time.perf_counter() - started) * 1000)
+            legs += len(entry.transactions)
+        
+        unbalanced = db.execute_query(
+            "SELECT COUNT(*) FROM (SELECT entry_id FROM postings WHERE entry_id IS NOT NULL "
+            "GROUP BY entry_id HAVING SUM(amount) != 0)"
+        )[0][0]
+        mismatched = db.execute_query(
+            "SELECT COUNT(*) FROM accounts a WHERE COALESCE(a.balance, 0) != "
+            "(SELECT COALESCE(SUM(amount), 0) FROM postings WHERE account_id = a.id)"
+        )[0][0]
+        report = integrity.verify(db, full=True)
+        db.writer.close()
+    
+    durations.sort()
+    speedup = min(timings[f"or_page_{offset}"]["median_ms"] / max(timings[f"page_{offset}"]["median_ms"], 1e-3)
+                  for offset in (0, 5000))
+    summary = {
+        "benchmark": "journal",
+        "timestamp": time.time(),
+        "transactions": args.transactions,
+        "rebuild_postings_s": round(rebuild_s, 2),
+        "account_postings": rows,
+        **{f"{name}_median_ms": round(stats["median_ms"], 2) for name, stats in timings.items()},
+        "page_speedup": round(speedup, 1),
+        "entries": args.entries,
+        "lines": args.lines,
+        "legs": legs,
+        "entry_p50_ms": round(durations[len(durations) // 2], 2),
+        "entry_p95_ms": round(durations[max(0, round(0.95 * len(durations)) - 1)], 2),
+        "unbalanced_entries": unbalanced,
+        "postings_mismatched_accounts": mismatched,
+        "balances_ok": report.ok,
+        "min_speedup": args.min_speedup,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    
+    if unbalanced or mismatched or not report.ok:
+        print("❌ سندها تراز نیستند یا موجودی‌ها با دفتر و postings برابر نیستند", file=sys.stderr)
+        return 1
+    if speedup < args.min_speedup:
+        print(f"❌ صفحه حساب: {speedup:.1f}x < {args.min_speedup}x نسبت به OR", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک بررسی لایسنس - امضای Ed25519 و کش لایسنس
+
+اجرا:
+    python benchmarks/bench_license.py [--tokens 200] [--verify-budget 1.0]
+
+با یک کلید موقت توکن صادر می‌شود و این زمان‌ها اندازه گرفته می‌شوند:
+اولین بررسی (شامل تجزیه کلید عمومی، بدون import ماژول)، میانه بررسی تکی،
+میانگین هر توکن در verify_many و بارگذاری LicenseManager از کش. اگر
+میانه بررسی تکی یا بارگذاری از کش از بودجه بیشتر شود، کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tools"))
+
+# بودجه‌ها به میلی‌ثانیه
+VERIFY_BUDGET_MS = 1.0
+CACHED_LOAD_BUDGET_MS = 1.0
+
+
+def elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک بررسی لایسنس")
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--verify-budget", type=float, default=VERIFY_BUDGET_MS)
+    parser.add_argument("--cached-budget", type=float, default=CACHED_LOAD_BUDGET_MS)
+    args = parser.parse_args()
+    
+    from Crypto.PublicKey import ECC
+    from license_keygen import issue_token
+    from imanaccounting import license as license_module
+    from imanaccounting.license_token import TokenVerifier
+    
+    key = ECC.generate(curve="Ed25519")
+    public_key = key.public_key().export_key(format="raw")
+    hwid = os.urandom(16).hex()
+    tokens = [issue_token(key, hwid, "PRO") for _ in range(args.tokens)]
+    
+    verifier = TokenVerifier(public_key)
+    start = time.perf_counter()
+    verifier.verify(tokens[0])
+    first_ms = elapsed_ms(start)
+    
+    single = []
+    for token in tokens:
+        start = time.perf_counter()
+        verifier.verify(token)
+        single.append(elapsed_ms(start))
+    
+    start = time.perf_counter()
+    results = TokenVerifier(public_key).verify_many(tokens)
+    batch_ms = elapsed_ms(start)
+    assert all(results)
+    
+    # بارگذاری کامل و سپس از کش، در یک پوشه موقت با کلید موقت
+    license_module.VERIFIER = TokenVerifier(public_key)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            manager = license_module.LicenseManager(autoload=False)
+            manager.hardware_id = manager.get_hardware_id()
+            manager.activate(issue_token(key, manager.hardware_id, "PRO"))
+            os.remove(manager.cache_file)
+            
+            start = time.perf_counter()
+            cold = license_module.LicenseManager()
+            cold_ms = elapsed_ms(start)
+            
+            start = time.perf_counter()
+            warm = license_module.LicenseManager()
+            cached_ms = elapsed_ms(start)
+            assert warm.from_cache and warm.license_type == cold.license_type
+        finally:
+            os.chdir(cwd)
+    
+    summary = {
+        "benchmark": "license",
+        "timestamp": time.time(),
+        "tokens": args.tokens,
+        "token_length": len(tokens[0]),
+        "first_verify_ms": first_ms,
+        "verify_median_ms": statistics.median(single),
+        "verify_p95_ms": sorted(single)[int(len(single) * 0.95) - 1],
+        "verify_many_per_token_ms": batch_ms / len(tokens),
+        "uncached_load_ms": cold_ms,
+        "cached_load_ms": cached_ms,
+        "budget": {
+            "verify_median_ms": args.verify_budget,
+            "cached_load_ms": args.cached_budget,
+        },
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    
+    failed = [k for k, budget in summary["budget"].items() if summary[k] > budget]
+    for k in failed:
+        print(f"❌ {k}: {summary[k]:.3f}ms > {summary['budget'][k]:.3f}ms", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک بستن دوره مالی و بایگانی
+
+اجرا:
+    python benchmarks/bench_periods.py [--transactions 100000] [--close 2024-12-31]
+                                       [--tolerance 0.25]
+
+روی کپی یک دفتر مصنوعی (پنج سال تا پایان ۲۰۲۵) مسیرهای روزمره (شمارش، وجه‌ها،
+صفحه اول فهرست، جستجو و فیلتر مبلغ) پس از بستن دوره تا --close با کپی دوم
+همان دفتر که بسته نشده مقایسه می‌شوند؛ اندازه‌گیری دو کپی یک در میان است تا
+نوسان سرعت ماشین روی هر دو یکسان اثر بگذارد. گزارش‌های تاریخی (فیلترهایی که
+بازه‌شان به دوره بسته می‌رسد و تسهیم سود ۳۶ ماه) باید پیش و پس از بستن یکسان
+باشند. اگر نتایج تاریخی تغییر کند یا عملیاتی پس از بستن بیش از tolerance
+کندتر شود کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_core import NOISE_FLOOR_MS, measure
+
+ROUNDS = 3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک بستن دوره مالی")
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--close", type=date.fromisoformat, default=date(2024, 12, 31))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    
+    from synthetic import dataset
+    from imanaccounting import periods, profit_sharing, search
+    from imanaccounting.events import immediate
+    from imanaccounting.ledger import DatabaseManager
+    from imanaccounting.query import TransactionFilter
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        ledgers = []
+        for name in ("ledger.db", "reference.db"):
+            path = os.path.join(workdir, name)
+            shutil.copy(dataset(args.transactions), path)
+            ledgers.append(DatabaseManager(path))
+            ledgers[-1].events.scheduler = immediate
+        db, reference = ledgers
+        expense = next(a.id for a in db.accounts if a.type == 'expense')
+        asset = next(a.id for a in db.accounts if a.type == 'asset')
+        
+        history = TransactionFilter().between(date(args.close.year, 1, 1), args.close)
+        months = profit_sharing.month_periods(36, date(args.close.year + 1, 12, 1))
+        
+        # فیلترهای بدون تاریخ شروع هم به بایگانی می‌رسند
+        open_ended = [TransactionFilter(), TransactionFilter().between(None, args.close),
+                      TransactionFilter().for_account(asset),
+                      TransactionFilter().for_account(asset).amount_between(1_000_000, None)]
+        
+        def historical():
+            return (db.query.count(history), db.query.facets(history),
+                    [t.number for t in db.query.select(history).transactions],
+                    db.query.count(TransactionFilter().for_account(asset).between(date(args.close.year - 2, 1, 1), None)),
+                    [(db.query.count(flt), db.query.facets(flt),
+                      [t.number for t in db.query.select(flt, offset=offset).transactions])
+                     for flt in open_ended for offset in (0, 1000)],
+                    profit_sharing.period_profits(db, months))
+        
+        operations = {
+            "count_all": lambda d: d.query.count(TransactionFilter()),
+            "facets_all": lambda d: d.query.facets(TransactionFilter()),
+            "facets_type": lambda d: d.query.facets(TransactionFilter().of_type('هزینه')),
+            "select_page": lambda d: d.query.select(TransactionFilter().of_type('هزینه').for_account(expense)),
+            "search": lambda d: search.search(d, 'خرید'),
+            "amount_range": lambda d: d.query.facets(TransactionFilter().amount_between(1_000_000, 2_000_000)),
+        }
+        
+        def hot(name, d):
+            return measure(lambda: operations[name](d), args.repeat, d.cache.clear)["median_ms"]
+        
+        before = historical()
+        started = time.perf_counter()
+        period = periods.close_period(db, args.close)
+        close_s = time.perf_counter() - started
+        after = historical()
+        
+        # کمترین میانه چند دور؛ در هر دور هر عملیات روی دفتر مرجع و بلافاصله روی
+        # دفتر بسته اجرا می‌شود
+        rounds = [{name: (hot(name, reference), hot(name, db)) for name in operations} for _ in range(ROUNDS)]
+        hot_before = {name: round(min(r[name][0] for r in rounds), 2) for name in operations}
+        hot_after = {name: round(min(r[name][1] for r in rounds), 2) for name in operations}
+        for ledger in ledgers:
+            ledger.writer.close()
+    
+    regressions = [name for name in operations
+                   if hot_after[name] - hot_before[name] > NOISE_FLOOR_MS
+                   and hot_after[name] > hot_before[name] * (1 + args.tolerance)]
+    summary = {
+        "benchmark": "periods",
+        "timestamp": time.time(),
+        "transactions": args.transactions,
+        "close": args.close.isoformat(),
+        "archived": period.transaction_count,
+        "close_s": round(close_s, 2),
+        "before_ms": hot_before,
+        "after_ms": hot_after,
+        "history_unchanged": before == after,
+        "regressions": regressions,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    
+    if before != after:
+        print("❌ گزارش‌های تاریخی پس از بستن دوره تغییر کردند", file=sys.stderr)
+        return 1
+    if regressions:
+        print(f"❌ کندتر پس از بستن دوره: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
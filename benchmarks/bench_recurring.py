@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک تراکنش‌های تکراری
+
+اجرا:
+    python benchmarks/bench_recurring.py [--templates 10000] [--months 12] [--max-tick-us 50]
+
+روی کپی یک دفتر مصنوعی ۱۰ هزار تراکنشی --templates الگو (ماهانه، هفتگی و
+روزانه با تاریخ شروع پراکنده در --months ماه گذشته) ساخته می‌شود و این‌ها
+اندازه گرفته می‌شوند: ساخت heap، tick بدون موعد رسیده (کاری که تایمر رابط
+کاربری هر دقیقه انجام می‌دهد) و ثبت همه موعدهای عقب افتاده با یک commit.
+اجرای دوباره نباید چیزی ثبت کند و موجودی حساب‌ها باید با دفتر برابر بماند.
+اگر tick بیش از --max-tick-us میکروثانیه طول بکشد کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_core import measure
+
+MAX_TICK_US = 50
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک تراکنش‌های تکراری")
+    parser.add_argument("--templates", type=int, default=10_000)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--max-tick-us", type=float, default=MAX_TICK_US)
+    args = parser.parse_args()
+    
+    from synthetic import dataset
+    from imanaccounting import integrity
+    from imanaccounting.events import immediate
+    from imanaccounting.ledger import DatabaseManager
+    
+    today = date.today()
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "ledger.db")
+        shutil.copy(dataset(10_000), path)
+        db = DatabaseManager(path)
+        db.events.scheduler = immediate
+        expense = [a.id for a in db.accounts if a.type == 'expense']
+        asset = [a.id for a in db.accounts if a.type == 'asset']
+        
+        rows = []
+        for i in range(args.templates):
+            frequency = rng.choices(('monthly', 'weekly', 'daily'), (8, 3, 1))[0]
+            start = today - timedelta(days=rng.randrange(args.months * 30))
+            rows.append((f"الگو {i}", 'هزینه', rng.randrange(1, 1000) * 10_000,
+                         rng.choice(expense), rng.choice(asset), frequency,
+                         start.isoformat(), start.isoformat()))
+        with db.get_connection() as conn:
+            conn.executemany('''
+                INSERT INTO recurring_templates
+                (description, type, amount, debit_account_id, credit_account_id, frequency,
+                 start_date, next_date) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        db.recurring.invalidate()
+        
+        started = time.perf_counter()
+        db.recurring.ensure_loaded()
+        load_ms = (time.perf_counter() - started) * 1000
+        
+        tick = measure(lambda: db.recurring.run_due(today - timedelta(days=args.months * 31)), 1000)
+        
+        started = time.perf_counter()
+        posted = db.recurring.run_due(today).result()
+        materialize_s = time.perf_counter() - started
+        again = db.recurring.run_due(today)
+        idle_tick = measure(lambda: db.recurring.run_due(today), 1000)
+        report = integrity.verify(db, full=True)
+        db.writer.close()
+    
+    tick_us = max(tick["p95_ms"], idle_tick["p95_ms"]) * 1000
+    summary = {
+        "benchmark": "recurring",
+        "timestamp": time.time(),
+        "templates": args.templates,
+        "months": args.months,
+        "heap_load_ms": round(load_ms, 2),
+        "tick_p95_us": round(tick_us, 2),
+        "materialized": len(posted),
+        "materialize_s": round(materialize_s, 3),
+        "rows_per_s": round(len(posted) / materialize_s),
+        "second_run_idle": again is None,
+        "balances_ok": report.ok,
+        "max_tick_us": args.max_tick_us,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    
+    if again is not None or not report.ok:
+        print("❌ موعدها دو بار ثبت شدند یا موجودی‌ها با دفتر برابر نیستند", file=sys.stderr)
+        return 1
+    if tick_us > args.max_tick_us:
+        print(f"❌ tick: {tick_us:.1f}us > {args.max_tick_us}us", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک جستجوی متن کامل (FTS5) در شرح تراکنش‌ها
+
+اجرا:
+    python benchmarks/bench_search.py [--rows 200000] [--budget 50]
+
+یک پایگاه داده موقت با شرح‌های تصادفی (فارسی با ي/ك عربی، نیم‌فاصله و ارقام
+فارسی) ساخته می‌شود و برای هر عبارت، صفحه اول و سوم نتایج زمان‌گیری می‌شود.
+اگر کندترین جستجو (میانه چند تکرار) از بودجه بیشتر شود، کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# بودجه به میلی‌ثانیه برای هر جستجو (میانه تکرارها)
+SEARCH_BUDGET_MS = 50
+
+WORDS = [
+    'خرید', 'فروش', 'كالا', 'ميز', 'صندلی', 'اجاره', 'حقوق', 'می‌خواهم', 'برق',
+    'آب', 'گاز', 'تعمیر', 'چاپگر', 'Printer', '۱۴۰۳', 'قسط', 'وام', 'بیمه',
+]
+QUERIES = ['میز', 'كالا صندل', 'می خواهم', '1403', 'printer', 'خ', 'w1', 'w17 w4', 'ناموجود']
+
+
+def build(path: str, rows: int, seed: int = 1):
+    from imanaccounting.ledger import DatabaseManager
+    
+    db = DatabaseManager(path)
+    vocabulary = WORDS + [f'w{i}' for i in range(2000)]
+    rng = random.Random(seed)
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO transactions (number, date, description, type, amount, "
+            "debit_account_id, credit_account_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((f"B{i}", '2024-01-01', ' '.join(rng.choices(vocabulary, k=5)), 'هزینه', i, 7, 1)
+             for i in range(rows))
+        )
+        conn.commit()
+    return db
+
+
+def timed(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک جستجوی متن کامل")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=SEARCH_BUDGET_MS)
+    args = parser.parse_args()
+    
+    from imanaccounting import search
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        db = build(os.path.join(workdir, "bench.db"), args.rows)
+        build_s = time.perf_counter() - start
+        
+        queries = {}
+        for query in QUERIES:
+            result = search.search(db, query)
+            queries[query] = {
+                "total": result.total,
+                "exact": result.exact,
+                # کش دفتر خالی می‌شود تا خود جستجو زمان‌گیری شود
+                "first_page_ms": timed(lambda: (db.cache.clear(), search.search(db, query)), args.repeat),
+                "third_page_ms": timed(
+                    lambda: (db.cache.clear(), search.search(db, query, offset=100)), args.repeat
+                ),
+            }
+    
+    worst = max(max(q["first_page_ms"], q["third_page_ms"]) for q in queries.values())
+    summary = {
+        "benchmark": "search",
+        "timestamp": time.time(),
+        "rows": args.rows,
+        "build_s": build_s,
+        "queries": queries,
+        "worst_ms": worst,
+        "budget_ms": args.budget,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    
+    if worst > args.budget:
+        print(f"❌ worst_ms: {worst:.1f}ms > {args.budget:.0f}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک راه‌اندازی - زمان تا اولین رسم پنجره و آماده شدن کامل
+
+اجرا:
+    python benchmarks/bench_startup.py [--runs 5] [--first-paint-budget 800]
+
+هر اجرا در یک پروسه تازه و پوشه خالی انجام می‌شود تا ساخت پایگاه داده هم
+حساب شود. اگر میانه زمان‌ها از بودجه بیشتر شود، کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# بودجه‌ها به میلی‌ثانیه (میانه اجراها)
+FIRST_PAINT_BUDGET_MS = 800
+READY_BUDGET_MS = 2500
+
+CHILD = r'''
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from imanaccounting.gui import startup as app_module
+from PyQt5.QtCore import QObject, QEvent, QTimer
+from PyQt5.QtWidgets import QApplication
+t_import = time.perf_counter()
+
+result = {"import_ms": (t_import - t0) * 1000}
+
+class PaintProbe(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and "first_paint_ms" not in result:
+            result["first_paint_ms"] = (time.perf_counter() - t0) * 1000
+        return False
+
+app = QApplication(sys.argv[:1])
+probe = PaintProbe()
+app.installEventFilter(probe)
+window, startup = app_module.launch(app, splash=False)
+
+def done():
+    result["ready_ms"] = (time.perf_counter() - t0) * 1000
+    result["stages_ms"] = {k: v * 1000 for k, v in startup.timings.items()}
+    QTimer.singleShot(0, app.quit)
+
+startup.finished.disconnect()
+startup.finished.connect(done)
+QTimer.singleShot(30000, app.quit)
+app.exec_()
+print(json.dumps(result, ensure_ascii=False))
+'''
+
+
+def run_once() -> dict:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    with tempfile.TemporaryDirectory() as workdir:
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD, ROOT],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True
+        )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک زمان راه‌اندازی")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--first-paint-budget", type=float, default=FIRST_PAINT_BUDGET_MS)
+    parser.add_argument("--ready-budget", type=float, default=READY_BUDGET_MS)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    summary = {
+        "benchmark": "startup",
+        "timestamp": time.time(),
+        "runs": runs,
+        "median": {
+            key: statistics.median(r[key] for r in runs)
+            for key in ("import_ms", "first_paint_ms", "ready_ms")
+        },
+        "budget": {
+            "first_paint_ms": args.first_paint_budget,
+            "ready_ms": args.ready_budget,
+        },
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+    failed = [
+        key for key, budget in summary["budget"].items()
+        if summary["median"][key] > budget
+    ]
+    for key in failed:
+        print(f"❌ {key}: {summary['median'][key]:.0f}ms > {summary['budget'][key]:.0f}ms",
+              file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک پوشه کاری چند شرکتی
+
+اجرا:
+    python benchmarks/bench_workspace.py [--companies 24] [--transactions 10000]
+                                         [--max-switch-ms 5]
+
+پوشه کاری با --companies کپی از یک دفتر مصنوعی ساخته می‌شود و این‌ها اندازه
+گرفته می‌شوند: باز کردن سرد هر دفتر، تعویض بین شرکت‌های باز (LRU)، و گزارش
+موجودی و سود ۱۲ ماهه تلفیقی همه شرکت‌ها با ATTACH. جمع تلفیقی با جمع گزارش
+تک‌تک دفترها مقایسه می‌شود. اگر تعویض بیش از --max-switch-ms طول بکشد یا
+جمع‌ها برابر نباشند کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_core import measure
+
+MAX_SWITCH_MS = 5
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک پوشه کاری چند شرکتی")
+    parser.add_argument("--companies", type=int, default=24)
+    parser.add_argument("--transactions", type=int, default=10_000)
+    parser.add_argument("--max-switch-ms", type=float, default=MAX_SWITCH_MS)
+    args = parser.parse_args()
+    
+    from synthetic import dataset
+    from imanaccounting.events import immediate
+    from imanaccounting.ledger import DatabaseManager
+    from imanaccounting.profit_sharing import month_periods, period_profits
+    from imanaccounting.workspace import MAX_OPEN, Workspace
+    
+    def open_ledger(path):
+        db = DatabaseManager(path, autoload=False)
+        db.events.scheduler = immediate
+        db.load()
+        return db
+    
+    source = dataset(args.transactions)
+    periods = month_periods(12, date(2025, 12, 1))
+    with tempfile.TemporaryDirectory() as workdir:
+        workspace = Workspace(workdir, factory=open_ledger)
+        keys = [f"c{i:02d}" for i in range(args.companies)]
+        for key in keys:
+            shutil.copy(source, os.path.join(workdir, f"{key}.db"))
+            workspace.add(key, f"شرکت {key}")
+        
+        cold = []
+        for key in keys:
+            started = time.perf_counter()
+            workspace.open(key)
+            cold.append((time.perf_counter() - started) * 1000)
+        
+        recent = keys[-min(MAX_OPEN, len(keys)):]
+        turn = iter(range(10 ** 9))
+        switch = measure(lambda: workspace.open(recent[next(turn) % len(recent)]), 200)
+        balances = measure(workspace.consolidated_balances, 5)
+        profits = measure(lambda: workspace.consolidated_profits(periods), 5)
+        
+        # همه شرکت‌ها کپی یک دفترند
+        first = workspace.open(keys[0])
+        consolidated = sum(int(a.total) for a in workspace.consolidated_balances() if a.type == 'asset')
+        totals_match = consolidated == int(first.get_total_balance()) * args.companies
+        result = workspace.consolidated_profits(periods)
+        profits_match = all(
+            sum(int(result[key][i]) for key in keys) == int(profit) * args.companies
+            for i, profit in enumerate(period_profits(first, periods))
+        )
+        workspace.close_all()
+    
+    summary = {
+        "benchmark": "workspace",
+        "timestamp": time.time(),
+        "companies": args.companies,
+        "transactions": args.transactions,
+        "cold_open_ms": round(sorted(cold)[len(cold) // 2], 2),
+        "switch_ms": round(switch["median_ms"], 3),
+        "switch_p95_ms": round(switch["p95_ms"], 3),
+        "consolidated_balances_ms": round(balances["median_ms"], 1),
+        "consolidated_profits_ms": round(profits["median_ms"], 1),
+        "totals_match": totals_match and profits_match,
+        "max_switch_ms": args.max_switch_ms,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    
+    if not (totals_match and profits_match):
+        print("❌ جمع تلفیقی با جمع دفترها برابر نیست", file=sys.stderr)
+        return 1
+    if summary["switch_p95_ms"] > args.max_switch_ms:
+        print(f"❌ تعویض شرکت: {summary['switch_p95_ms']}ms > {args.max_switch_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
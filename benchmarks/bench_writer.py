@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+بنچمارک ثبت همزمان از چند thread: add_transaction مستقیم در برابر صف commit گروهی
+
+اجرا:
+    python benchmarks/bench_writer.py [--threads 8] [--posts 200] [--min-speedup 3]
+
+هر thread تعدادی تراکنش پشت سر هم ثبت می‌کند و منتظر نتیجه هر ثبت می‌ماند
+(مثل چند کاربر یا پلاگین). یک بار با add_transaction (هر ثبت یک commit جدا) و
+یک بار با db.writer.submit روی کپی یک دفتر مصنوعی ۱۰ هزار تراکنشی اجرا
+می‌شود. اگر نسبت سرعت کمتر از --min-speedup باشد کد خروج ۱ است.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+# اگر صف دسته نسازد نسبت نزدیک ۱ است. نسبت واقعی به کار هر ردیف (trigger های
+# transactions) و تعداد commit هر ثبت مستقیم بستگی دارد و روی ماشین پرنوسان
+# چند واحد جابه‌جا می‌شود، پس مرز پایین‌تر از نسبت معمول است
+MIN_SPEEDUP = 3
+
+
+def run_threads(threads: int, posts: int, post_one) -> float:
+    """ثبت‌ها در ثانیه"""
+    def worker(k):
+        for i in range(posts):
+            post_one(k, i)
+    
+    workers = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * posts / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="بنچمارک صف commit گروهی")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--posts", type=int, default=200, help="تعداد ثبت هر thread")
+    parser.add_argument("--min-speedup", type=float, default=MIN_SPEEDUP)
+    args = parser.parse_args()
+    
+    from synthetic import dataset
+    from imanaccounting.events import immediate
+    from imanaccounting.ledger import DatabaseManager, Transaction
+    
+    source = dataset(10_000)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in ("direct", "group_commit"):
+            path = os.path.join(workdir, f"{mode}.db")
+            shutil.copy(source, path)
+            db = DatabaseManager(path)
+            db.events.scheduler = immediate
+            expense = [a.id for a in db.accounts if a.type == 'expense']
+            asset = [a.id for a in db.accounts if a.type == 'asset']
+            
+            def make(k, i):
+                return Transaction(datetime(2025, 12, 31), f"بنچمارک {k}-{i}", 1000 + i, 'هزینه',
+                                   expense[k % len(expense)], asset[k % len(asset)])
+            
+            if mode == "direct":
+                rate = run_threads(args.threads, args.posts, lambda k, i: db.add_transaction(make(k, i)))
+            else:
+                rate = run_threads(args.threads, args.posts,
+                                   lambda k, i: db.writer.submit([make(k, i)]).result())
+                db.writer.close()
+            
+            count = db.execute_query("SELECT COUNT(*) FROM transactions WHERE description LIKE 'بنچمارک %'")
+            results[mode] = {"posts_per_s": round(rate, 1), "posted": count[0][0]}
+            if mode == "group_commit":
+                stats = db.writer.stats()
+                results[mode]["rows_per_commit"] = round(stats.rows_per_commit, 1)
+    
+    speedup = results["group_commit"]["posts_per_s"] / results["direct"]["posts_per_s"]
+    summary = {
+        "benchmark": "writer",
+        "timestamp": time.time(),
+        "threads": args.threads,
+        "posts_per_thread": args.posts,
+        "results": results,
+        "speedup": round(speedup, 1),
+        "min_speedup": args.min_speedup,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    
+    expected = args.threads * args.posts
+    if any(r["posted"] != expected for r in results.values()):
+        print(f"❌ تعداد ثبت‌ها برابر {expected} نیست", file=sys.stderr)
+        return 1
+    if speedup < args.min_speedup:
+        print(f"❌ speedup: {speedup:.1f} < {args.min_speedup}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
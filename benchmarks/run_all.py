@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+اجرای همه بنچمارک‌ها و جمع کردن نتایج در یک فایل
+
+اجرا:
+    python benchmarks/run_all.py [--output benchmarks/results/<commit>.json]
+                                 [--skip core] [--no-gui]
+
+هر اسکریپت bench_*.py در یک پردازه جدا اجرا می‌شود (تا import ها و کش‌های
+یک بنچمارک روی دیگری اثر نگذارند) و خروجی JSON آن زیر نامش ذخیره می‌شود.
+اگر بودجه یکی از بنچمارک‌ها رعایت نشود یا اجرای آن خطا دهد کد خروج ۱ است.
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_core import git_commit
+
+
+def run(script: str, extra: list) -> dict:
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, script] + extra, cwd=ROOT, capture_output=True, text=True)
+    # بعضی اسکریپت‌ها پیش از JSON پیام وضعیت چاپ می‌کنند
+    start = proc.stdout.find("{")
+    try:
+        output = json.loads(proc.stdout[start:]) if start >= 0 else proc.stdout
+    except ValueError:
+        output = proc.stdout
+    return {
+        "exit_code": proc.returncode,
+        "seconds": round(time.perf_counter() - started, 2),
+        "output": output,
+        "stderr": proc.stderr[-2000:],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="اجرای همه بنچمارک‌ها")
+    parser.add_argument("--output", help="پیش‌فرض: benchmarks/results/<commit>.json")
+    parser.add_argument("--skip", action="append", default=[], help="نام بنچمارک (مثلاً core)")
+    parser.add_argument("--no-gui", action="store_true", help="به bench_core داده می‌شود")
+    args = parser.parse_args()
+    
+    commit = git_commit()
+    summary = {"commit": commit, "timestamp": time.time(), "benchmarks": {}}
+    failed = []
+    for script in sorted(glob.glob(os.path.join(ROOT, "benchmarks", "bench_*.py"))):
+        name = os.path.basename(script)[len("bench_"):-len(".py")]
+        if name in args.skip:
+            continue
+        extra = ["--no-gui"] if name == "core" and args.no_gui else []
+        print(f"⏳ {name} ...", file=sys.stderr)
+        result = summary["benchmarks"][name] = run(script, extra)
+        status = "✅" if result["exit_code"] == 0 else "❌"
+        print(f"{status} {name}: {result['seconds']}s", file=sys.stderr)
+        if result["exit_code"] != 0:
+            failed.append(name)
+    
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    print(output)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
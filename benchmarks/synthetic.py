@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ساخت دفتر مصنوعی قطعی (deterministic) برای بنچمارک‌ها
+
+اجرا:
+    python benchmarks/synthetic.py --transactions 1000000 [--seed 1] [--out ledger.db]
+
+با seed یکسان همیشه همان پایگاه داده ساخته می‌شود (تاریخ‌ها نسبت به
+END_DATE ثابت هستند، نه امروز). سرفصل حساب‌ها شامل حساب‌های پیش‌فرض برنامه
+و زیرحساب‌های بانک، صندوق، مشتری، تأمین‌کننده، درآمد و هزینه است. توزیع‌ها:
+- نوع: هزینه ۵۵٪، درآمد ۳۰٪، انتقال ۱۵٪
+- مبلغ: لگ‌نرمال گرد شده به هزار ریال (میانه هزینه ۲ میلیون، درآمد ۸ میلیون)
+- تاریخ: پخش در YEARS سال با روزهای کاری پرتر و اوج آخر ماه
+- حساب‌ها: چند حساب پرکاربرد (توزیع زیپف) و سازگار با نوع تراکنش
+
+تراکنش‌ها پیش از ساخت نمایه‌ها (FTS، rollup و index ها) درج می‌شوند و
+نمایه‌ها یک‌جا توسط DatabaseManager ساخته می‌شوند که از درج با trigger
+بسیار سریع‌تر است. موجودی حساب‌ها با تراکنش‌ها سازگار است.
+"""
+
+import argparse
+import itertools
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from imanaccounting.ledger import ACCOUNTS_DDL, TRANSACTIONS_DDL
+
+# با تغییر منطق ساخت بالا برود تا پایگاه‌های کش شده قدیمی استفاده نشوند
+GENERATOR_VERSION = 2
+
+END_DATE = date(2025, 12, 31)
+YEARS = 5
+CHUNK = 50_000
+
+DEFAULT_ACCOUNTS = [
+    ('1001', 'وجه نقد', 'asset'),
+    ('1002', 'بانک', 'asset'),
+    ('1101', 'حساب‌های دریافتنی', 'asset'),
+    ('2001', 'حساب‌های پرداختنی', 'liability'),
+    ('3001', 'سرمایه', 'equity'),
+    ('4001', 'فروش', 'revenue'),
+    ('5001', 'هزینه‌ها', 'expense'),
+]
+
+# (پیشوند کد، نام، نوع، تعداد زیرحساب)
+SUB_ACCOUNTS = [
+    ('1002', 'بانک', 'asset', 6),
+    ('1001', 'صندوق', 'asset', 3),
+    ('1101', 'مشتری', 'asset', 40),
+    ('2001', 'تأمین‌کننده', 'liability', 25),
+    ('4001', 'درآمد', 'revenue', 8),
+    ('5001', 'هزینه', 'expense', 30),
+]
+
+TYPE_WEIGHTS = (('هزینه', 55), ('درآمد', 30), ('انتقال', 15))
+# (میانه ریال، پراکندگی لگاریتمی)
+AMOUNTS = {'هزینه': (2_000_000, 1.1), 'درآمد': (8_000_000, 1.0), 'انتقال': (20_000_000, 0.8)}
+
+WORDS = {
+    'هزینه': ['خرید', 'اجاره', 'حقوق', 'قبض برق', 'قبض آب', 'گاز', 'تعمیر', 'چاپگر', 'لوازم‌التحریر',
+              'بیمه', 'قسط وام', 'پذیرایی', 'ایاب و ذهاب', 'تبلیغات', 'اینترنت'],
+    'درآمد': ['فروش کالا', 'فروش خدمات', 'دریافت از مشتری', 'پیش‌پرداخت', 'سود سپرده', 'کارمزد'],
+    'انتقال': ['انتقال به بانک', 'برداشت نقدی', 'واریز به صندوق', 'تسویه حساب'],
+}
+GOODS = ['ميز', 'صندلی', 'كالا', 'کاغذ', 'لپ‌تاپ', 'مانیتور', 'کابل', 'قفسه', 'تونر', 'هارد']
+
+
+def chart_of_accounts():
+    """لیست (کد، نام، نوع) سرفصل حساب‌ها"""
+    accounts = list(DEFAULT_ACCOUNTS)
+    for prefix, name, type_, count in SUB_ACCOUNTS:
+        accounts += [(f"{prefix}{i:03d}", f"{name} {i}", type_) for i in range(1, count + 1)]
+    return accounts
+
+
+def zipf_weights(n: int, s: float = 1.1):
+    return list(itertools.accumulate(1 / (k ** s) for k in range(1, n + 1)))
+
+
+def day_weights():
+    """روزهای بازه با وزن: جمعه کم، پنجشنبه نصف، پنج روز آخر ماه دو برابر"""
+    days, weights = [], []
+    day = END_DATE - timedelta(days=365 * YEARS - 1)
+    while day <= END_DATE:
+        weight = {4: 0.1, 3: 0.5}.get(day.weekday(), 1.0)
+        if (day + timedelta(days=5)).month != day.month:
+            weight *= 2
+        days.append(day.isoformat())
+        weights.append(weight)
+        day += timedelta(days=1)
+    return days, list(itertools.accumulate(weights))
+
+
+def generate_rows(count: int, seed: int, ids_by_type: dict):
+    """تراکنش‌ها به صورت ردیف‌های آماده درج (بدون id)"""
+    rng = random.Random(seed)
+    days, day_cum = day_weights()
+    types = [t for t, _ in TYPE_WEIGHTS]
+    type_cum = list(itertools.accumulate(w for _, w in TYPE_WEIGHTS))
+    pools = {
+        type_: (ids, zipf_weights(len(ids))) for type_, ids in ids_by_type.items()
+    }
+    
+    def pick(type_):
+        ids, cum = pools[type_]
+        return rng.choices(ids, cum_weights=cum)[0]
+    
+    for i in range(count):
+        type_ = rng.choices(types, cum_weights=type_cum)[0]
+        median, sigma = AMOUNTS[type_]
+        amount = max(1000, round(rng.lognormvariate(math.log(median), sigma), -3))
+        if type_ == 'هزینه':
+            debit, credit = pick('expense'), pick('asset')
+        elif type_ == 'درآمد':
+            debit, credit = pick('asset'), pick('revenue')
+        else:
+            debit, credit = rng.sample(pools['asset'][0][:12], 2)
+        description = f"{rng.choice(WORDS[type_])} {rng.choice(GOODS)} ش{rng.randint(1, 9999)}"
+        yield (
+            f"SYN{seed:02d}{i:09d}", rng.choices(days, cum_weights=day_cum)[0], description,
+            type_, int(amount), debit, credit,
+        )
+
+
+def generate(path: str, transactions: int, seed: int = 1) -> dict:
+    """ساخت پایگاه داده در path (نباید وجود داشته باشد)؛ آمار ساخت برمی‌گردد"""
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    started = time.perf_counter()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute(ACCOUNTS_DDL.format(name='accounts'))
+    conn.execute(TRANSACTIONS_DDL.format(name='transactions'))
+    conn.executemany("INSERT INTO accounts (code, name, type) VALUES (?, ?, ?)", chart_of_accounts())
+    
+    ids_by_type = {}
+    for account_id, type_ in conn.execute("SELECT id, type FROM accounts ORDER BY id"):
+        ids_by_type.setdefault(type_, []).append(account_id)
+    
+    balances = {}
+    rows = generate_rows(transactions, seed, ids_by_type)
+    while True:
+        chunk = list(itertools.islice(rows, CHUNK))
+        if not chunk:
+            break
+        conn.executemany(
+            "INSERT INTO transactions (number, date, description, type, amount, "
+            "debit_account_id, credit_account_id) VALUES (?, ?, ?, ?, ?, ?, ?)", chunk
+        )
+        for _, _, _, _, amount, debit, credit in chunk:
+            balances[debit] = balances.get(debit, 0) + amount
+            balances[credit] = balances.get(credit, 0) - amount
+    conn.executemany("UPDATE accounts SET balance = ? WHERE id = ?",
+                     [(balance, account_id) for account_id, balance in balances.items()])
+    conn.commit()
+    conn.close()
+    inserted = time.perf_counter()
+    
+    # نمایه‌ها، FTS و rollup یک‌جا ساخته می‌شوند
+    from imanaccounting.ledger import DatabaseManager
+    DatabaseManager(path, autoload=False).init_database()
+    with sqlite3.connect(path) as conn:
+        conn.execute("ANALYZE")
+    return {
+        "transactions": transactions,
+        "seed": seed,
+        "insert_s": inserted - started,
+        "index_s": time.perf_counter() - inserted,
+    }
+
+
+def dataset(transactions: int, seed: int = 1, cache_dir: str = None) -> str:
+    """مسیر پایگاه داده مصنوعی؛ در cache_dir نگه داشته می‌شود تا دوباره ساخته نشود"""
+    cache_dir = cache_dir or os.path.join(ROOT, "benchmarks", ".data")
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"ledger-v{GENERATOR_VERSION}-{transactions}-{seed}.db")
+    if not os.path.exists(path):
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        generate(partial, transactions, seed)
+        os.replace(partial, path)
+    return path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="ساخت دفتر مصنوعی برای بنچمارک")
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="مسیر خروجی (پیش‌فرض: کش benchmarks/.data)")
+    args = parser.parse_args()
+    
+    if args.out:
+        stats = generate(args.out, args.transactions, args.seed)
+        print(f"✅ {args.out}: {stats['transactions']:,} تراکنش، "
+              f"درج {stats['insert_s']:.1f}s، نمایه {stats['index_s']:.1f}s")
+    else:
+        print(dataset(args.transactions, args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
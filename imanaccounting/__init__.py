@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+"""
+ایمان حسابداری - ImanAccounting
+
+ماژول‌های غیرگرافیکی (ledger, ai, license, reports, money) بدون Qt import
+می‌شوند و رابط کاربری در زیربسته gui قرار دارد. نام‌های عمومی این بسته
+به صورت تنبل و در اولین دسترسی بارگذاری می‌شوند.
+"""
+
+from .branding import APP_NAME, APP_NAME_EN, APP_VERSION
+
+_LAZY_EXPORTS = {
+    'Money': 'money',
+    'Account': 'ledger',
+    'Transaction': 'ledger',
+    'DatabaseManager': 'ledger',
+    'SimpleAI': 'ai',
+    'Sequential': 'ai',
+    'Dense': 'ai',
+    'Tensor': 'ai',
+    'LicenseManager': 'license',
+    'LicenseType': 'license',
+}
+
+__all__ = ['APP_NAME', 'APP_NAME_EN', 'APP_VERSION', *_LAZY_EXPORTS]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    import importlib
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+"""
+python -m imanaccounting - خط فرمان بدون رابط گرافیکی (imanaccounting/cli.py)
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
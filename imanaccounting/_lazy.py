@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+"""
+بارگذاری تنبل ماژول‌ها - ماژول واقعی فقط در اولین دسترسی به یک ویژگی اجرا می‌شود
+"""
+
+import sys
+import importlib.util
+
+
+def lazy_import(name: str):
+    """برگرداندن ماژول به صورت تنبل (برای زیرسیستم‌هایی که کم استفاده می‌شوند)"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"ماژول {name} پیدا نشد", name=name)
+    
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""
+ImanAILight - هوش مصنوعی سبک داخلی (بدون وابستگی به Qt)
+"""
+
+import math
+import random
+
+
+# ====================== ImanAILight (داخلی) ======================
+
+class Tensor:
+    """تانسور اختصاصی ImanAILight"""
+    
+    def __init__(self, data, shape=None):
+        self.data = data if isinstance(data, list) else [data]
+        self.shape = shape if shape else (len(self.data),)
+    
+    def __add__(self, other):
+        if isinstance(other, (int, float)):
+            return Tensor([x + other for x in self.data])
+        return Tensor([a + b for a, b in zip(self.data, other.data)])
+    
+    def __sub__(self, other):
+        if isinstance(other, (int, float)):
+            return Tensor([x - other for x in self.data])
+        return Tensor([a - b for a, b in zip(self.data, other.data)])
+    
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return Tensor([x * other for x in self.data])
+        return Tensor([a * b for a, b in zip(self.data, other.data)])
+    
+    def __truediv__(self, other):
+        if isinstance(other, (int, float)):
+            return Tensor([x / other for x in self.data])
+        return Tensor([a / b for a, b in zip(self.data, other.data)])
+    
+    def sum(self):
+        return sum(self.data)
+    
+    def mean(self):
+        return sum(self.data) / len(self.data)
+    
+    def tolist(self):
+        return self.data
+
+
+class ActivationFunctions:
+    """توابع فعالسازی"""
+    
+    @staticmethod
+    def relu(x):
+        return max(0, x)
+    
+    @staticmethod
+    def sigmoid(x):
+        return 1 / (1 + math.exp(-x))
+    
+    @staticmethod
+    def tanh(x):
+        return math.tanh(x)
+    
+    @staticmethod
+    def linear(x):
+        return x
+
+
+class Dense:
+    """لایه تمام متصل"""
+    
+    def __init__(self, input_dim, output_dim, activation='relu'):
+        self.input_dim = input_dim
+        self.output_dim = output_dim
+        self.activation = activation
+        self.weights = Tensor([random.uniform(-1, 1) for _ in range(input_dim * output_dim)])
+        self.bias = Tensor([random.uniform(-1, 1) for _ in range(output_dim)])
+        self.input_data = None
+    
+    def forward(self, x):
+        self.input_data = x
+        # ضرب ماتریسی ساده
+        result = []
+        for i in range(self.output_dim):
+            s = 0
+            for j in range(self.input_dim):
+                s += x.data[j] * self.weights.data[i * self.input_dim + j]
+            s += self.bias.data[i]
+            
+            if self.activation == 'relu':
+                s = ActivationFunctions.relu(s)
+            elif self.activation == 'sigmoid':
+                s = ActivationFunctions.sigmoid(s)
+            elif self.activation == 'tanh':
+                s = ActivationFunctions.tanh(s)
+            
+            result.append(s)
+        
+        return Tensor(result)
+
+
+class Sequential:
+    """مدل ترتیبی"""
+    
+    def __init__(self, name='model'):
+        self.name = name
+        self.layers = []
+    
+    def add(self, layer):
+        self.layers.append(layer)
+    
+    def forward(self, x):
+        for layer in self.layers:
+            x = layer.forward(x)
+        return x
+    
+    def predict(self, x):
+        if not isinstance(x, Tensor):
+            x = Tensor(x)
+        return self.forward(x)
+
+
+class SimpleAI:
+    """هوش مصنوعی ساده برای تحلیل"""
+    
+    @staticmethod
+    def predict_next(data):
+        """پیش‌بینی مقدار بعدی با میانگین متحرک"""
+        if len(data) < 3:
+            return sum(data) / len(data) if data else 0
+        return (data[-1] + data[-2] + data[-3]) / 3
+    
+    @staticmethod
+    def detect_anomaly(data, value):
+        """تشخیص ناهنجاری با انحراف معیار"""
+        return SimpleAI.is_anomaly(SimpleAI.anomaly_bounds(data), value)
+    
+    @staticmethod
+    def anomaly_bounds(data):
+        """(میانگین، انحراف معیار) داده‌ها برای بررسی پشت سر هم چند مقدار؛ کمتر از ۵ داده: None"""
+        if len(data) < 5:
+            return None
+        mean = sum(data) / len(data)
+        variance = sum((x - mean) ** 2 for x in data) / len(data)
+        return mean, math.sqrt(variance)
+    
+    @staticmethod
+    def is_anomaly(bounds, value):
+        if bounds is None:
+            return False
+        mean, std = bounds
+        return abs(value - mean) > 3 * std
+    
+    @staticmethod
+    def trend_analysis(data):
+        """تحلیل روند"""
+        if len(data) < 2:
+            return "نامشخص"
+        if data[-1] > data[0]:
+            return "صعودی 📈"
+        elif data[-1] < data[0]:
+            return "نزولی 📉"
+        else:
+            return "ثابت ➡️"
@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+
+"""
+پشتیبان‌گیری آنلاین، نگهداری snapshot‌ها و فشرده‌سازی دوره‌ای (بدون وابستگی به Qt)
+
+کپی پایگاه داده با backup API خود SQLite و در گام‌های PAGES_PER_STEP صفحه‌ای
+گرفته می‌شود، پس کپی همیشه سازگار است و کاربران در طول پشتیبان‌گیری ثبت
+می‌کنند. در حالت WAL یک تراکنش خواندن باز روی منبع نگه داشته می‌شود؛ کپی از
+روی همان نسخه ثابت ادامه می‌یابد و ثبت‌های جدید به WAL می‌روند. در حالت
+rollback journal هر commit دیگران کپی را از اول شروع می‌کند؛ بعد از
+MAX_RESTARTS بار شروع دوباره، باقی کار در یک گام انجام می‌شود و نویسنده‌ها فقط
+در طول همان گام منتظر می‌مانند.
+
+هر snapshot یک فایل zip فشرده در پوشه backups کنار پایگاه داده است
+(<نام>-YYYYmmdd-HHMMSS.zip) که ledger.db و manifest.json (زمان، نسخه
+برنامه، sha256 و اثر انگشت داده‌ها) را دارد. اگر اثر انگشت با آخرین snapshot
+یکی باشد snapshot جدیدی ساخته نمی‌شود. نگهداری به روش پدربزرگ-پدر-پسر است:
+آخرین snapshot هر روز برای KEEP_DAILY روز، هر هفته برای KEEP_WEEKLY هفته و هر
+ماه برای KEEP_MONTHLY ماه.
+
+بازیابی، فایل را در کنار پایگاه داده باز می‌کند، sha256 و PRAGMA quick_check
+را بررسی و سپس آن را با backup API روی همان فایل در حال استفاده کپی می‌کند
+(اتصال‌های دیگر نسخه جدید را می‌بینند). نگهداری (maintain) آمار بهینه‌ساز را
+با PRAGMA optimize و ANALYZE به‌روز می‌کند و فقط وقتی صفحات آزاد بیش از
+VACUUM_FREE_RATIO باشند VACUUM اجرا می‌کند. نوشتن روی پایگاه داده (بازیابی و
+نگهداری) از thread نویسنده دفتر (db.writer) می‌گذرد تا با ثبت‌ها تداخل نکند.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from .branding import APP_VERSION
+from .instrument import timed
+
+PAGES_PER_STEP = 1024
+STEP_SLEEP = 0.005
+MAX_RESTARTS = 3
+
+KEEP_DAILY = 7
+KEEP_WEEKLY = 4
+KEEP_MONTHLY = 12
+
+SNAPSHOT_INTERVAL = timedelta(days=1)
+MAINTENANCE_INTERVAL = timedelta(days=7)
+VACUUM_FREE_RATIO = 0.2
+
+ARCHIVE_DB = 'ledger.db'
+ARCHIVE_MANIFEST = 'manifest.json'
+MAINTENANCE_STATE = 'maintenance.json'
+CHUNK = 1 << 20
+
+# progress(انجام شده، کل) برای صفحات کپی یا بایت‌های بازشده
+Progress = Callable[[int, int], None]
+
+FINGERPRINT_SQL = '''
+    SELECT (SELECT COUNT(*) FROM transactions),
+           (SELECT IFNULL(MAX(id), 0) FROM transactions),
+           (SELECT TOTAL(amount) FROM transactions),
+           (SELECT TOTAL(is_verified) FROM transactions),
+           (SELECT COUNT(*) FROM accounts),
+           (SELECT TOTAL(balance) FROM accounts)
+'''
+
+
+class BackupError(Exception):
+    """فایل پشتیبان ناقص یا خراب است"""
+
+
+class Snapshot(NamedTuple):
+    path: str
+    created: datetime
+    
+    def manifest(self) -> dict:
+        with zipfile.ZipFile(self.path) as archive:
+            return json.loads(archive.read(ARCHIVE_MANIFEST))
+
+
+class MaintenanceReport(NamedTuple):
+    size_before: int
+    size_after: int
+    free_ratio: float
+    vacuumed: bool
+
+
+def default_directory(db_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'backups')
+
+
+def fingerprint(conn: sqlite3.Connection) -> str:
+    """خلاصه ارزان داده‌ها برای تشخیص تغییر نکردن دفتر از آخرین snapshot"""
+    schema = conn.execute("PRAGMA schema_version").fetchone()[0]
+    return ':'.join(str(value) for value in (schema, *conn.execute(FINGERPRINT_SQL).fetchone()))
+
+
+# ====================== کپی آنلاین ======================
+
+class _Restarted(Exception):
+    pass
+
+
+@timed('backup.online_copy')
+def online_copy(source: str, target: str, progress: Progress = None,
+                pages: int = PAGES_PER_STEP) -> str:
+    """کپی سازگار پایگاه داده در حال استفاده؛ اثر انگشت همان نسخه کپی شده برمی‌گردد"""
+    src = sqlite3.connect(source, timeout=30)
+    dst = sqlite3.connect(target)
+    try:
+        wal = src.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        if wal:
+            # اثر انگشت و کپی هر دو از یک نسخه ثابت خوانده می‌شوند
+            src.execute("BEGIN")
+            digest = fingerprint(src)
+        
+        restarts = 0
+        last = None
+        
+        def step(status, remaining, total):
+            nonlocal restarts, last
+            if last is not None and remaining > last:
+                restarts += 1
+                if restarts > MAX_RESTARTS:
+                    raise _Restarted()
+            last = remaining
+            if progress is not None:
+                progress(total - remaining, total)
+        
+        try:
+            src.backup(dst, pages=pages, progress=step, sleep=STEP_SLEEP)
+        except _Restarted:
+            src.backup(dst)
+        if wal:
+            src.rollback()
+            return digest
+        return fingerprint(dst)
+    finally:
+        src.close()
+        dst.close()
+
+
+# ====================== snapshot‌ها ======================
+
+def snapshot_name(db_path: str, created: datetime) -> str:
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    return f"{stem}-{created:%Y%m%d-%H%M%S}.zip"
+
+
+def list_snapshots(directory: str, db_path: str) -> List[Snapshot]:
+    """snapshot‌های یک پایگاه داده، جدیدترین اول"""
+    stem = os.path.splitext(os.path.basename(db_path))[0]
+    pattern = re.compile(re.escape(stem) + r'-(\d{8}-\d{6})\.zip$')
+    snapshots = []
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            match = pattern.match(name)
+            if match:
+                created = datetime.strptime(match.group(1), '%Y%m%d-%H%M%S')
+                snapshots.append(Snapshot(os.path.join(directory, name), created))
+    snapshots.sort(key=lambda s: s.created, reverse=True)
+    return snapshots
+
+
+def expired(snapshots: List[Snapshot], daily: int = KEEP_DAILY, weekly: int = KEEP_WEEKLY,
+            monthly: int = KEEP_MONTHLY) -> List[Snapshot]:
+    """snapshot‌هایی که طبق نگهداری پدربزرگ-پدر-پسر حذف می‌شوند (ورودی جدیدترین اول)"""
+    keep = set()
+    periods = (
+        (daily, lambda d: d.date()),
+        (weekly, lambda d: d.isocalendar()[:2]),
+        (monthly, lambda d: (d.year, d.month)),
+    )
+    for count, period in periods:
+        seen = set()
+        for snapshot in snapshots:
+            key = period(snapshot.created)
+            if key in seen:
+                continue
+            if len(seen) == count:
+                break
+            seen.add(key)
+            keep.add(snapshot.path)
+    return [s for s in snapshots if s.path not in keep]
+
+
+@timed('backup.snapshot')
+def create_snapshot(db_path: str, directory: str = None, progress: Progress = None,
+                    force: bool = False, created: datetime = None, rotate: bool = True) -> Optional[Snapshot]:
+    """snapshot فشرده جدید؛ اگر داده‌ها از آخرین snapshot تغییر نکرده باشند None
+    
+    rotate=False (مثلاً snapshot قبل از بازیابی) snapshot‌های قدیمی را حذف نمی‌کند تا
+    فایلی که از آن بازیابی می‌شود سر جایش بماند.
+    """
+    directory = directory or default_directory(db_path)
+    os.makedirs(directory, exist_ok=True)
+    snapshots = list_snapshots(directory, db_path)
+    if snapshots and not force:
+        conn = sqlite3.connect(db_path)
+        try:
+            current = fingerprint(conn)
+        finally:
+            conn.close()
+        try:
+            if snapshots[0].manifest().get('fingerprint') == current:
+                return None
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            pass
+    
+    created = created or datetime.now().replace(microsecond=0)
+    path = os.path.join(directory, snapshot_name(db_path, created))
+    workdir = tempfile.mkdtemp(prefix='.snapshot-', dir=directory)
+    try:
+        copy = os.path.join(workdir, ARCHIVE_DB)
+        digest = online_copy(db_path, copy, progress)
+        
+        sha256 = hashlib.sha256()
+        partial = path + '.partial'
+        with zipfile.ZipFile(partial, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            with open(copy, 'rb') as stream, archive.open(ARCHIVE_DB, 'w', force_zip64=True) as out:
+                while chunk := stream.read(CHUNK):
+                    sha256.update(chunk)
+                    out.write(chunk)
+            manifest = {
+                'created': created.isoformat(),
+                'app_version': APP_VERSION,
+                'source': os.path.basename(db_path),
+                'size': os.path.getsize(copy),
+                'sha256': sha256.hexdigest(),
+                'fingerprint': digest,
+            }
+            archive.writestr(ARCHIVE_MANIFEST, json.dumps(manifest, ensure_ascii=False, indent=2))
+        os.replace(partial, path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    if rotate:
+        for old in expired(list_snapshots(directory, db_path)):
+            os.remove(old.path)
+    return Snapshot(path, created)
+
+
+# ====================== بازیابی ======================
+
+def extract_verified(archive_path: str, workdir: str, progress: Progress = None) -> Tuple[str, dict]:
+    """باز کردن ledger.db از فایل پشتیبان با بررسی sha256 و quick_check؛ (مسیر، manifest)"""
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            manifest = json.loads(archive.read(ARCHIVE_MANIFEST))
+            path = os.path.join(workdir, ARCHIVE_DB)
+            sha256 = hashlib.sha256()
+            done = 0
+            with archive.open(ARCHIVE_DB) as stream, open(path, 'wb') as out:
+                while chunk := stream.read(CHUNK):
+                    sha256.update(chunk)
+                    out.write(chunk)
+                    done += len(chunk)
+                    if progress is not None:
+                        progress(done, manifest['size'])
+    except (KeyError, ValueError, zipfile.BadZipFile) as e:
+        raise BackupError(f"فایل پشتیبان نامعتبر است: {e}")
+    if sha256.hexdigest() != manifest['sha256']:
+        raise BackupError("sha256 فایل پشتیبان با manifest یکی نیست")
+    
+    conn = sqlite3.connect(path)
+    try:
+        result = conn.execute("PRAGMA quick_check").fetchall()
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    except sqlite3.DatabaseError as e:
+        raise BackupError(f"پایگاه داده پشتیبان خراب است: {e}")
+    finally:
+        conn.close()
+    if result != [('ok',)]:
+        raise BackupError(f"quick_check: {result[0][0]}")
+    if not {'accounts', 'transactions'} <= tables:
+        raise BackupError("فایل پشتیبان دفتر حساب نیست")
+    return path, manifest
+
+
+@timed('backup.restore')
+def restore_snapshot(db: 'DatabaseManager', archive_path: str, progress: Progress = None) -> dict:
+    """جایگزینی محتوای دفتر با فایل پشتیبان؛ manifest فایل برمی‌گردد"""
+    if db.is_remote:
+        raise BackupError("بازیابی فقط روی دفتر محلی انجام می‌شود")
+    workdir = tempfile.mkdtemp(prefix='.restore-', dir=os.path.dirname(os.path.abspath(db.db_path)))
+    try:
+        path, manifest = extract_verified(archive_path, workdir, progress)
+        db.writer.call(copy_into, path, db).result()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return manifest
+
+
+def copy_into(path: str, db: 'DatabaseManager'):
+    """کپی یک‌گامی روی پایگاه داده در حال استفاده و بارگذاری دوباره (در thread نویسنده)"""
+    src = sqlite3.connect(path)
+    try:
+        with db.get_connection() as dst:
+            src.backup(dst)
+    finally:
+        src.close()
+    db.reload()
+
+
+# ====================== نگهداری ======================
+
+def maintain(db: 'DatabaseManager', vacuum: bool = None) -> MaintenanceReport:
+    """به‌روزرسانی آمار بهینه‌ساز و VACUUM در صورت نیاز (vacuum=None یعنی طبق VACUUM_FREE_RATIO)"""
+    if db.is_remote:
+        raise BackupError("نگهداری فقط روی دفتر محلی انجام می‌شود")
+    return db.writer.call(run_maintenance, db, vacuum).result()
+
+
+@timed('backup.maintain')
+def run_maintenance(db: 'DatabaseManager', vacuum: bool = None) -> MaintenanceReport:
+    size_before = os.path.getsize(db.db_path)
+    with db.get_connection() as conn:
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        ratio = free / pages if pages else 0.0
+        if vacuum is None:
+            vacuum = ratio > VACUUM_FREE_RATIO
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+            conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+        if vacuum:
+            conn.execute("VACUUM")
+    db.bump_revision()
+    return MaintenanceReport(size_before, os.path.getsize(db.db_path), ratio, vacuum)
+
+
+# ====================== سرویس ======================
+
+class BackupService:
+    """پشتیبان‌گیری، بازیابی و نگهداری دفتر در یک thread کارگر (هر بار یک کار)"""
+    
+    def __init__(self, db: 'DatabaseManager', directory: str = None):
+        if db.is_remote:
+            raise BackupError("در حالت کلاینت پشتیبان‌گیری کار سرور است")
+        self.db = db
+        self.directory = directory or default_directory(db.db_path)
+        self.executor = None
+    
+    def submit(self, func: Callable, *args) -> Future:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ledger-backup')
+        return self.executor.submit(func, *args)
+    
+    def snapshot(self, progress: Progress = None, force: bool = False) -> Future:
+        return self.submit(create_snapshot, self.db.db_path, self.directory, progress, force)
+    
+    def restore(self, archive_path: str, progress: Progress = None) -> Future:
+        """بازیابی؛ وضعیت فعلی دفتر قبل از بازنویسی snapshot می‌شود"""
+        def work():
+            create_snapshot(self.db.db_path, self.directory, rotate=False)
+            return restore_snapshot(self.db, archive_path, progress)
+        return self.submit(work)
+    
+    def maintain(self, vacuum: bool = None) -> Future:
+        return self.submit(self.run_maintenance, vacuum)
+    
+    def snapshots(self) -> List[Snapshot]:
+        return list_snapshots(self.directory, self.db.db_path)
+    
+    def snapshot_due(self, now: datetime = None) -> bool:
+        snapshots = self.snapshots()
+        return not snapshots or (now or datetime.now()) - snapshots[0].created >= SNAPSHOT_INTERVAL
+    
+    def maintenance_due(self, now: datetime = None) -> bool:
+        try:
+            with open(os.path.join(self.directory, MAINTENANCE_STATE), encoding='utf-8') as f:
+                last = datetime.fromisoformat(json.load(f)['last'])
+        except (OSError, KeyError, ValueError):
+            return True
+        return (now or datetime.now()) - last >= MAINTENANCE_INTERVAL
+    
+    def run_maintenance(self, vacuum: bool = None) -> MaintenanceReport:
+        report = maintain(self.db, vacuum)
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, MAINTENANCE_STATE), 'w', encoding='utf-8') as f:
+            json.dump({'last': datetime.now().isoformat(), **report._asdict()}, f)
+        return report
+    
+    def run_due(self, progress: Progress = None) -> Optional[Future]:
+        """snapshot و نگهداری زمان‌بندی شده اگر موعدشان رسیده باشد"""
+        snapshot, maintenance = self.snapshot_due(), self.maintenance_due()
+        if not (snapshot or maintenance):
+            return None
+        
+        def work():
+            created = create_snapshot(self.db.db_path, self.directory, progress) if snapshot else None
+            if maintenance:
+                self.run_maintenance()
+            return created
+        return self.submit(work)
+    
+    def close(self, wait: bool = True):
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+"""
+اطلاعات برند ایمان حسابداری
+"""
+
+APP_NAME = "ایمان حسابداری"
+APP_NAME_EN = "ImanAccounting"
+APP_VERSION = "8.0.0"
+APP_AUTHOR = "سینا"
+APP_SLOGAN = "حساب‌هایت رو به ایمان بسپار"
+APP_WEBSITE = "iman-ai.ir"
+APP_EMAIL = "info@iman-ai.ir"
+APP_TELEGRAM = "@ImanAI2026"
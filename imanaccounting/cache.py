@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""
+کش LRU نتایج پرس‌وجو و محاسبات دفتر (بدون وابستگی به Qt)
+
+کلید هر مدخل شامل شماره بازبینی (revision) دفتر است که DatabaseManager با هر
+نوشتن یک واحد بالا می‌برد؛ پس بعد از هر تغییر، خواندن بعدی دوباره محاسبه
+می‌شود و مدخل‌های قدیمی به مرور با سیاست LRU بیرون می‌روند. نتایج کش شده بین
+فراخواننده‌ها مشترک‌اند و نباید تغییر داده شوند.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+    
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QueryCache:
+    """کش LRU با اندازه محدود و شمارنده برخورد/عدم برخورد"""
+    
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+    
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """مقدار کش شده key؛ در نبود آن compute اجرا و نتیجه ذخیره می‌شود"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+        
+        # محاسبه بیرون از قفل تا خواندن‌های دیگر منتظر نمانند
+        value = compute()
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return value
+    
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+    
+    def stats(self) -> CacheStats:
+        with self.lock:
+            return CacheStats(self.hits, self.misses, len(self.entries), self.maxsize)
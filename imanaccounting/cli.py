@@ -0,0 +1,754 @@
+# -*- coding: utf-8 -*-
+
+"""
+رابط خط فرمان بدون رابط گرافیکی (بدون وابستگی به Qt)
+
+اجرا:
+    python -m imanaccounting [--db iman_accounting.db | --company KEY] <دستور> ...
+
+دستورها:
+    post      ثبت یک تراکنش (با --repeat به صورت تراکنش تکراری)
+    import    ثبت دسته‌ای تراکنش‌ها از CSV یا JSON Lines (همه یا هیچ‌کدام)
+    export    خروجی تراکنش‌ها به CSV یا JSON Lines (با فیلتر نوع/حساب/تاریخ)
+    report    گزارش موجودی‌ها، پیش‌بینی هزینه، تراکنش‌های مشکوک یا سود ماهانه
+    serve     سرویس HTTP/JSON برای چند کاربر (imanaccounting/server.py)
+    reindex   بازسازی نمایه جستجو، جدول‌های rollup و postings و آمار بهینه‌ساز
+    vacuum    فشرده‌سازی فایل پایگاه داده
+    backup    snapshot فشرده با پشتیبان‌گیری آنلاین (imanaccounting/backup.py)
+    restore   بازیابی از فایل پشتیبان با بررسی sha256 و سلامت پایگاه داده
+    maintain  به‌روزرسانی آمار بهینه‌ساز و VACUUM در صورت زیاد بودن صفحات آزاد
+    periods   فهرست دوره‌های مالی بسته
+    close     بستن دوره مالی تا یک تاریخ و بایگانی تراکنش‌هایش (imanaccounting/periods.py)
+    reopen    باز کردن آخرین دوره بسته
+    recurring فهرست، ثبت موعدهای رسیده یا حذف تراکنش‌های تکراری (imanaccounting/recurring.py)
+    check     بررسی موجودی حساب‌ها با جمع دفتر و اصلاح با --repair (imanaccounting/integrity.py)
+    entry     ثبت سند چندسطری تراز یا نمایش یک سند (imanaccounting/journal.py)
+    statement گردش یک حساب با مانده بعد از هر سطر
+    companies فهرست، ثبت یا حذف شرکت‌های پوشه کاری (imanaccounting/workspace.py)
+    consolidate  موجودی یا سود ماهانه تلفیقی همه شرکت‌ها با یک پرس‌وجو
+
+--company دفتر یک شرکت ثبت شده در پوشه کاری (--workspace، پیش‌فرض
+IMAN_WORKSPACE یا companies) را به جای --db باز می‌کند.
+
+ستون‌های import/export: number, date, description, type, amount, debit, credit
+که debit و credit کد حساب هستند و number اختیاری است. رویدادهای دفتر همزمان
+(immediate) تحویل می‌شوند و thread پس‌زمینه‌ای ساخته نمی‌شود. export تراکنش‌های
+دوره‌های بسته را هم از بایگانی می‌خواند.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import date, datetime
+from typing import Iterator
+
+from .events import immediate
+from .ledger import DatabaseManager, Transaction
+from .money import Money
+from .query import TRANSACTION_TYPES, TransactionFilter, compile_filter
+from .recurring import FREQUENCIES
+
+COLUMNS = ('number', 'date', 'description', 'type', 'amount', 'debit', 'credit')
+
+EXPORT_SQL = '''
+    SELECT t.number, t.date, t.description, t.type, t.amount, d.code, c.code
+    FROM ledger_transactions t
+    JOIN accounts d ON d.id = t.debit_account_id
+    JOIN accounts c ON c.id = t.credit_account_id
+    WHERE {where}
+    ORDER BY t.date, t.id
+'''
+
+
+class CommandError(Exception):
+    """خطای ورودی کاربر؛ پیام آن بدون traceback چاپ می‌شود"""
+
+
+def open_ledger(path: str) -> DatabaseManager:
+    db = DatabaseManager(path, autoload=False)
+    db.events.scheduler = immediate
+    db.load()
+    return db
+
+
+def account_ids_by_code(db: DatabaseManager) -> dict:
+    return {account.code: account.id for account in db.get_all_accounts()}
+
+
+def parse_date(text: str) -> datetime:
+    try:
+        return datetime.combine(date.fromisoformat(text.strip()), datetime.min.time())
+    except ValueError:
+        raise CommandError(f"تاریخ نامعتبر: {text!r} (قالب YYYY-MM-DD)")
+
+
+def build_transaction(row: dict, codes: dict) -> Transaction:
+    """ساخت Transaction از یک ردیف import با ستون‌های COLUMNS"""
+    missing = [name for name in COLUMNS[1:] if name != 'description' and not row.get(name)]
+    if missing:
+        raise CommandError(f"ستون خالی: {', '.join(missing)}")
+    if row['type'] not in TRANSACTION_TYPES:
+        raise CommandError(f"نوع نامعتبر: {row['type']!r}")
+    try:
+        amount = Money(str(row['amount']))
+    except (ValueError, OverflowError):
+        raise CommandError(f"مبلغ نامعتبر: {row['amount']!r}")
+    if amount <= 0:
+        raise CommandError("مبلغ باید مثبت باشد")
+    
+    accounts = []
+    for side in ('debit', 'credit'):
+        code = str(row[side]).strip()
+        if code not in codes:
+            raise CommandError(f"حساب با کد {code} وجود ندارد")
+        accounts.append(codes[code])
+    
+    transaction = Transaction(parse_date(str(row['date'])), row.get('description') or '',
+                              amount, row['type'], *accounts)
+    if row.get('number'):
+        transaction.number = str(row['number'])
+    return transaction
+
+
+def read_rows(path: str, fmt: str) -> Iterator[dict]:
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8-sig', newline='')
+    try:
+        if fmt == 'csv':
+            yield from csv.DictReader(stream)
+        else:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def file_format(path: str, fmt: str) -> str:
+    if fmt:
+        return fmt
+    return 'jsonl' if path.endswith(('.jsonl', '.json')) else 'csv'
+
+
+# ====================== دستورها ======================
+
+def cmd_post(db: DatabaseManager, args) -> int:
+    row = {
+        'date': args.date or date.today().isoformat(), 'description': args.description,
+        'type': args.type, 'amount': args.amount, 'debit': args.debit, 'credit': args.credit,
+    }
+    transaction = build_transaction(row, account_ids_by_code(db))
+    if args.repeat:
+        from .recurring import RecurringError
+        try:
+            template_id = db.recurring.add(transaction, args.repeat, args.every,
+                                           args.until and parse_date(args.until).date())
+        except RecurringError as e:
+            raise CommandError(str(e))
+        posted = db.recurring.run_due()
+        count = len(posted.result()) if posted is not None else 0
+        print(f"✅ الگوی تکرار {template_id} ({count} تراکنش سررسید ثبت شد)")
+        return 0
+    if not db.add_transaction(transaction):
+        return 1
+    print(f"✅ {transaction.number} (id={transaction.id})")
+    return 0
+
+
+def cmd_import(db: DatabaseManager, args) -> int:
+    codes = account_ids_by_code(db)
+    transactions = []
+    # شماره خط فایل (سطر عنوان CSV خط ۱ است)
+    first_line = 2 if file_format(args.file, args.format) == 'csv' else 1
+    for line, row in enumerate(read_rows(args.file, file_format(args.file, args.format)), first_line):
+        try:
+            transactions.append(build_transaction(row, codes))
+        except CommandError as e:
+            raise CommandError(f"خط {line}: {e}")
+    if args.dry_run:
+        print(f"✅ {len(transactions):,} تراکنش معتبر (ثبت نشد)")
+        return 0
+    try:
+        count = db.post_transactions(transactions)
+    except Exception as e:
+        raise CommandError(f"هیچ تراکنشی ثبت نشد: {e}")
+    print(f"✅ {count:,} تراکنش ثبت شد")
+    return 0
+
+
+def cmd_export(db: DatabaseManager, args) -> int:
+    flt = TransactionFilter()
+    if args.type:
+        flt = flt.of_type(*args.type)
+    if args.account:
+        codes = account_ids_by_code(db)
+        unknown = [code for code in args.account if code not in codes]
+        if unknown:
+            raise CommandError(f"حساب با کد {', '.join(unknown)} وجود ندارد")
+        flt = flt.for_account(*(codes[code] for code in args.account))
+    if args.date_from or args.date_to:
+        flt = flt.between(args.date_from and parse_date(args.date_from).date(),
+                          args.date_to and parse_date(args.date_to).date())
+    where, params = compile_filter(flt)
+    
+    fmt = file_format(args.file, args.format)
+    stream = sys.stdout if args.file == '-' else open(args.file, 'w', encoding='utf-8', newline='')
+    count = 0
+    try:
+        writer = csv.writer(stream) if fmt == 'csv' else None
+        if writer:
+            writer.writerow(COLUMNS)
+        with db.get_connection() as conn:
+            # ردیف‌ها پشت سر هم نوشته می‌شوند و کل نتیجه در حافظه نمی‌ماند
+            for row in conn.execute(EXPORT_SQL.format(where=where), params):
+                if writer:
+                    writer.writerow(row)
+                else:
+                    stream.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False) + '\n')
+                count += 1
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    if args.file != '-':
+        print(f"✅ {count:,} تراکنش در {args.file}")
+    return 0
+
+
+def report_balances(db: DatabaseManager, args) -> dict:
+    return {
+        'accounts': [
+            {'code': a.code, 'name': a.name, 'type': a.type, 'balance': int(a.balance)}
+            for a in db.get_all_accounts()
+        ],
+        'total_assets': int(db.get_total_balance()),
+    }
+
+
+def report_forecast(db: DatabaseManager, args) -> dict:
+    from .reports import expense_forecast
+    return expense_forecast(db) or {}
+
+
+def report_anomalies(db: DatabaseManager, args) -> dict:
+    """ارزیابی دوباره آخرین تراکنش‌ها با مرزهای محاسبه شده از هزینه‌های همان بازه"""
+    rows = db.execute_query(
+        "SELECT * FROM transactions ORDER BY date DESC, id DESC LIMIT ?", (args.limit,)
+    )
+    transactions = [db.row_to_transaction(row) for row in rows]
+    bounds = db.ai.anomaly_bounds([t.amount for t in transactions if t.type == 'هزینه'])
+    suspicious = [t for t in transactions if db.ai.is_anomaly(bounds, t.amount)]
+    return {
+        'scanned': len(transactions),
+        'suspicious': [
+            {'number': t.number, 'date': t.date.strftime('%Y-%m-%d'), 'type': t.type,
+             'amount': int(t.amount), 'description': t.description}
+            for t in suspicious
+        ],
+    }
+
+
+def report_profit(db: DatabaseManager, args) -> dict:
+    from .profit_sharing import month_periods, period_profits
+    periods = month_periods(args.months)
+    return {
+        'months': [
+            {'month': period.label, 'profit': int(profit)}
+            for period, profit in zip(periods, period_profits(db, periods))
+        ],
+    }
+
+
+def report_closing(db: DatabaseManager, args) -> dict:
+    from .periods import closed_periods, closing_balances
+    periods = closed_periods(db)
+    if not periods:
+        return {}
+    names = {account.id: account for account in db.get_all_accounts()}
+    return {
+        'end': periods[-1].end.isoformat(),
+        'accounts': [
+            {'code': names[account_id].code, 'name': names[account_id].name, 'balance': int(balance)}
+            for account_id, balance in sorted(closing_balances(db).items(),
+                                              key=lambda item: names[item[0]].code if item[0] in names else '')
+            if account_id in names
+        ],
+    }
+
+
+REPORTS = {
+    'balances': report_balances,
+    'closing': report_closing,
+    'forecast': report_forecast,
+    'anomalies': report_anomalies,
+    'profit': report_profit,
+}
+
+
+def print_report(name: str, data: dict):
+    if name == 'balances':
+        for account in data['accounts']:
+            print(f"{account['code']:>8}  {account['balance']:>20,}  {account['name']}")
+        print(f"{'':>8}  {data['total_assets']:>20,}  جمع دارایی‌ها")
+    elif name == 'closing':
+        if not data:
+            print("دوره بسته‌ای وجود ندارد")
+            return
+        print(f"مانده حساب‌ها در پایان {data['end']}")
+        for account in data['accounts']:
+            print(f"{account['code']:>8}  {account['balance']:>20,}  {account['name']}")
+    elif name == 'forecast':
+        if not data:
+            print("هزینه‌ای ثبت نشده است")
+        for key, value in data.items():
+            print(f"{key}: {value:,.0f}" if isinstance(value, float) else f"{key}: {value}")
+    elif name == 'anomalies':
+        for t in data['suspicious']:
+            print(f"{t['date']}  {t['number']}  {t['amount']:>16,}  {t['type']}  {t['description']}")
+        print(f"{len(data['suspicious'])} مشکوک از {data['scanned']:,} تراکنش")
+    elif name == 'profit':
+        for month in data['months']:
+            print(f"{month['month']}  {month['profit']:>20,}")
+
+
+def cmd_report(db: DatabaseManager, args) -> int:
+    data = REPORTS[args.name](db, args)
+    if args.json:
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+    else:
+        print_report(args.name, data)
+    return 0
+
+
+def cmd_serve(db: DatabaseManager, args) -> int:
+    import asyncio
+    from .server import serve
+    token = args.token or os.environ.get('IMAN_API_TOKEN')
+    if args.host not in ('127.0.0.1', 'localhost', '::1') and not token:
+        raise CommandError("برای گوش دادن روی شبکه توکن لازم است (--token یا IMAN_API_TOKEN)")
+    try:
+        asyncio.run(serve(db, args.host, args.port, token))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_reindex(db: DatabaseManager, args) -> int:
+    from .journal import rebuild_postings
+    from .query import rebuild_rollup
+    from .search import reindex
+    reindex(db)
+    with db.get_connection() as conn:
+        rebuild_rollup(conn)
+        rebuild_postings(conn)
+        conn.commit()
+        conn.execute("ANALYZE")
+    db.bump_revision()
+    print("✅ نمایه جستجو، rollup، postings و آمار بازسازی شد")
+    return 0
+
+
+def cmd_vacuum(db: DatabaseManager, args) -> int:
+    from .backup import maintain
+    report = maintain(db, vacuum=True)
+    print(f"✅ {report.size_before / 2**20:,.1f}MB -> {report.size_after / 2**20:,.1f}MB")
+    return 0
+
+
+def show_progress(done: int, total: int):
+    print(f"\r⏳ {done * 100 // max(total, 1)}%", end='', file=sys.stderr, flush=True)
+
+
+def cmd_backup(db: DatabaseManager, args) -> int:
+    from .backup import create_snapshot, list_snapshots
+    progress = show_progress if sys.stderr.isatty() else None
+    snapshot = create_snapshot(db.db_path, args.dir, progress, force=args.force)
+    if progress:
+        print(file=sys.stderr)
+    if snapshot is None:
+        print("✅ دفتر از آخرین snapshot تغییر نکرده است")
+        return 0
+    kept = len(list_snapshots(os.path.dirname(snapshot.path), db.db_path))
+    print(f"✅ {snapshot.path} ({os.path.getsize(snapshot.path) / 2**20:,.1f}MB، {kept} snapshot نگه داشته شده)")
+    return 0
+
+
+def cmd_restore(db: DatabaseManager, args) -> int:
+    from .backup import BackupError, create_snapshot, restore_snapshot
+    if not os.path.exists(args.archive):
+        raise CommandError(f"فایل {args.archive} وجود ندارد")
+    if not args.no_snapshot:
+        # وضعیت فعلی قبل از بازنویسی نگه داشته می‌شود
+        create_snapshot(db.db_path, args.dir, rotate=False)
+    try:
+        manifest = restore_snapshot(db, args.archive)
+    except BackupError as e:
+        raise CommandError(str(e))
+    print(f"✅ بازیابی از {manifest['created']}: {len(db.accounts)} حساب")
+    return 0
+
+
+def cmd_maintain(db: DatabaseManager, args) -> int:
+    from .backup import BackupService
+    report = BackupService(db, args.dir).run_maintenance()
+    action = "VACUUM شد" if report.vacuumed else "بدون VACUUM"
+    print(f"✅ آمار به‌روز شد، {action} (صفحات آزاد {report.free_ratio:.0%}): "
+          f"{report.size_before / 2**20:,.1f}MB -> {report.size_after / 2**20:,.1f}MB")
+    return 0
+
+
+def cmd_recurring(db: DatabaseManager, args) -> int:
+    if args.action == 'run':
+        posted = db.recurring.run_due()
+        count = len(posted.result()) if posted is not None else 0
+        print(f"✅ {count} تراکنش تکراری ثبت شد")
+        return 0
+    if args.action == 'remove':
+        if args.id is None:
+            raise CommandError("شناسه الگو لازم است")
+        if not db.recurring.remove(args.id):
+            raise CommandError(f"الگوی {args.id} وجود ندارد")
+        print(f"✅ الگوی {args.id} حذف شد (تراکنش‌های ثبت شده‌اش باقی ماندند)")
+        return 0
+    
+    templates = db.recurring.templates()
+    if not templates:
+        print("تراکنش تکراری‌ای تعریف نشده است")
+    codes = {account.id: account.code for account in db.get_all_accounts()}
+    for t in templates:
+        next_date = t.next_date.isoformat() if t.next_date else 'تمام شده'
+        print(f"{t.id:>4}  {t.label:<12} {next_date:<10}  {t.amount:>16,}  "
+              f"{codes.get(t.debit_account_id, '?')} <- {codes.get(t.credit_account_id, '?')}  "
+              f"({t.occurrences} بار)  {t.description}")
+    return 0
+
+
+def cmd_check(db: DatabaseManager, args) -> int:
+    from .integrity import VerifyError, verify
+    try:
+        report = verify(db, full=args.full, repair=args.repair)
+    except VerifyError as e:
+        raise CommandError(str(e))
+    scope = "کامل" if report.full else f"از شناسه {report.since:,}"
+    print(f"بررسی {scope} تا شناسه {report.through:,}، {report.accounts} حساب در {report.seconds:.2f}s")
+    for drift in report.drifts:
+        print(f"  {drift.code:>8}  ذخیره شده {drift.stored:>18,}  دفتر {drift.expected:>18,}  "
+              f"اختلاف {drift.difference:>16,}  {drift.name}")
+    if report.ok:
+        print("✅ موجودی همه حساب‌ها با دفتر برابر است")
+        return 0
+    if report.repaired:
+        print(f"✅ موجودی {len(report.drifts)} حساب اصلاح شد")
+        return 0
+    print(f"❌ موجودی {len(report.drifts)} حساب با دفتر برابر نیست (برای اصلاح --repair)", file=sys.stderr)
+    return 1
+
+
+def print_entry(db: DatabaseManager, entry):
+    codes = {account.id: account for account in db.get_all_accounts()}
+    print(f"سند {entry.id} ({entry.number})  {entry.date.isoformat()}  {entry.type}  {entry.description}")
+    for line in entry.lines:
+        account = codes.get(line.account_id)
+        debit, credit = (f"{line.amount:,}", '') if line.amount > 0 else ('', f"{-line.amount:,}")
+        print(f"  {account.code if account else '?':>8}  {debit:>16}  {credit:>16}  "
+              f"{account.name if account else ''}")
+    print(f"  {len(entry.transactions)} ردیف دوطرفه")
+
+
+def cmd_entry(db: DatabaseManager, args) -> int:
+    from .journal import JournalError, get_entry, post_entry
+    if args.show is not None:
+        entry = get_entry(db, args.show)
+        if entry is None:
+            raise CommandError(f"سند {args.show} وجود ندارد")
+        print_entry(db, entry)
+        return 0
+    if not args.type:
+        raise CommandError("نوع سند (--type) لازم است")
+    
+    codes = account_ids_by_code(db)
+    lines = []
+    for text in args.lines:
+        code, _, amount = text.partition(':')
+        if code not in codes:
+            raise CommandError(f"حساب با کد {code} وجود ندارد")
+        try:
+            lines.append((codes[code], Money(amount)))
+        except (ValueError, OverflowError):
+            raise CommandError(f"سطر نامعتبر: {text!r} (قالب CODE:AMOUNT)")
+    day = parse_date(args.date).date() if args.date else date.today()
+    try:
+        entry = post_entry(db, day, args.description, args.type, lines, args.number)
+    except JournalError as e:
+        raise CommandError(str(e))
+    except Exception as e:
+        raise CommandError(f"سند ثبت نشد: {e}")
+    print_entry(db, entry)
+    return 0
+
+
+def cmd_statement(db: DatabaseManager, args) -> int:
+    from .journal import statement
+    codes = account_ids_by_code(db)
+    if args.account not in codes:
+        raise CommandError(f"حساب با کد {args.account} وجود ندارد")
+    result = statement(
+        db, codes[args.account],
+        args.date_from and parse_date(args.date_from).date(),
+        args.date_to and parse_date(args.date_to).date(),
+        args.limit, args.offset
+    )
+    account = db.get_account_by_id(result.account_id)
+    print(f"{account.code} {account.name}: مانده ابتدا {result.opening:,}، مانده پایان {result.closing:,}، "
+          f"{result.total:,} سطر")
+    for line in result.lines:
+        debit, credit = (f"{line.amount:,}", '') if line.amount > 0 else ('', f"{-line.amount:,}")
+        entry = f"  (سند {line.entry_id})" if line.entry_id else ''
+        print(f"{line.date.isoformat()}  {line.number:<24} {debit:>16} {credit:>16} "
+              f"{line.balance:>18,}  {line.description}{entry}")
+    return 0
+
+
+def cmd_companies(db: DatabaseManager, args) -> int:
+    from .workspace import Workspace, WorkspaceError
+    workspace = Workspace(args.workspace)
+    try:
+        if args.action == 'add':
+            if not args.key or not args.name:
+                raise CommandError("برای ثبت شرکت کلید و نام لازم است")
+            company = workspace.add(args.key, args.name, args.path and os.path.abspath(args.path))
+            print(f"✅ {company.key} ({company.name}): {company.path}")
+            return 0
+        if args.action == 'remove':
+            if not args.key:
+                raise CommandError("کلید شرکت لازم است")
+            company = workspace.remove(args.key)
+            print(f"✅ {company.key} از فهرست حذف شد (فایل {company.path} باقی ماند)")
+            return 0
+    except WorkspaceError as e:
+        raise CommandError(str(e))
+    companies = workspace.companies()
+    if not companies:
+        print(f"شرکتی در {workspace.root} ثبت نشده است")
+    for company in companies:
+        mark = '*' if company.key == workspace.last else ' '
+        print(f"{mark} {company.key:<16} {company.name}  ({company.path})")
+    return 0
+
+
+def cmd_consolidate(db: DatabaseManager, args) -> int:
+    from .profit_sharing import month_periods
+    from .workspace import Workspace, WorkspaceError
+    workspace = Workspace(args.workspace)
+    try:
+        companies = workspace.selected(args.keys)
+        keys = [company.key for company in companies]
+        if args.report == 'balances':
+            data = {'companies': keys, 'accounts': [
+                {'code': a.code, 'name': a.name, 'type': a.type, 'total': int(a.total),
+                 'balances': {key: int(balance) for key, balance in a.balances.items()}}
+                for a in workspace.consolidated_balances(keys)
+            ]}
+        else:
+            periods = month_periods(args.months)
+            profits = workspace.consolidated_profits(periods, keys)
+            data = {'companies': keys, 'months': [
+                {'month': period.label, 'total': sum(int(profits[key][i]) for key in keys),
+                 'profits': {key: int(profits[key][i]) for key in keys}}
+                for i, period in enumerate(periods)
+            ]}
+    except WorkspaceError as e:
+        raise CommandError(str(e))
+    
+    if args.json:
+        print(json.dumps(data, ensure_ascii=False, indent=2))
+        return 0
+    header = ''.join(f"{key:>18}" for key in keys)
+    if args.report == 'balances':
+        print(f"{'':>8}{header}{'جمع':>20}")
+        for account in data['accounts']:
+            row = ''.join(f"{account['balances'].get(key, 0):>18,}" for key in keys)
+            print(f"{account['code']:>8}{row}{account['total']:>20,}  {account['name']}")
+    else:
+        print(f"{'':>8}{header}{'جمع':>20}")
+        for month in data['months']:
+            row = ''.join(f"{month['profits'][key]:>18,}" for key in keys)
+            print(f"{month['month']:>8}{row}{month['total']:>20,}")
+    return 0
+
+
+def cmd_periods(db: DatabaseManager, args) -> int:
+    from .periods import closed_periods
+    periods = closed_periods(db)
+    if not periods:
+        print("دوره بسته‌ای وجود ندارد")
+    for period in periods:
+        start = period.start.isoformat() if period.start else '...'
+        print(f"{period.id:>4}  {start} تا {period.end.isoformat()}  {period.transaction_count:>10,} تراکنش  "
+              f"(بسته شده {period.closed_at})")
+    return 0
+
+
+def cmd_close(db: DatabaseManager, args) -> int:
+    from .periods import PeriodError, close_period
+    try:
+        period = close_period(db, parse_date(args.end).date())
+    except PeriodError as e:
+        raise CommandError(str(e))
+    print(f"✅ دوره تا {period.end.isoformat()} بسته شد و {period.transaction_count:,} تراکنش بایگانی شد")
+    return 0
+
+
+def cmd_reopen(db: DatabaseManager, args) -> int:
+    from .periods import PeriodError, reopen_period
+    try:
+        period = reopen_period(db)
+    except PeriodError as e:
+        raise CommandError(str(e))
+    print(f"✅ دوره تا {period.end.isoformat()} باز شد")
+    return 0
+
+
+# ====================== ورودی ======================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='imanaccounting', description="ایمان حسابداری - خط فرمان")
+    parser.add_argument('--db', default='iman_accounting.db', help="مسیر پایگاه داده")
+    parser.add_argument('--company', help="کلید شرکت در پوشه کاری (به جای --db)")
+    parser.add_argument('--workspace', help="پوشه کاری شرکت‌ها (پیش‌فرض: IMAN_WORKSPACE یا companies)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    post = commands.add_parser('post', help="ثبت یک تراکنش")
+    post.add_argument('--date', help="YYYY-MM-DD (پیش‌فرض: امروز)")
+    post.add_argument('--description', default='')
+    post.add_argument('--type', required=True, choices=TRANSACTION_TYPES)
+    post.add_argument('--amount', required=True, help="ریال")
+    post.add_argument('--debit', required=True, help="کد حساب بدهکار")
+    post.add_argument('--credit', required=True, help="کد حساب بستانکار")
+    post.add_argument('--repeat', choices=tuple(FREQUENCIES), help="ثبت به صورت تراکنش تکراری")
+    post.add_argument('--every', type=int, default=1, help="--repeat: فاصله تکرار")
+    post.add_argument('--until', help="--repeat: آخرین روز تکرار YYYY-MM-DD")
+    post.set_defaults(func=cmd_post)
+    
+    import_ = commands.add_parser('import', help="ثبت دسته‌ای از فایل (- برای stdin)")
+    import_.add_argument('file')
+    import_.add_argument('--format', choices=('csv', 'jsonl'), help="پیش‌فرض: از پسوند فایل")
+    import_.add_argument('--dry-run', action='store_true', help="فقط بررسی، بدون ثبت")
+    import_.set_defaults(func=cmd_import)
+    
+    export = commands.add_parser('export', help="خروجی تراکنش‌ها (- برای stdout)")
+    export.add_argument('file')
+    export.add_argument('--format', choices=('csv', 'jsonl'), help="پیش‌فرض: از پسوند فایل")
+    export.add_argument('--type', action='append', choices=TRANSACTION_TYPES)
+    export.add_argument('--account', action='append', help="کد حساب (بدهکار یا بستانکار)")
+    export.add_argument('--from', dest='date_from', help="YYYY-MM-DD")
+    export.add_argument('--to', dest='date_to', help="YYYY-MM-DD (شامل خود روز)")
+    export.set_defaults(func=cmd_export)
+    
+    report = commands.add_parser('report', help="گزارش‌ها")
+    report.add_argument('name', choices=sorted(REPORTS))
+    report.add_argument('--json', action='store_true')
+    report.add_argument('--limit', type=int, default=1000, help="anomalies: تعداد آخرین تراکنش‌ها")
+    report.add_argument('--months', type=int, default=12, help="profit: تعداد ماه‌ها")
+    report.set_defaults(func=cmd_report)
+    
+    serve = commands.add_parser('serve', help="سرویس HTTP/JSON")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8750)
+    serve.add_argument('--token', help="پیش‌فرض: IMAN_API_TOKEN")
+    serve.set_defaults(func=cmd_serve)
+    
+    reindex = commands.add_parser('reindex', help="بازسازی نمایه‌ها")
+    reindex.set_defaults(func=cmd_reindex)
+    
+    vacuum = commands.add_parser('vacuum', help="فشرده‌سازی پایگاه داده")
+    vacuum.set_defaults(func=cmd_vacuum)
+    
+    backup = commands.add_parser('backup', help="snapshot فشرده دفتر")
+    backup.add_argument('--dir', help="پیش‌فرض: پوشه backups کنار پایگاه داده")
+    backup.add_argument('--force', action='store_true', help="حتی اگر دفتر تغییر نکرده باشد")
+    backup.set_defaults(func=cmd_backup)
+    
+    restore = commands.add_parser('restore', help="بازیابی از فایل پشتیبان")
+    restore.add_argument('archive')
+    restore.add_argument('--dir', help="پوشه snapshot وضعیت فعلی قبل از بازیابی")
+    restore.add_argument('--no-snapshot', action='store_true', help="بدون snapshot وضعیت فعلی")
+    restore.set_defaults(func=cmd_restore)
+    
+    maintain = commands.add_parser('maintain', help="آمار بهینه‌ساز و VACUUM در صورت نیاز")
+    maintain.add_argument('--dir', help="پوشه وضعیت نگهداری (پیش‌فرض: پوشه backups)")
+    maintain.set_defaults(func=cmd_maintain)
+    
+    periods = commands.add_parser('periods', help="دوره‌های مالی بسته")
+    periods.set_defaults(func=cmd_periods)
+    
+    close = commands.add_parser('close', help="بستن دوره مالی و بایگانی تراکنش‌ها")
+    close.add_argument('end', help="آخرین روز دوره YYYY-MM-DD")
+    close.set_defaults(func=cmd_close)
+    
+    reopen = commands.add_parser('reopen', help="باز کردن آخرین دوره بسته")
+    reopen.set_defaults(func=cmd_reopen)
+    
+    recurring = commands.add_parser('recurring', help="تراکنش‌های تکراری")
+    recurring.add_argument('action', nargs='?', default='list', choices=('list', 'run', 'remove'))
+    recurring.add_argument('id', nargs='?', type=int, help="remove: شناسه الگو")
+    recurring.set_defaults(func=cmd_recurring)
+    
+    check = commands.add_parser('check', help="بررسی موجودی حساب‌ها با دفتر")
+    check.add_argument('--full', action='store_true', help="بدون checkpoint، از ابتدای دفتر")
+    check.add_argument('--repair', action='store_true', help="اصلاح موجودی‌های نابرابر")
+    check.set_defaults(func=cmd_check)
+    
+    entry = commands.add_parser('entry', help="ثبت سند چندسطری")
+    entry.add_argument('lines', nargs='*', help="CODE:AMOUNT (بدهکار مثبت، بستانکار منفی)")
+    entry.add_argument('--date', help="YYYY-MM-DD (پیش‌فرض: امروز)")
+    entry.add_argument('--description', default='')
+    entry.add_argument('--type', choices=TRANSACTION_TYPES)
+    entry.add_argument('--number', help="شماره سند (پیش‌فرض: JE<زمان>)")
+    entry.add_argument('--show', type=int, metavar='ID', help="نمایش یک سند به جای ثبت")
+    entry.set_defaults(func=cmd_entry)
+    
+    statement = commands.add_parser('statement', help="گردش یک حساب با مانده")
+    statement.add_argument('account', help="کد حساب")
+    statement.add_argument('--from', dest='date_from', help="YYYY-MM-DD")
+    statement.add_argument('--to', dest='date_to', help="YYYY-MM-DD (شامل خود روز)")
+    statement.add_argument('--limit', type=int, default=50)
+    statement.add_argument('--offset', type=int, default=0)
+    statement.set_defaults(func=cmd_statement)
+    
+    companies = commands.add_parser('companies', help="شرکت‌های پوشه کاری")
+    companies.add_argument('action', nargs='?', default='list', choices=('list', 'add', 'remove'))
+    companies.add_argument('key', nargs='?', help="کلید شرکت (حروف لاتین و رقم)")
+    companies.add_argument('name', nargs='?', help="add: نام نمایشی")
+    companies.add_argument('--path', help="add: فایل دفتر (پیش‌فرض: <key>.db در پوشه کاری)")
+    companies.set_defaults(func=cmd_companies, ledger=False)
+    
+    consolidate = commands.add_parser('consolidate', help="گزارش تلفیقی شرکت‌ها")
+    consolidate.add_argument('report', choices=('balances', 'profit'))
+    consolidate.add_argument('keys', nargs='*', help="کلید شرکت‌ها (پیش‌فرض: همه)")
+    consolidate.add_argument('--months', type=int, default=12, help="profit: تعداد ماه‌ها")
+    consolidate.add_argument('--json', action='store_true')
+    consolidate.set_defaults(func=cmd_consolidate, ledger=False)
+    return parser
+
+
+def ledger_path(args) -> str:
+    if not args.company:
+        return args.db
+    from .workspace import Workspace, WorkspaceError
+    try:
+        return Workspace(args.workspace).company(args.company).path
+    except WorkspaceError as e:
+        raise CommandError(str(e))
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        # companies و consolidate دفتر جاری را باز نمی‌کنند
+        db = open_ledger(ledger_path(args)) if getattr(args, 'ledger', True) else None
+        return args.func(db, args)
+    except CommandError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+"""
+گذرگاه رویدادهای دفتر (بدون وابستگی به Qt)
+
+DatabaseManager رویدادهای ایجاد تراکنش، ایجاد حساب و تغییر موجودی را منتشر
+می‌کند. رویدادها صف می‌شوند و به صورت ناهمزمان و دسته‌ای تحویل می‌شوند:
+هر مشترک در هر تحویل یک لیست از رویدادهای نوع خودش می‌گیرد. داخل
+`with bus.batch():` (مثلاً هنگام import) همه رویدادها در یک تحویل جمع می‌شوند
+و تغییرات موجودی هر حساب در یک رویداد ادغام می‌شود.
+"""
+
+import queue
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from .money import Money
+
+
+# ====================== انواع رویداد ======================
+
+class PostingCreated(NamedTuple):
+    transaction: Any
+
+
+class AccountCreated(NamedTuple):
+    account: Any
+
+
+class BalanceChanged(NamedTuple):
+    account_id: int
+    delta: Money
+    balance: Money
+
+
+EVENT_TYPES = (PostingCreated, AccountCreated, BalanceChanged)
+
+
+def coalesce(events: List[NamedTuple]) -> Dict[type, list]:
+    """گروه‌بندی رویدادها بر اساس نوع؛ تغییرات موجودی هر حساب جمع زده می‌شود"""
+    grouped = defaultdict(list)
+    balances = {}
+    for event in events:
+        if isinstance(event, BalanceChanged):
+            previous = balances.get(event.account_id)
+            if previous is not None:
+                event = BalanceChanged(event.account_id, previous.delta + event.delta, event.balance)
+            balances[event.account_id] = event
+        else:
+            grouped[type(event)].append(event)
+    if balances:
+        grouped[BalanceChanged] = list(balances.values())
+    return grouped
+
+
+# ====================== زمان‌بندی تحویل ======================
+
+_STOP = object()
+
+
+class ThreadScheduler:
+    """تحویل رویدادها روی یک thread پس‌زمینه (برای حالت بدون رابط کاربری)"""
+    
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+    
+    def __call__(self, func: Callable[[], None]):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, args=(self.queue,), daemon=True)
+                self.thread.start()
+            self.queue.put(func)
+    
+    def close(self, wait: bool = True):
+        """پایان thread بعد از تحویل رویدادهای صف شده"""
+        with self.lock:
+            thread, self.thread = self.thread, None
+            if thread is not None:
+                self.queue.put(_STOP)
+                self.queue = queue.Queue()
+        if thread is not None and wait:
+            thread.join()
+    
+    @staticmethod
+    def run(tasks: queue.Queue):
+        while True:
+            func = tasks.get()
+            if func is _STOP:
+                return
+            func()
+
+
+def immediate(func: Callable[[], None]):
+    """تحویل همزمان در همان thread منتشرکننده (برای اسکریپت‌ها و ابزارها)"""
+    func()
+
+
+# ====================== کلاس EventBus ======================
+
+class EventBus:
+    """انتشار/اشتراک رویدادهای دفتر با تحویل دسته‌ای
+    
+    callback هر مشترک با لیست رویدادهای نوع مشترک شده صدا زده می‌شود.
+    scheduler تابعی است که flush را «بعداً» اجرا می‌کند؛ رابط کاربری آن را
+    با یک سیگنال صف‌شده Qt جایگزین می‌کند تا تحویل در thread اصلی باشد.
+    """
+    
+    def __init__(self, scheduler: Callable[[Callable[[], None]], None] = None):
+        self.scheduler = scheduler or ThreadScheduler()
+        self.subscribers: Dict[type, List[Callable[[list], None]]] = defaultdict(list)
+        self.pending = []
+        self.lock = threading.Lock()
+        self.depth = 0
+        self.scheduled = False
+    
+    def close(self):
+        """پایان thread زمان‌بند پیش‌فرض؛ scheduler های دیگر (Qt، immediate) thread ندارند"""
+        close = getattr(self.scheduler, 'close', None)
+        if close is not None:
+            close()
+    
+    def subscribe(self, event_type: type, callback: Callable[[list], None]):
+        self.subscribers[event_type].append(callback)
+        return callback
+    
+    def unsubscribe(self, event_type: type, callback: Callable[[list], None]):
+        try:
+            self.subscribers[event_type].remove(callback)
+        except ValueError:
+            pass
+    
+    def publish(self, event: NamedTuple):
+        with self.lock:
+            self.pending.append(event)
+            if self.depth or self.scheduled:
+                return
+            self.scheduled = True
+        self.scheduler(self.flush)
+    
+    @contextmanager
+    def batch(self):
+        """همه رویدادهای داخل بلوک در یک تحویل فرستاده می‌شوند"""
+        with self.lock:
+            self.depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.depth -= 1
+                schedule = self.depth == 0 and bool(self.pending) and not self.scheduled
+                if schedule:
+                    self.scheduled = True
+            if schedule:
+                self.scheduler(self.flush)
+    
+    def flush(self):
+        """تحویل رویدادهای صف شده به مشترکان (در thread فراخوان)"""
+        with self.lock:
+            if self.depth:
+                # batch هنوز باز است؛ تحویل به پایان آن موکول می‌شود
+                self.scheduled = False
+                return
+            events, self.pending = self.pending, []
+            self.scheduled = False
+        
+        for event_type, batch in coalesce(events).items():
+            for callback in list(self.subscribers.get(event_type, ())):
+                try:
+                    callback(batch)
+                except Exception as e:
+                    print(f"⚠️ خطا در مشترک رویداد {event_type.__name__}: {e}")
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+"""
+رابط کاربری PyQt5 ایمان حسابداری
+"""
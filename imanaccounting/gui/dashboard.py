@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+"""
+داشبورد اصلی
+"""
+
+from datetime import datetime
+
+from PyQt5.QtWidgets import (
+    QFrame, QGridLayout, QHBoxLayout, QLabel, QMessageBox, QPushButton,
+    QVBoxLayout, QWidget
+)
+from PyQt5.QtCore import Qt
+
+from .._lazy import lazy_import
+from ..instrument import timed
+from ..ledger import DatabaseManager
+from ..license import LicenseManager
+from ..money import Money
+from .. import reports
+from .theme import ThemeManager, set_variant
+from .views import LedgerSignals, ViewCache
+from .widgets import StatCard
+
+# دیالوگ‌ها فقط با اولین کلیک بارگذاری می‌شوند
+dialogs = lazy_import(__package__ + '.dialogs')
+
+
+# ====================== کلاس DashboardWidget ======================
+
+class DashboardWidget(QWidget):
+    def __init__(self, db: DatabaseManager, license_mgr: LicenseManager, theme_manager: ThemeManager):
+        super().__init__()
+        self.db = db
+        self.license = license_mgr
+        self.theme_manager = theme_manager
+        self.optimizer = theme_manager.optimizer
+        self.theme = theme_manager.current_theme
+        
+        self.setObjectName("dashboard")
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        
+        self.signals = LedgerSignals(db)
+        self.signals.transactions_added.connect(self.on_transactions_added)
+        self.signals.balances_changed.connect(self.on_balances_changed)
+        self.views = ViewCache(self.signals)
+        
+        self.total = self.income = self.expense = Money(0)
+        self.ai_frame = None
+        self.init_ui()
+        if self.db.loaded:
+            self.refresh()
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(self.optimizer.get_spacing(15))
+        
+        # وضعیت لایسنس
+        license_frame = QFrame()
+        license_frame.setObjectName("licenseFrame")
+        license_layout = QHBoxLayout()
+        
+        self.license_label = QLabel("🔑 در حال بررسی لایسنس...")
+        self.license_label.setObjectName("licenseLabel_text_secondary")
+        license_layout.addWidget(self.license_label)
+        license_layout.addStretch()
+        license_frame.setLayout(license_layout)
+        layout.addWidget(license_frame)
+        
+        # کارت‌های آماری
+        stats_layout = QHBoxLayout()
+        stats_layout.setSpacing(self.optimizer.get_spacing(15))
+        
+        self.total_card = StatCard(
+            "موجودی کل", "۰", "💰", 
+            'primary', self.optimizer, self.theme
+        )
+        stats_layout.addWidget(self.total_card)
+        
+        self.income_card = StatCard(
+            "درآمد امروز", "۰", "📈", 
+            'success', self.optimizer, self.theme
+        )
+        stats_layout.addWidget(self.income_card)
+        
+        self.expense_card = StatCard(
+            "هزینه امروز", "۰", "📉", 
+            'danger', self.optimizer, self.theme
+        )
+        stats_layout.addWidget(self.expense_card)
+        
+        layout.addLayout(stats_layout)
+        
+        # دکمه‌ها
+        btn_layout = QGridLayout()
+        btn_layout.setSpacing(self.optimizer.get_spacing(10))
+        
+        buttons = [
+            ("➕ تراکنش جدید", self.show_transaction, 0, 0, 'success'),
+            ("📊 لیست حساب‌ها", self.show_accounts, 0, 1, 'info'),
+            ("📋 لیست تراکنش‌ها", self.show_transactions, 1, 0, 'warning'),
+            ("🤖 هوش مصنوعی", self.show_ai, 1, 1, 'primary'),
+            ("🔑 لایسنس", self.show_license, 2, 0, 'secondary'),
+            ("ℹ️ درباره", self.show_about, 2, 1, 'secondary')
+        ]
+        
+        self.action_buttons = []
+        for text, func, row, col, variant in buttons:
+            btn = QPushButton(text)
+            btn.setFixedHeight(self.optimizer.get_button_height(40))
+            btn.setObjectName(f"dashButton_{variant}")
+            btn.clicked.connect(func)
+            btn.setEnabled(self.db.loaded)
+            btn_layout.addWidget(btn, row, col)
+            self.action_buttons.append(btn)
+        
+        layout.addLayout(btn_layout)
+        
+        # جای بنر هوش مصنوعی؛ بعد از بارگذاری داده‌ها پر می‌شود
+        self.ai_layout = QVBoxLayout()
+        layout.addLayout(self.ai_layout)
+        
+        layout.addStretch()
+        self.setLayout(layout)
+        
+        if self.license.loaded:
+            self.update_license()
+    
+    def update_license(self):
+        if self.license.is_school:
+            license_text = "🏫 نسخه مدرسه"
+            variant = 'success'
+        elif self.license.is_admin:
+            license_text = "👑 ادمین"
+            variant = 'warning'
+        else:
+            license_text = f"🔑 {self.license.license_type.value}"
+            variant = 'text_secondary'
+        
+        self.license_label.setText(license_text)
+        set_variant(self.license_label, "licenseLabel", variant)
+    
+    def load_ai_banner(self):
+        """هشدار هوش مصنوعی (اسکن پیش‌بینی و روند، بعد از نمایش پنجره)"""
+        if self.ai_frame is not None:
+            self.ai_layout.removeWidget(self.ai_frame)
+            self.ai_frame.deleteLater()
+            self.ai_frame = None
+        
+        forecast = reports.expense_forecast(self.db)
+        if forecast and forecast['count'] > 5:
+            
+            ai_frame = QFrame()
+            ai_frame.setObjectName("aiBanner")
+            ai_layout = QHBoxLayout()
+            
+            ai_icon = QLabel("🤖")
+            ai_icon.setObjectName("aiBannerIcon")
+            ai_layout.addWidget(ai_icon)
+            
+            ai_text = QLabel(f"پیش‌بینی ماه آینده: {forecast['prediction']:,.0f} ({forecast['trend']})")
+            ai_text.setObjectName("aiBannerText")
+            ai_layout.addWidget(ai_text)
+            
+            ai_layout.addStretch()
+            ai_frame.setLayout(ai_layout)
+            self.ai_layout.addWidget(ai_frame)
+            self.ai_frame = ai_frame
+    
+    @timed('dashboard.refresh')
+    def refresh(self):
+        self.total = self.db.get_total_balance()
+        self.income, self.expense = self.db.get_today_income_expense()
+        self.update_cards()
+    
+    def update_cards(self):
+        self.total_card.update_value(f"{self.total:,.0f}")
+        self.income_card.update_value(f"{self.income:,.0f}")
+        self.expense_card.update_value(f"{self.expense:,.0f}")
+    
+    def on_transactions_added(self, transactions: list):
+        # جمع‌های امروز بدون پیمایش دوباره همه تراکنش‌ها به‌روز می‌شوند
+        today = datetime.now().date()
+        for trans in transactions:
+            if trans.date.date() == today:
+                if trans.type == 'درآمد':
+                    self.income += trans.amount
+                elif trans.type == 'هزینه':
+                    self.expense += trans.amount
+        self.update_cards()
+    
+    def on_balances_changed(self, changes: list):
+        for change in changes:
+            account = self.db.get_account_by_id(change.account_id)
+            if account is not None and account.type == 'asset':
+                self.total += change.delta
+        self.update_cards()
+    
+    def show_view(self, key: str, dialog_class):
+        """باز کردن دیالوگ از کش؛ فقط بار اول ساخته می‌شود"""
+        return self.views.get(
+            key, lambda: dialog_class(self.db, self.optimizer, self.theme, self.window())
+        )
+    
+    def show_transaction(self):
+        dialog = self.show_view('transaction', dialogs.TransactionDialog)
+        dialog.reset()
+        dialog.exec_()
+    
+    def show_accounts(self):
+        self.show_view('accounts', dialogs.AccountsDialog).exec_()
+    
+    def show_transactions(self):
+        self.show_view('transactions', dialogs.TransactionsDialog).exec_()
+    
+    def show_ai(self):
+        self.show_view('ai', dialogs.AIDashboard).exec_()
+    
+    def show_recurring(self):
+        self.show_view('recurring', dialogs.RecurringDialog).exec_()
+    
+    def show_license(self):
+        dialog = dialogs.LicenseDialog(self.license, self.optimizer, self.theme, self.window())
+        if dialog.exec_():
+            self.window().update_license()
+            QMessageBox.information(self.window(), "موفق", "لایسنس فعال شد")
+    
+    def show_about(self):
+        dialog = dialogs.AboutDialog(self.license, self.optimizer, self.theme, self.window())
+        dialog.exec_()
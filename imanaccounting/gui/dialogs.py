@@ -0,0 +1,950 @@
+# -*- coding: utf-8 -*-
+
+"""
+دیالوگ‌های برنامه
+"""
+
+import time
+from datetime import datetime
+from typing import List
+
+from PyQt5.QtWidgets import (
+    QCheckBox, QComboBox, QDateEdit, QDialog, QDoubleSpinBox, QFormLayout, QGroupBox,
+    QHBoxLayout, QHeaderView, QLabel, QLineEdit, QMessageBox, QPushButton, QTableWidget,
+    QTableWidgetItem, QTextEdit, QVBoxLayout
+)
+from PyQt5.QtCore import QDate, Qt, QTimer
+from PyQt5.QtGui import QColor
+
+from ..branding import APP_NAME, APP_VERSION, APP_AUTHOR, APP_SLOGAN, APP_WEBSITE, APP_EMAIL, APP_TELEGRAM
+from ..ledger import DatabaseManager, Transaction
+from ..license import LicenseManager
+from ..money import Money
+from .. import reports, search
+from .. import instrument
+from ..instrument import timed
+from ..query import TransactionFilter
+from ..recurring import FREQUENCIES
+from .screen import ScreenOptimizer
+
+
+# ====================== کلاس AIDashboard ======================
+
+class AIDashboard(QDialog):
+    """داشبورد هوش مصنوعی"""
+    
+    def __init__(self, db: DatabaseManager, optimizer: ScreenOptimizer, theme: dict, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.optimizer = optimizer
+        self.theme = theme
+        
+        self.setWindowTitle("🤖 داشبورد هوش مصنوعی")
+        self.resize(self.optimizer.get_size(600), self.optimizer.get_size(500))
+        
+        self.setObjectName("aiDashboard")
+        
+        self.init_ui()
+    
+    @timed('ai_dashboard.init_ui')
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(self.optimizer.get_spacing(15))
+        
+        title = QLabel("🤖 داشبورد هوش مصنوعی")
+        title.setObjectName("dialogTitle")
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+        
+        # پیش‌بینی هزینه
+        pred_group = QGroupBox("📊 پیش‌بینی هزینه")
+        pred_layout = QVBoxLayout()
+        
+        self.average_label = QLabel()
+        self.prediction_label = QLabel()
+        self.trend_label = QLabel()
+        self.no_data_label = QLabel("داده کافی برای پیش‌بینی وجود ندارد")
+        for label in (self.average_label, self.prediction_label, self.trend_label, self.no_data_label):
+            pred_layout.addWidget(label)
+        
+        pred_group.setLayout(pred_layout)
+        layout.addWidget(pred_group)
+        
+        # تشخیص ناهنجاری
+        anomaly_group = QGroupBox("🚨 تراکنش‌های مشکوک")
+        anomaly_layout = QVBoxLayout()
+        
+        self.suspicious_label = QLabel()
+        anomaly_layout.addWidget(self.suspicious_label)
+        
+        self.anomaly_status_label = QLabel()
+        anomaly_layout.addWidget(self.anomaly_status_label)
+        
+        anomaly_group.setLayout(anomaly_layout)
+        layout.addWidget(anomaly_group)
+        
+        # دکمه‌ها
+        btn_layout = QHBoxLayout()
+        
+        close_btn = QPushButton("✖ بستن")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        
+        layout.addLayout(btn_layout)
+        
+        self.setLayout(layout)
+        self.refresh()
+    
+    def refresh(self):
+        self.stale = False
+        
+        forecast = reports.expense_forecast(self.db)
+        if forecast:
+            self.average_label.setText(f"میانگین هزینه‌ها: {forecast['average']:,.0f}")
+            self.prediction_label.setText(f"🔮 پیش‌بینی ماه آینده: {forecast['prediction']:,.0f}")
+            self.trend_label.setText(f"📈 روند: {forecast['trend']}")
+        for label in (self.average_label, self.prediction_label, self.trend_label):
+            label.setVisible(bool(forecast))
+        self.no_data_label.setVisible(not forecast)
+        
+        suspicious_count = reports.count_suspicious(self.db, 50)
+        self.suspicious_label.setText(f"تعداد تراکنش‌های مشکوک: {suspicious_count}")
+        if suspicious_count > 0:
+            self.anomaly_status_label.setText("⚠️ برخی تراکنش‌ها نیاز به بررسی دارند")
+        else:
+            self.anomaly_status_label.setText("✅ هیچ تراکنش مشکوکی یافت نشد")
+    
+    def on_transactions_added(self, transactions: List[Transaction]):
+        # تحلیل‌ها فقط وقتی دیالوگ دیده می‌شود دوباره حساب می‌شوند
+        if self.isVisible():
+            self.refresh()
+        else:
+            self.stale = True
+    
+    def showEvent(self, event):
+        if self.stale:
+            self.refresh()
+        super().showEvent(event)
+
+
+# ====================== کلاس TransactionDialog ======================
+
+class TransactionDialog(QDialog):
+    def __init__(self, db: DatabaseManager, optimizer: ScreenOptimizer, theme: dict, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.optimizer = optimizer
+        self.theme = theme
+        
+        self.setWindowTitle("➕ ثبت تراکنش جدید")
+        self.setFixedSize(self.optimizer.get_size(550), self.optimizer.get_size(650))
+        
+        self.setObjectName("transactionDialog")
+        
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(self.optimizer.get_spacing(20))
+        layout.setContentsMargins(
+            self.optimizer.get_margin(30),
+            self.optimizer.get_margin(30),
+            self.optimizer.get_margin(30),
+            self.optimizer.get_margin(30)
+        )
+        
+        form_layout = QFormLayout()
+        form_layout.setSpacing(self.optimizer.get_spacing(15))
+        form_layout.setLabelAlignment(Qt.AlignRight)
+        
+        self.date_edit = QDateEdit()
+        self.date_edit.setDate(QDate.currentDate())
+        self.date_edit.setCalendarPopup(True)
+        self.date_edit.setFixedHeight(self.optimizer.get_button_height(45))
+        form_layout.addRow("📅 تاریخ:", self.date_edit)
+        
+        self.desc_edit = QTextEdit()
+        self.desc_edit.setMaximumHeight(self.optimizer.get_button_height(100))
+        self.desc_edit.setPlaceholderText("شرح تراکنش را وارد کنید...")
+        form_layout.addRow("📝 شرح:", self.desc_edit)
+        
+        self.type_combo = QComboBox()
+        self.type_combo.addItems(["درآمد", "هزینه", "انتقال"])
+        self.type_combo.setFixedHeight(self.optimizer.get_button_height(45))
+        form_layout.addRow("📊 نوع:", self.type_combo)
+        
+        self.amount_spin = QDoubleSpinBox()
+        self.amount_spin.setRange(0, 999999999999)
+        self.amount_spin.setDecimals(0)
+        self.amount_spin.setPrefix("ریال ")
+        self.amount_spin.setGroupSeparatorShown(True)
+        self.amount_spin.setFixedHeight(self.optimizer.get_button_height(45))
+        form_layout.addRow("💰 مبلغ:", self.amount_spin)
+        
+        self.debit_combo = QComboBox()
+        self.debit_combo.setFixedHeight(self.optimizer.get_button_height(45))
+        self.debit_combo.setMaxVisibleItems(15)
+        form_layout.addRow("📤 حساب بدهکار:", self.debit_combo)
+        
+        self.credit_combo = QComboBox()
+        self.credit_combo.setFixedHeight(self.optimizer.get_button_height(45))
+        self.credit_combo.setMaxVisibleItems(15)
+        form_layout.addRow("📥 حساب بستانکار:", self.credit_combo)
+        
+        self.repeat_combo = QComboBox()
+        self.repeat_combo.addItem("بدون تکرار", None)
+        for frequency, label in FREQUENCIES.items():
+            self.repeat_combo.addItem(label, frequency)
+        self.repeat_combo.setFixedHeight(self.optimizer.get_button_height(45))
+        # در حالت کلاینت موعدها را سرور ثبت می‌کند و الگو از اینجا ساخته نمی‌شود
+        if not self.db.is_remote:
+            form_layout.addRow("🔁 تکرار:", self.repeat_combo)
+        
+        layout.addLayout(form_layout)
+        
+        self.load_accounts()
+        
+        # هشدار هوش مصنوعی (اگه تراکنش مشکوک باشه)
+        if self.amount_spin.value() > 0:
+            warning_label = QLabel("")
+            layout.addWidget(warning_label)
+        
+        btn_layout = QHBoxLayout()
+        btn_layout.setSpacing(self.optimizer.get_spacing(15))
+        
+        self.save_btn = QPushButton("💾 ذخیره تراکنش")
+        self.save_btn.setObjectName("saveBtn")
+        self.save_btn.setFixedHeight(self.optimizer.get_button_height(45))
+        self.save_btn.clicked.connect(self.save_transaction)
+        btn_layout.addWidget(self.save_btn)
+        
+        self.cancel_btn = QPushButton("✖ انصراف")
+        self.cancel_btn.setObjectName("cancelBtn")
+        self.cancel_btn.setFixedHeight(self.optimizer.get_button_height(45))
+        self.cancel_btn.clicked.connect(self.reject)
+        btn_layout.addWidget(self.cancel_btn)
+        
+        layout.addLayout(btn_layout)
+        
+        self.setLayout(layout)
+    
+    def reset(self):
+        """پاک کردن فرم برای استفاده دوباره از همین دیالوگ"""
+        self.date_edit.setDate(QDate.currentDate())
+        self.desc_edit.clear()
+        self.type_combo.setCurrentIndex(0)
+        self.amount_spin.setValue(0)
+        self.debit_combo.setCurrentIndex(0)
+        self.credit_combo.setCurrentIndex(0)
+        self.repeat_combo.setCurrentIndex(0)
+    
+    def on_accounts_added(self, accounts: list):
+        for account in accounts:
+            if account.is_active:
+                text = f"{account.code} - {account.name}"
+                self.debit_combo.addItem(text, account.id)
+                self.credit_combo.addItem(text, account.id)
+    
+    def load_accounts(self):
+        accounts = self.db.get_all_accounts()
+        
+        self.debit_combo.clear()
+        self.credit_combo.clear()
+        
+        self.debit_combo.addItem("─── انتخاب کنید ───", None)
+        self.credit_combo.addItem("─── انتخاب کنید ───", None)
+        
+        for acc in accounts:
+            if acc.is_active:
+                text = f"{acc.code} - {acc.name}"
+                self.debit_combo.addItem(text, acc.id)
+                self.credit_combo.addItem(text, acc.id)
+        
+        self.debit_combo.setCurrentIndex(0)
+        self.credit_combo.setCurrentIndex(0)
+    
+    def save_transaction(self):
+        if self.amount_spin.value() <= 0:
+            QMessageBox.warning(self, "خطا", "مبلغ باید بزرگتر از صفر باشد")
+            return
+        
+        if self.debit_combo.count() <= 1 or self.credit_combo.count() <= 1:
+            QMessageBox.warning(self, "خطا", "هیچ حسابی برای انتخاب وجود ندارد")
+            return
+        
+        debit_id = self.debit_combo.currentData()
+        credit_id = self.credit_combo.currentData()
+        
+        if debit_id is None or credit_id is None:
+            QMessageBox.warning(self, "خطا", "لطفاً حساب‌ها را انتخاب کنید")
+            return
+        
+        if debit_id == credit_id:
+            QMessageBox.warning(self, "خطا", "حساب‌ها نمی‌توانند یکسان باشند")
+            return
+        
+        qdate = self.date_edit.date()
+        date = datetime(qdate.year(), qdate.month(), qdate.day())
+        
+        transaction = Transaction(
+            date=date,
+            description=self.desc_edit.toPlainText(),
+            amount=Money(self.amount_spin.value()),
+            type=self.type_combo.currentText(),
+            debit_account_id=debit_id,
+            credit_account_id=credit_id
+        )
+        
+        # بررسی با هوش مصنوعی
+        if self.db.detect_anomaly(transaction):
+            reply = QMessageBox.question(
+                self, 
+                "⚠️ هشدار هوش مصنوعی",
+                "این تراکنش مشکوک تشخیص داده شده!\nآیا مطمئن هستید؟",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if reply == QMessageBox.No:
+                return
+        
+        frequency = self.repeat_combo.currentData()
+        if frequency is not None:
+            self.save_recurring(transaction, frequency)
+            return
+        
+        if self.db.add_transaction(transaction):
+            QMessageBox.information(self, "موفق", "✅ تراکنش با موفقیت ثبت شد")
+            self.accept()
+        else:
+            QMessageBox.critical(self, "خطا", "❌ خطا در ثبت تراکنش")
+    
+    def save_recurring(self, transaction: Transaction, frequency: str):
+        """ساخت الگوی تکرار؛ موعدهای رسیده (از جمله همین تاریخ اگر گذشته باشد) همان‌جا ثبت می‌شوند"""
+        try:
+            self.db.recurring.add(transaction, frequency)
+            future = self.db.recurring.run_due()
+            posted = future.result() if future is not None else []
+        except Exception as e:
+            QMessageBox.critical(self, "خطا", f"❌ خطا در ثبت تراکنش تکراری: {e}")
+            return
+        QMessageBox.information(
+            self, "موفق", f"✅ تراکنش {FREQUENCIES[frequency]} تعریف شد ({len(posted)} موعد ثبت شد)"
+        )
+        self.accept()
+
+
+# ====================== کلاس AccountsDialog ======================
+
+class AccountsDialog(QDialog):
+    def __init__(self, db: DatabaseManager, optimizer: ScreenOptimizer, theme: dict, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.optimizer = optimizer
+        self.theme = theme
+        
+        self.setWindowTitle("📊 لیست حساب‌ها")
+        self.setFixedSize(self.optimizer.get_size(600), self.optimizer.get_size(400))
+        
+        self.setObjectName("accountsDialog")
+        
+        layout = QVBoxLayout()
+        
+        self.table = QTableWidget()
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(["کد", "نام", "نوع", "موجودی"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        
+        self.load_accounts()
+        
+        layout.addWidget(self.table)
+        
+        close_btn = QPushButton("✖ بستن")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+        
+        self.setLayout(layout)
+    
+    TYPE_MAP = {
+        'asset': 'دارایی',
+        'liability': 'بدهی',
+        'equity': 'سرمایه',
+        'revenue': 'درآمد',
+        'expense': 'هزینه'
+    }
+    
+    def load_accounts(self):
+        accounts = self.db.get_all_accounts()
+        self.table.setRowCount(len(accounts))
+        self.rows = {}
+        
+        for i, acc in enumerate(accounts):
+            self.set_account_row(i, acc)
+    
+    def set_account_row(self, i: int, acc):
+        self.rows[acc.id] = i
+        self.table.setItem(i, 0, QTableWidgetItem(acc.code))
+        self.table.setItem(i, 1, QTableWidgetItem(acc.name))
+        self.table.setItem(i, 2, QTableWidgetItem(self.TYPE_MAP.get(acc.type, acc.type)))
+        self.set_balance(i, acc)
+    
+    def set_balance(self, i: int, acc):
+        balance = QTableWidgetItem(f"{acc.balance:,.0f}")
+        balance.setTextAlignment(Qt.AlignRight)
+        if acc.balance >= 0:
+            balance.setForeground(QColor(self.theme['success']))
+        else:
+            balance.setForeground(QColor(self.theme['danger']))
+        self.table.setItem(i, 3, balance)
+    
+    def on_accounts_added(self, accounts: list):
+        for account in accounts:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.set_account_row(row, account)
+    
+    def on_balances_changed(self, changes: list):
+        # فقط موجودی حساب‌های تغییر کرده به‌روز می‌شود
+        for change in changes:
+            row = self.rows.get(change.account_id)
+            account = self.db.get_account_by_id(change.account_id)
+            if row is not None and account is not None:
+                self.set_balance(row, account)
+    
+    def view_cost(self) -> int:
+        return self.table.rowCount() * self.table.columnCount()
+
+
+# ====================== کلاس RecurringDialog ======================
+
+class RecurringDialog(QDialog):
+    """فهرست الگوهای تراکنش تکراری و حذف آن‌ها"""
+    
+    def __init__(self, db: DatabaseManager, optimizer: ScreenOptimizer, theme: dict, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.optimizer = optimizer
+        self.theme = theme
+        
+        self.setWindowTitle("🔁 تراکنش‌های تکراری")
+        self.setFixedSize(self.optimizer.get_size(700), self.optimizer.get_size(400))
+        
+        self.setObjectName("recurringDialog")
+        
+        layout = QVBoxLayout()
+        
+        self.table = QTableWidget()
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["شرح", "مبلغ", "تکرار", "موعد بعدی", "ثبت شده"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        
+        btn_layout = QHBoxLayout()
+        
+        remove_btn = QPushButton("🗑 حذف الگو")
+        remove_btn.clicked.connect(self.remove_template)
+        btn_layout.addWidget(remove_btn)
+        
+        close_btn = QPushButton("✖ بستن")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        
+        layout.addLayout(btn_layout)
+        
+        self.setLayout(layout)
+        self.templates = []
+    
+    def load_templates(self):
+        self.templates = self.db.recurring.templates()
+        self.table.setRowCount(len(self.templates))
+        for i, template in enumerate(self.templates):
+            next_date = template.next_date.strftime('%Y/%m/%d') if template.next_date else "تمام شده"
+            for column, text in enumerate((template.description, f"{template.amount:,}", template.label,
+                                           next_date, str(template.occurrences))):
+                self.table.setItem(i, column, QTableWidgetItem(text))
+    
+    def remove_template(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return
+        template = self.templates[row]
+        answer = QMessageBox.question(
+            self, "حذف الگو",
+            f"الگوی «{template.description or template.label}» حذف شود؟\nتراکنش‌های ثبت شده باقی می‌مانند."
+        )
+        if answer == QMessageBox.Yes:
+            self.db.recurring.remove(template.id)
+            self.load_templates()
+    
+    def on_transactions_added(self, transactions: List[Transaction]):
+        if self.isVisible():
+            self.load_templates()
+    
+    def showEvent(self, event):
+        self.load_templates()
+        super().showEvent(event)
+    
+    def view_cost(self) -> int:
+        return self.table.rowCount() * self.table.columnCount()
+
+
+# ====================== کلاس TransactionsDialog ======================
+
+class TransactionsDialog(QDialog):
+    def __init__(self, db: DatabaseManager, optimizer: ScreenOptimizer, theme: dict, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.optimizer = optimizer
+        self.theme = theme
+        
+        self.setWindowTitle("📋 لیست تراکنش‌ها")
+        self.setFixedSize(self.optimizer.get_size(800), self.optimizer.get_size(500))
+        
+        self.setObjectName("transactionsDialog")
+        
+        layout = QVBoxLayout()
+        
+        # جستجو هنگام تایپ؛ با هر کلید تایمر از نو شروع می‌شود
+        self.result = None
+        self.filter = TransactionFilter()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("🔍 جستجو در شرح تراکنش‌ها...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(lambda: self.run_search(0))
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        layout.addWidget(self.search_edit)
+        
+        # فیلتر چندوجهی؛ هر گزینه تعداد تراکنش‌های منطبق را نشان می‌دهد
+        facets_layout = QHBoxLayout()
+        self.type_combo = QComboBox()
+        self.account_combo = QComboBox()
+        self.month_combo = QComboBox()
+        for combo in (self.type_combo, self.account_combo, self.month_combo):
+            combo.activated.connect(self.apply_facets)
+            facets_layout.addWidget(combo, 1)
+        layout.addLayout(facets_layout)
+        
+        self.table = QTableWidget()
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(["شماره", "تاریخ", "شرح", "نوع", "مبلغ", "وضعیت"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        
+        self.load_transactions()
+        
+        layout.addWidget(self.table)
+        
+        pager_layout = QHBoxLayout()
+        self.prev_btn = QPushButton("→ قبلی")
+        self.prev_btn.clicked.connect(lambda: self.run_search(self.result.offset - self.LIMIT))
+        pager_layout.addWidget(self.prev_btn)
+        self.search_status = QLabel()
+        self.search_status.setObjectName("searchStatus")
+        self.search_status.setAlignment(Qt.AlignCenter)
+        pager_layout.addWidget(self.search_status, 1)
+        self.next_btn = QPushButton("بعدی ←")
+        self.next_btn.clicked.connect(lambda: self.run_search(self.result.offset + self.LIMIT))
+        pager_layout.addWidget(self.next_btn)
+        layout.addLayout(pager_layout)
+        self.update_pager()
+        self.update_facets()
+        
+        # دکمه تحلیل هوشمند
+        ai_btn = QPushButton("🤖 تحلیل هوشمند تراکنش‌ها")
+        ai_btn.clicked.connect(self.show_ai_analysis)
+        layout.addWidget(ai_btn)
+        
+        close_btn = QPushButton("✖ بستن")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+        
+        self.setLayout(layout)
+    
+    LIMIT = 50
+    SEARCH_DELAY_MS = 250
+    
+    def load_transactions(self):
+        self.shown = self.db.get_all_transactions(self.LIMIT)
+        self.show_rows(self.shown)
+    
+    def show_rows(self, transactions: List[Transaction]):
+        self.table.setRowCount(len(transactions))
+        for i, trans in enumerate(transactions):
+            self.set_transaction_row(i, trans)
+    
+    @timed('transactions.run_search')
+    def run_search(self, offset: int):
+        query = self.search_edit.text()
+        flt = self.filter.matching(query)
+        offset = max(offset, 0)
+        if flt != TransactionFilter(text=flt.text):
+            # با فیلتر وجه‌ها نتایج از جدیدترین مرتب می‌شوند
+            self.result = self.db.query.select(flt, self.LIMIT, offset)
+        elif search.build_match(query):
+            self.result = search.search(self.db, query, self.LIMIT, offset)
+        else:
+            if self.result is not None:
+                self.result = None
+                self.load_transactions()
+            self.update_pager()
+            self.update_facets()
+            return
+        
+        self.show_rows(self.result.transactions)
+        self.update_pager()
+        self.update_facets()
+    
+    def apply_facets(self):
+        self.filter = (self.filter
+                       .of_type(*filter(None, [self.type_combo.currentData()]))
+                       .for_account(*filter(None, [self.account_combo.currentData()]))
+                       .in_month(self.month_combo.currentData()))
+        self.run_search(0)
+    
+    def update_facets(self):
+        facets = self.db.query.facets(self.filter.matching(self.search_edit.text()))
+        names = {account.id: account.name for account in self.db.accounts}
+        self.fill_combo(self.type_combo, "همه انواع", facets.types, self.filter.types, str)
+        self.fill_combo(self.account_combo, "همه حساب‌ها", facets.accounts, self.filter.account_ids,
+                        lambda account_id: names.get(account_id, f"#{account_id}"))
+        self.fill_combo(self.month_combo, "همه ماه‌ها", facets.months,
+                        tuple(filter(None, [self.filter.month])),
+                        lambda month: month.replace('-', '/'))
+    
+    @staticmethod
+    def fill_combo(combo: QComboBox, everything: str, counts: dict, selected: tuple, label):
+        combo.clear()
+        combo.addItem(everything, None)
+        for key, count in counts.items():
+            combo.addItem(f"{label(key)} ({count:,})", key)
+        for key in selected:
+            # گزینه انتخاب‌شده حتی بدون نتیجه در لیست می‌ماند
+            index = combo.findData(key)
+            if index < 0:
+                combo.addItem(f"{label(key)} (0)", key)
+                index = combo.count() - 1
+            combo.setCurrentIndex(index)
+    
+    def update_pager(self):
+        result = self.result
+        if result is None:
+            self.search_status.setText("")
+            self.prev_btn.setVisible(False)
+            self.next_btn.setVisible(False)
+            return
+        
+        more = "+" if not result.exact else ""
+        if result.total:
+            end = result.offset + len(result.transactions)
+            self.search_status.setText(
+                f"نتایج {result.offset + 1:,} تا {end:,} از {result.total:,}{more}"
+            )
+        else:
+            self.search_status.setText("نتیجه‌ای یافت نشد")
+        self.prev_btn.setVisible(True)
+        self.next_btn.setVisible(True)
+        self.prev_btn.setEnabled(result.offset > 0)
+        self.next_btn.setEnabled(result.offset + self.LIMIT < result.total)
+    
+    def set_transaction_row(self, i: int, trans: Transaction):
+        self.table.setItem(i, 0, QTableWidgetItem(trans.number))
+        self.table.setItem(i, 1, QTableWidgetItem(trans.date.strftime("%Y/%m/%d")))
+        description = QTableWidgetItem(trans.description[:30])
+        description.setToolTip(trans.description)
+        self.table.setItem(i, 2, description)
+        self.table.setItem(i, 3, QTableWidgetItem(trans.type))
+        
+        amount = QTableWidgetItem(f"{trans.amount:,.0f}")
+        amount.setTextAlignment(Qt.AlignRight)
+        
+        # رنگ‌بندی با هوش مصنوعی
+        if self.db.detect_anomaly(trans):
+            amount.setForeground(QColor(self.theme['danger']))
+            amount.setToolTip("⚠️ تراکنش مشکوک")
+        elif trans.type == "درآمد":
+            amount.setForeground(QColor(self.theme['success']))
+        else:
+            amount.setForeground(QColor(self.theme['warning']))
+        
+        self.table.setItem(i, 4, amount)
+        
+        status = QTableWidgetItem("✅ تأیید")
+        status.setForeground(QColor(self.theme['success']))
+        self.table.setItem(i, 5, status)
+    
+    def on_transactions_added(self, transactions: List[Transaction]):
+        if self.result is not None:
+            # نتایج جستجو از نو گرفته می‌شوند؛ لیست عادی بعد از پاک کردن جستجو بارگذاری می‌شود
+            self.search_timer.start()
+            return
+        for transaction in transactions:
+            self.insert_transaction(transaction)
+        self.update_facets()
+    
+    def insert_transaction(self, transaction: Transaction):
+        # درج یک ردیف در جای مرتب (جدیدترین تاریخ بالا) به جای بارگذاری دوباره جدول
+        index = next(
+            (i for i, t in enumerate(self.shown) if t.date <= transaction.date),
+            len(self.shown)
+        )
+        if index >= self.LIMIT:
+            return
+        
+        self.shown.insert(index, transaction)
+        self.table.insertRow(index)
+        self.set_transaction_row(index, transaction)
+        
+        if len(self.shown) > self.LIMIT:
+            self.shown.pop()
+            self.table.removeRow(self.LIMIT)
+    
+    def view_cost(self) -> int:
+        return self.table.rowCount() * self.table.columnCount()
+    
+    def show_ai_analysis(self):
+        dialog = AIDashboard(self.db, self.optimizer, self.theme, self)
+        dialog.exec_()
+
+
+# ====================== کلاس LicenseDialog ======================
+
+class LicenseDialog(QDialog):
+    def __init__(self, license_manager: LicenseManager, optimizer: ScreenOptimizer, theme: dict, parent=None):
+        super().__init__(parent)
+        self.license = license_manager
+        self.optimizer = optimizer
+        self.theme = theme
+        
+        self.setWindowTitle("🔑 فعال‌سازی لایسنس")
+        self.setFixedSize(self.optimizer.get_size(500), self.optimizer.get_size(400))
+        
+        self.setObjectName("licenseDialog")
+        
+        layout = QVBoxLayout()
+        layout.setSpacing(self.optimizer.get_spacing(20))
+        
+        title = QLabel("🔑 فعال‌سازی لایسنس")
+        title.setObjectName("dialogTitle")
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+        
+        hwid_label = QLabel(f"شناسه سیستم:")
+        layout.addWidget(hwid_label)
+        
+        hwid_value = QLabel(self.license.hardware_id)
+        hwid_value.setObjectName("hwidValue")
+        hwid_value.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        hwid_value.setAlignment(Qt.AlignCenter)
+        layout.addWidget(hwid_value)
+        
+        status_label = QLabel(f"وضعیت فعلی: {self.license.license_type.value}")
+        layout.addWidget(status_label)
+        
+        self.key_input = QTextEdit()
+        self.key_input.setPlaceholderText("کلید لایسنس را وارد کنید...")
+        self.key_input.setMaximumHeight(self.optimizer.get_button_height(100))
+        layout.addWidget(self.key_input)
+        
+        activate_btn = QPushButton("✅ فعال‌سازی")
+        activate_btn.clicked.connect(self.activate)
+        layout.addWidget(activate_btn)
+        
+        close_btn = QPushButton("✖ بستن")
+        close_btn.clicked.connect(self.reject)
+        layout.addWidget(close_btn)
+        
+        self.setLayout(layout)
+    
+    def activate(self):
+        key = self.key_input.toPlainText().strip()
+        if not key:
+            QMessageBox.warning(self, "خطا", "کلید لایسنس را وارد کنید")
+            return
+        
+        valid, msg = self.license.activate(key)
+        if valid:
+            QMessageBox.information(self, "موفق", msg)
+            self.accept()
+        else:
+            QMessageBox.critical(self, "خطا", msg)
+
+
+# ====================== کلاس AboutDialog ======================
+
+class AboutDialog(QDialog):
+    def __init__(self, license_manager: LicenseManager, optimizer: ScreenOptimizer, theme: dict, parent=None):
+        super().__init__(parent)
+        self.license = license_manager
+        self.optimizer = optimizer
+        self.theme = theme
+        
+        self.setWindowTitle("ℹ️ درباره ایمان حسابداری")
+        self.setFixedSize(self.optimizer.get_size(500), self.optimizer.get_size(450))
+        
+        self.setObjectName("aboutDialog")
+        
+        layout = QVBoxLayout()
+        
+        logo = QLabel("⚡💰")
+        logo.setObjectName("aboutLogo")
+        logo.setAlignment(Qt.AlignCenter)
+        layout.addWidget(logo)
+        
+        title = QLabel(APP_NAME)
+        title.setObjectName("aboutTitle")
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+        
+        version = QLabel(f"نسخه {APP_VERSION} (با ImanAILight داخلی)")
+        version.setAlignment(Qt.AlignCenter)
+        layout.addWidget(version)
+        
+        slogan = QLabel(APP_SLOGAN)
+        slogan.setObjectName("aboutSlogan")
+        slogan.setAlignment(Qt.AlignCenter)
+        layout.addWidget(slogan)
+        
+        author = QLabel(f"توسعه‌دهنده: {APP_AUTHOR}")
+        author.setAlignment(Qt.AlignCenter)
+        layout.addWidget(author)
+        
+        contact = QLabel(f"📧 {APP_EMAIL}\n🌐 {APP_WEBSITE}\n📱 {APP_TELEGRAM}")
+        contact.setAlignment(Qt.AlignCenter)
+        layout.addWidget(contact)
+        
+        if self.license.is_school:
+            license_text = "🏫 نسخه ویژه مدرسه"
+        elif self.license.is_admin:
+            license_text = "👑 دسترسی ادمین"
+        else:
+            license_text = f"🔑 {self.license.license_type.value}"
+        
+        license_label = QLabel(license_text)
+        license_label.setObjectName("aboutLicense")
+        license_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(license_label)
+        
+        ai_label = QLabel("🤖 مجهز به ImanAILight - هوش مصنوعی اختصاصی")
+        ai_label.setObjectName("aboutAi")
+        ai_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(ai_label)
+        
+        layout.addStretch()
+        
+        close_btn = QPushButton("✖ بستن")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+        
+        self.setLayout(layout)
+
+
+# ====================== کلاس PerformanceDialog ======================
+
+class PerformanceDialog(QDialog):
+    """پنل توسعه‌دهنده: صدک‌های زمان هر عملیات، زمان‌گیری SQL و ضبط cProfile"""
+    
+    REFRESH_MS = 1000
+    
+    def __init__(self, optimizer: ScreenOptimizer, parent=None):
+        super().__init__(parent)
+        self.optimizer = optimizer
+        
+        self.setWindowTitle("⏱ عملکرد برنامه")
+        self.resize(self.optimizer.get_size(700), self.optimizer.get_size(500))
+        self.setObjectName("performanceDialog")
+        
+        layout = QVBoxLayout()
+        
+        self.table = QTableWidget()
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["عملیات", "تعداد", "p50 (ms)", "p95 (ms)", "بیشینه (ms)"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table, 2)
+        
+        self.details = QTextEdit()
+        self.details.setReadOnly(True)
+        self.details.setObjectName("perfDetails")
+        layout.addWidget(self.details, 1)
+        
+        options = QHBoxLayout()
+        self.sql_check = QCheckBox("زمان‌گیری SQL")
+        self.sql_check.setChecked(instrument.sql_enabled)
+        self.sql_check.toggled.connect(self.toggle_sql)
+        options.addWidget(self.sql_check)
+        self.status_check = QCheckBox("نمایش در نوار وضعیت")
+        panel = getattr(parent, 'perf_label', None)
+        self.status_check.setEnabled(panel is not None)
+        self.status_check.setChecked(panel is not None and not panel.isHidden())
+        self.status_check.toggled.connect(lambda on: panel.setVisible(on))
+        options.addWidget(self.status_check)
+        options.addStretch()
+        layout.addLayout(options)
+        
+        buttons = QHBoxLayout()
+        self.profile_btn = QPushButton()
+        self.profile_btn.clicked.connect(self.toggle_profiler)
+        buttons.addWidget(self.profile_btn)
+        save_btn = QPushButton("💾 ذخیره گزارش")
+        save_btn.clicked.connect(self.save_report)
+        buttons.addWidget(save_btn)
+        reset_btn = QPushButton("🗑 پاک کردن")
+        reset_btn.clicked.connect(self.reset)
+        buttons.addWidget(reset_btn)
+        close_btn = QPushButton("✖ بستن")
+        close_btn.clicked.connect(self.close)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+        
+        self.setLayout(layout)
+        
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(self.REFRESH_MS)
+        self.refresh()
+    
+    def refresh(self):
+        stats = instrument.METRICS.snapshot()
+        self.table.setRowCount(len(stats))
+        for i, op in enumerate(stats):
+            self.table.setItem(i, 0, QTableWidgetItem(op.name))
+            for column, value in enumerate((f"{op.count:,}", f"{op.p50_ms:.2f}",
+                                            f"{op.p95_ms:.2f}", f"{op.max_ms:.2f}"), 1):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(i, column, item)
+        
+        now = time.perf_counter()
+        lines = [f"⏳ {(now - started) * 1000:>8.0f} ms  {sql}"
+                 for started, sql in list(instrument.METRICS.in_flight.values())]
+        lines += [f"{ms:>10.1f} ms  {sql}" for ms, sql in reversed(instrument.METRICS.slow_sql)]
+        if lines and not instrument.profiling():
+            self.details.setPlainText("دستورهای کند SQL:\n" + "\n".join(lines))
+        self.profile_btn.setText(
+            "⏹ پایان پروفایل" if instrument.profiling() else "▶ شروع پروفایل (cProfile)"
+        )
+    
+    def toggle_sql(self, on: bool):
+        # فقط اتصال‌های بعدی را تغییر می‌دهد؛ DatabaseManager برای هر کار اتصال تازه می‌گیرد
+        instrument.sql_enabled = on
+    
+    def toggle_profiler(self):
+        if instrument.profiling():
+            path = datetime.now().strftime("profile-%Y%m%d-%H%M%S.prof")
+            self.details.setPlainText(f"ذخیره شد: {path}\n\n" + instrument.stop_profiler(path))
+        else:
+            instrument.start_profiler()
+            self.details.setPlainText("⏺ در حال ضبط پروفایل...")
+        self.refresh()
+    
+    def save_report(self):
+        path = datetime.now().strftime("perf-report-%Y%m%d-%H%M%S.json")
+        instrument.METRICS.dump(path)
+        self.details.setPlainText(f"گزارش ذخیره شد: {path}")
+    
+    def reset(self):
+        instrument.METRICS.reset()
+        self.details.clear()
+        self.refresh()
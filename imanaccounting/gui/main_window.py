@@ -0,0 +1,628 @@
+# -*- coding: utf-8 -*-
+
+"""
+پنجره اصلی برنامه
+"""
+
+import os
+import threading
+from functools import partial
+
+from PyQt5.QtWidgets import (
+    QAction, QActionGroup, QApplication, QFileDialog, QInputDialog, QLabel, QMainWindow,
+    QMessageBox, QStatusBar, QStyle, QTabWidget, QWidget
+)
+from PyQt5.QtCore import QDateTime, QSize, QTimer, pyqtSignal
+
+from .._lazy import lazy_import
+from ..branding import APP_NAME
+from ..instrument import METRICS
+from ..money import Money
+from ..plugins import PluginHost
+from .dashboard import DashboardWidget
+from .screen import ScreenOptimizer
+from .theme import ThemeManager, set_variant
+
+dialogs = lazy_import(__package__ + '.dialogs')
+
+# فاصله دریافت تغییرات کاربران دیگر در حالت کلاینت
+SYNC_INTERVAL_MS = 3000
+# بررسی موعد snapshot روزانه و نگهداری هفتگی (اولین بار کمی بعد از راه‌اندازی)
+BACKUP_CHECK_MS = 60 * 60 * 1000
+BACKUP_FIRST_CHECK_MS = 60 * 1000
+# بررسی موعد تراکنش‌های تکراری (فقط سر صف موعدها نگاه می‌شود)
+RECURRING_CHECK_MS = 60 * 1000
+
+
+# ====================== کلاس MainWindow ======================
+
+class MainWindow(QMainWindow):
+    # نتیجه گزارش پلاگین از پروسه جدا (عنوان، Future)
+    report_ready = pyqtSignal(str, object)
+    # پیشرفت و نتیجه کارهای پشتیبان‌گیری از thread کارگر (انجام شده، کل) و (نوع، Future)
+    backup_progress = pyqtSignal(int, int)
+    backup_done = pyqtSignal(str, object)
+    # نتیجه بررسی موجودی حساب‌ها از thread کارگر (درخواست کاربر؟، Future)
+    integrity_done = pyqtSignal(bool, object)
+    # ثبت تراکنش‌های تکراری سررسید در thread نویسنده تمام شد (Future)
+    recurring_done = pyqtSignal(object)
+    # بارگذاری دفتر شرکت در پس‌زمینه تمام شد (کلید شرکت)
+    company_loaded = pyqtSignal(str)
+    
+    def __init__(self, db, license_mgr, plugins: PluginHost = None, plugin_pool=None, workspace=None):
+        super().__init__()
+        self.db = db
+        self.license = license_mgr
+        self.plugins = plugins
+        self.plugin_pool = plugin_pool
+        # چند شرکت (imanaccounting/workspace.py): داشبورد هر دفتر باز نگه داشته می‌شود
+        self.workspace = workspace
+        self.company_key = workspace.last if workspace is not None else None
+        self.pending_company = self.company_key
+        self.dashboards = {}
+        self.report_ready.connect(self.show_report)
+        self.backup_progress.connect(self.show_backup_progress)
+        self.backup_done.connect(self.on_backup_done)
+        self.integrity_done.connect(self.on_integrity_done)
+        self.recurring_done.connect(self.on_recurring_done)
+        self.company_loaded.connect(self.show_company)
+        self.backups = None
+        self.integrity = None
+        self.backup_timer = None
+        self.recurring_timer = None
+        self.plugin_menus = {}
+        self.optimizer = ScreenOptimizer()
+        self.theme_manager = ThemeManager(self.optimizer)
+        
+        w = self.optimizer.get_size(1200)
+        h = self.optimizer.get_size(700)
+        self.resize(w, h)
+        
+        self.setWindowTitle(APP_NAME)
+        self.setWindowIcon(self.style().standardIcon(QStyle.SP_ComputerIcon))
+        
+        self.apply_theme()
+        
+        self.init_ui()
+        self.create_menus()
+        self.create_toolbar()
+        self.create_statusbar()
+        
+        if self.license.loaded:
+            self.update_license()
+    
+    def update_license(self):
+        title = APP_NAME
+        if self.license.is_school:
+            title += " [نسخه مدرسه]"
+        elif self.license.is_admin:
+            title += " [ادمین]"
+        self.setWindowTitle(title)
+        
+        if self.license.is_school:
+            status = "🏫 نسخه مدرسه"
+            variant = 'success'
+        elif self.license.is_admin:
+            status = "👑 ادمین"
+            variant = 'warning'
+        else:
+            status = f"🔑 {self.license.license_type.value}"
+            variant = 'text_secondary'
+        
+        self.license_label.setText(status)
+        set_variant(self.license_label, "statusLicense", variant)
+        self.dashboard.update_license()
+    
+    def on_data_loaded(self):
+        self.dashboard.refresh()
+        for btn in self.dashboard.action_buttons:
+            btn.setEnabled(True)
+        self.toolbar.setEnabled(True)
+        
+        if not self.db.is_remote:
+            # پشتیبان‌گیری و تراکنش‌های تکراری فقط روی پایگاه داده محلی (در حالت کلاینت کار سرور است)
+            self.start_backups()
+            self.start_recurring()
+    
+    def start_backups(self):
+        """سرویس پشتیبان‌گیری و بررسی موجودی دفتر جاری (بعد از تعویض شرکت دوباره ساخته می‌شوند)"""
+        from ..backup import BackupService
+        from ..integrity import IntegrityService
+        if self.backups is not None:
+            self.backups.close(wait=False)
+            self.integrity.close(wait=False)
+        self.backups = BackupService(self.db)
+        self.integrity = IntegrityService(self.db)
+        self.backup_action.setEnabled(True)
+        self.restore_action.setEnabled(True)
+        self.integrity_action.setEnabled(True)
+        if self.backup_timer is None:
+            self.backup_timer = QTimer()
+            self.backup_timer.timeout.connect(self.run_scheduled_backup)
+            self.backup_timer.timeout.connect(self.check_integrity)
+            self.backup_timer.start(BACKUP_CHECK_MS)
+            QTimer.singleShot(BACKUP_FIRST_CHECK_MS, self.run_scheduled_backup)
+            QTimer.singleShot(BACKUP_FIRST_CHECK_MS, self.check_integrity)
+    
+    def apply_theme(self):
+        self.theme_manager.apply(QApplication.instance())
+    
+    def change_theme(self, theme_name):
+        self.theme_manager.set_theme(theme_name)
+        self.apply_theme()
+        
+        if hasattr(self, 'dashboard'):
+            for dashboard in {self.dashboard, *self.dashboards.values()}:
+                dashboard.theme = self.theme_manager.current_theme
+                # رنگ آیتم‌های جدول‌ها از تم قبلی است؛ دیالوگ‌ها دوباره ساخته می‌شوند
+                dashboard.views.clear()
+    
+    def init_ui(self):
+        self.tabs = QTabWidget()
+        self.tabs.setDocumentMode(True)
+        
+        self.dashboard = DashboardWidget(self.db, self.license, self.theme_manager)
+        self.tabs.addTab(self.dashboard, "🏠 داشبورد")
+        if self.company_key is not None:
+            self.dashboards[self.company_key] = self.dashboard
+        
+        self.tabs.addTab(QWidget(), "📊 گزارشات")
+        self.tabs.addTab(QWidget(), "⚙️ تنظیمات")
+        
+        self.setCentralWidget(self.tabs)
+    
+    def create_menus(self):
+        menubar = self.menuBar()
+        
+        file_menu = menubar.addMenu("فایل")
+        
+        license_action = QAction("🔑 فعال‌سازی لایسنس", self)
+        license_action.triggered.connect(lambda: self.dashboard.show_license())
+        file_menu.addAction(license_action)
+        
+        self.backup_action = QAction("💾 پشتیبان‌گیری", self)
+        self.backup_action.triggered.connect(self.backup_now)
+        self.backup_action.setEnabled(False)
+        file_menu.addAction(self.backup_action)
+        
+        self.restore_action = QAction("♻️ بازیابی از پشتیبان", self)
+        self.restore_action.triggered.connect(self.restore_backup)
+        self.restore_action.setEnabled(False)
+        file_menu.addAction(self.restore_action)
+        
+        self.integrity_action = QAction("🩺 بررسی موجودی حساب‌ها", self)
+        self.integrity_action.triggered.connect(lambda: self.check_integrity(manual=True))
+        self.integrity_action.setEnabled(False)
+        file_menu.addAction(self.integrity_action)
+        
+        self.recurring_action = QAction("🔁 تراکنش‌های تکراری", self)
+        self.recurring_action.triggered.connect(lambda: self.dashboard.show_recurring())
+        self.recurring_action.setEnabled(False)
+        file_menu.addAction(self.recurring_action)
+        
+        file_menu.addSeparator()
+        
+        if self.workspace is not None:
+            self.company_menu = menubar.addMenu("🏢 شرکت‌ها")
+            self.company_menu.aboutToShow.connect(self.update_company_menu)
+        
+        exit_action = QAction("خروج", self)
+        exit_action.setShortcut("Ctrl+Q")
+        exit_action.triggered.connect(self.close)
+        file_menu.addAction(exit_action)
+        
+        settings_menu = menubar.addMenu("⚙️ تنظیمات")
+        
+        theme_menu = settings_menu.addMenu("🎨 تم برنامه")
+        
+        dark_action = QAction("🌙 تم تیره", self)
+        dark_action.triggered.connect(lambda: self.change_theme("dark"))
+        theme_menu.addAction(dark_action)
+        
+        light_action = QAction("☀️ تم روشن", self)
+        light_action.triggered.connect(lambda: self.change_theme("light"))
+        theme_menu.addAction(light_action)
+        
+        ai_menu = menubar.addMenu("🤖 هوش مصنوعی")
+        
+        predict_action = QAction("📊 پیش‌بینی هزینه", self)
+        predict_action.triggered.connect(lambda: self.dashboard.show_ai())
+        ai_menu.addAction(predict_action)
+        
+        help_menu = menubar.addMenu("راهنما")
+        
+        about_action = QAction("ℹ️ درباره", self)
+        about_action.triggered.connect(lambda: self.dashboard.show_about())
+        help_menu.addAction(about_action)
+        
+        perf_action = QAction("⏱ عملکرد برنامه", self)
+        perf_action.setShortcut("Ctrl+Shift+P")
+        perf_action.triggered.connect(self.show_performance)
+        help_menu.addAction(perf_action)
+    
+    def create_toolbar(self):
+        toolbar = self.addToolBar("ابزارها")
+        toolbar.setMovable(False)
+        toolbar.setEnabled(self.db.loaded)
+        self.toolbar = toolbar
+        
+        icon_size = self.optimizer.get_icon_size(24)
+        toolbar.setIconSize(QSize(icon_size, icon_size))
+        
+        trans_btn = QAction("➕", self)
+        trans_btn.setToolTip("تراکنش جدید")
+        trans_btn.triggered.connect(lambda: self.dashboard.show_transaction())
+        toolbar.addAction(trans_btn)
+        
+        accounts_btn = QAction("📊", self)
+        accounts_btn.setToolTip("لیست حساب‌ها")
+        accounts_btn.triggered.connect(lambda: self.dashboard.show_accounts())
+        toolbar.addAction(accounts_btn)
+        
+        transactions_btn = QAction("📋", self)
+        transactions_btn.setToolTip("لیست تراکنش‌ها")
+        transactions_btn.triggered.connect(lambda: self.dashboard.show_transactions())
+        toolbar.addAction(transactions_btn)
+        
+        ai_btn = QAction("🤖", self)
+        ai_btn.setToolTip("هوش مصنوعی")
+        ai_btn.triggered.connect(lambda: self.dashboard.show_ai())
+        toolbar.addAction(ai_btn)
+        
+        toolbar.addSeparator()
+    
+    def plugin_menu(self, path: str):
+        """منوی مسیر «منو/زیرمنو» برای آیتم پلاگین؛ منوهای موجود دوباره استفاده می‌شوند"""
+        menu = self.menuBar()
+        key = ()
+        for part in filter(None, path.split('/')):
+            key += (part,)
+            if key not in self.plugin_menus:
+                self.plugin_menus[key] = menu.addMenu(part)
+            menu = self.plugin_menus[key]
+        return menu
+    
+    def install_plugins(self):
+        """ثبت منو و نوار ابزار پلاگین‌ها از روی manifest (بدون import پلاگین)"""
+        for item in self.plugins.items('menu_items'):
+            action = QAction(item.get('title', item['method']), self)
+            if item.get('shortcut'):
+                action.setShortcut(item['shortcut'])
+            action.triggered.connect(partial(self.run_plugin, item['plugin'], item['method']))
+            self.plugin_menu(item.get('path', '🧩 پلاگین‌ها')).addAction(action)
+        
+        for item in self.plugins.items('toolbar_items'):
+            action = QAction(item.get('title', item['method']), self)
+            action.setToolTip(item.get('tooltip', ''))
+            action.triggered.connect(partial(self.run_plugin, item['plugin'], item['method']))
+            self.toolbar.addAction(action)
+        
+        for item in self.plugins.items('reports'):
+            action = QAction(item.get('name', item['method']), self)
+            action.triggered.connect(partial(self.run_report, item['plugin'], item['method'],
+                                             item.get('name', item['method'])))
+            self.plugin_menu('📊 گزارشات/پلاگین‌ها').addAction(action)
+    
+    def run_plugin(self, key: str, method: str):
+        try:
+            self.plugins.call(key, method)
+        except Exception as e:
+            QMessageBox.critical(self, "خطای پلاگین", f"❌ {key}: {e}")
+    
+    def run_report(self, key: str, method: str, title: str):
+        """گزارش پلاگین؛ در حالت ایزوله در پروسه جدا و بدون قفل کردن رابط کاربری"""
+        if self.plugin_pool is None:
+            try:
+                self.show_report_text(title, self.plugins.call(key, method))
+            except Exception as e:
+                QMessageBox.critical(self, "خطای پلاگین", f"❌ {key}: {e}")
+            return
+        
+        self.statusbar.showMessage(f"⏳ در حال تهیه {title}...")
+        future = self.plugin_pool.submit(key, method)
+        future.add_done_callback(lambda f: self.report_ready.emit(title, f))
+    
+    def show_report(self, title: str, future):
+        self.statusbar.clearMessage()
+        try:
+            text = future.result()
+        except Exception as e:
+            QMessageBox.critical(self, "خطای پلاگین", f"❌ {title}: {e}")
+            return
+        self.show_report_text(title, text)
+    
+    def show_report_text(self, title: str, text):
+        QMessageBox.information(self, title, str(text))
+    
+    def create_statusbar(self):
+        self.statusbar = QStatusBar()
+        self.setStatusBar(self.statusbar)
+        
+        self.license_label = QLabel("🔑 ...")
+        self.license_label.setObjectName("statusLicense_text_secondary")
+        self.statusbar.addPermanentWidget(self.license_label)
+        
+        ai_label = QLabel("🤖 ImanAILight فعال")
+        ai_label.setObjectName("statusAi")
+        self.statusbar.addPermanentWidget(ai_label)
+        
+        # کندترین عملیات (p50/p95)؛ با IMAN_PERF=1 یا از پنل عملکرد نمایش داده می‌شود
+        self.perf_label = QLabel()
+        self.perf_label.setObjectName("statusPerf")
+        self.perf_label.setVisible(os.environ.get('IMAN_PERF') == '1')
+        self.statusbar.addPermanentWidget(self.perf_label)
+        
+        if self.workspace is not None:
+            self.company_label = QLabel()
+            self.company_label.setObjectName("statusCompany")
+            self.statusbar.addPermanentWidget(self.company_label)
+            self.update_company_label()
+        
+        self.date_label = QLabel()
+        self.statusbar.addPermanentWidget(self.date_label)
+        
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.update_status)
+        self.timer.start(1000)
+        
+        if self.db.is_remote:
+            # حالت کلاینت: ثبت‌های کاربران دیگر به صورت رویداد می‌رسند
+            self.sync_timer = QTimer()
+            self.sync_timer.timeout.connect(self.sync_remote)
+            self.sync_timer.start(SYNC_INTERVAL_MS)
+        
+        self.update_status()
+    
+    def update_status(self):
+        now = QDateTime.currentDateTime()
+        self.date_label.setText(now.toString("yyyy/MM/dd HH:mm"))
+        if not self.perf_label.isHidden():
+            self.update_perf_label()
+    
+    def sync_remote(self):
+        if not self.db.loaded:
+            return
+        try:
+            self.db.sync()
+        except OSError as e:
+            self.statusbar.showMessage(f"⚠️ اتصال به سرور: {e}", 5000)
+    
+    # ====================== شرکت‌ها ======================
+    
+    def update_company_menu(self):
+        self.company_menu.clear()
+        group = QActionGroup(self.company_menu)
+        for company in self.workspace.companies():
+            action = QAction(company.name, self.company_menu, checkable=True)
+            action.setChecked(company.key == self.company_key)
+            action.setEnabled(self.db.loaded)
+            action.triggered.connect(partial(self.switch_company, company.key))
+            group.addAction(action)
+            self.company_menu.addAction(action)
+        self.company_menu.addSeparator()
+        
+        add_action = QAction("➕ شرکت جدید...", self.company_menu)
+        add_action.triggered.connect(self.add_company)
+        self.company_menu.addAction(add_action)
+        
+        report_action = QAction("📊 موجودی تلفیقی", self.company_menu)
+        report_action.triggered.connect(self.show_consolidated)
+        self.company_menu.addAction(report_action)
+    
+    def update_company_label(self):
+        name = self.workspace.company(self.company_key).name if self.company_key else "-"
+        self.company_label.setText(f"🏢 {name}")
+    
+    def add_company(self):
+        from ..workspace import WorkspaceError
+        name, ok = QInputDialog.getText(self, "شرکت جدید", "نام شرکت:")
+        if not ok or not name.strip():
+            return
+        key, ok = QInputDialog.getText(self, "شرکت جدید", "کلید (حروف لاتین و رقم، نام فایل دفتر):")
+        if not ok:
+            return
+        try:
+            company = self.workspace.add(key.strip(), name.strip())
+        except WorkspaceError as e:
+            QMessageBox.critical(self, "شرکت جدید", f"❌ {e}")
+            return
+        self.switch_company(company.key)
+    
+    def switch_company(self, key: str):
+        """تعویض دفتر جاری؛ دفترهای اخیر از LRU پوشه کاری بدون بارگذاری دوباره می‌آیند"""
+        if key == self.company_key:
+            return
+        self.pending_company = key
+        db = self.workspace.open(key)
+        if db.loaded:
+            self.show_company(key)
+            return
+        
+        self.statusbar.showMessage(f"⏳ بارگذاری {self.workspace.company(key).name}...")
+        
+        def work():
+            try:
+                db.load()
+            except Exception as e:
+                print(f"خطا در بارگذاری دفتر {key}: {e}")
+            self.company_loaded.emit(key)
+        threading.Thread(target=work, daemon=True).start()
+    
+    def show_company(self, key: str):
+        # اگر کاربر در حین بارگذاری شرکت دیگری را انتخاب کرده باشد
+        if key != self.pending_company or not self.workspace.is_open(key):
+            return
+        self.statusbar.clearMessage()
+        self.db = self.workspace.open(key)
+        self.company_key = key
+        dashboard = self.dashboards.get(key)
+        if dashboard is None:
+            dashboard = DashboardWidget(self.db, self.license, self.theme_manager)
+            dashboard.load_ai_banner()
+            self.dashboards[key] = dashboard
+        
+        self.dashboard = dashboard
+        self.tabs.removeTab(0)
+        self.tabs.insertTab(0, dashboard, "🏠 داشبورد")
+        self.tabs.setCurrentIndex(0)
+        dashboard.refresh()
+        if self.plugins is not None:
+            self.plugins.core.rebind(self.db)
+        self.start_backups()
+        self.start_recurring()
+        self.update_company_label()
+    
+    def drop_company(self, key: str, db):
+        """دفتر شرکت از LRU پوشه کاری بیرون رفت؛ داشبورد و دیالوگ‌هایش حذف می‌شوند"""
+        dashboard = self.dashboards.pop(key, None)
+        if dashboard is not None and dashboard is not self.dashboard:
+            dashboard.views.clear()
+            dashboard.deleteLater()
+    
+    def show_consolidated(self):
+        from ..workspace import WorkspaceError
+        try:
+            accounts = self.workspace.consolidated_balances()
+        except WorkspaceError as e:
+            QMessageBox.critical(self, "موجودی تلفیقی", f"❌ {e}")
+            return
+        lines = [f"{a.code}  {a.name}: {a.total:,}" for a in accounts if a.type == 'asset' and a.total]
+        total = Money.sum(a.total for a in accounts if a.type == 'asset')
+        lines.append(f"جمع دارایی‌ها: {total:,}")
+        self.show_report_text("موجودی تلفیقی", "\n".join(lines))
+    
+    # ====================== پشتیبان‌گیری ======================
+    
+    def backup_now(self):
+        self.statusbar.showMessage("⏳ پشتیبان‌گیری...")
+        future = self.backups.snapshot(self.backup_progress.emit, force=True)
+        future.add_done_callback(lambda f: self.backup_done.emit('backup', f))
+    
+    def restore_backup(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "بازیابی از پشتیبان", self.backups.directory, "پشتیبان دفتر (*.zip)"
+        )
+        if not path:
+            return
+        answer = QMessageBox.question(
+            self, "بازیابی از پشتیبان",
+            "اطلاعات فعلی با محتوای فایل پشتیبان جایگزین می‌شود (از وضعیت فعلی snapshot گرفته می‌شود).\nادامه می‌دهید؟"
+        )
+        if answer != QMessageBox.Yes:
+            return
+        self.statusbar.showMessage("⏳ بازیابی...")
+        future = self.backups.restore(path, self.backup_progress.emit)
+        future.add_done_callback(lambda f: self.backup_done.emit('restore', f))
+    
+    def run_scheduled_backup(self):
+        future = self.backups.run_due(self.backup_progress.emit)
+        if future is not None:
+            future.add_done_callback(lambda f: self.backup_done.emit('scheduled', f))
+    
+    def show_backup_progress(self, done: int, total: int):
+        self.statusbar.showMessage(f"💾 {done * 100 // max(total, 1)}%")
+    
+    def on_backup_done(self, kind: str, future):
+        self.statusbar.clearMessage()
+        try:
+            result = future.result()
+        except Exception as e:
+            QMessageBox.critical(self, "خطای پشتیبان‌گیری", f"❌ {e}")
+            return
+        if kind == 'restore':
+            self.dashboard.views.clear()
+            self.dashboard.refresh()
+            QMessageBox.information(self, "بازیابی از پشتیبان", f"✅ بازیابی از {result['created']}")
+        elif result is not None:
+            self.statusbar.showMessage(f"💾 {os.path.basename(result.path)}", 5000)
+    
+    # ====================== تراکنش‌های تکراری ======================
+    
+    def start_recurring(self):
+        self.recurring_action.setEnabled(True)
+        if self.recurring_timer is None:
+            self.recurring_timer = QTimer()
+            self.recurring_timer.timeout.connect(self.run_recurring)
+            self.recurring_timer.start(RECURRING_CHECK_MS)
+        self.run_recurring()
+    
+    def run_recurring(self):
+        """ثبت موعدهای رسیده دفتر جاری با یک commit؛ بدون موعد رسیده هیچ پرس‌وجویی اجرا نمی‌شود"""
+        future = self.db.recurring.run_due()
+        if future is not None:
+            future.add_done_callback(self.recurring_done.emit)
+    
+    def on_recurring_done(self, future):
+        try:
+            posted = future.result()
+        except Exception as e:
+            self.statusbar.showMessage(f"⚠️ تراکنش‌های تکراری: {e}", 10000)
+            return
+        failed = self.db.recurring.failed
+        if failed:
+            errors = '، '.join(f"{template_id}: {error}" for template_id, error in failed.items())
+            self.statusbar.showMessage(f"⚠️ الگوهای تکرار ثبت نشده ({errors})", 10000)
+        elif posted:
+            self.statusbar.showMessage(f"🔁 {len(posted)} تراکنش تکراری ثبت شد", 5000)
+    
+    # ====================== بررسی موجودی‌ها ======================
+    
+    def check_integrity(self, manual: bool = False):
+        """بررسی موجودی حساب‌ها با دفتر؛ زمان‌بندی شده از checkpoint و به درخواست کاربر کامل"""
+        if manual:
+            self.statusbar.showMessage("⏳ بررسی موجودی حساب‌ها...")
+        future = self.integrity.check(full=manual)
+        future.add_done_callback(lambda f: self.integrity_done.emit(manual, f))
+    
+    def on_integrity_done(self, manual: bool, future):
+        if manual:
+            self.statusbar.clearMessage()
+        try:
+            report = future.result()
+        except Exception as e:
+            if manual:
+                QMessageBox.critical(self, "بررسی موجودی حساب‌ها", f"❌ {e}")
+            return
+        if report.repaired:
+            self.dashboard.refresh()
+            self.statusbar.showMessage(f"🩺 موجودی {len(report.drifts)} حساب اصلاح شد", 5000)
+            return
+        if report.ok:
+            if manual:
+                QMessageBox.information(
+                    self, "بررسی موجودی حساب‌ها",
+                    f"✅ موجودی {report.accounts} حساب با دفتر برابر است ({report.seconds:.1f} ثانیه)"
+                )
+            return
+        if not manual:
+            self.statusbar.showMessage(
+                f"⚠️ موجودی {len(report.drifts)} حساب با دفتر برابر نیست (فایل > بررسی موجودی حساب‌ها)"
+            )
+            return
+        lines = [f"{d.code}  {d.name}: {d.stored:,} ≠ {d.expected:,}" for d in report.drifts[:20]]
+        answer = QMessageBox.question(
+            self, "بررسی موجودی حساب‌ها",
+            "موجودی این حساب‌ها با جمع دفتر برابر نیست:\n" + "\n".join(lines) + "\n\nاز روی دفتر اصلاح شوند؟"
+        )
+        if answer == QMessageBox.Yes:
+            future = self.integrity.check(repair=True)
+            future.add_done_callback(lambda f: self.integrity_done.emit(True, f))
+    
+    def update_perf_label(self):
+        stats = METRICS.snapshot()
+        if not stats:
+            self.perf_label.setText("⏱ -")
+            return
+        slowest = stats[0]
+        self.perf_label.setText(
+            f"⏱ {slowest.name}: p50 {slowest.p50_ms:.1f} / p95 {slowest.p95_ms:.1f} ms"
+        )
+        self.perf_label.setToolTip("\n".join(
+            f"{op.name}: p50 {op.p50_ms:.1f} / p95 {op.p95_ms:.1f} ms ({op.count})" for op in stats[:10]
+        ))
+    
+    def show_performance(self):
+        if getattr(self, 'perf_dialog', None) is None:
+            self.perf_dialog = dialogs.PerformanceDialog(self.optimizer, self)
+        self.perf_dialog.show()
+        self.perf_dialog.raise_()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+"""
+بهینه‌سازی اندازه‌ها بر اساس صفحه نمایش
+"""
+
+from PyQt5.QtWidgets import QDesktopWidget
+
+
+# ====================== کلاس ScreenOptimizer ======================
+
+class ScreenOptimizer:
+    """بهینه‌سازی برای همه صفحه‌ها"""
+    
+    def __init__(self):
+        self.screen = QDesktopWidget().screenGeometry()
+        self.width = self.screen.width()
+        self.height = self.screen.height()
+        
+        if self.width <= 1024:
+            self.scale = 0.7
+        elif self.width <= 1280:
+            self.scale = 0.8
+        elif self.width <= 1366:
+            self.scale = 0.9
+        else:
+            self.scale = 1.0
+    
+    @classmethod
+    def for_scale(cls, scale: float) -> 'ScreenOptimizer':
+        """نمونه بدون پرس‌وجو از صفحه نمایش، فقط برای محاسبه اندازه‌ها"""
+        optimizer = cls.__new__(cls)
+        optimizer.screen = None
+        optimizer.width = optimizer.height = None
+        optimizer.scale = scale
+        return optimizer
+    
+    def get_size(self, base_size):
+        return int(base_size * self.scale)
+    
+    def get_font_size(self, base=10):
+        sizes = {
+            0.7: max(8, int(base * 0.8)),
+            0.8: max(9, int(base * 0.9)),
+            0.9: int(base * 1.0),
+            1.0: int(base * 1.1)
+        }
+        return sizes.get(self.scale, base)
+    
+    def get_margin(self, base=8):
+        return int(base * self.scale)
+    
+    def get_spacing(self, base=10):
+        return int(base * self.scale)
+    
+    def get_icon_size(self, base=24):
+        return int(base * self.scale)
+    
+    def get_card_size(self, base=100):
+        return int(base * self.scale)
+    
+    def get_button_height(self, base=40):
+        return int(base * self.scale)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+"""
+راه‌اندازی مرحله‌ای و تابع اصلی برنامه
+"""
+
+import os
+import sys
+import time
+import threading
+from typing import Optional, Tuple
+
+from PyQt5.QtWidgets import QApplication, QSplashScreen
+from PyQt5.QtCore import QObject, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QPainter, QPixmap
+
+from ..branding import APP_NAME, APP_VERSION
+from ..instrument import METRICS
+from ..ledger import DatabaseManager
+from ..license import LicenseManager, LicenseType
+from ..plugin_pool import PluginProcessPool
+from ..plugins import CoreProxy, PluginHost
+from .main_window import MainWindow
+from .screen import ScreenOptimizer
+
+
+# ====================== کلاس StartupSequence ======================
+
+class StartupSequence(QObject):
+    """راه‌اندازی مرحله‌ای: اول پنجره نمایش داده می‌شود، بعد کارهای سنگین
+
+    مراحل پس‌زمینه در یک thread جدا اجرا می‌شوند و نتیجه با سیگنال
+    (به صورت queued) به thread رابط کاربری برمی‌گردد.
+    """
+    
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal()
+    _stage_done = pyqtSignal(int)
+    
+    def __init__(self, window: 'MainWindow', splash: Optional[QSplashScreen] = None):
+        super().__init__()
+        self.window = window
+        self.splash = splash
+        self.stages = [
+            ("📂 بارگذاری پایگاه داده...", window.db.load, True, window.on_data_loaded),
+            ("🔑 بررسی لایسنس...", window.license.load, True, window.update_license),
+            ("🤖 آماده‌سازی هوش مصنوعی...", window.dashboard.load_ai_banner, False, None),
+        ]
+        if window.plugins is not None:
+            self.stages.append(
+                ("🧩 بارگذاری پلاگین‌ها...", window.plugins.discover, True, window.install_plugins)
+            )
+        self.index = 0
+        self.timings = {}
+        self._stage_started = 0.0
+        self._stage_done.connect(self._on_stage_done)
+        if splash is not None:
+            self.progress.connect(self._show_progress)
+    
+    def start(self):
+        QTimer.singleShot(0, self._run_next)
+    
+    def _show_progress(self, percent: int, message: str):
+        self.splash.showMessage(
+            f"{message}  {percent}%",
+            Qt.AlignBottom | Qt.AlignHCenter,
+            QColor("white")
+        )
+    
+    def _run_next(self):
+        if self.index >= len(self.stages):
+            self.progress.emit(100, "✅ آماده")
+            if self.splash is not None:
+                self.splash.finish(self.window)
+            self.finished.emit()
+            return
+        
+        message, func, background, _ = self.stages[self.index]
+        self.progress.emit(self.index * 100 // len(self.stages), message)
+        self._stage_started = time.perf_counter()
+        index = self.index
+        
+        if background:
+            def work():
+                try:
+                    func()
+                except Exception as e:
+                    print(f"خطا در راه‌اندازی: {e}")
+                self._stage_done.emit(index)
+            threading.Thread(target=work, daemon=True).start()
+        else:
+            func()
+            self._on_stage_done(index)
+    
+    def _on_stage_done(self, index: int):
+        message, _, _, on_done = self.stages[index]
+        self.timings[message] = time.perf_counter() - self._stage_started
+        METRICS.record(f"startup: {message}", self.timings[message])
+        if on_done is not None:
+            on_done()
+        self.index = index + 1
+        # برگشت به حلقه رویداد تا رابط کاربری بین مراحل رسم شود
+        QTimer.singleShot(0, self._run_next)
+
+
+def create_splash(optimizer: ScreenOptimizer, theme: dict) -> QSplashScreen:
+    pixmap = QPixmap(optimizer.get_size(420), optimizer.get_size(220))
+    pixmap.fill(QColor(theme['secondary']))
+    
+    painter = QPainter(pixmap)
+    painter.setPen(QColor(theme['text']))
+    font = painter.font()
+    font.setPixelSize(optimizer.get_font_size(22))
+    font.setBold(True)
+    painter.setFont(font)
+    painter.drawText(pixmap.rect(), Qt.AlignCenter, f"⚡💰 {APP_NAME}\n{APP_VERSION}")
+    painter.end()
+    
+    return QSplashScreen(pixmap)
+
+
+def launch(app: QApplication, splash: bool = True,
+           isolate_plugins: bool = True) -> Tuple['MainWindow', StartupSequence]:
+    """ساخت پوسته پنجره و شروع راه‌اندازی مرحله‌ای"""
+    server = os.environ.get('IMAN_SERVER')
+    workspace = None
+    if server:
+        # حالت کلاینت: دفتر مشترک روی سرویس (python -m imanaccounting serve)
+        from ..remote import RemoteLedger
+        db = RemoteLedger(server, os.environ.get('IMAN_API_TOKEN'), autoload=False)
+    elif os.environ.get('IMAN_WORKSPACE'):
+        # چند شرکت: آخرین شرکت باز شده؛ بقیه از منوی شرکت‌ها (imanaccounting/workspace.py)
+        from ..workspace import Workspace
+        workspace = Workspace(factory=lambda path: DatabaseManager(path, autoload=False))
+        company = workspace.recent() or workspace.add('main', "شرکت اصلی")
+        db = workspace.open(company.key)
+        app.aboutToQuit.connect(workspace.close_all)
+    else:
+        db = DatabaseManager(autoload=False)
+    license_mgr = LicenseManager(autoload=False)
+    
+    plugins = PluginHost(CoreProxy(db))
+    plugin_pool = None
+    if isolate_plugins:
+        # پروسه‌ها در اولین گزارش ساخته می‌شوند؛ اینجا فقط سرویس RPC هسته بالا می‌آید
+        plugin_pool = PluginProcessPool(plugins)
+        app.aboutToQuit.connect(plugin_pool.shutdown)
+    window = MainWindow(db, license_mgr, plugins, plugin_pool, workspace)
+    if workspace is not None:
+        workspace.on_close = window.drop_company
+    
+    splash_screen = None
+    if splash:
+        splash_screen = create_splash(window.optimizer, window.theme_manager.current_theme)
+        splash_screen.show()
+    
+    window.show()
+    
+    startup = StartupSequence(window, splash_screen)
+    
+    def ask_license():
+        if license_mgr.license_type == LicenseType.FREE and not license_mgr.is_school:
+            window.dashboard.show_license()
+    
+    startup.finished.connect(ask_license)
+    startup.start()
+    return window, startup
+
+
+# ====================== تابع اصلی ======================
+
+def main():
+    app = QApplication(sys.argv)
+    
+    window, startup = launch(app)
+    
+    sys.exit(app.exec_())
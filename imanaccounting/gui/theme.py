@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+
+"""
+تم‌های برنامه و ThemeManager
+"""
+
+import json
+from functools import lru_cache
+
+from ..instrument import timed
+from .screen import ScreenOptimizer
+
+
+THEMES = {
+    "dark": {
+        'name': 'تیره',
+        'primary': '#00a8ff',
+        'secondary': '#192a56',
+        'background': '#2c3a47',
+        'card_bg': '#34495e',
+        'text': '#ecf0f1',
+        'text_secondary': '#bdc3c7',
+        'border': '#2980b9',
+        'success': '#00b894',
+        'danger': '#d63031',
+        'warning': '#f39c12',
+        'info': '#0984e3',
+        'hover': '#74b9ff'
+    },
+    "light": {
+        'name': 'روشن',
+        'primary': '#0984e3',
+        'secondary': '#74b9ff',
+        'background': '#dfe6e9',
+        'card_bg': '#ffffff',
+        'text': '#2d3436',
+        'text_secondary': '#636e72',
+        'border': '#b2bec3',
+        'success': '#00cec9',
+        'danger': '#ff7675',
+        'warning': '#fdcb6e',
+        'info': '#0984e3',
+        'hover': '#00a8ff'
+    }
+}
+
+
+# ====================== کلاس ThemeManager ======================
+
+class ThemeManager:
+    def __init__(self, optimizer: ScreenOptimizer):
+        self.optimizer = optimizer
+        self.themes = THEMES
+        self.current_theme_name = "dark"
+        self.current_theme = self.themes[self.current_theme_name]
+        self.settings_file = "theme_settings.json"
+        self.applied_key = None
+        self.load_settings()
+    
+    def load_settings(self):
+        try:
+            with open(self.settings_file, 'r') as f:
+                data = json.load(f)
+                self.current_theme_name = data.get("theme", "dark")
+                self.current_theme = self.themes[self.current_theme_name]
+        except:
+            pass
+    
+    def save_settings(self):
+        try:
+            with open(self.settings_file, 'w') as f:
+                json.dump({"theme": self.current_theme_name}, f)
+        except:
+            pass
+    
+    def set_theme(self, theme_name):
+        if theme_name in self.themes:
+            self.current_theme_name = theme_name
+            self.current_theme = self.themes[theme_name]
+            self.save_settings()
+    
+    def get_style(self) -> str:
+        return compile_stylesheet(self.current_theme_name, self.optimizer.scale)
+    
+    def apply(self, app):
+        """اعمال یک‌باره استایل کل برنامه؛ اگر تغییری نکرده باشد Qt دوباره parse نمی‌کند"""
+        key = (self.current_theme_name, self.optimizer.scale)
+        if self.applied_key != key:
+            with timed('theme.apply_stylesheet'):
+                app.setStyleSheet(self.get_style())
+            self.applied_key = key
+
+
+# ====================== کامپایلر استایل ======================
+
+# رنگ‌هایی از تم که به صورت «variant» روی ویجت‌ها انتخاب می‌شوند
+VARIANTS = ('primary', 'secondary', 'success', 'danger', 'warning', 'info', 'text_secondary')
+
+
+@lru_cache(maxsize=16)
+def compile_stylesheet(theme_name: str, scale: float) -> str:
+    """ساخت استایل کامل برنامه برای یک تم و مقیاس (حافظه‌دار)
+
+    همه دیالوگ‌ها و ویجت‌ها با objectName از این استایل انتخاب می‌شوند،
+    پس هیچ ویجتی استایل درون‌خطی جدا لازم ندارد.
+    """
+    theme = THEMES[theme_name]
+    opt = ScreenOptimizer.for_scale(scale)
+    
+    variants = []
+    for name in VARIANTS:
+        color = theme[name]
+        variants.append(f"""
+            QFrame#statCard_{name}, QPushButton#dashButton_{name} {{
+                background-color: {color};
+            }}
+            QLabel#licenseLabel_{name}, QLabel#statusLicense_{name} {{
+                color: {color};
+            }}""")
+    variants = "".join(variants)
+    
+    return f"""            QMainWindow {{
+                background-color: {theme['background']};
+            }}
+            QMenuBar {{
+                background-color: {theme['secondary']};
+                color: {theme['text']};
+                border: none;
+                font-size: {opt.get_font_size(10)}px;
+                padding: {opt.get_margin(5)}px;
+            }}
+            QMenuBar::item {{
+                background: transparent;
+                padding: {opt.get_margin(8)}px {opt.get_margin(12)}px;
+            }}
+            QMenuBar::item:selected {{
+                background-color: {theme['primary']};
+                border-radius: {opt.get_margin(4)}px;
+            }}
+            QMenu {{
+                background-color: {theme['card_bg']};
+                color: {theme['text']};
+                border: 1px solid {theme['border']};
+                font-size: {opt.get_font_size(10)}px;
+            }}
+            QMenu::item:selected {{
+                background-color: {theme['primary']};
+                color: white;
+            }}
+            QTabWidget::pane {{
+                background-color: {theme['background']};
+                border: none;
+            }}
+            QTabBar::tab {{
+                background-color: {theme['card_bg']};
+                color: {theme['text']};
+                padding: {opt.get_margin(8)}px {opt.get_margin(16)}px;
+                margin-right: 2px;
+                border: 1px solid {theme['border']};
+                border-bottom: none;
+                border-top-left-radius: {opt.get_margin(6)}px;
+                border-top-right-radius: {opt.get_margin(6)}px;
+                font-size: {opt.get_font_size(10)}px;
+            }}
+            QTabBar::tab:selected {{
+                background-color: {theme['primary']};
+                color: white;
+            }}
+            QTabBar::tab:hover:!selected {{
+                background-color: {theme['hover']};
+            }}
+            QStatusBar {{
+                background-color: {theme['secondary']};
+                color: {theme['text']};
+                font-size: {opt.get_font_size(9)}px;
+            }}
+            QToolBar {{
+                background-color: {theme['card_bg']};
+                border: none;
+                spacing: {opt.get_spacing(5)}px;
+                padding: {opt.get_margin(5)}px;
+            }}
+
+
+            /* AIDashboard */
+            QDialog#aiDashboard {{
+                background-color: {theme['background']};
+            }}
+            #aiDashboard QGroupBox {{
+                color: {theme['text']};
+                border: 2px solid {theme['primary']};
+                border-radius: {opt.get_margin(5)}px;
+                margin-top: {opt.get_margin(10)}px;
+                font-weight: bold;
+            }}
+            #aiDashboard QGroupBox::title {{
+                subcontrol-origin: margin;
+                left: {opt.get_margin(10)}px;
+                padding: 0 {opt.get_margin(5)}px 0 {opt.get_margin(5)}px;
+                color: {theme['primary']};
+            }}
+            #aiDashboard QLabel {{
+                color: {theme['text']};
+            }}
+            #aiDashboard QPushButton {{
+                background-color: {theme['primary']};
+                color: white;
+                border: none;
+                border-radius: {opt.get_margin(5)}px;
+                padding: {opt.get_margin(8)}px;
+                font-weight: bold;
+            }}
+
+            /* TransactionDialog */
+            QDialog#transactionDialog {{
+                background-color: {theme['card_bg']};
+                border: 2px solid {theme['primary']};
+                border-radius: {opt.get_margin(15)}px;
+            }}
+            #transactionDialog QLabel {{
+                color: {theme['text']};
+                font-size: {opt.get_font_size(11)}px;
+            }}
+            #transactionDialog QLineEdit, #transactionDialog QTextEdit, #transactionDialog QComboBox, #transactionDialog QDateEdit, #transactionDialog QDoubleSpinBox {{
+                padding: {opt.get_margin(10)}px;
+                border: 2px solid {theme['border']};
+                border-radius: {opt.get_margin(6)}px;
+                background: {theme['background']};
+                color: {theme['text']};
+                font-size: {opt.get_font_size(11)}px;
+                min-height: {opt.get_button_height(40)}px;
+            }}
+            #transactionDialog QPushButton {{
+                padding: {opt.get_margin(12)}px {opt.get_margin(24)}px;
+                border: none;
+                border-radius: {opt.get_margin(6)}px;
+                font-weight: bold;
+                font-size: {opt.get_font_size(12)}px;
+                min-height: {opt.get_button_height(45)}px;
+            }}
+            #transactionDialog QPushButton#saveBtn {{
+                background-color: {theme['success']};
+                color: white;
+            }}
+            #transactionDialog QPushButton#cancelBtn {{
+                background-color: {theme['danger']};
+                color: white;
+            }}
+
+            /* AccountsDialog */
+            QDialog#accountsDialog {{
+                background-color: {theme['background']};
+            }}
+            #accountsDialog QTableWidget {{
+                background-color: {theme['card_bg']};
+                color: {theme['text']};
+                alternate-background-color: {theme['secondary']};
+                gridline-color: {theme['border']};
+                font-size: {opt.get_font_size(10)}px;
+            }}
+            #accountsDialog QHeaderView::section {{
+                background-color: {theme['secondary']};
+                color: {theme['text']};
+                padding: {opt.get_margin(5)}px;
+                font-size: {opt.get_font_size(10)}px;
+            }}
+            #accountsDialog QPushButton {{
+                background-color: {theme['primary']};
+                color: white;
+                border: none;
+                border-radius: {opt.get_margin(5)}px;
+                padding: {opt.get_margin(10)}px {opt.get_margin(20)}px;
+                font-size: {opt.get_font_size(11)}px;
+                font-weight: bold;
+            }}
+
+            /* TransactionsDialog */
+            QDialog#transactionsDialog {{
+                background-color: {theme['background']};
+            }}
+            #transactionsDialog QTableWidget {{
+                background-color: {theme['card_bg']};
+                color: {theme['text']};
+                alternate-background-color: {theme['secondary']};
+                gridline-color: {theme['border']};
+                font-size: {opt.get_font_size(10)}px;
+            }}
+            #transactionsDialog QHeaderView::section {{
+                background-color: {theme['secondary']};
+                color: {theme['text']};
+                padding: {opt.get_margin(5)}px;
+                font-size: {opt.get_font_size(10)}px;
+            }}
+            #transactionsDialog QLineEdit {{
+                padding: {opt.get_margin(8)}px;
+                border: 2px solid {theme['border']};
+                border-radius: {opt.get_margin(6)}px;
+                background: {theme['card_bg']};
+                color: {theme['text']};
+                font-size: {opt.get_font_size(11)}px;
+            }}
+            #transactionsDialog QLineEdit:focus {{
+                border-color: {theme['primary']};
+            }}
+            #searchStatus {{
+                color: {theme['text_secondary']};
+                font-size: {opt.get_font_size(10)}px;
+            }}
+            #transactionsDialog QPushButton {{
+                background-color: {theme['primary']};
+                color: white;
+                border: none;
+                border-radius: {opt.get_margin(5)}px;
+                padding: {opt.get_margin(10)}px {opt.get_margin(20)}px;
+                font-size: {opt.get_font_size(11)}px;
+                font-weight: bold;
+            }}
+
+            /* LicenseDialog */
+            QDialog#licenseDialog {{
+                background-color: {theme['card_bg']};
+                border: 2px solid {theme['primary']};
+                border-radius: {opt.get_margin(15)}px;
+            }}
+            #licenseDialog QLabel {{
+                color: {theme['text']};
+                font-size: {opt.get_font_size(11)}px;
+            }}
+            #licenseDialog QTextEdit {{
+                border: 2px solid {theme['border']};
+                border-radius: {opt.get_margin(6)}px;
+                padding: {opt.get_margin(8)}px;
+                background: {theme['background']};
+                color: {theme['text']};
+                font-family: monospace;
+                font-size: {opt.get_font_size(10)}px;
+            }}
+            #licenseDialog QPushButton {{
+                background-color: {theme['success']};
+                color: white;
+                border: none;
+                border-radius: {opt.get_margin(6)}px;
+                padding: {opt.get_margin(10)}px {opt.get_margin(20)}px;
+                font-weight: bold;
+                font-size: {opt.get_font_size(11)}px;
+                min-height: {opt.get_button_height(40)}px;
+            }}
+            #licenseDialog QPushButton:hover {{
+                background-color: {theme['hover']};
+            }}
+
+            /* AboutDialog */
+            QDialog#aboutDialog {{
+                background-color: {theme['card_bg']};
+                border: 2px solid {theme['primary']};
+                border-radius: {opt.get_margin(15)}px;
+            }}
+            #aboutDialog QLabel {{
+                color: {theme['text']};
+            }}
+            #aboutDialog QPushButton {{
+                background-color: {theme['primary']};
+                color: white;
+                border: none;
+                border-radius: {opt.get_margin(6)}px;
+                padding: {opt.get_margin(10)}px;
+                font-weight: bold;
+            }}
+
+            /* ویجت‌های داشبورد */
+            QWidget#dashboard {{
+                background-color: {theme['background']};
+            }}
+            QFrame#licenseFrame {{
+                background: {theme['card_bg']};
+                border-radius: {opt.get_margin(10)}px;
+                border: 1px solid {theme['border']};
+                padding: {opt.get_margin(10)}px;
+            }}
+            QLabel[objectName^="licenseLabel_"] {{
+                font-weight: bold;
+                font-size: {opt.get_font_size(14)}px;
+            }}
+            QFrame#aiBanner {{
+                background: {theme['card_bg']};
+                border-radius: {opt.get_margin(8)}px;
+                border: 1px solid {theme['primary']};
+                padding: {opt.get_margin(8)}px;
+            }}
+            QLabel#aiBannerIcon {{
+                font-size: {opt.get_font_size(20)}px;
+            }}
+            QLabel#aiBannerText {{
+                color: {theme['primary']};
+                font-weight: bold;
+            }}
+            QPushButton[objectName^="dashButton_"] {{
+                color: white;
+                border: none;
+                border-radius: {opt.get_margin(6)}px;
+                padding: {opt.get_margin(8)}px;
+                font-size: {opt.get_font_size(11)}px;
+                font-weight: bold;
+            }}
+            QPushButton[objectName^="dashButton_"]:hover {{
+                background-color: {theme['hover']};
+            }}
+            QFrame[objectName^="statCard_"] {{
+                border-radius: {opt.get_margin(10)}px;
+                padding: {opt.get_margin(10)}px;
+            }}
+            QLabel#statIcon {{
+                font-size: {opt.get_icon_size(30)}px;
+                background: transparent;
+                color: white;
+            }}
+            QLabel#statTitle {{
+                font-size: {opt.get_font_size(12)}px;
+                color: rgba(255,255,255,0.8);
+                background: transparent;
+            }}
+            QLabel#statValue {{
+                font-size: {opt.get_font_size(20)}px;
+                font-weight: bold;
+                color: white;
+                background: transparent;
+            }}
+            QLabel#statusAi {{
+                color: {theme['primary']};
+            }}
+            QLabel#statusPerf {{
+                color: {theme['text_secondary']};
+                font-family: monospace;
+            }}
+            #perfDetails {{
+                font-family: monospace;
+                font-size: {opt.get_font_size(10)}px;
+            }}
+{variants}
+            /* عنوان‌ها و برچسب‌های دیالوگ‌ها */
+            QLabel#dialogTitle {{
+                font-size: {opt.get_font_size(18)}px;
+                font-weight: bold;
+                color: {theme['primary']};
+            }}
+            QLabel#hwidValue {{
+                font-family: monospace;
+                background: {theme['background']};
+                color: {theme['text']};
+                padding: {opt.get_margin(10)}px;
+                border-radius: {opt.get_margin(5)}px;
+                border: 1px solid {theme['border']};
+            }}
+            QLabel#aboutLogo {{
+                font-size: {opt.get_icon_size(60)}px;
+            }}
+            QLabel#aboutTitle {{
+                font-size: {opt.get_font_size(22)}px;
+                font-weight: bold;
+                color: {theme['primary']};
+            }}
+            QLabel#aboutSlogan {{
+                color: {theme['success']};
+                font-style: italic;
+            }}
+            QLabel#aboutLicense {{
+                color: {theme['success']};
+                font-weight: bold;
+            }}
+            QLabel#aboutAi {{
+                color: {theme['primary']};
+            }}
+    """
+
+
+def set_variant(widget, base: str, variant: str):
+    """انتخاب variant با objectName و polish دوباره فقط همان ویجت"""
+    name = f"{base}_{variant}"
+    if widget.objectName() != name:
+        widget.setObjectName(name)
+        widget.style().unpolish(widget)
+        widget.style().polish(widget)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""
+کش دیالوگ‌ها - دیالوگ‌ها بعد از اولین باز شدن زنده می‌مانند و به جای ساخت
+دوباره، با سیگنال تغییر دفتر به صورت جزئی به‌روز می‌شوند.
+"""
+
+from collections import OrderedDict
+from typing import Callable
+
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+from ..events import AccountCreated, BalanceChanged, PostingCreated
+from ..ledger import DatabaseManager
+
+# سقف حافظه کش بر حسب تعداد سلول‌های جدول‌ها (هر دیالوگ بدون جدول = ۱)
+DEFAULT_CELL_BUDGET = 200_000
+
+
+class LedgerSignals(QObject):
+    """پل گذرگاه رویداد دفتر به سیگنال‌های Qt
+
+    تحویل رویدادها با یک اتصال صف‌شده به حلقه رویداد Qt سپرده می‌شود؛ پس
+    مشترکان همیشه در thread اصلی و بعد از پایان کار جاری صدا زده می‌شوند و
+    هر سیگنال در هر تحویل یک بار با لیست تغییرات منتشر می‌شود.
+    """
+    
+    transactions_added = pyqtSignal(list)
+    accounts_added = pyqtSignal(list)
+    balances_changed = pyqtSignal(list)
+    _deliver = pyqtSignal(object)
+    
+    def __init__(self, db: DatabaseManager):
+        super().__init__()
+        self._deliver.connect(self._run, Qt.QueuedConnection)
+        db.events.scheduler = self._deliver.emit
+        db.events.subscribe(PostingCreated, self.on_postings)
+        db.events.subscribe(AccountCreated, self.on_accounts)
+        db.events.subscribe(BalanceChanged, self.balances_changed.emit)
+    
+    @staticmethod
+    def _run(func):
+        func()
+    
+    def on_postings(self, events: list):
+        self.transactions_added.emit([event.transaction for event in events])
+    
+    def on_accounts(self, events: list):
+        self.accounts_added.emit([event.account for event in events])
+
+
+class ViewCache:
+    """کش LRU دیالوگ‌ها با سقف حافظه
+
+    دیالوگ‌ها می‌توانند متدهای on_transactions_added / on_accounts_added /
+    on_balances_changed برای به‌روزرسانی جزئی و view_cost برای تخمین حافظه
+    داشته باشند.
+    """
+    
+    SLOTS = {
+        'transactions_added': 'on_transactions_added',
+        'accounts_added': 'on_accounts_added',
+        'balances_changed': 'on_balances_changed',
+    }
+    
+    def __init__(self, signals: LedgerSignals, budget: int = DEFAULT_CELL_BUDGET):
+        self.signals = signals
+        self.budget = budget
+        self.views = OrderedDict()
+    
+    def get(self, key: str, factory: Callable[[], QObject]):
+        view = self.views.pop(key, None)
+        if view is None:
+            view = factory()
+            self.connect(view)
+        self.views[key] = view
+        self.evict()
+        return view
+    
+    def connect(self, view):
+        for signal_name, slot_name in self.SLOTS.items():
+            slot = getattr(view, slot_name, None)
+            if slot is not None:
+                getattr(self.signals, signal_name).connect(slot)
+    
+    def disconnect(self, view):
+        for signal_name, slot_name in self.SLOTS.items():
+            slot = getattr(view, slot_name, None)
+            if slot is not None:
+                try:
+                    getattr(self.signals, signal_name).disconnect(slot)
+                except TypeError:
+                    pass
+    
+    @staticmethod
+    def cost(view) -> int:
+        view_cost = getattr(view, 'view_cost', None)
+        return view_cost() if view_cost is not None else 1
+    
+    def total_cost(self) -> int:
+        return sum(self.cost(view) for view in self.views.values())
+    
+    def evict(self):
+        """حذف قدیمی‌ترین دیالوگ‌های بسته تا زیر سقف حافظه برگردیم"""
+        total = self.total_cost()
+        for key in list(self.views):
+            if total <= self.budget:
+                break
+            view = self.views[key]
+            if view.isVisible():
+                continue
+            total -= self.cost(view)
+            self.remove(key)
+    
+    def remove(self, key: str):
+        view = self.views.pop(key, None)
+        if view is not None:
+            self.disconnect(view)
+            view.deleteLater()
+    
+    def clear(self):
+        for key in list(self.views):
+            self.remove(key)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+ویجت‌های مشترک رابط کاربری
+"""
+
+from PyQt5.QtWidgets import QFrame, QHBoxLayout, QLabel, QVBoxLayout
+
+from .screen import ScreenOptimizer
+
+
+# ====================== کلاس StatCard ======================
+
+class StatCard(QFrame):
+    def __init__(self, title: str, value: str, icon: str, variant: str, optimizer: ScreenOptimizer, theme: dict):
+        super().__init__()
+        self.optimizer = optimizer
+        self.theme = theme
+        
+        self.setFrameStyle(QFrame.StyledPanel)
+        self.setObjectName(f"statCard_{variant}")
+        
+        layout = QHBoxLayout()
+        layout.setContentsMargins(
+            self.optimizer.get_margin(15),
+            self.optimizer.get_margin(10),
+            self.optimizer.get_margin(15),
+            self.optimizer.get_margin(10)
+        )
+        layout.setSpacing(self.optimizer.get_spacing(10))
+        
+        icon_label = QLabel(icon)
+        icon_label.setObjectName("statIcon")
+        layout.addWidget(icon_label)
+        
+        text_layout = QVBoxLayout()
+        text_layout.setSpacing(2)
+        
+        title_label = QLabel(title)
+        title_label.setObjectName("statTitle")
+        text_layout.addWidget(title_label)
+        
+        self.value_label = QLabel(value)
+        self.value_label.setObjectName("statValue")
+        text_layout.addWidget(self.value_label)
+        
+        layout.addLayout(text_layout)
+        layout.addStretch()
+        
+        self.setLayout(layout)
+        self.setFixedHeight(self.optimizer.get_card_size(100))
+    
+    def update_value(self, value: str):
+        self.value_label.setText(value)
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+"""
+اندازه‌گیری زمان مسیرهای پرکاربرد (بدون وابستگی به Qt)
+
+هر عملیات با timed (دکوراتور یا context manager) زمان‌گیری می‌شود و در
+هیستوگرام هم‌نامش در METRICS ثبت می‌شود؛ هیستوگرام آخرین نمونه‌ها را نگه
+می‌دارد و p50/p95 از روی آن‌ها حساب می‌شود. این بخش همیشه فعال است و هزینه
+هر اندازه‌گیری حدود یک میکروثانیه است.
+
+دو ابزار سنگین‌تر اختیاری‌اند و با متغیر محیطی هم روشن می‌شوند:
+- زمان‌گیری SQL (IMAN_PROFILE_SQL=1): اتصال‌های DatabaseManager هر دستور را
+  زمان‌گیری می‌کنند. متن واقعی هر دستور (با مقادیر پارامترها و دستورهای داخل
+  trigger) از trace callback گرفته می‌شود؛ دستورهای کندتر از SLOW_SQL_MS
+  ثبت می‌شوند و progress callback دستورهای کندی را که هنوز در حال اجرا
+  هستند در METRICS.in_flight نشان می‌دهد.
+- cProfile (IMAN_PROFILE=1): ضبط پروفایل کل برنامه تا stop_profiler.
+"""
+
+import functools
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from ._lazy import lazy_import
+
+cProfile = lazy_import('cProfile')
+pstats = lazy_import('pstats')
+io = lazy_import('io')
+
+# تعداد نمونه‌های نگه‌داشته برای محاسبه صدک‌ها در هر عملیات
+SAMPLE_WINDOW = 1024
+
+SLOW_SQL_MS = 50
+# هر چند دستور ماشین مجازی SQLite یک بار progress handler صدا زده شود
+PROGRESS_STEPS = 20_000
+
+
+# ====================== هیستوگرام ======================
+
+class OpStats(NamedTuple):
+    name: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    total_ms: float
+
+
+def percentile(sorted_samples: List[float], p: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, round(p / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+class Histogram:
+    """زمان‌های یک عملیات: شمارش و جمع کل به همراه آخرین SAMPLE_WINDOW نمونه"""
+    
+    __slots__ = ('samples', 'count', 'total', 'max')
+    
+    def __init__(self):
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def stats(self, name: str) -> OpStats:
+        ordered = sorted(self.samples)
+        return OpStats(
+            name, self.count,
+            percentile(ordered, 50) * 1000, percentile(ordered, 95) * 1000,
+            self.max * 1000, self.total * 1000,
+        )
+
+
+class Metrics:
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+        self.slow_sql = deque(maxlen=100)  # (ms, دستور)
+        self.in_flight: Dict[int, Tuple[float, str]] = {}  # اتصال -> (شروع، دستور)
+        self.lock = threading.Lock()
+    
+    def record(self, name: str, seconds: float):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(seconds)
+    
+    def snapshot(self) -> List[OpStats]:
+        """آمار همه عملیات‌ها، از بیشترین p95"""
+        with self.lock:
+            stats = [h.stats(name) for name, h in self.histograms.items()]
+        return sorted(stats, key=lambda s: s.p95_ms, reverse=True)
+    
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.slow_sql.clear()
+    
+    def dump(self, path: str):
+        """ذخیره آمار به صورت JSON (برای ارسال از کامپیوتر مشتری)"""
+        import json  # فقط اینجا لازم است
+        data = {
+            'timestamp': time.time(),
+            'operations': [s._asdict() for s in self.snapshot()],
+            'slow_sql': [{'ms': ms, 'sql': sql} for ms, sql in list(self.slow_sql)],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+METRICS = Metrics()
+
+
+class timed:
+    """زمان‌گیری یک بلوک (with timed('name')) یا یک تابع (@timed('name'))"""
+    
+    __slots__ = ('name', 'started')
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        METRICS.record(self.name, time.perf_counter() - self.started)
+    
+    def __call__(self, func):
+        name = self.name
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                METRICS.record(name, time.perf_counter() - started)
+        return wrapper
+
+
+# ====================== زمان‌گیری SQL ======================
+
+sql_enabled = os.environ.get('IMAN_PROFILE_SQL') == '1'
+
+_WHITESPACE = re.compile(r'\s+')
+# مقادیر ثابت عددی و رشته‌ای تا دستورهای هم‌شکل یک هیستوگرام داشته باشند
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def statement_name(sql: str) -> str:
+    sql = _LITERALS.sub('?', _WHITESPACE.sub(' ', sql).strip())
+    return 'sql: ' + (sql if len(sql) <= 90 else sql[:87] + '...')
+
+
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        return self.connection.run(statement_name(sql), super().execute, sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.connection.run(statement_name(sql), super().executemany, sql, seq_of_parameters)
+    
+    def executescript(self, sql_script):
+        return self.connection.run('sql: <script>', super().executescript, sql_script)
+
+
+class TimedConnection(sqlite3.Connection):
+    """اتصالی که زمان هر دستور را ثبت و دستورهای کند را گزارش می‌کند"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statement = None
+        self.started = None
+        # trace پیش از اجرای هر دستور (و هر دستور داخل trigger) صدا زده می‌شود
+        self.set_trace_callback(self._on_trace)
+        self.set_progress_handler(self._on_progress, PROGRESS_STEPS)
+    
+    def _on_trace(self, statement: str):
+        self.statement = statement
+    
+    def _on_progress(self) -> int:
+        # بعد از execute (هنگام fetch) started خالی است و چیزی ثبت نمی‌شود
+        if self.started is not None and (time.perf_counter() - self.started) * 1000 > SLOW_SQL_MS:
+            METRICS.in_flight[id(self)] = (self.started, _WHITESPACE.sub(' ', self.statement or ''))
+        return 0  # ادامه اجرا
+    
+    def run(self, name: str, execute, *args):
+        """اجرا و زمان‌گیری یک دستور؛ زمان تا آماده شدن اولین ردیف است و fetch را شامل نمی‌شود"""
+        self.started = time.perf_counter()
+        try:
+            return execute(*args)
+        finally:
+            elapsed = time.perf_counter() - self.started
+            self.started = None
+            METRICS.record(name, elapsed)
+            METRICS.in_flight.pop(id(self), None)
+            if elapsed * 1000 > SLOW_SQL_MS:
+                METRICS.slow_sql.append(
+                    (round(elapsed * 1000, 1), _WHITESPACE.sub(' ', self.statement or name).strip())
+                )
+    
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+    
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+def connection_factory():
+    """کلاس اتصال برای sqlite3.connect با توجه به روشن بودن زمان‌گیری SQL"""
+    return TimedConnection if sql_enabled else sqlite3.Connection
+
+
+# ====================== cProfile ======================
+
+_profiler = None
+
+
+def profiling() -> bool:
+    return _profiler is not None
+
+
+def start_profiler():
+    global _profiler
+    if _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def stop_profiler(path: Optional[str] = None, top: int = 30) -> str:
+    """پایان ضبط؛ پروفایل در path (قابل باز کردن با pstats/snakeviz) ذخیره و خلاصه برگردانده می‌شود"""
+    global _profiler
+    if _profiler is None:
+        return ''
+    profiler, _profiler = _profiler, None
+    profiler.disable()
+    if path:
+        profiler.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(top)
+    return out.getvalue()
+
+
+if os.environ.get('IMAN_PROFILE') == '1':
+    start_profiler()
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+"""
+بررسی یکپارچگی دوطرفه دفتر و بازسازی موجودی حساب‌ها (بدون وابستگی به Qt)
+
+accounts.balance جدا از ردیف‌های transactions نگه داشته می‌شود و ممکن است
+(مثلاً با ویرایش مستقیم فایل، خطای نسخه‌های قبل یا بازیابی ناقص) از دفتر
+جدا بیفتد. verify(db) موجودی هر حساب را از روی دفتر (دوره باز و بایگانی)
+دوباره حساب می‌کند: جمع بدهکار منهای جمع بستانکار. جمع همه حساب‌ها با یک
+پرس‌وجوی GROUP BY از نمایه‌های (حساب، تاریخ، مبلغ) خوانده می‌شود و جدول
+transactions پیمایش نمی‌شود؛ یک پرس‌وجو یک نسخه از دفتر را می‌بیند، پس انتقال
+همزمان ردیف‌ها به بایگانی (که شناسه‌شان را حفظ می‌کند) جمع را به هم نمی‌زند.
+ACCOUNT_TOTAL_SQL (account_total) فقط برای بررسی جزئی یک حساب است.
+
+جمع هر حساب تا آخرین شناسه بررسی شده در integrity_totals می‌ماند (checkpoint).
+بررسی بعدی فقط ردیف‌های بعد از آن را جمع می‌زند، مگر اینکه ردیفی از قبل
+ویرایش یا از دوره باز حذف شده باشد: trigger ها در این حالت generation را بالا
+می‌برند و بررسی بعدی کامل است. مقایسه با accounts.balance در یک تراکنش خواندن
+همراه با ردیف‌های تازه ثبت شده انجام می‌شود، پس ثبت همزمان اختلاف کاذب نمی‌سازد.
+
+repair اختلاف‌ها را با UPDATE نسبی (balance - اختلاف) در thread نویسنده دفتر
+اصلاح می‌کند؛ ثبت‌هایی که بین بررسی و اصلاح رسیده‌اند از بین نمی‌روند.
+IntegrityService همین کارها را در یک thread کارگر اجرا می‌کند.
+"""
+
+import time
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+from .events import BalanceChanged
+from .instrument import timed
+from .money import Money
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from .ledger import DatabaseManager
+
+# اگر ردیف‌های قبلی در طول بررسی ویرایش شوند بررسی از نو انجام می‌شود
+RETRIES = 3
+
+INTEGRITY_DDL = '''
+    CREATE TABLE IF NOT EXISTS integrity_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        generation INTEGER NOT NULL DEFAULT 0,  -- با ویرایش یا حذف ردیف‌های ثبت شده بالا می‌رود
+        checked_generation INTEGER,  -- generation زمان ساخت checkpoint
+        last_id INTEGER NOT NULL DEFAULT 0,  -- integrity_totals تا این شناسه است
+        checked_at TIMESTAMP
+    );
+    INSERT OR IGNORE INTO integrity_state (id) VALUES (1);
+    CREATE TABLE IF NOT EXISTS integrity_totals (
+        account_id INTEGER PRIMARY KEY,
+        total INTEGER NOT NULL  -- بدهکار - بستانکار
+    );
+    CREATE TRIGGER IF NOT EXISTS integrity_transactions_update
+    AFTER UPDATE OF amount, debit_account_id, credit_account_id ON transactions BEGIN
+        UPDATE integrity_state SET generation = generation + 1;
+    END;
+    -- انتقال به بایگانی (ردیف‌های دوره بسته) جمع‌ها را تغییر نمی‌دهد
+    CREATE TRIGGER IF NOT EXISTS integrity_transactions_delete AFTER DELETE ON transactions
+    WHEN old.date > COALESCE((SELECT MAX(end_date) FROM fiscal_periods), '') BEGIN
+        UPDATE integrity_state SET generation = generation + 1;
+    END;
+'''
+
+# هر شاخه روی نمایه به ترتیب حساب جمع زده می‌شود (بدون مرتب‌سازی یک میلیون ردیف)
+TOTALS_SQL = '''
+    SELECT account_id, SUM(total) FROM (
+        SELECT debit_account_id AS account_id, SUM(amount) AS total FROM transactions
+        WHERE +id <= :through GROUP BY debit_account_id
+        UNION ALL
+        SELECT credit_account_id, -SUM(amount) FROM transactions
+        WHERE +id <= :through GROUP BY credit_account_id
+        UNION ALL
+        SELECT debit_account_id, SUM(amount) FROM transactions_archive
+        WHERE +id <= :through GROUP BY debit_account_id
+        UNION ALL
+        SELECT credit_account_id, -SUM(amount) FROM transactions_archive
+        WHERE +id <= :through GROUP BY credit_account_id
+    ) GROUP BY account_id
+'''
+
+ACCOUNT_TOTAL_SQL = '''
+    SELECT (SELECT COALESCE(SUM(amount), 0) FROM transactions
+            WHERE debit_account_id = :account AND +id <= :through)
+         + (SELECT COALESCE(SUM(amount), 0) FROM transactions_archive
+            WHERE debit_account_id = :account AND +id <= :through)
+         - (SELECT COALESCE(SUM(amount), 0) FROM transactions
+            WHERE credit_account_id = :account AND +id <= :through)
+         - (SELECT COALESCE(SUM(amount), 0) FROM transactions_archive
+            WHERE credit_account_id = :account AND +id <= :through)
+'''
+
+RANGE_TOTALS_SQL = '''
+    SELECT account_id, SUM(amount) FROM (
+        SELECT debit_account_id AS account_id, amount FROM transactions
+        WHERE id > :after AND id <= :through
+        UNION ALL
+        SELECT credit_account_id, -amount FROM transactions
+        WHERE id > :after AND id <= :through
+        UNION ALL
+        SELECT debit_account_id, amount FROM transactions_archive
+        WHERE id > :after AND id <= :through
+        UNION ALL
+        SELECT credit_account_id, -amount FROM transactions_archive
+        WHERE id > :after AND id <= :through
+    ) GROUP BY account_id
+'''
+
+LAST_ID_SQL = '''
+    SELECT MAX(COALESCE((SELECT MAX(id) FROM transactions), 0),
+               COALESCE((SELECT MAX(id) FROM transactions_archive), 0))
+'''
+
+
+class VerifyError(Exception):
+    """دفتر در طول بررسی مدام ویرایش شد و نتیجه سازگاری به دست نیامد"""
+
+
+class Drift(NamedTuple):
+    account_id: int
+    code: str
+    name: str
+    stored: Money
+    expected: Money
+    
+    @property
+    def difference(self) -> Money:
+        return Money(self.stored - self.expected)
+
+
+class IntegrityReport(NamedTuple):
+    full: bool  # بدون checkpoint، از ابتدای دفتر
+    since: int  # شناسه‌های بیشتر از این جمع زده شدند
+    through: int
+    accounts: int
+    drifts: List[Drift]
+    repaired: bool
+    seconds: float
+    
+    @property
+    def ok(self) -> bool:
+        return not self.drifts
+
+
+def create_integrity_tables(conn):
+    conn.executescript(INTEGRITY_DDL)
+    conn.commit()
+
+
+def account_totals(conn, through: int) -> Dict[int, int]:
+    """بدهکار - بستانکار هر حساب گردش‌دار در ردیف‌های با شناسه تا through (یک پرس‌وجو)"""
+    return dict(conn.execute(TOTALS_SQL, {'through': through}))
+
+
+def account_total(conn, account_id: int, through: int) -> int:
+    """بدهکار - بستانکار یک حساب تا شناسه through (بررسی جزئی یک حساب)"""
+    return conn.execute(ACCOUNT_TOTAL_SQL, {'account': account_id, 'through': through}).fetchone()[0]
+
+
+def add_range(conn, totals: Dict[int, int], after: int, through: int):
+    """افزودن گردش ردیف‌های after < id <= through به totals"""
+    if through <= after:
+        return
+    for account, amount in conn.execute(RANGE_TOTALS_SQL, {'after': after, 'through': through}):
+        totals[account] = totals.get(account, 0) + amount
+
+
+# ====================== بررسی و اصلاح ======================
+
+@timed('integrity.verify')
+def verify(db: 'DatabaseManager', full: bool = False, repair: bool = False) -> IntegrityReport:
+    """مقایسه accounts.balance با دفتر؛ با repair اختلاف‌ها اصلاح می‌شوند"""
+    if db.is_remote:
+        raise VerifyError("بررسی موجودی فقط روی دفتر محلی انجام می‌شود")
+    started = time.perf_counter()
+    for _ in range(RETRIES):
+        with db.get_connection() as conn:
+            generation, checked, last_id = conn.execute(
+                "SELECT generation, checked_generation, last_id FROM integrity_state"
+            ).fetchone()
+            through = conn.execute(LAST_ID_SQL).fetchone()[0]
+            incremental = not full and checked == generation and last_id <= through
+            if incremental:
+                since = last_id
+                totals = dict(conn.execute("SELECT account_id, total FROM integrity_totals"))
+                add_range(conn, totals, since, through)
+            else:
+                since = 0
+                totals = account_totals(conn, through)
+            
+            # ردیف‌های ثبت شده در طول بررسی و موجودی‌ها از یک نسخه خوانده می‌شوند
+            conn.execute("BEGIN")
+            try:
+                current = conn.execute("SELECT generation FROM integrity_state").fetchone()[0]
+                tail = conn.execute(LAST_ID_SQL).fetchone()[0]
+                add_range(conn, totals, through, tail)
+                balances = conn.execute("SELECT id, code, name, balance FROM accounts").fetchall()
+            finally:
+                conn.rollback()
+        if current != generation:
+            continue
+        
+        drifts = [
+            Drift(account_id, code, name, Money(balance or 0), Money(totals.get(account_id, 0)))
+            for account_id, code, name, balance in balances
+            if (balance or 0) != totals.get(account_id, 0)
+        ]
+        db.writer.call(save_checkpoint, db, generation, tail, totals).result()
+        repaired = bool(drifts) and repair and db.writer.call(apply_repair, db, generation, drifts).result()
+        return IntegrityReport(not incremental, since, tail, len(balances), drifts, repaired,
+                               time.perf_counter() - started)
+    raise VerifyError("دفتر در طول بررسی ویرایش شد؛ دوباره تلاش کنید")
+
+
+def save_checkpoint(db: 'DatabaseManager', generation: int, through: int, totals: Dict[int, int]) -> bool:
+    """ذخیره جمع‌ها اگر از زمان خواندن ردیفی ویرایش نشده باشد (در thread نویسنده)"""
+    with db.get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT generation FROM integrity_state").fetchone()[0] != generation:
+            conn.rollback()
+            return False
+        conn.execute("DELETE FROM integrity_totals")
+        conn.executemany("INSERT INTO integrity_totals VALUES (?, ?)", totals.items())
+        conn.execute(
+            "UPDATE integrity_state SET checked_generation = ?, last_id = ?, checked_at = CURRENT_TIMESTAMP",
+            (generation, through)
+        )
+        conn.commit()
+    return True
+
+
+def apply_repair(db: 'DatabaseManager', generation: int, drifts: List[Drift]) -> bool:
+    """کم کردن اختلاف از موجودی هر حساب (در thread نویسنده)؛ False اگر دفتر ویرایش شده باشد"""
+    with db.get_connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT generation FROM integrity_state").fetchone()[0] != generation:
+            conn.rollback()
+            return False
+        conn.executemany(
+            "UPDATE accounts SET balance = balance - ? WHERE id = ?",
+            [(drift.difference, drift.account_id) for drift in drifts]
+        )
+        conn.commit()
+    db.bump_revision()
+    
+    with db.events.batch():
+        for drift in drifts:
+            account = db.get_account_by_id(drift.account_id)
+            if account is not None:
+                account.balance -= drift.difference
+                db.events.publish(BalanceChanged(account.id, Money(-drift.difference), account.balance))
+    return True
+
+
+def last_checked(db: 'DatabaseManager') -> Optional[str]:
+    """زمان آخرین checkpoint (UTC) یا None"""
+    return db.execute_query("SELECT checked_at FROM integrity_state")[0][0]
+
+
+# ====================== سرویس پس‌زمینه ======================
+
+class IntegrityService:
+    """بررسی یکپارچگی دفتر در یک thread کارگر (هر بار یک بررسی)"""
+    
+    def __init__(self, db: 'DatabaseManager'):
+        self.db = db
+        self.executor = None
+    
+    def check(self, full: bool = False, repair: bool = False) -> 'Future':
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ledger-integrity')
+        return self.executor.submit(verify, self.db, full, repair)
+    
+    def close(self, wait: bool = True):
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+
+"""
+سندهای چندسطری (فاکتور با چند قلم، حقوق با کسورات) و جدول سطرهای حساب (بدون وابستگی به Qt)
+
+هر ردیف transactions یک بدهکار و یک بستانکار دارد. سند چندسطری یک ردیف در
+journal_entries است و سطرهایش (حساب، مبلغ علامت‌دار: بدهکار مثبت، بستانکار
+منفی) باید جمع صفر داشته باشند. post_entry سطرها را به کمترین تعداد ردیف
+دوطرفه (حداکثر تعداد سطرها منهای یک) می‌شکند که همه ستون entry_id سند را
+دارند و با یک post_transactions (یک commit) ثبت می‌شوند؛ پس موجودی‌ها،
+rollup، جستجو، بایگانی دوره‌های بسته و بررسی یکپارچگی بدون تغییر کار می‌کنند.
+
+جدول postings برای هر ردیف دو سطر دارد، یکی برای هر حساب، با کلید
+(حساب، تاریخ، شناسه تراکنش). trigger ها آن را با transactions به‌روز نگه
+می‌دارند؛ انتقال به بایگانی سطرها را حذف نمی‌کند، پس postings کل دفتر است.
+صورتحساب یک حساب (statement) و جمع گردش آن یک پیمایش بازه از همین کلید
+است، به جای OR روی دو ستون بدهکار و بستانکار و مرتب‌سازی نتیجه. در دفترهای
+قدیمی جدول یک بار از روی تراکنش‌های موجود ساخته می‌شود.
+"""
+
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .instrument import timed
+from .money import Money
+
+if TYPE_CHECKING:
+    from .ledger import DatabaseManager, Transaction
+
+JOURNAL_DDL = '''
+    CREATE TABLE IF NOT EXISTS journal_entries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        number TEXT UNIQUE NOT NULL,
+        date DATE NOT NULL,
+        description TEXT,
+        type TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS postings (
+        account_id INTEGER NOT NULL,
+        date DATE NOT NULL,
+        transaction_id INTEGER NOT NULL,
+        side INTEGER NOT NULL,  -- 1 بدهکار، -1 بستانکار
+        amount INTEGER NOT NULL,  -- بدهکار مثبت، بستانکار منفی
+        entry_id INTEGER,  -- journal_entries.id؛ NULL برای تراکنش تک‌سطری
+        PRIMARY KEY (account_id, date, transaction_id, side)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_postings_entry ON postings(entry_id) WHERE entry_id IS NOT NULL;
+'''
+
+_POSTINGS_ADD = '''
+    INSERT OR IGNORE INTO postings VALUES
+        (new.debit_account_id, new.date, new.id, 1, new.amount, new.entry_id),
+        (new.credit_account_id, new.date, new.id, -1, -new.amount, new.entry_id);
+'''
+
+_POSTINGS_REMOVE = '''
+    DELETE FROM postings WHERE account_id = old.debit_account_id AND date = old.date
+        AND transaction_id = old.id AND side = 1;
+    DELETE FROM postings WHERE account_id = old.credit_account_id AND date = old.date
+        AND transaction_id = old.id AND side = -1;
+'''
+
+# ردیفی که به بایگانی منتقل می‌شود سطرهایش را نگه می‌دارد و با باز شدن دوره
+# و برگشتن به transactions دوباره اضافه نمی‌شود (OR IGNORE)
+POSTINGS_TRIGGERS = f'''
+    CREATE TRIGGER IF NOT EXISTS postings_insert AFTER INSERT ON transactions BEGIN
+        {_POSTINGS_ADD}
+    END;
+    CREATE TRIGGER IF NOT EXISTS postings_delete AFTER DELETE ON transactions
+    WHEN old.date > COALESCE((SELECT MAX(end_date) FROM fiscal_periods), '') BEGIN
+        {_POSTINGS_REMOVE}
+    END;
+    CREATE TRIGGER IF NOT EXISTS postings_update
+    AFTER UPDATE OF date, amount, debit_account_id, credit_account_id, entry_id ON transactions BEGIN
+        {_POSTINGS_REMOVE}
+        {_POSTINGS_ADD}
+    END;
+'''
+
+REBUILD_POSTINGS_SQL = '''
+    INSERT INTO postings
+    SELECT account_id, date, id, side, amount, entry_id FROM (
+        SELECT debit_account_id AS account_id, date, id, 1 AS side, amount, entry_id
+        FROM {table}
+        UNION ALL
+        SELECT credit_account_id, date, id, -1, -amount, entry_id FROM {table}
+    ) ORDER BY 1, 2, 3, 4
+'''
+
+STATEMENT_SQL = '''
+    SELECT p.date, p.transaction_id, p.entry_id, COALESCE(t.number, a.number),
+           COALESCE(t.description, a.description), p.amount
+    FROM postings p
+    LEFT JOIN transactions t ON t.id = p.transaction_id
+    LEFT JOIN transactions_archive a ON t.id IS NULL AND a.id = p.transaction_id
+    WHERE p.account_id = ? AND p.date >= ? AND p.date <= ?
+    ORDER BY p.date DESC, p.transaction_id DESC, p.side DESC
+    LIMIT ? OFFSET ?
+'''
+
+
+class JournalError(Exception):
+    """سند نامعتبر است یا ثبت آن ممکن نیست"""
+
+
+class EntryLine(NamedTuple):
+    account_id: int
+    amount: Money  # بدهکار مثبت، بستانکار منفی
+
+
+class JournalEntry(NamedTuple):
+    id: int
+    number: str
+    date: date
+    description: str
+    type: str
+    lines: List[EntryLine]
+    transactions: List['Transaction']  # ردیف‌های دوطرفه سند
+
+
+class StatementLine(NamedTuple):
+    date: date
+    transaction_id: int
+    entry_id: Optional[int]
+    number: str
+    description: str
+    amount: Money  # بدهکار مثبت، بستانکار منفی
+    balance: Money  # مانده حساب بعد از این سطر
+
+
+class Statement(NamedTuple):
+    account_id: int
+    start: Optional[date]
+    end: Optional[date]
+    opening: Money  # مانده قبل از start
+    closing: Money  # مانده تا end (شامل)
+    total: int  # تعداد سطرهای بازه
+    offset: int
+    lines: List[StatementLine]  # از جدیدترین
+
+
+def create_journal_tables(conn):
+    """ساخت جدول‌ها و trigger ها؛ در دفتر قدیمی entry_id اضافه و postings از روی تراکنش‌ها پر می‌شود"""
+    cursor = conn.cursor()
+    exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'postings'").fetchone()
+    for table in ('transactions', 'transactions_archive'):
+        columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+        if 'entry_id' not in columns:
+            # ستون آخر هر دو جدول، تا انتقال SELECT * به بایگانی هم‌ستون بماند
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN entry_id INTEGER")
+    cursor.executescript(JOURNAL_DDL)
+    cursor.executescript(POSTINGS_TRIGGERS)
+    if not exists:
+        rebuild_postings(conn)
+    conn.commit()
+
+
+def rebuild_postings(conn):
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM postings")
+    for table in ('transactions_archive', 'transactions'):
+        cursor.execute(REBUILD_POSTINGS_SQL.format(table=table))
+
+
+# ====================== سند چندسطری ======================
+
+def balance_lines(lines: Iterable[Tuple[int, int]]) -> List[EntryLine]:
+    """ادغام سطرهای هم‌حساب و بررسی تراز؛ سطرها به ترتیب اولین ظهور هر حساب"""
+    totals: Dict[int, Money] = {}
+    for account_id, amount in lines:
+        totals[account_id] = totals.get(account_id, Money(0)) + Money(amount)
+    merged = [EntryLine(account_id, amount) for account_id, amount in totals.items() if amount]
+    if len(merged) < 2:
+        raise JournalError("سند باید حداقل یک حساب بدهکار و یک حساب بستانکار داشته باشد")
+    total = Money.sum(line.amount for line in merged)
+    if total:
+        raise JournalError(f"سند تراز نیست: جمع بدهکار و بستانکار {total:,} ریال اختلاف دارد")
+    return merged
+
+
+def split_legs(lines: List[EntryLine]) -> List[Tuple[int, int, Money]]:
+    """(بدهکار، بستانکار، مبلغ) هایی که همان گردش سطرهای تراز شده را می‌سازند"""
+    debits = [[line.account_id, line.amount] for line in lines if line.amount > 0]
+    credits = [[line.account_id, -line.amount] for line in lines if line.amount < 0]
+    legs = []
+    i = j = 0
+    while i < len(debits) and j < len(credits):
+        amount = min(debits[i][1], credits[j][1])
+        legs.append((debits[i][0], credits[j][0], Money(amount)))
+        debits[i][1] -= amount
+        credits[j][1] -= amount
+        if not debits[i][1]:
+            i += 1
+        if not credits[j][1]:
+            j += 1
+    return legs
+
+
+@timed('journal.post_entry')
+def post_entry(db: 'DatabaseManager', day: date, description: str, type: str,
+               lines: Iterable[Tuple[int, int]], number: str = None) -> JournalEntry:
+    """ثبت سند تراز با یک commit؛ خطای پایگاه داده (مثلاً دوره بسته) به فراخواننده می‌رسد"""
+    from .ledger import Transaction  # ledger این ماژول را import می‌کند
+    if db.is_remote:
+        raise JournalError("سند چندسطری فقط روی دفتر محلی ثبت می‌شود")
+    lines = balance_lines(lines)
+    unknown = [line.account_id for line in lines if db.get_account_by_id(line.account_id) is None]
+    if unknown:
+        raise JournalError(f"حساب با شناسه {', '.join(map(str, unknown))} وجود ندارد")
+    
+    number = number or f"JE{Transaction.generate_number()[2:]}"
+    when = datetime(day.year, day.month, day.day)
+    transactions = []
+    for index, (debit, credit, amount) in enumerate(split_legs(lines), 1):
+        transaction = Transaction(when, description, amount, type, debit, credit)
+        transaction.number = f"{number}/{index}"
+        transactions.append(transaction)
+    
+    entry_id = None
+    
+    def insert_header(conn):
+        nonlocal entry_id
+        entry_id = conn.execute(
+            "INSERT INTO journal_entries (number, date, description, type) VALUES (?, ?, ?, ?)",
+            (number, day.isoformat(), description, type)
+        ).lastrowid
+        for transaction in transactions:
+            transaction.entry_id = entry_id
+    
+    db.writer.call(db.post_transactions, transactions, insert_header).result()
+    return JournalEntry(entry_id, number, day, description, type, lines, transactions)
+
+
+def get_entry(db: 'DatabaseManager', entry_id: int) -> Optional[JournalEntry]:
+    """سند با سطرهای خالص هر حساب و ردیف‌هایش (از دوره باز یا بایگانی)"""
+    header = db.cached_query(
+        "SELECT id, number, date, description, type FROM journal_entries WHERE id = ?", (entry_id,)
+    )
+    if not header:
+        return None
+    entry_id, number, day, description, type_ = header[0]
+    lines = db.cached_query(
+        "SELECT account_id, SUM(amount) FROM postings WHERE entry_id = ? GROUP BY account_id "
+        "ORDER BY SUM(amount) < 0, account_id", (entry_id,)
+    )
+    rows = db.cached_query(
+        "SELECT * FROM ledger_transactions WHERE id IN "
+        "(SELECT transaction_id FROM postings WHERE entry_id = ?) ORDER BY id", (entry_id,)
+    )
+    return JournalEntry(
+        entry_id, number, date.fromisoformat(day), description or '', type_,
+        [EntryLine(account_id, Money(amount)) for account_id, amount in lines if amount],
+        [db.row_to_transaction(row) for row in rows]
+    )
+
+
+# ====================== صورتحساب حساب ======================
+
+def account_total(db: 'DatabaseManager', account_id: int, before: date = None, through: date = None) -> Money:
+    """بدهکار - بستانکار حساب در کل دفتر، قبل از before یا تا through (شامل)"""
+    if before is not None:
+        sql, params = "date < ?", (before.isoformat(),)
+    elif through is not None:
+        sql, params = "date <= ?", (through.isoformat(),)
+    else:
+        sql, params = "1", ()
+    return Money(db.cached_query(
+        f"SELECT COALESCE(SUM(amount), 0) FROM postings WHERE account_id = ? AND {sql}",
+        (account_id, *params)
+    )[0][0])
+
+
+@timed('journal.statement')
+def statement(db: 'DatabaseManager', account_id: int, start: date = None, end: date = None,
+              limit: int = 50, offset: int = 0) -> Statement:
+    """یک صفحه از گردش حساب در بازه [start, end] از جدیدترین، با مانده بعد از هر سطر"""
+    bounds = (account_id, start.isoformat() if start else '', end.isoformat() if end else '9999-12-31')
+    opening = account_total(db, account_id, before=start) if start else Money(0)
+    total, moved = db.cached_query(
+        "SELECT COUNT(*), COALESCE(SUM(amount), 0) FROM postings "
+        "WHERE account_id = ? AND date >= ? AND date <= ?", bounds
+    )[0]
+    closing = opening + Money(moved)
+    
+    balance = closing
+    if offset:
+        # سطرهای جدیدتر از این صفحه
+        balance -= Money(db.cached_query(
+            "SELECT COALESCE(SUM(amount), 0) FROM (SELECT amount FROM postings "
+            "WHERE account_id = ? AND date >= ? AND date <= ? "
+            "ORDER BY date DESC, transaction_id DESC, side DESC LIMIT ?)", bounds + (offset,)
+        )[0][0])
+    lines = []
+    for day, transaction_id, entry_id, number, description, amount in db.cached_query(
+        STATEMENT_SQL, bounds + (limit, offset)
+    ):
+        lines.append(StatementLine(date.fromisoformat(day), transaction_id, entry_id, number,
+                                   description or '', Money(amount), balance))
+        balance -= Money(amount)
+    return Statement(account_id, start, end, opening, closing, total, offset, lines)
@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+
+"""
+دفتر حساب‌ها - حساب‌ها، تراکنش‌ها و DatabaseManager (بدون وابستگی به Qt)
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+from .ai import SimpleAI
+from .cache import QueryCache
+from .events import AccountCreated, BalanceChanged, EventBus, PostingCreated
+from .instrument import connection_factory, timed
+from .integrity import create_integrity_tables
+from .money import Money
+from .periods import create_period_tables
+from .query import QueryEngine, create_indexes
+from .recurring import RecurringScheduler, create_recurring_tables
+from .search import ensure_index, register_functions
+from .writer import GroupCommitWriter
+
+
+# ====================== کلاس DatabaseManager ======================
+
+class Account:
+    def __init__(self, code: str, name: str, type: str, parent_id: int = None):
+        self.id = None
+        self.code = code
+        self.name = name
+        self.type = type
+        self.parent_id = parent_id
+        self.balance = Money(0)
+        self.is_active = True
+        self.created_at = datetime.now()
+
+
+class Transaction:
+    def __init__(self, date: datetime, description: str, amount: Money, 
+                 type: str, debit_account_id: int, credit_account_id: int):
+        self.id = None
+        self.number = self.generate_number()
+        self.date = date
+        self.description = description
+        self.amount = Money(amount)
+        self.type = type
+        self.debit_account_id = debit_account_id
+        self.credit_account_id = credit_account_id
+        self.is_verified = True
+        # سند چندسطری (imanaccounting/journal.py)؛ None برای تراکنش تک‌سطری
+        self.entry_id = None
+        self.created_at = datetime.now()
+    
+    _last_stamp = ''
+    _sequence = 0
+    # تراکنش‌ها در thread های مختلف ساخته می‌شوند (سرویس، recurring، رابط کاربری)
+    _number_lock = threading.Lock()
+    
+    @classmethod
+    def generate_number(cls) -> str:
+        # چند تراکنش در یک ثانیه (مثلاً هنگام import) شماره یکتای جدا می‌گیرند
+        with cls._number_lock:
+            stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+            if stamp == cls._last_stamp:
+                cls._sequence += 1
+                return f"TR{stamp}-{cls._sequence}"
+            cls._last_stamp, cls._sequence = stamp, 0
+            return f"TR{stamp}"
+
+
+ACCOUNTS_DDL = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        code TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        parent_id INTEGER,
+        balance INTEGER DEFAULT 0,
+        is_active INTEGER DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+TRANSACTIONS_DDL = '''
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        number TEXT UNIQUE NOT NULL,
+        date DATE NOT NULL,
+        description TEXT,
+        type TEXT NOT NULL,
+        amount INTEGER NOT NULL,
+        debit_account_id INTEGER NOT NULL,
+        credit_account_id INTEGER NOT NULL,
+        is_verified INTEGER DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        entry_id INTEGER,  -- journal_entries.id (imanaccounting/journal.py)
+        FOREIGN KEY (debit_account_id) REFERENCES accounts(id),
+        FOREIGN KEY (credit_account_id) REFERENCES accounts(id)
+    )
+'''
+
+
+def account_dict(acc: Account) -> dict:
+    return {'id': acc.id, 'code': acc.code, 'name': acc.name,
+            'type': acc.type, 'balance': int(acc.balance)}
+
+
+def transaction_dict(t: Transaction) -> dict:
+    return {'id': t.id, 'number': t.number, 'date': t.date.strftime('%Y-%m-%d'),
+            'description': t.description, 'type': t.type, 'amount': int(t.amount),
+            'debit_account_id': t.debit_account_id, 'credit_account_id': t.credit_account_id}
+
+
+def account_from_dict(data: dict) -> Account:
+    account = Account(data['code'], data['name'], data['type'], data.get('parent_id'))
+    account.id = data.get('id')
+    account.balance = Money(data.get('balance', 0))
+    return account
+
+
+def transaction_from_dict(data: dict) -> Transaction:
+    transaction = Transaction(
+        datetime.strptime(data['date'], '%Y-%m-%d'), data.get('description') or '',
+        data['amount'], data['type'], data['debit_account_id'], data['credit_account_id']
+    )
+    transaction.id = data.get('id')
+    if data.get('number'):
+        transaction.number = data['number']
+    return transaction
+
+
+INSERT_TRANSACTION_SQL = '''
+    INSERT INTO transactions
+    (number, date, description, type, amount, debit_account_id, credit_account_id, entry_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def transaction_params(transaction: Transaction) -> tuple:
+    return (
+        transaction.number,
+        transaction.date.strftime('%Y-%m-%d'),
+        transaction.description,
+        transaction.type,
+        transaction.amount,
+        transaction.debit_account_id,
+        transaction.credit_account_id,
+        transaction.entry_id,
+    )
+
+
+class DatabaseManager:
+    # RemoteLedger (imanaccounting/remote.py) اتصال SQLite محلی ندارد؛ کارهای
+    # مستقیم روی فایل (دوره مالی، پشتیبان، بررسی موجودی، ...) این را بررسی می‌کنند
+    is_remote = False
+    
+    def __init__(self, db_path: str = "iman_accounting.db", autoload: bool = True):
+        self.db_path = db_path
+        self.accounts = []
+        self.transactions = []
+        self.ai = SimpleAI()
+        self.events = EventBus()
+        # با هر نوشتن بالا می‌رود و جزء کلید کش است
+        self.revision = 0
+        self.cache = QueryCache()
+        self.query = QueryEngine(self)
+        # ثبت همزمان از چند thread با commit گروهی (db.writer.submit)
+        self.writer = GroupCommitWriter(self)
+        # تراکنش‌های تکراری (imanaccounting/recurring.py)
+        self.recurring = RecurringScheduler(self)
+        self.loaded = False
+        if autoload:
+            self.load()
+    
+    def load(self):
+        """ساخت جداول و بارگذاری داده‌ها (برای اجرا در پس‌زمینه)"""
+        self.init_database()
+        self.load_data()
+        self.loaded = True
+    
+    def close(self):
+        """پایان thread نویسنده و thread تحویل رویدادها بعد از کارهای صف شده"""
+        self.writer.close()
+        self.events.close()
+    
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path, factory=connection_factory())
+        register_functions(conn)
+        return conn
+    
+    @timed('ledger.init_database')
+    def init_database(self):
+        # سندهای چندسطری (و NamedTuple هایشان) فقط برای ساخت جداول لازم‌اند، نه هنگام import
+        from .journal import create_journal_tables
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(ACCOUNTS_DDL.format(name='accounts'))
+            cursor.execute(TRANSACTIONS_DDL.format(name='transactions'))
+            # تراکنش‌های دوره‌های مالی بسته (imanaccounting/periods.py)
+            cursor.execute(TRANSACTIONS_DDL.format(name='transactions_archive'))
+            
+            self.migrate_money_columns(conn)
+            ensure_index(conn)
+            create_indexes(conn)
+            create_period_tables(conn)
+            create_journal_tables(conn)
+            create_integrity_tables(conn)
+            create_recurring_tables(conn)
+            
+            cursor.execute("SELECT COUNT(*) FROM accounts")
+            count = cursor.fetchone()[0]
+            
+            if count == 0:
+                default_accounts = [
+                    ('1001', 'وجه نقد', 'asset'),
+                    ('1002', 'بانک', 'asset'),
+                    ('1101', 'حساب‌های دریافتنی', 'asset'),
+                    ('2001', 'حساب‌های پرداختنی', 'liability'),
+                    ('3001', 'سرمایه', 'equity'),
+                    ('4001', 'فروش', 'revenue'),
+                    ('5001', 'هزینه‌ها', 'expense'),
+                ]
+                
+                for code, name, type_ in default_accounts:
+                    cursor.execute('''
+                        INSERT INTO accounts (code, name, type)
+                        VALUES (?, ?, ?)
+                    ''', (code, name, type_))
+                
+                conn.commit()
+    
+    def migrate_money_columns(self, conn):
+        """تبدیل ستون‌های REAL قدیمی (balance و amount) به ریال صحیح"""
+        cursor = conn.cursor()
+        migrations = [
+            ('accounts', 'balance', ACCOUNTS_DDL),
+            ('transactions', 'amount', TRANSACTIONS_DDL),
+        ]
+        
+        for table, column, ddl in migrations:
+            columns = cursor.execute(f"PRAGMA table_info({table})").fetchall()
+            names = [col[1] for col in columns]
+            types = {col[1]: (col[2] or '').upper() for col in columns}
+            if types.get(column) != 'REAL':
+                continue
+            
+            # SQLite نوع ستون را با ALTER تغییر نمی‌دهد؛ جدول بازسازی می‌شود
+            select = ', '.join(
+                f"CAST(ROUND(COALESCE({name}, 0)) AS INTEGER)" if name == column else name
+                for name in names
+            )
+            cursor.execute(ddl.format(name=f"{table}_new"))
+            cursor.execute(
+                f"INSERT INTO {table}_new ({', '.join(names)}) SELECT {select} FROM {table}"
+            )
+            cursor.execute(f"DROP TABLE {table}")
+            cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+        
+        conn.commit()
+    
+    @timed('ledger.load_data')
+    def load_data(self):
+        try:
+            accounts_data = self.execute_query("SELECT * FROM accounts WHERE is_active = 1 ORDER BY code")
+            
+            for acc in accounts_data:
+                account = Account(acc[1], acc[2], acc[3])
+                account.id = acc[0]
+                account.balance = Money(acc[5] or 0)
+                account.parent_id = acc[4]
+                self.accounts.append(account)
+            
+            trans_data = self.execute_query(
+                "SELECT * FROM transactions ORDER BY date DESC LIMIT 100"
+            )
+            
+            for trans in trans_data:
+                self.transactions.append(self.row_to_transaction(trans))
+            
+        except Exception as e:
+            print(f"خطا در بارگذاری: {e}")
+        self.bump_revision()
+    
+    def reload(self):
+        """بارگذاری دوباره از پایگاه داده (مثلاً بعد از بازیابی فایل پشتیبان)"""
+        self.init_database()
+        self.accounts = []
+        self.transactions = []
+        self.recurring.invalidate()
+        self.load_data()
+    
+    @staticmethod
+    def row_to_transaction(row) -> Transaction:
+        """ساخت Transaction از یک ردیف SELECT * FROM transactions"""
+        transaction = Transaction(
+            datetime.strptime(row[2], '%Y-%m-%d'), row[3] or '', row[5], row[4],
+            row[6], row[7]
+        )
+        transaction.id = row[0]
+        transaction.number = row[1]
+        transaction.is_verified = bool(row[8])
+        transaction.entry_id = row[10] if len(row) > 10 else None
+        return transaction
+    
+    def execute_query(self, query: str, params: tuple = ()):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchall()
+    
+    def execute_insert(self, query: str, params: tuple = ()):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            conn.commit()
+        self.bump_revision()
+        return cursor.lastrowid
+    
+    def execute_update(self, query: str, params: tuple = ()):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            conn.commit()
+        self.bump_revision()
+        return cursor.rowcount
+    
+    # ====================== کش خواندن‌ها ======================
+    
+    def bump_revision(self):
+        """اعلام تغییر داده؛ همه نوشتن‌های DatabaseManager این را صدا می‌زنند"""
+        self.revision += 1
+    
+    def cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """نتیجه compute برای key تا نوشتن بعدی (نتیجه نباید تغییر داده شود)"""
+        return self.cache.get((key, self.revision), compute)
+    
+    def cached_query(self, query: str, params: tuple = ()) -> tuple:
+        """execute_query با کش؛ ردیف‌ها به صورت tuple تغییرناپذیر برمی‌گردند"""
+        return self.cached(('query', query, params), lambda: tuple(self.execute_query(query, params)))
+    
+    def get_all_accounts(self) -> List[Account]:
+        if len(self.accounts) == 0:
+            self.load_data()
+        return self.accounts
+    
+    def get_account_by_id(self, account_id: int) -> Optional[Account]:
+        for acc in self.accounts:
+            if acc.id == account_id:
+                return acc
+        return None
+    
+    def add_account(self, account: Account) -> bool:
+        try:
+            account_id = self.execute_insert('''
+                INSERT INTO accounts (code, name, type, parent_id)
+                VALUES (?, ?, ?, ?)
+            ''', (account.code, account.name, account.type, account.parent_id))
+            
+            account.id = account_id
+            self.accounts.append(account)
+            self.events.publish(AccountCreated(account))
+            return True
+        except:
+            return False
+    
+    def update_account_balance(self, account_id: int, amount: Money):
+        amount = Money(amount)
+        for acc in self.accounts:
+            if acc.id == account_id:
+                acc.balance += amount
+                self.execute_update(
+                    "UPDATE accounts SET balance = balance + ? WHERE id = ?",
+                    (amount, account_id)
+                )
+                self.events.publish(BalanceChanged(account_id, amount, acc.balance))
+                break
+    
+    @timed('ledger.add_transaction')
+    def add_transaction(self, transaction: Transaction) -> bool:
+        # ثبت و موجودی دو حساب در یک commit، تا accounts.balance از دفتر جدا نیفتد
+        try:
+            self.post_transactions([transaction])
+            return True
+        except Exception as e:
+            print(f"خطا: {e}")
+            return False
+    
+    def add_transactions(self, transactions: List[Transaction]) -> int:
+        """ثبت چند تراکنش با یک تحویل رویداد؛ تعداد ثبت‌های موفق را برمی‌گرداند"""
+        with self.events.batch():
+            return sum(self.add_transaction(t) for t in transactions)
+    
+    @timed('ledger.post_transactions')
+    def post_transactions(self, transactions: List[Transaction],
+                          prepare: Callable[[sqlite3.Connection], None] = None) -> int:
+        """ثبت دسته‌ای در یک تراکنش پایگاه داده (برای import)؛ همه ثبت می‌شوند یا هیچ‌کدام
+        
+        برخلاف add_transactions یک بار commit می‌شود و موجودی هر حساب با یک
+        UPDATE جمع‌شده به‌روز می‌شود. prepare نوشتن‌های وابسته (مثلاً پیشروی
+        الگوهای تکرار یا سرآیند سند چندسطری) را در همان تراکنش و پیش از درج
+        ردیف‌ها انجام می‌دهد. خطا به فراخواننده می‌رسد.
+        """
+        deltas = {}
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if prepare is not None:
+                prepare(conn)
+            for transaction in transactions:
+                cursor.execute(INSERT_TRANSACTION_SQL, transaction_params(transaction))
+                transaction.id = cursor.lastrowid
+                for account_id, amount in ((transaction.debit_account_id, transaction.amount),
+                                           (transaction.credit_account_id, -transaction.amount)):
+                    deltas[account_id] = deltas.get(account_id, Money(0)) + amount
+            cursor.executemany(
+                "UPDATE accounts SET balance = balance + ? WHERE id = ?",
+                [(amount, account_id) for account_id, amount in deltas.items()]
+            )
+            conn.commit()
+        
+        # رویدادهای batch پس از بلوک تحویل می‌شوند؛ revision بعد از به‌روز شدن حافظه
+        # عوض می‌شود تا خواندن همزمان، لیست و موجودی کهنه را با revision تازه کش نکند
+        with self.events.batch():
+            self.transactions[:0] = reversed(transactions)
+            for account_id, amount in deltas.items():
+                account = self.get_account_by_id(account_id)
+                if account is not None:
+                    account.balance += amount
+                    self.events.publish(BalanceChanged(account_id, amount, account.balance))
+            for transaction in transactions:
+                self.events.publish(PostingCreated(transaction))
+            self.bump_revision()
+        return len(transactions)
+    
+    def get_all_transactions(self, limit: int = 100) -> List[Transaction]:
+        # کپی از لیست کش شده، چون فراخواننده‌ها لیست را تغییر می‌دهند
+        return list(self.cached(
+            ('transactions', limit),
+            lambda: sorted(self.transactions, key=lambda x: x.date, reverse=True)[:limit]
+        ))
+    
+    def get_total_balance(self) -> Money:
+        return Money.sum(acc.balance for acc in self.accounts if acc.type == 'asset')
+    
+    def get_today_income_expense(self) -> Tuple[Money, Money]:
+        today = datetime.now().date()
+        return self.cached(('today', today), lambda: self.income_expense_on(today))
+    
+    def income_expense_on(self, day) -> Tuple[Money, Money]:
+        income = Money(0)
+        expense = Money(0)
+        
+        for trans in self.transactions:
+            if trans.date.date() == day:
+                if trans.type == 'درآمد':
+                    income += trans.amount
+                elif trans.type == 'هزینه':
+                    expense += trans.amount
+        
+        return income, expense
+    
+    # ====================== قابلیت‌های هوش مصنوعی ======================
+    
+    def expenses(self) -> List[Money]:
+        """مبالغ هزینه‌های بارگذاری‌شده (کش شده تا نوشتن بعدی)"""
+        return self.cached(
+            'expenses', lambda: [t.amount for t in self.transactions if t.type == "هزینه"]
+        )
+    
+    def predict_next_expense(self):
+        """پیش‌بینی هزینه ماه آینده"""
+        return self.ai.predict_next(self.expenses())
+    
+    def detect_anomaly(self, transaction):
+        """تشخیص تراکنش مشکوک"""
+        bounds = self.cached('anomaly_bounds', lambda: self.ai.anomaly_bounds(self.expenses()))
+        return self.ai.is_anomaly(bounds, transaction.amount)
+    
+    def trend_analysis(self):
+        """تحلیل روند هزینه‌ها"""
+        return self.ai.trend_analysis(self.expenses())
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+"""
+مدیریت لایسنس (بدون وابستگی به Qt)
+
+توکن لایسنس معتبر در license.cache ذخیره می‌شود، همراه با mtime/اندازه
+فایل‌های لایسنس. در اجرای بعدی اگر فایل‌ها تغییر نکرده باشند فقط همین توکن
+(نه همه فایل‌ها) دوباره بررسی می‌شود: امضا و ادعاهایش، با شناسه سخت‌افزاری
+که همان لحظه محاسبه می‌شود. نوع، انقضا و شناسه سخت‌افزار لایسنس همیشه از
+توکن امضاشده خوانده می‌شوند، نه از خود کش، پس کش دست‌ساز یا کپی‌شده از
+کامپیوتر دیگر لایسنس نمی‌سازد.
+
+کلید لایسنس یک توکن امضاشده با Ed25519 است (قالب در license_token.py)؛
+برنامه فقط کلید عمومی را دارد و نمی‌تواند لایسنس بسازد.
+"""
+
+import os
+import json
+import hashlib
+from datetime import datetime
+from enum import Enum
+from typing import Optional, Tuple
+
+from ._lazy import lazy_import
+from .license_token import LicenseClaims, TokenVerifier
+
+# فقط هنگام محاسبه شناسه سخت‌افزار لازم هستند
+platform = lazy_import('platform')
+socket = lazy_import('socket')
+uuid = lazy_import('uuid')
+
+
+# کلید عمومی Ed25519 امضای لایسنس‌ها؛ کلید خصوصی فقط نزد ابزار tools/license_keygen.py است
+LICENSE_PUBLIC_KEY = bytes.fromhex(
+    "476cd5323e2a6ce2365d1b7621920ac7545f58496b138c81ecc52404dbc759ad"
+)
+VERIFIER = TokenVerifier(LICENSE_PUBLIC_KEY)
+CACHE_VERSION = 2
+
+
+# ====================== کلاس LicenseManager ======================
+
+class LicenseType(Enum):
+    FREE = "رایگان"
+    TRIAL = "آزمایشی"
+    PRO = "حرفه‌ای"
+    ADMIN = "ادمین"
+    SCHOOL = "مدرسه"
+
+
+LICENSE_MESSAGES = {
+    LicenseType.FREE: "لایسنس فعال شد",
+    LicenseType.TRIAL: "لایسنس آزمایشی فعال شد",
+    LicenseType.PRO: "لایسنس حرفه‌ای فعال شد",
+    LicenseType.ADMIN: "لایسنس ادمین فعال شد",
+    LicenseType.SCHOOL: "لایسنس مدرسه فعال شد",
+}
+INVALID_MESSAGE = "لایسنس نامعتبر یا دستکاری شده"
+
+
+class LicenseManager:
+    """مدیریت لایسنس"""
+    
+    def __init__(self, autoload: bool = True):
+        self.license_type = LicenseType.FREE
+        self.license_key = None
+        self.license_data = None
+        self.expiry_date = None
+        self.is_admin = False
+        self.is_school = False
+        self.hardware_id = None
+        self.license_file = "license.lic"
+        self.admin_file = "admin.lic"
+        self.school_file = "school.lic"
+        self.pro_file = "pro.lic"
+        self.trial_file = "trial.lic"
+        self.cache_file = "license.cache"
+        self.from_cache = False
+        self.loaded = False
+        if autoload:
+            self.load()
+    
+    def load(self):
+        """بررسی لایسنس؛ از کش اگر معتبر باشد، وگرنه مسیر کامل (برای اجرا در پس‌زمینه)"""
+        self.hardware_id = self.get_hardware_id()
+        self.from_cache = self.load_cache()
+        if not self.from_cache:
+            self.load_license()
+            self.save_cache()
+        self.loaded = True
+    
+    # ====================== کش لایسنس ======================
+    
+    def license_files(self) -> list:
+        return [self.school_file, self.admin_file, self.pro_file, self.trial_file, self.license_file]
+    
+    def fingerprint(self) -> dict:
+        """mtime و اندازه فایل‌های لایسنس موجود"""
+        files = {}
+        for filename in self.license_files():
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            files[filename] = [stat.st_mtime_ns, stat.st_size]
+        return files
+    
+    def load_cache(self) -> bool:
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            payload = cache['payload']
+            if cache.get('version') != CACHE_VERSION:
+                return False
+            if payload['files'] != self.fingerprint():
+                return False
+            license_key = payload['key']
+            license_type, expiry = LicenseType.FREE, None
+            if license_key is not None:
+                # فقط توکن امضاشده مورد اعتماد است؛ نوع، انقضا و شناسه سخت‌افزار از
+                # ادعاهای آن، در برابر self.hardware_id که load همین حالا محاسبه کرده
+                claims = VERIFIER.verify(license_key)
+                valid, _, license_type = self.check_claims(claims)
+                if not valid:
+                    return False
+                expiry = claims.expiry
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        
+        self.apply(license_type, license_key, expiry)
+        print(f"✅ لایسنس {license_type.value} (از کش)")
+        return True
+    
+    def save_cache(self):
+        payload = {
+            'files': self.fingerprint(),
+            'key': self.license_key,
+        }
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'payload': payload}, f, ensure_ascii=False)
+        except OSError:
+            pass
+    
+    def apply(self, license_type: LicenseType, license_key: str = None,
+              expiry: Optional[datetime] = None):
+        """اعمال نتیجه بررسی لایسنس روی وضعیت برنامه"""
+        self.license_type = license_type
+        self.license_key = license_key
+        self.expiry_date = expiry
+        self.is_admin = license_type == LicenseType.ADMIN
+        self.is_school = license_type == LicenseType.SCHOOL
+    
+    def get_hardware_id(self) -> str:
+        try:
+            mac = uuid.getnode()
+            hostname = socket.gethostname()
+            processor = platform.processor()
+            hw_string = f"{mac}-{hostname}-{processor}"
+            return hashlib.sha256(hw_string.encode()).hexdigest()[:32]
+        except:
+            return hashlib.sha256(str(uuid.uuid4()).encode()).hexdigest()[:32]
+    
+    def validate_license(self, license_key: str) -> Tuple[bool, str, LicenseType]:
+        """بررسی امضا و ادعاهای توکن بدون تغییر وضعیت LicenseManager"""
+        try:
+            claims = VERIFIER.verify(license_key)
+        except Exception:
+            return False, INVALID_MESSAGE, LicenseType.FREE
+        return self.check_claims(claims)
+    
+    def check_claims(self, claims: LicenseClaims) -> Tuple[bool, str, LicenseType]:
+        if claims.hwid != self.hardware_id:
+            return False, "این لایسنس برای این کامپیوتر نیست", LicenseType.FREE
+        if claims.expiry is not None and claims.expiry < datetime.now():
+            return False, "لایسنس منقضی شده", LicenseType.FREE
+        license_type = LicenseType[claims.type]
+        return True, LICENSE_MESSAGES[license_type], license_type
+    
+    def load_license(self):
+        """بررسی دسته‌ای همه فایل‌های لایسنس موجود؛ اولین معتبر به ترتیب اولویت اعمال می‌شود"""
+        keys = []
+        for filename in self.license_files():
+            try:
+                with open(filename, 'r') as f:
+                    keys.append(f.read().strip())
+            except OSError:
+                continue
+        
+        for license_key, claims in zip(keys, VERIFIER.verify_many(keys)):
+            if claims is None:
+                continue
+            valid, msg, ltype = self.check_claims(claims)
+            if valid:
+                self.apply(ltype, license_key, claims.expiry)
+                print(f"✅ {msg}")
+                return
+        
+        print("ℹ️ نسخه رایگان فعال شد")
+        self.apply(LicenseType.FREE)
+    
+    def activate(self, license_key: str) -> Tuple[bool, str]:
+        """بررسی، ذخیره و اعمال کلید وارد شده توسط کاربر"""
+        license_key = ''.join(license_key.split())
+        try:
+            claims = VERIFIER.verify(license_key)
+        except Exception:
+            return False, INVALID_MESSAGE
+        valid, msg, ltype = self.check_claims(claims)
+        if valid:
+            self.save_license(license_key, ltype)
+            self.apply(ltype, license_key, claims.expiry)
+            self.save_cache()
+        return valid, msg
+    
+    def save_license(self, license_key: str, license_type: LicenseType):
+        if license_type == LicenseType.ADMIN:
+            filename = self.admin_file
+        elif license_type == LicenseType.SCHOOL:
+            filename = self.school_file
+        elif license_type == LicenseType.PRO:
+            filename = self.pro_file
+        elif license_type == LicenseType.TRIAL:
+            filename = self.trial_file
+        else:
+            filename = self.license_file
+        
+        try:
+            with open(filename, 'w') as f:
+                f.write(license_key)
+            return True
+        except:
+            return False
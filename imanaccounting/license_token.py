@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+قالب توکن لایسنس امضاشده با Ed25519 (بدون وابستگی به Qt)
+
+توکن = "IMAN-" + base64url(داده ۳۰ بایتی + امضای ۶۴ بایتی)
+
+داده به ترتیب: نسخه، نوع، سریال تصادفی، زمان صدور، زمان انقضا (۰ = بدون
+انقضا) و ۱۶ بایت شناسه سخت‌افزار. برنامه فقط کلید عمومی را دارد؛ ساخت و
+امضای توکن در ابزار جدای tools/license_keygen.py با کلید خصوصی انجام می‌شود.
+"""
+
+import struct
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Sequence
+
+from ._lazy import lazy_import
+
+# فقط هنگام بررسی توکن لازم هستند (import امضا چند ده میلی‌ثانیه طول می‌کشد)
+base64 = lazy_import('base64')
+eddsa = lazy_import('Crypto.Signature.eddsa')
+
+TOKEN_PREFIX = "IMAN-"
+TOKEN_VERSION = 1
+TOKEN_STRUCT = struct.Struct('>BB4sII16s')
+SIGNATURE_SIZE = 64
+
+# کد یک بایتی هر نوع لایسنس (نام‌ها همان اعضای LicenseType هستند)
+TYPE_CODES = {'FREE': 0, 'TRIAL': 1, 'PRO': 2, 'ADMIN': 3, 'SCHOOL': 4}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+
+
+class LicenseClaims(NamedTuple):
+    type: str
+    serial: bytes
+    issued: datetime
+    expiry: Optional[datetime]
+    hwid: str
+
+
+def pack_claims(claims: LicenseClaims) -> bytes:
+    return TOKEN_STRUCT.pack(
+        TOKEN_VERSION,
+        TYPE_CODES[claims.type],
+        claims.serial,
+        int(claims.issued.timestamp()),
+        int(claims.expiry.timestamp()) if claims.expiry else 0,
+        bytes.fromhex(claims.hwid),
+    )
+
+
+def unpack_claims(payload: bytes) -> LicenseClaims:
+    version, type_code, serial, issued, expiry, hwid = TOKEN_STRUCT.unpack(payload)
+    if version != TOKEN_VERSION or type_code not in TYPE_NAMES:
+        raise ValueError("نسخه یا نوع توکن ناشناخته است")
+    return LicenseClaims(
+        TYPE_NAMES[type_code],
+        serial,
+        datetime.fromtimestamp(issued),
+        datetime.fromtimestamp(expiry) if expiry else None,
+        hwid.hex(),
+    )
+
+
+def encode_token(payload: bytes, signature: bytes) -> str:
+    return TOKEN_PREFIX + base64.urlsafe_b64encode(payload + signature).decode().rstrip('=')
+
+
+def split_token(token: str):
+    """جدا کردن داده و امضا؛ برای توکن بدشکل ValueError"""
+    token = ''.join(token.split())
+    if not token.startswith(TOKEN_PREFIX):
+        raise ValueError("فرمت لایسنس نامعتبر")
+    body = token[len(TOKEN_PREFIX):]
+    raw = base64.urlsafe_b64decode(body + '=' * (-len(body) % 4))
+    if len(raw) != TOKEN_STRUCT.size + SIGNATURE_SIZE:
+        raise ValueError("طول لایسنس نامعتبر")
+    return raw[:TOKEN_STRUCT.size], raw[TOKEN_STRUCT.size:]
+
+
+class TokenVerifier:
+    """بررسی امضای توکن‌ها با یک کلید عمومی Ed25519 (۳۲ بایت خام)
+    
+    کلید عمومی یک بار تجزیه می‌شود و برای همه توکن‌ها استفاده می‌شود.
+    """
+    
+    def __init__(self, public_key: bytes):
+        self.public_key = public_key
+        self._verifier = None
+    
+    @property
+    def verifier(self):
+        if self._verifier is None:
+            key = eddsa.import_public_key(self.public_key)
+            self._verifier = eddsa.new(key, 'rfc8032')
+        return self._verifier
+    
+    def verify(self, token: str) -> LicenseClaims:
+        """ادعاهای توکن اگر امضا معتبر باشد؛ وگرنه ValueError"""
+        payload, signature = split_token(token)
+        self.verifier.verify(payload, signature)
+        return unpack_claims(payload)
+    
+    def verify_many(self, tokens: Sequence[str]) -> List[Optional[LicenseClaims]]:
+        """بررسی دسته‌ای؛ برای هر توکن نامعتبر None (توکن‌های تکراری یک بار بررسی می‌شوند)"""
+        seen = {}
+        results = []
+        for token in tokens:
+            if token not in seen:
+                try:
+                    seen[token] = self.verify(token)
+                except (ValueError, TypeError, struct.error):
+                    seen[token] = None
+            results.append(seen[token])
+        return results
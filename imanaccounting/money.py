@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+مبالغ پولی به صورت ریال صحیح
+"""
+
+import math
+
+
+# ====================== کلاس Money ======================
+
+class Money(int):
+    """مبلغ پولی به صورت عدد صحیح ریال (۶۴ بیتی)
+
+    جمع و تفریق دقیق است و مستقیماً به ستون INTEGER در SQLite نگاشت می‌شود.
+    """
+    
+    __slots__ = ()
+    
+    MIN = -(2 ** 63)
+    MAX = 2 ** 63 - 1
+    
+    def __new__(cls, value=0):
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                raise ValueError("مبلغ نامعتبر")
+            value = math.floor(value + 0.5)
+        elif isinstance(value, str):
+            value = Money.parse(value)
+        rials = int(value)
+        if not cls.MIN <= rials <= cls.MAX:
+            raise OverflowError("مبلغ خارج از محدوده ۶۴ بیتی")
+        return super().__new__(cls, rials)
+    
+    @staticmethod
+    def parse(text: str) -> int:
+        """تبدیل متن (با جداکننده هزارگان یا ارقام فارسی) به ریال"""
+        text = text.strip().translate(_MONEY_DIGITS)
+        if '.' in text:
+            return math.floor(float(text) + 0.5)
+        return int(text)
+    
+    @classmethod
+    def sum(cls, values) -> 'Money':
+        return cls(sum(int(v) for v in values))
+    
+    def __add__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) + int(other))
+        return NotImplemented
+    
+    __radd__ = __add__
+    
+    def __sub__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) - int(other))
+        return NotImplemented
+    
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return Money(int(other) - int(self))
+        return NotImplemented
+    
+    def __mul__(self, other):
+        if isinstance(other, int):
+            return Money(int(self) * int(other))
+        if isinstance(other, float):
+            return Money(int(self) * other)
+        return NotImplemented
+    
+    __rmul__ = __mul__
+    
+    def __neg__(self):
+        return Money(-int(self))
+    
+    def __pos__(self):
+        return self
+    
+    def __abs__(self):
+        return Money(abs(int(self)))
+    
+    def __format__(self, spec):
+        # قالب‌هایی مثل ",.0f" بدون تبدیل به float (و از دست رفتن دقت) اعمال می‌شوند
+        if spec.endswith('.0f'):
+            spec = spec[:-3] + 'd'
+        return int.__format__(self, spec)
+    
+    def __repr__(self):
+        return f"Money({int(self)})"
+
+
+_MONEY_DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩", "01234567890123456789", ",،٬ ")
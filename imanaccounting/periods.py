@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+
+"""
+بستن دوره مالی و بایگانی تراکنش‌های دوره‌های بسته (بدون وابستگی به Qt)
+
+close_period(db, end) دوره را از پایان دوره قبلی تا end (شامل خود روز) می‌بندد:
+1. ردیف fiscal_periods و مانده پایان دوره هر حساب در period_balances (مانده
+   دوره قبل + گردش بدهکار - گردش بستانکار) در یک تراکنش ثبت می‌شوند. از همین
+   لحظه trigger ها ثبت تراکنش یا تغییر تاریخ آن به داخل دوره بسته را رد
+   می‌کنند (IntegrityError).
+2. تراکنش‌های دوره در دسته‌های CLOSE_BATCH تایی از transactions به
+   transactions_archive (با همان ستون‌ها) منتقل می‌شوند. هر دسته یک کار جدا
+   در thread نویسنده دفتر (db.writer) است، پس ثبت کاربران بین دسته‌ها ادامه
+   می‌یابد. اگر انتقال نیمه‌کاره بماند close_period بعدی یا archive_closed آن
+   را تمام می‌کند.
+
+پس از آن transactions و نمایه‌هایش و نمایه جستجو فقط دوره باز را دارند و
+عملیات روزمره با بزرگ شدن بایگانی کند نمی‌شوند. accounts.balance، جدول rollup
+و postings همچنان کل دفتر را دارند. نمای ledger_transactions (بایگانی UNION
+ALL دوره باز) برای گزارش‌های تاریخی است: QueryEngine فیلترهایی را که بازه
+تاریخشان به دوره‌ای بسته می‌رسد (از جمله فیلترهای بدون تاریخ شروع) روی این نما
+اجرا می‌کند و تسهیم سود و خروجی خط فرمان هم بایگانی را می‌خوانند. جستجوی متنی
+فقط دوره باز را می‌گردد.
+
+reopen_period آخرین دوره بسته را باز می‌کند و تراکنش‌هایش را برمی‌گرداند.
+"""
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+from .instrument import timed
+from .money import Money
+
+if TYPE_CHECKING:
+    from .ledger import DatabaseManager
+
+CLOSE_BATCH = 5000
+
+PERIODS_DDL = '''
+    CREATE TABLE IF NOT EXISTS fiscal_periods (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        start_date DATE,  -- NULL: از ابتدای دفتر
+        end_date DATE NOT NULL UNIQUE,  -- شامل خود روز
+        transaction_count INTEGER NOT NULL,
+        closed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS period_balances (
+        period_id INTEGER NOT NULL,
+        account_id INTEGER NOT NULL,
+        debit_total INTEGER NOT NULL,
+        credit_total INTEGER NOT NULL,
+        closing_balance INTEGER NOT NULL,
+        PRIMARY KEY (period_id, account_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_archive_date ON transactions_archive(date);
+    DROP INDEX IF EXISTS idx_archive_debit_date;
+    DROP INDEX IF EXISTS idx_archive_credit_date;
+    CREATE INDEX IF NOT EXISTS idx_archive_debit_date_amount ON transactions_archive(debit_account_id, date, amount);
+    CREATE INDEX IF NOT EXISTS idx_archive_credit_date_amount ON transactions_archive(credit_account_id, date, amount);
+    CREATE VIEW IF NOT EXISTS ledger_transactions AS
+        SELECT * FROM transactions_archive UNION ALL SELECT * FROM transactions;
+    CREATE TRIGGER IF NOT EXISTS transactions_closed_insert BEFORE INSERT ON transactions
+    WHEN new.date <= (SELECT MAX(end_date) FROM fiscal_periods) BEGIN
+        SELECT RAISE(ABORT, 'دوره مالی این تاریخ بسته شده است');
+    END;
+    CREATE TRIGGER IF NOT EXISTS transactions_closed_update BEFORE UPDATE OF date ON transactions
+    WHEN new.date <= (SELECT MAX(end_date) FROM fiscal_periods) BEGIN
+        SELECT RAISE(ABORT, 'دوره مالی این تاریخ بسته شده است');
+    END;
+    -- ستون number فقط در هر جدول یکتاست؛ شماره‌های بایگانی هم دوباره ثبت نمی‌شوند
+    CREATE TRIGGER IF NOT EXISTS transactions_archived_number BEFORE INSERT ON transactions
+    WHEN EXISTS (SELECT 1 FROM transactions_archive WHERE number = new.number) BEGIN
+        SELECT RAISE(ABORT, 'UNIQUE constraint failed: transactions.number');
+    END;
+'''
+
+# گردش بدهکار/بستانکار هر حساب در بازه (start, end] روی مانده پایان دوره قبل
+CLOSING_BALANCES_SQL = '''
+    INSERT INTO period_balances (period_id, account_id, debit_total, credit_total, closing_balance)
+    SELECT :period, a.id, COALESCE(m.debit, 0), COALESCE(m.credit, 0),
+           COALESCE(p.closing_balance, 0) + COALESCE(m.debit, 0) - COALESCE(m.credit, 0)
+    FROM accounts a
+    LEFT JOIN (
+        SELECT account_id, SUM(debit) AS debit, SUM(credit) AS credit FROM (
+            SELECT debit_account_id AS account_id, amount AS debit, 0 AS credit
+            FROM transactions WHERE date > :start AND date <= :end
+            UNION ALL
+            SELECT credit_account_id, 0, amount
+            FROM transactions WHERE date > :start AND date <= :end
+        ) GROUP BY account_id
+    ) m ON m.account_id = a.id
+    LEFT JOIN period_balances p ON p.period_id = :previous AND p.account_id = a.id
+'''
+
+
+class PeriodError(Exception):
+    """بستن یا باز کردن دوره با این ورودی ممکن نیست"""
+
+
+class FiscalPeriod(NamedTuple):
+    id: int
+    start: Optional[date]
+    end: date
+    transaction_count: int
+    closed_at: str
+
+
+def create_period_tables(conn):
+    conn.executescript(PERIODS_DDL)
+    conn.commit()
+
+
+def _period(row) -> FiscalPeriod:
+    return FiscalPeriod(row[0], row[1] and date.fromisoformat(row[1]), date.fromisoformat(row[2]),
+                        row[3], row[4])
+
+
+def closed_periods(db: 'DatabaseManager') -> List[FiscalPeriod]:
+    """دوره‌های بسته، قدیمی‌ترین اول"""
+    return [_period(row) for row in db.cached_query(
+        "SELECT id, start_date, end_date, transaction_count, closed_at FROM fiscal_periods ORDER BY end_date"
+    )]
+
+
+def closed_through(db: 'DatabaseManager') -> Optional[str]:
+    """پایان آخرین دوره بسته ('YYYY-MM-DD') یا None"""
+    return db.cached_query("SELECT MAX(end_date) FROM fiscal_periods")[0][0]
+
+
+def closing_balances(db: 'DatabaseManager', period_id: int = None) -> Dict[int, Money]:
+    """مانده پایان دوره هر حساب (پیش‌فرض: آخرین دوره بسته)"""
+    if period_id is None:
+        periods = closed_periods(db)
+        if not periods:
+            return {}
+        period_id = periods[-1].id
+    rows = db.cached_query(
+        "SELECT account_id, closing_balance FROM period_balances WHERE period_id = ?", (period_id,)
+    )
+    return {account_id: Money(balance) for account_id, balance in rows}
+
+
+# ====================== بستن و باز کردن ======================
+
+@timed('periods.close')
+def close_period(db: 'DatabaseManager', end: date, batch: int = CLOSE_BATCH) -> FiscalPeriod:
+    """بستن دوره تا end (شامل) و انتقال تراکنش‌هایش به بایگانی"""
+    if db.is_remote:
+        raise PeriodError("دوره مالی فقط روی دفتر محلی بسته می‌شود")
+    if end >= date.today():
+        raise PeriodError("فقط روزهای گذشته را می‌توان بست")
+    archive_closed(db, batch)
+    period = db.writer.call(_freeze, db, end).result()
+    archive_closed(db, batch)
+    return period
+
+
+def _freeze(db: 'DatabaseManager', end: date) -> FiscalPeriod:
+    with db.get_connection() as conn:
+        previous = conn.execute(
+            "SELECT id, end_date FROM fiscal_periods ORDER BY end_date DESC LIMIT 1"
+        ).fetchone()
+        previous_id, previous_end = previous or (None, None)
+        if previous_end is not None and end.isoformat() <= previous_end:
+            raise PeriodError(f"دوره تا {previous_end} قبلاً بسته شده است")
+        start = previous_end and date.fromisoformat(previous_end) + timedelta(days=1)
+        
+        bounds = {'start': previous_end or '', 'end': end.isoformat()}
+        count = conn.execute(
+            "SELECT COUNT(*) FROM transactions WHERE date > :start AND date <= :end", bounds
+        ).fetchone()[0]
+        cursor = conn.execute(
+            "INSERT INTO fiscal_periods (start_date, end_date, transaction_count) VALUES (?, ?, ?)",
+            (start and start.isoformat(), end.isoformat(), count)
+        )
+        period_id = cursor.lastrowid
+        conn.execute(CLOSING_BALANCES_SQL, {**bounds, 'period': period_id, 'previous': previous_id})
+        conn.commit()
+        row = conn.execute(
+            "SELECT id, start_date, end_date, transaction_count, closed_at FROM fiscal_periods WHERE id = ?",
+            (period_id,)
+        ).fetchone()
+    db.bump_revision()
+    return _period(row)
+
+
+def archive_closed(db: 'DatabaseManager', batch: int = CLOSE_BATCH) -> int:
+    """انتقال تراکنش‌های باقی‌مانده دوره‌های بسته به بایگانی؛ تعداد منتقل شده"""
+    closed = closed_through(db)
+    if closed is None:
+        return 0
+    moved = 0
+    
+    def move() -> int:
+        count = _move_batch(db, 'transactions', 'transactions_archive', "date <= ?", (closed,), batch)
+        if not count and moved:
+            # در thread نویسنده و پیش از نسخه جدید، تا ثبت همزمان گم نشود و کشی
+            # با فهرست قدیمی به نسخه جدید نسبت داده نشود
+            db.transactions = [t for t in db.transactions if t.date.strftime('%Y-%m-%d') > closed]
+            db.bump_revision()
+        return count
+    
+    while True:
+        count = db.writer.call(move).result()
+        if not count:
+            break
+        moved += count
+    return moved
+
+
+@timed('periods.reopen')
+def reopen_period(db: 'DatabaseManager', batch: int = CLOSE_BATCH) -> FiscalPeriod:
+    """باز کردن آخرین دوره بسته و برگرداندن تراکنش‌هایش به دوره باز"""
+    if db.is_remote:
+        raise PeriodError("دوره مالی فقط روی دفتر محلی باز می‌شود")
+    periods = closed_periods(db)
+    if not periods:
+        raise PeriodError("دوره بسته‌ای وجود ندارد")
+    period = periods[-1]
+    
+    def unfreeze():
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM period_balances WHERE period_id = ?", (period.id,))
+            conn.execute("DELETE FROM fiscal_periods WHERE id = ?", (period.id,))
+            conn.commit()
+        db.bump_revision()
+    
+    db.writer.call(unfreeze).result()
+    start = period.start.isoformat() if period.start else ''
+    while db.writer.call(
+        _move_batch, db, 'transactions_archive', 'transactions', "date >= ?", (start,), batch
+    ).result():
+        pass
+    db.reload()
+    return period
+
+
+def _move_batch(db: 'DatabaseManager', source: str, target: str, where: str,
+                params: tuple, batch: int) -> int:
+    """انتقال حداکثر batch ردیف از source به target در یک تراکنش (در thread نویسنده)"""
+    with db.get_connection() as conn:
+        conn.execute(
+            f"CREATE TEMP TABLE moving AS SELECT * FROM {source} WHERE {where} ORDER BY date, id LIMIT ?",
+            (*params, batch)
+        )
+        try:
+            count = conn.execute("SELECT COUNT(*) FROM temp.moving").fetchone()[0]
+            if count:
+                # اول حذف، تا trigger شماره تکراری ردیف در حال انتقال را رد نکند
+                conn.execute(f"DELETE FROM {source} WHERE id IN (SELECT id FROM temp.moving)")
+                conn.execute(f"INSERT INTO {target} SELECT * FROM temp.moving")
+                conn.commit()
+        finally:
+            conn.rollback()
+            conn.execute("DROP TABLE temp.moving")
+    if count:
+        db.bump_revision()
+    return count
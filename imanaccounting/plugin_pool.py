@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+
+"""
+اجرای پلاگین‌ها در پروسه‌های جدا (حالت ایزوله)
+
+پلاگین‌ها در پروسه‌های یک ProcessPoolExecutor اجرا می‌شوند تا نتوانند حلقه
+رویداد رابط کاربری را قفل کنند یا برنامه را از کار بیندازند. هسته از طریق
+یک رابط RPC باریک (RemoteCoreProxy) در دسترس است که چند فراخوانی را در یک
+رفت‌وبرگشت می‌فرستد و داده‌های حجیم را به صورت بافر فشرده برمی‌گرداند.
+"""
+
+import os
+import threading
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .plugins import CoreProxy, PluginHost
+
+# متدهای مجاز هسته برای پروسه‌های پلاگین
+RPC_METHODS = frozenset({
+    'app_version', 'get_accounts', 'get_transactions', 'get_total_balance', 'get_amounts',
+    'distribute_profit',
+})
+
+
+# ====================== سمت برنامه اصلی ======================
+
+class CoreServer:
+    """سرویس‌دهنده RPC هسته برای پروسه‌های پلاگین (روی یک thread جدا)"""
+    
+    def __init__(self, core: CoreProxy):
+        self.core = core
+        self.authkey = os.urandom(16)
+        self.listener = Listener(authkey=self.authkey)
+        self.address = self.listener.address
+        self.closed = False
+        threading.Thread(target=self.serve, daemon=True).start()
+    
+    def serve(self):
+        while not self.closed:
+            try:
+                conn = self.listener.accept()
+            except OSError:
+                break
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+    
+    def handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    calls = conn.recv()
+                except (EOFError, OSError):
+                    return
+                conn.send([self.dispatch(name, args) for name, args in calls])
+    
+    def dispatch(self, name: str, args: tuple) -> Tuple[bool, Any]:
+        if name not in RPC_METHODS:
+            return False, f"متد {name} مجاز نیست"
+        try:
+            if name == 'app_version':
+                return True, self.core.app_version
+            if name == 'get_amounts':
+                return True, self.get_amounts(*args)
+            return True, getattr(self.core, name)(*args)
+        except Exception as e:
+            return False, str(e)
+    
+    def get_amounts(self, type_: Optional[str] = None) -> bytes:
+        """همه مبالغ (یا مبالغ یک نوع) به صورت آرایه int64 فشرده"""
+        amounts = array('q', (
+            int(t['amount']) for t in self.core.get_transactions(limit=None)
+            if type_ is None or t['type'] == type_
+        ))
+        return amounts.tobytes()
+    
+    def close(self):
+        self.closed = True
+        self.listener.close()
+
+
+class PluginProcessPool:
+    """مدیریت پروسه‌های پلاگین و اجرای موازی متدهای آن‌ها"""
+    
+    def __init__(self, host: PluginHost, processes: Optional[int] = None):
+        self.host = host
+        self.processes = processes or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.server = CoreServer(host.core)
+        self.executor = None
+    
+    def ensure_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            # spawn: پروسه فرزند از حالت Qt پروسه اصلی کپی نمی‌گیرد (و روی ویندوز تنها گزینه است)
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.server.address, self.server.authkey,
+                          self.host.plugins_dir, self.host.manifest)
+            )
+        return self.executor
+    
+    def submit(self, plugin: str, method: str, *args, **kwargs) -> Future:
+        try:
+            return self.ensure_executor().submit(_run_plugin_method, plugin, method, args, kwargs)
+        except BrokenProcessPool:
+            # یک پلاگین پروسه را از کار انداخته؛ استخر از نو ساخته می‌شود
+            self.executor = None
+            return self.ensure_executor().submit(_run_plugin_method, plugin, method, args, kwargs)
+    
+    def map(self, calls: Sequence[Tuple[str, str, tuple]]) -> List[Any]:
+        """اجرای موازی چند متد پلاگین؛ نتایج به همان ترتیب برمی‌گردند"""
+        futures = [self.submit(plugin, method, *args) for plugin, method, args in calls]
+        return [future.result() for future in futures]
+    
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.server.close()
+
+
+# ====================== سمت پروسه پلاگین ======================
+
+class RemoteCoreProxy:
+    """نسخه راه دور CoreProxy در پروسه پلاگین
+    
+    فراخوانی‌های داخل `with proxy.batch():` جمع شده و یکجا فرستاده می‌شوند؛
+    نتیجه هر کدام بعد از خروج از بلوک در future برگشتی قرار می‌گیرد.
+    """
+    
+    def __init__(self, address, authkey: bytes):
+        self.conn = Client(address, authkey=authkey)
+        self.pending = None
+    
+    def call_many(self, calls: List[Tuple[str, tuple]]) -> List[Any]:
+        self.conn.send(calls)
+        results = []
+        for ok, value in self.conn.recv():
+            if not ok:
+                raise RuntimeError(value)
+            results.append(value)
+        return results
+    
+    def call(self, name: str, *args):
+        if self.pending is not None:
+            future = Future()
+            self.pending.append((name, args, future))
+            return future
+        return self.call_many([(name, args)])[0]
+    
+    def batch(self):
+        return _Batch(self)
+    
+    @property
+    def app_version(self) -> str:
+        return self.call('app_version')
+    
+    def get_accounts(self) -> List[dict]:
+        return self.call('get_accounts')
+    
+    def get_transactions(self, limit: Optional[int] = 100) -> List[dict]:
+        return self.call('get_transactions', limit)
+    
+    def get_total_balance(self) -> int:
+        return self.call('get_total_balance')
+    
+    def distribute_profit(self, partners: List[dict], months: int = 1) -> List[dict]:
+        return self.call('distribute_profit', partners, months)
+    
+    def get_amounts(self, type_: Optional[str] = None) -> array:
+        result = self.call('get_amounts', type_)
+        if isinstance(result, Future):
+            return result
+        amounts = array('q')
+        amounts.frombytes(result)
+        return amounts
+
+
+class _Batch:
+    def __init__(self, proxy: RemoteCoreProxy):
+        self.proxy = proxy
+    
+    def __enter__(self):
+        self.proxy.pending = []
+        return self.proxy
+    
+    def __exit__(self, exc_type, exc, tb):
+        pending, self.proxy.pending = self.proxy.pending, None
+        if exc_type is not None or not pending:
+            return False
+        results = self.proxy.call_many([(name, args) for name, args, _ in pending])
+        for (name, _, future), value in zip(pending, results):
+            if name == 'get_amounts':
+                amounts = array('q')
+                amounts.frombytes(value)
+                value = amounts
+            future.set_result(value)
+        return False
+
+
+_worker_host: Optional[PluginHost] = None
+
+
+def _init_worker(address, authkey: bytes, plugins_dir: str, manifest: Dict[str, dict]):
+    global _worker_host
+    _worker_host = PluginHost(RemoteCoreProxy(address, authkey), plugins_dir=plugins_dir)
+    _worker_host.manifest = manifest
+
+
+def _run_plugin_method(plugin: str, method: str, args: tuple, kwargs: dict):
+    return _worker_host.call(plugin, method, *args, **kwargs)
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""
+میزبان پلاگین‌ها - کشف تنبل پلاگین‌های پوشه plugins/ (بدون وابستگی به Qt)
+
+متادیتای هر پلاگین (امضا، قابلیت‌ها، آیتم‌های منو و نوار ابزار) بدون اجرای
+کد و با تجزیه AST خوانده می‌شود و همراه با mtime و hash در یک manifest ذخیره
+می‌شود. ماژول پلاگین فقط در اولین فعال‌سازی (مثلاً با Ctrl+T) import می‌شود.
+"""
+
+import os
+import sys
+import ast
+import json
+import hashlib
+import importlib.util
+from typing import Any, Callable, Dict, List, Optional
+
+from .branding import APP_VERSION
+from .events import AccountCreated, BalanceChanged, PostingCreated
+from .ledger import DatabaseManager, account_dict, transaction_dict
+from . import profit_sharing
+
+PLUGIN_SIGNATURE = "IMAN_ACCOUNTING_PLUGIN_2024"
+MANIFEST_VERSION = 1
+
+# متدهایی که آیتم‌های رابط کاربری را برمی‌گردانند
+ITEM_METHODS = ('get_menu_items', 'get_toolbar_items', 'get_reports')
+INFO_FIELDS = ('name', 'version', 'author', 'description', 'capabilities')
+
+
+# ====================== کلاس CoreProxy ======================
+
+class CoreProxy:
+    """رابط محدود هسته برای پلاگین‌ها (فقط خواندنی)"""
+    
+    # نام رویدادها برای پلاگین‌ها و تبدیل هر رویداد به dict
+    EVENTS = {
+        'posting_created': (PostingCreated, lambda e: transaction_dict(e.transaction)),
+        'account_created': (AccountCreated, lambda e: account_dict(e.account)),
+        'balance_changed': (BalanceChanged, lambda e: {
+            'account_id': e.account_id, 'delta': int(e.delta), 'balance': int(e.balance)}),
+    }
+    
+    def __init__(self, db: DatabaseManager):
+        self._db = db
+        self._subscriptions = []
+    
+    @property
+    def app_version(self) -> str:
+        return APP_VERSION
+    
+    def get_accounts(self) -> List[dict]:
+        return [account_dict(acc) for acc in self._db.get_all_accounts()]
+    
+    def get_transactions(self, limit: int = 100) -> List[dict]:
+        return [transaction_dict(t) for t in self._db.get_all_transactions(limit)]
+    
+    def get_total_balance(self) -> int:
+        return int(self._db.get_total_balance())
+    
+    def distribute_profit(self, partners: List[dict], months: int = 1) -> List[dict]:
+        """تسهیم سود خالص months ماه آخر بین partners ([{'name', 'weight'}])"""
+        result = profit_sharing.distribute(
+            self._db,
+            [profit_sharing.Partner(p['name'], p['weight']) for p in partners],
+            profit_sharing.month_periods(months)
+        )
+        return [
+            {'period': d.period.label, 'start': d.period.start.strftime('%Y-%m-%d'),
+             'end': d.period.end.strftime('%Y-%m-%d'), 'profit': int(d.profit),
+             'shares': [{'name': s.name, 'percent': float(s.ratio * 100), 'share': int(s.share)}
+                        for s in d.shares]}
+            for d in result
+        ]
+    
+    def subscribe(self, event: str, callback: Callable[[List[dict]], None]):
+        """اشتراک در رویداد دفتر؛ callback در هر تحویل لیست رویدادها را می‌گیرد"""
+        event_type, convert = self.EVENTS[event]
+        handler = self._db.events.subscribe(
+            event_type, lambda events: callback([convert(e) for e in events])
+        )
+        self._subscriptions.append((event_type, handler))
+    
+    def rebind(self, db: DatabaseManager):
+        """انتقال پلاگین‌ها و اشتراک‌هایشان به دفتر دیگر (تعویض شرکت)"""
+        for event_type, handler in self._subscriptions:
+            self._db.events.unsubscribe(event_type, handler)
+            db.events.subscribe(event_type, handler)
+        self._db = db
+    
+    def unsubscribe_all(self):
+        for event_type, handler in self._subscriptions:
+            self._db.events.unsubscribe(event_type, handler)
+        self._subscriptions.clear()
+
+
+# ====================== تجزیه متادیتا ======================
+
+def _literal(node) -> Any:
+    """مقدار ثابت یک گره AST؛ ارجاع self.method به صورت {'method': نام} ذخیره می‌شود"""
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == 'self':
+        return {'method': node.attr}
+    if isinstance(node, ast.Dict):
+        return {
+            _literal(k): _literal(v) for k, v in zip(node.keys, node.values)
+            if isinstance(k, ast.Constant)
+        }
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return [_literal(item) for item in node.elts]
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        return None
+
+
+def parse_plugin_source(source: str) -> Optional[dict]:
+    """استخراج متادیتای پلاگین از کد بدون import؛ اگر پلاگین نباشد None"""
+    tree = ast.parse(source)
+    signature = None
+    plugin_class = None
+    
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id == 'PLUGIN_SIGNATURE':
+                    signature = _literal(node.value)
+        elif isinstance(node, ast.ClassDef) and plugin_class is None:
+            methods = {n.name for n in node.body if isinstance(n, ast.FunctionDef)}
+            if {'on_load', 'get_info'} <= methods:
+                plugin_class = node
+    
+    if signature != PLUGIN_SIGNATURE or plugin_class is None:
+        return None
+    
+    meta = {'class': plugin_class.name, 'signature': signature}
+    for func in plugin_class.body:
+        if not isinstance(func, ast.FunctionDef):
+            continue
+        if func.name == '__init__':
+            for node in ast.walk(func):
+                if isinstance(node, ast.Assign) and len(node.targets) == 1:
+                    target = node.targets[0]
+                    if (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                            and target.value.id == 'self' and target.attr in INFO_FIELDS):
+                        meta[target.attr] = _literal(node.value)
+        elif func.name in ITEM_METHODS:
+            for node in ast.walk(func):
+                if isinstance(node, ast.Return) and node.value is not None:
+                    value = _literal(node.value)
+                    meta[func.name[4:]] = value if isinstance(value, list) else []
+                    break
+    return meta
+
+
+# ====================== کلاس PluginHost ======================
+
+class PluginHost:
+    """کشف، کش و فعال‌سازی تنبل پلاگین‌ها"""
+    
+    def __init__(self, core: CoreProxy, plugins_dir: str = "plugins",
+                 manifest_file: str = "plugin_manifest.json"):
+        self.core = core
+        self.plugins_dir = plugins_dir
+        self.manifest_file = manifest_file
+        self.manifest: Dict[str, dict] = {}
+        self.instances: Dict[str, Any] = {}
+    
+    def load_manifest(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                return data.get('plugins', {})
+        except (OSError, ValueError):
+            pass
+        return {}
+    
+    def save_manifest(self):
+        try:
+            with open(self.manifest_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'plugins': self.manifest},
+                          f, ensure_ascii=False, indent=1)
+        except OSError:
+            pass
+    
+    def discover(self) -> Dict[str, dict]:
+        """اسکن پوشه پلاگین‌ها؛ فایل‌های تغییر نکرده فقط با یک stat بررسی می‌شوند"""
+        cached = self.load_manifest()
+        manifest = {}
+        changed = False
+        
+        try:
+            entries = sorted(os.scandir(self.plugins_dir), key=lambda e: e.name)
+        except OSError:
+            entries = []
+        
+        for entry in entries:
+            if not entry.name.endswith('.py') or entry.name.startswith('_'):
+                continue
+            stat = entry.stat()
+            key = entry.name[:-3]
+            meta = cached.get(key)
+            
+            if meta is None or meta['mtime_ns'] != stat.st_mtime_ns or meta['size'] != stat.st_size:
+                changed = True
+                with open(entry.path, 'rb') as f:
+                    source = f.read()
+                try:
+                    meta = parse_plugin_source(source.decode('utf-8'))
+                except (SyntaxError, UnicodeDecodeError) as e:
+                    print(f"⚠️ پلاگین {entry.name} قابل خواندن نیست: {e}")
+                    meta = None
+                if meta is None:
+                    continue
+                meta.update({
+                    'file': entry.name,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'sha256': hashlib.sha256(source).hexdigest(),
+                })
+            manifest[key] = meta
+        
+        self.manifest = manifest
+        if changed or set(manifest) != set(cached):
+            self.save_manifest()
+        return manifest
+    
+    def items(self, kind: str) -> List[dict]:
+        """آیتم‌های menu_items / toolbar_items / reports همه پلاگین‌ها از روی manifest"""
+        result = []
+        for key, meta in self.manifest.items():
+            for item in meta.get(kind, []):
+                callback = item.get('callback')
+                if isinstance(callback, dict) and 'method' in callback:
+                    result.append(dict(item, plugin=key, method=callback['method']))
+        return result
+    
+    def activate(self, key: str):
+        """import و راه‌اندازی پلاگین در اولین استفاده"""
+        instance = self.instances.get(key)
+        if instance is not None:
+            return instance
+        
+        meta = self.manifest[key]
+        path = os.path.join(self.plugins_dir, meta['file'])
+        spec = importlib.util.spec_from_file_location(f"iman_plugin_{key}", path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        
+        if getattr(module, 'PLUGIN_SIGNATURE', None) != PLUGIN_SIGNATURE:
+            raise ImportError(f"امضای پلاگین {key} نامعتبر است")
+        
+        instance = getattr(module, meta['class'])()
+        if instance.on_load(self.core) is False:
+            raise ImportError(f"پلاگین {key} بارگذاری نشد")
+        if hasattr(instance, 'on_enable'):
+            instance.on_enable()
+        
+        self.instances[key] = instance
+        return instance
+    
+    def call(self, key: str, method: str, *args, **kwargs):
+        return getattr(self.activate(key), method)(*args, **kwargs)
+    
+    def unload_all(self):
+        for instance in self.instances.values():
+            if hasattr(instance, 'on_disable'):
+                instance.on_disable()
+        self.instances.clear()
+        if hasattr(self.core, 'unsubscribe_all'):
+            self.core.unsubscribe_all()
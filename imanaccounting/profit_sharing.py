@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+موتور تسهیم سود و زیان (بدون وابستگی به Qt)
+
+سود خالص هر دوره با یک پرس‌وجوی تجمعی از حساب‌های درآمد و هزینه خوانده
+می‌شود و با وزن‌های کسری بین شرکا تقسیم می‌شود. گرد کردن به روش «بزرگ‌ترین
+باقیمانده» است تا جمع سهم‌ها دقیقاً برابر سود باشد.
+"""
+
+from datetime import date, timedelta
+from fractions import Fraction
+from typing import List, NamedTuple, Sequence, Union
+
+from .ledger import DatabaseManager
+from .money import Money
+
+Weight = Union[int, float, str, Fraction]
+
+# هر بستانکار شدن حساب درآمد/هزینه سود را زیاد و هر بدهکار شدن آن را کم می‌کند
+INCOME_TYPES = "('revenue', 'expense')"
+
+# دوره باز و بایگانی دوره‌های بسته جدا با نمایه تاریخ خوانده می‌شوند (join با
+# نمای ledger_transactions کل نما را می‌سازد)
+PERIOD_PROFIT_SQL = '''
+    WITH periods(idx, start, end) AS (VALUES {values}),
+    moves AS (
+        SELECT p.idx, t.amount, t.debit_account_id, t.credit_account_id
+        FROM periods p JOIN transactions t ON t.date >= p.start AND t.date < p.end
+        UNION ALL
+        SELECT p.idx, t.amount, t.debit_account_id, t.credit_account_id
+        FROM periods p JOIN transactions_archive t ON t.date >= p.start AND t.date < p.end
+    )
+    SELECT m.idx, COALESCE(SUM(
+        m.amount * ((c.type IN {types}) - (d.type IN {types}))
+    ), 0)
+    FROM moves m
+    LEFT JOIN accounts d ON d.id = m.debit_account_id
+    LEFT JOIN accounts c ON c.id = m.credit_account_id
+    GROUP BY m.idx
+'''
+
+
+class Period(NamedTuple):
+    label: str
+    start: date
+    end: date  # انحصاری
+
+
+class Partner(NamedTuple):
+    name: str
+    weight: Weight
+
+
+class Share(NamedTuple):
+    name: str
+    ratio: Fraction  # سهم از کل (جمع ratio ها = ۱)
+    share: Money
+
+
+class Distribution(NamedTuple):
+    period: Period
+    profit: Money
+    shares: List[Share]
+
+
+def to_fraction(weight: Weight) -> Fraction:
+    """وزن به کسر دقیق؛ اعشار float به شکل دهدهی خوانده می‌شود (۳۳.۳ نه 33.29999…)"""
+    if isinstance(weight, float):
+        return Fraction(str(weight))
+    return Fraction(weight)
+
+
+def allocate(total: int, weights: Sequence[Weight]) -> List[Money]:
+    """تقسیم total به نسبت وزن‌ها با گرد کردن بزرگ‌ترین باقیمانده
+    
+    جمع خروجی همیشه برابر total است؛ در تساوی باقیمانده‌ها شریک اول‌تر
+    ریال اضافه را می‌گیرد. زیان (total منفی) قرینه همان تقسیم است.
+    """
+    fractions = [to_fraction(w) for w in weights]
+    if any(w < 0 for w in fractions):
+        raise ValueError("وزن شریک نمی‌تواند منفی باشد")
+    weight_sum = sum(fractions)
+    if weight_sum == 0:
+        raise ValueError("مجموع وزن‌ها باید بیشتر از صفر باشد")
+    
+    sign = -1 if total < 0 else 1
+    total = abs(int(total))
+    quotas = [total * w / weight_sum for w in fractions]
+    shares = [q.numerator // q.denominator for q in quotas]
+    
+    remainder = total - sum(shares)
+    order = sorted(range(len(quotas)), key=lambda i: (-(quotas[i] - shares[i]), i))
+    for i in order[:remainder]:
+        shares[i] += 1
+    
+    return [Money(sign * s) for s in shares]
+
+
+def month_periods(count: int, until: date = None) -> List[Period]:
+    """count ماه آخر (شامل ماه جاری) به ترتیب زمانی"""
+    until = until or date.today()
+    periods = []
+    year, month = until.year, until.month
+    for _ in range(count):
+        start = date(year, month, 1)
+        end = (start + timedelta(days=32)).replace(day=1)
+        periods.append(Period(start.strftime('%Y/%m'), start, end))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return periods[::-1]
+
+
+def period_profits(db: DatabaseManager, periods: Sequence[Period]) -> List[Money]:
+    """سود خالص همه دوره‌ها با یک پرس‌وجو"""
+    if not periods:
+        return []
+    values = ', '.join('(?, ?, ?)' for _ in periods)
+    params = []
+    for i, period in enumerate(periods):
+        params += [i, period.start.strftime('%Y-%m-%d'), period.end.strftime('%Y-%m-%d')]
+    
+    rows = db.cached_query(
+        PERIOD_PROFIT_SQL.format(values=values, types=INCOME_TYPES), tuple(params)
+    )
+    profits = dict(rows)
+    return [Money(profits.get(i, 0)) for i in range(len(periods))]
+
+
+def distribute(db: DatabaseManager, partners: Sequence[Partner],
+               periods: Sequence[Period]) -> List[Distribution]:
+    """تسهیم سود همه دوره‌ها بین همه شرکا در یک اجرا"""
+    weights = [to_fraction(p.weight) for p in partners]
+    weight_sum = sum(weights)
+    result = []
+    for period, profit in zip(periods, period_profits(db, periods)):
+        amounts = allocate(profit, weights)
+        shares = [
+            Share(partner.name, weight / weight_sum, amount)
+            for partner, weight, amount in zip(partners, weights, amounts)
+        ]
+        result.append(Distribution(period, profit, shares))
+    return result
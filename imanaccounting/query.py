@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+
+"""
+فیلتر و شمارش چندوجهی (facet) تراکنش‌ها (بدون وابستگی به Qt)
+
+TransactionFilter یک مقدار تغییرناپذیر است که با متدهای of_type، for_account،
+amount_between، between، in_month و matching ساخته می‌شود و هر متد فیلتر
+جدیدی برمی‌گرداند. compile_filter آن را به شرط WHERE پارامتری تبدیل می‌کند که
+با نمایه‌های INDEXES_DDL اجرا می‌شود.
+
+شمارش هر وجه (نوع، حساب، ماه) بدون شرط همان وجه حساب می‌شود تا در رابط
+کاربری گزینه‌های دیگر همان وجه هم با تعدادشان دیده شوند. هر سه وجه با یک
+پرس‌وجوی تجمیعی گرفته و با کلید فیلتر در کش دفتر می‌مانند. جدول transaction_rollup
+(تعداد تراکنش به ازای ماه، نوع و دو حساب) با trigger به‌روز می‌ماند تا
+فیلترهای نوع/حساب/ماه کامل بدون پیمایش جدول transactions شمرده شوند.
+
+transactions فقط دوره مالی باز را دارد (imanaccounting/periods.py)، اما rollup
+با trigger های بایگانی همه دفتر را می‌شمارد. فیلتری که بازه تاریخش بعد از
+آخرین دوره بسته شروع شود روی transactions و بقیه (از جمله فیلترهای بدون
+date_from) روی نمای ledger_transactions که بایگانی را هم دارد اجرا می‌شوند.
+
+صفحه نتایج فیلتر یک حساب از جدول postings (imanaccounting/journal.py) به ترتیب
+تاریخ خوانده می‌شود و فقط ردیف‌های همان صفحه از transactions (و اگر بازه به
+دوره بسته برسد، از transactions_archive با ادغام دو بخش مرتب) خوانده می‌شوند،
+نه همه تراکنش‌های حساب با OR روی دو ستون و مرتب‌سازی آن‌ها.
+"""
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+from .instrument import timed
+from .periods import closed_through
+from .search import build_match
+
+if TYPE_CHECKING:
+    from .ledger import DatabaseManager, Transaction
+
+TRANSACTION_TYPES = ('درآمد', 'هزینه', 'انتقال')
+
+INDEXES_DDL = '''
+    CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(date);
+    CREATE INDEX IF NOT EXISTS idx_transactions_type_date ON transactions(type, date);
+    -- amount در نمایه حساب‌ها: جمع گردش هر حساب بدون خواندن جدول (imanaccounting/integrity.py)
+    DROP INDEX IF EXISTS idx_transactions_debit_date;
+    DROP INDEX IF EXISTS idx_transactions_credit_date;
+    CREATE INDEX IF NOT EXISTS idx_transactions_debit_date_amount ON transactions(debit_account_id, date, amount);
+    CREATE INDEX IF NOT EXISTS idx_transactions_credit_date_amount ON transactions(credit_account_id, date, amount);
+    CREATE INDEX IF NOT EXISTS idx_transactions_amount ON transactions(amount);
+'''
+
+# هر تراکنش یک بار در سطر حساب بدهکار و یک بار در سطر حساب بستانکار شمرده
+# می‌شود؛ تعداد سطرها به ماه × نوع × حساب محدود است، نه به تعداد تراکنش‌ها
+ROLLUP_DDL = '''
+    CREATE TABLE IF NOT EXISTS transaction_rollup (
+        month TEXT NOT NULL,
+        type TEXT NOT NULL,
+        account_id INTEGER NOT NULL,
+        debit_count INTEGER NOT NULL,
+        credit_count INTEGER NOT NULL,  -- بدون تراکنش‌هایی که بدهکار و بستانکارشان یکی است
+        PRIMARY KEY (month, type, account_id)
+    ) WITHOUT ROWID
+'''
+
+_ROLLUP_ADD = '''
+    INSERT INTO transaction_rollup VALUES
+        (substr(new.date, 1, 7), new.type, new.debit_account_id, 1, 0)
+    ON CONFLICT DO UPDATE SET debit_count = debit_count + 1;
+    INSERT INTO transaction_rollup
+        SELECT substr(new.date, 1, 7), new.type, new.credit_account_id, 0, 1
+        WHERE new.credit_account_id != new.debit_account_id
+    ON CONFLICT DO UPDATE SET credit_count = credit_count + 1;
+'''
+
+_ROLLUP_REMOVE = '''
+    UPDATE transaction_rollup SET debit_count = debit_count - 1
+    WHERE month = substr(old.date, 1, 7) AND type = old.type AND account_id = old.debit_account_id;
+    UPDATE transaction_rollup SET credit_count = credit_count - 1
+    WHERE month = substr(old.date, 1, 7) AND type = old.type AND account_id = old.credit_account_id
+      AND old.credit_account_id != old.debit_account_id;
+'''
+
+ROLLUP_TRIGGERS = f'''
+    CREATE TRIGGER IF NOT EXISTS transaction_rollup_insert AFTER INSERT ON transactions BEGIN
+        {_ROLLUP_ADD}
+    END;
+    CREATE TRIGGER IF NOT EXISTS transaction_rollup_delete AFTER DELETE ON transactions BEGIN
+        {_ROLLUP_REMOVE}
+    END;
+    CREATE TRIGGER IF NOT EXISTS transaction_rollup_update
+    AFTER UPDATE OF date, type, debit_account_id, credit_account_id ON transactions BEGIN
+        {_ROLLUP_REMOVE}
+        {_ROLLUP_ADD}
+    END;
+    -- انتقال به بایگانی (و برگشت از آن) تعدادها را تغییر نمی‌دهد
+    CREATE TRIGGER IF NOT EXISTS transaction_rollup_archive_insert AFTER INSERT ON transactions_archive BEGIN
+        {_ROLLUP_ADD}
+    END;
+    CREATE TRIGGER IF NOT EXISTS transaction_rollup_archive_delete AFTER DELETE ON transactions_archive BEGIN
+        {_ROLLUP_REMOVE}
+    END;
+'''
+
+
+def create_indexes(conn):
+    """ساخت نمایه‌ها و جدول rollup؛ اگر جدول تازه ساخته شده باشد از روی تراکنش‌ها پر می‌شود"""
+    cursor = conn.cursor()
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(transaction_rollup)")]
+    if columns and 'debit_count' not in columns:
+        # rollup نسخه قبل (بر اساس جفت بدهکار/بستانکار) کنار گذاشته و از نو ساخته می‌شود
+        cursor.executescript('''
+            DROP TRIGGER IF EXISTS transaction_rollup_insert;
+            DROP TRIGGER IF EXISTS transaction_rollup_delete;
+            DROP TRIGGER IF EXISTS transaction_rollup_update;
+            DROP TABLE transaction_rollup;
+        ''')
+        columns = []
+    # rollup نسخه قبل بایگانی را نمی‌شمرد
+    exists = bool(columns) and bool(cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'transaction_rollup_archive_insert'"
+    ).fetchone())
+    cursor.executescript(INDEXES_DDL)
+    cursor.execute(ROLLUP_DDL)
+    cursor.executescript(ROLLUP_TRIGGERS)
+    if not exists:
+        rebuild_rollup(conn)
+    conn.commit()
+
+
+def rebuild_rollup(conn):
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM transaction_rollup")
+    cursor.execute('''
+        INSERT INTO transaction_rollup
+        SELECT month, type, account_id, SUM(debit), SUM(credit) FROM (
+            SELECT substr(date, 1, 7) AS month, type, debit_account_id AS account_id,
+                   1 AS debit, 0 AS credit
+            FROM transactions
+            UNION ALL
+            SELECT substr(date, 1, 7), type, credit_account_id, 0, 1
+            FROM transactions WHERE credit_account_id != debit_account_id
+            UNION ALL
+            SELECT substr(date, 1, 7), type, debit_account_id, 1, 0
+            FROM transactions_archive
+            UNION ALL
+            SELECT substr(date, 1, 7), type, credit_account_id, 0, 1
+            FROM transactions_archive WHERE credit_account_id != debit_account_id
+        ) GROUP BY 1, 2, 3
+    ''')
+
+
+# ====================== فیلتر ======================
+
+class TransactionFilter(NamedTuple):
+    types: Tuple[str, ...] = ()
+    account_ids: Tuple[int, ...] = ()  # بدهکار یا بستانکار
+    min_amount: Optional[int] = None
+    max_amount: Optional[int] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None  # شامل خود روز
+    text: str = ''
+    
+    def of_type(self, *types: str) -> 'TransactionFilter':
+        return self._replace(types=tuple(sorted(set(types))))
+    
+    def for_account(self, *account_ids: int) -> 'TransactionFilter':
+        return self._replace(account_ids=tuple(sorted(set(account_ids))))
+    
+    def amount_between(self, low: int = None, high: int = None) -> 'TransactionFilter':
+        return self._replace(
+            min_amount=None if low is None else int(low),
+            max_amount=None if high is None else int(high),
+        )
+    
+    def between(self, start: date = None, end: date = None) -> 'TransactionFilter':
+        return self._replace(date_from=start, date_to=end)
+    
+    def in_month(self, month: Optional[str]) -> 'TransactionFilter':
+        """محدود به یک ماه میلادی به شکل 'YYYY-MM'؛ None محدودیت تاریخ را برمی‌دارد"""
+        if month is None:
+            return self.between()
+        start = date(int(month[:4]), int(month[5:7]), 1)
+        return self.between(start, _month_end(start))
+    
+    def matching(self, text: str) -> 'TransactionFilter':
+        return self._replace(text=text.strip())
+    
+    @property
+    def month(self) -> Optional[str]:
+        """ماه فیلتر اگر بازه تاریخ دقیقاً یک ماه کامل باشد"""
+        months = _month_range(self)
+        if months is None or months[0] is None or months[0] != months[1]:
+            return None
+        return months[0]
+    
+    @property
+    def rollup_friendly(self) -> bool:
+        """آیا وجه‌ها و تعداد کل از جدول rollup قابل محاسبه‌اند (حداکثر یک حساب)"""
+        return (self.min_amount is None and self.max_amount is None and len(self.account_ids) <= 1
+                and build_match(self.text) is None and _month_range(self) is not None)
+
+
+def _month_end(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+
+def _month_range(flt: TransactionFilter) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """بازه تاریخ به صورت (ماه اول، ماه آخر) اگر مرزها روی ماه‌های کامل باشند"""
+    if flt.date_from is not None and flt.date_from.day != 1:
+        return None
+    if flt.date_to is not None and flt.date_to != _month_end(flt.date_to):
+        return None
+    return (
+        flt.date_from and flt.date_from.strftime('%Y-%m'),
+        flt.date_to and flt.date_to.strftime('%Y-%m'),
+    )
+
+
+def _conditions(flt: TransactionFilter, rollup: bool = False) -> Dict[str, Tuple[str, list]]:
+    """شرط SQL هر بخش فیلتر با پارامترهایش، به تفکیک وجه (نام مستعار جدول t)"""
+    parts = {}
+    if flt.types:
+        parts['type'] = (f"t.type IN ({', '.join('?' * len(flt.types))})", list(flt.types))
+    if flt.account_ids and rollup:
+        parts['account'] = ("t.account_id = ?", list(flt.account_ids))
+    elif flt.account_ids:
+        marks = ', '.join('?' * len(flt.account_ids))
+        # دو شرط جدا تا SQLite از هر دو نمایه بدهکار و بستانکار استفاده کند
+        parts['account'] = (
+            f"(t.debit_account_id IN ({marks}) OR t.credit_account_id IN ({marks}))",
+            list(flt.account_ids) * 2,
+        )
+    
+    if rollup:
+        first, last = _month_range(flt)
+        dates = [("t.month >= ?", first), ("t.month <= ?", last)]
+    else:
+        dates = [
+            ("t.date >= ?", flt.date_from and flt.date_from.isoformat()),
+            ("t.date <= ?", flt.date_to and flt.date_to.isoformat()),
+        ]
+    dates = [(sql, value) for sql, value in dates if value is not None]
+    if dates:
+        parts['month'] = (' AND '.join(sql for sql, _ in dates), [v for _, v in dates])
+    
+    other = []
+    if flt.min_amount is not None:
+        other.append(("t.amount >= ?", flt.min_amount))
+    if flt.max_amount is not None:
+        other.append(("t.amount <= ?", flt.max_amount))
+    match = build_match(flt.text)
+    if match:
+        other.append(("t.id IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ?)", match))
+    if other:
+        parts['other'] = (' AND '.join(sql for sql, _ in other), [v for _, v in other])
+    return parts
+
+
+def _join(parts) -> Tuple[str, list]:
+    parts = list(parts)
+    if not parts:
+        return '1', []
+    return ' AND '.join(sql for sql, _ in parts), [p for _, params in parts for p in params]
+
+
+def compile_filter(flt: TransactionFilter) -> Tuple[str, list]:
+    """شرط WHERE پارامتری (بدون کلمه WHERE) روی transactions با نام مستعار t"""
+    return _join(_conditions(flt).values())
+
+
+# صفحه تراکنش‌های یک حساب به ترتیب کلید postings؛ ردیفی که بدهکار و بستانکارش
+# همین حساب است فقط یک بار (از طرف بدهکار) می‌آید. دو ستون آخر کلید ترتیب‌اند
+ACCOUNT_PAGE_PART = '''
+    SELECT t.*, p.date AS page_date, p.transaction_id AS page_id
+    FROM postings p CROSS JOIN {table} t ON t.id = p.transaction_id
+    WHERE p.account_id = ? AND p.date {lower} ? AND p.date <= ? AND {where}
+      AND (p.side = 1 OR t.debit_account_id != p.account_id)
+'''
+
+ACCOUNT_PAGE_ORDER = "ORDER BY page_date DESC, page_id DESC LIMIT ? OFFSET ?"
+
+
+def account_page_sql(flt: TransactionFilter, closed: str = None) -> Tuple[str, list]:
+    """پرس‌وجوی صفحه برای فیلتر دقیقاً یک حساب (بدون LIMIT و OFFSET در پارامترها)
+    
+    با closed (پایان آخرین دوره بسته) بخش دوره باز از transactions و بخش دوره
+    بسته از transactions_archive خوانده می‌شوند؛ هر بخش به ترتیب کلید postings
+    است و SQLite آن‌ها را بدون مرتب‌سازی ادغام می‌کند.
+    """
+    where, params = compile_filter(flt._replace(account_ids=()))
+    start = flt.date_from.isoformat() if flt.date_from else ''
+    end = flt.date_to.isoformat() if flt.date_to else '9999-12-31'
+    account = flt.account_ids[0]
+    if closed is None:
+        parts = [('transactions', '>=', start, end)]
+    else:
+        parts = [('transactions', '>', max(start, closed), end),
+                 ('transactions_archive', '>=', start, min(end, closed))]
+    sql = '\n    UNION ALL'.join(
+        ACCOUNT_PAGE_PART.format(table=table, lower=lower, where=where) for table, lower, _, _ in parts
+    )
+    return sql + ACCOUNT_PAGE_ORDER, [
+        value for _, _, low, high in parts for value in (account, low, high, *params)
+    ]
+
+
+# ====================== نتایج ======================
+
+class QueryResult(NamedTuple):
+    filter: TransactionFilter
+    total: int
+    exact: bool
+    offset: int
+    transactions: List['Transaction']
+
+
+class Facets(NamedTuple):
+    total: int
+    types: Dict[str, int]
+    accounts: Dict[int, int]
+    months: Dict[str, int]  # 'YYYY-MM' -> تعداد، از جدیدترین
+
+
+# فیلتر مبلغ یا متن: تراکنش‌های منطبق پیش از شمارش وجه‌ها گروه‌بندی می‌شوند
+SCAN_FACETS_SQL = '''
+    WITH hits AS (
+        SELECT t.type, substr(t.date, 1, 7) AS month, t.debit_account_id, t.credit_account_id,
+               {flags}, COUNT(*) AS count
+        FROM {table} t WHERE {base} GROUP BY 1, 2, 3, 4, 5, 6, 7
+    )
+    SELECT 'total', NULL, SUM(count) FROM hits WHERE m_type AND m_account AND m_month
+    UNION ALL
+    SELECT 'type', type, SUM(count) FROM hits WHERE m_account AND m_month GROUP BY type
+    UNION ALL
+    SELECT 'account', account_id, SUM(count) FROM (
+        SELECT debit_account_id AS account_id, count FROM hits WHERE m_type AND m_month
+        UNION ALL
+        SELECT credit_account_id, count FROM hits
+        WHERE m_type AND m_month AND credit_account_id != debit_account_id
+    ) GROUP BY account_id
+    UNION ALL
+    SELECT 'month', month, SUM(count) FROM hits WHERE m_type AND m_account GROUP BY month
+'''
+
+
+ROLLUP_FACETS_SQL = '''
+    SELECT 'total', NULL, SUM({count}) FROM transaction_rollup t WHERE {type} AND {account} AND {month}
+    UNION ALL
+    SELECT 'type', type, SUM({count}) FROM transaction_rollup t
+    WHERE {account} AND {month} GROUP BY type
+    UNION ALL
+    SELECT 'account', account_id, SUM(debit_count + credit_count) FROM transaction_rollup t
+    WHERE {type} AND {month} GROUP BY account_id
+    UNION ALL
+    SELECT 'month', month, SUM({count}) FROM transaction_rollup t
+    WHERE {type} AND {account} GROUP BY month
+'''
+
+
+def _rollup_count(flt: TransactionFilter) -> str:
+    # با فیلتر حساب، تراکنش‌های آن حساب از هر دو طرف؛ بدون آن هر تراکنش یک بار (طرف بدهکار)
+    return 't.debit_count + t.credit_count' if flt.account_ids else 't.debit_count'
+
+
+def facets_sql(flt: TransactionFilter, table: str = 'transactions') -> Tuple[str, list]:
+    """یک پرس‌وجو برای هر سه وجه؛ هر وجه با همه شرط‌ها به جز شرط خودش شمرده می‌شود"""
+    if flt.rollup_friendly:
+        parts = _conditions(flt, rollup=True)
+        where = {facet: parts.get(facet, ('1', [])) for facet in ('type', 'account', 'month')}
+        order = {
+            'total': ('type', 'account', 'month'), 'type': ('account', 'month'),
+            'account': ('type', 'month'), 'month': ('type', 'account'),
+        }
+        params = [p for select in order.values() for facet in select for p in where[facet][1]]
+        sql = ROLLUP_FACETS_SQL.format(
+            count=_rollup_count(flt), **{facet: sql for facet, (sql, _) in where.items()}
+        )
+        return sql, params
+    
+    parts = _conditions(flt)
+    flags, params = [], []
+    for facet in ('type', 'account', 'month'):
+        sql, facet_params = parts.get(facet, ('1', []))
+        flags.append(f"({sql}) AS m_{facet}")
+        params += facet_params
+    base, base_params = parts.get('other', ('1', []))
+    sql = SCAN_FACETS_SQL.format(flags=', '.join(flags), base=base, table=table)
+    return sql, params + base_params
+
+
+# ====================== کلاس QueryEngine ======================
+
+class QueryEngine:
+    """اجرای فیلترها روی یک DatabaseManager؛ نتایج در کش دفتر (db.cached) می‌مانند"""
+    
+    def __init__(self, db: 'DatabaseManager'):
+        self.db = db
+    
+    def table(self, flt: TransactionFilter) -> str:
+        """transactions فقط اگر کل بازه فیلتر بعد از دوره بسته باشد، وگرنه ledger_transactions
+        
+        فیلتر بدون date_from از ابتدای دفتر است و به بایگانی هم می‌رسد.
+        """
+        closed = closed_through(self.db)
+        if closed is not None and (flt.date_from is None or flt.date_from.isoformat() <= closed):
+            return 'ledger_transactions'
+        return 'transactions'
+    
+    def count(self, flt: TransactionFilter) -> int:
+        table = self.table(flt)
+        if flt.rollup_friendly:
+            where, params = _join(_conditions(flt, rollup=True).values())
+            sql = f"SELECT COALESCE(SUM({_rollup_count(flt)}), 0) FROM transaction_rollup t WHERE {where}"
+        else:
+            where, params = compile_filter(flt)
+            sql = f"SELECT COUNT(*) FROM {table} t WHERE {where}"
+        return self.db.cached_query(sql, tuple(params))[0][0]
+    
+    def select(self, flt: TransactionFilter, limit: int = 50, offset: int = 0) -> QueryResult:
+        """یک صفحه از تراکنش‌های منطبق، از جدیدترین تاریخ"""
+        total = self.count(flt)
+        rows = []
+        table = self.table(flt)
+        if total and len(flt.account_ids) == 1:
+            closed = closed_through(self.db) if table == 'ledger_transactions' else None
+            sql, params = account_page_sql(flt, closed)
+            rows = self.db.cached_query(sql, tuple(params) + (limit, offset))
+        elif total:
+            where, params = compile_filter(flt)
+            rows = self.db.cached_query(
+                f"SELECT t.* FROM {table} t WHERE {where} "
+                f"ORDER BY t.date DESC, t.id DESC LIMIT ? OFFSET ?",
+                tuple(params) + (limit, offset)
+            )
+        return QueryResult(flt, total, True, offset, [self.db.row_to_transaction(r) for r in rows])
+    
+    def facets(self, flt: TransactionFilter) -> Facets:
+        return self.db.cached(('facets', flt), lambda: self.compute_facets(flt))
+    
+    @timed('query.facets')
+    def compute_facets(self, flt: TransactionFilter) -> Facets:
+        sql, params = facets_sql(flt, self.table(flt))
+        total, types, accounts, months = 0, {}, {}, {}
+        for facet, key, count in self.db.execute_query(sql, tuple(params)):
+            if not count:
+                continue
+            if facet == 'total':
+                total = count
+            elif facet == 'type':
+                types[key] = count
+            elif facet == 'account':
+                accounts[key] = count
+            else:
+                months[key] = count
+        
+        return Facets(total, types, accounts, dict(sorted(months.items(), reverse=True)))
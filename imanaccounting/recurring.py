@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+
+"""
+تراکنش‌های تکراری (اجاره، حقوق، اشتراک‌ها) با ثبت دسته‌ای موعدها (بدون وابستگی به Qt)
+
+هر الگو در recurring_templates یک تراکنش با قاعده تکرار است: روزانه، هفتگی،
+ماهانه یا سالانه، هر interval بار، از start_date تا end_date (اختیاری). موعد
+k ام همیشه از روی start_date حساب می‌شود، پس الگوی ماهانه روز ۳۱ در ماه‌های
+کوتاه‌تر روز آخر ماه ثبت می‌شود و بعد دوباره به ۳۱ برمی‌گردد.
+
+RecurringScheduler (db.recurring) موعد بعدی الگوها را در یک heap نگه می‌دارد.
+run_due فقط سر heap را با امروز مقایسه می‌کند؛ اگر موعدی رسیده باشد فقط
+الگوهای سررسید خوانده می‌شوند و همه موعدهای گذشته‌شان با یک post_transactions
+ثبت می‌شوند. پیشروی الگوها (occurrences و next_date) در همان commit ذخیره
+می‌شود و شماره هر تراکنش (RC<الگو>-<موعد>) یکتاست، پس هیچ موعدی دو بار
+ثبت نمی‌شود. موعدهایی که در دوره مالی بسته افتاده‌اند (imanaccounting/periods.py)
+ثبت نمی‌شوند و فقط از رویشان عبور می‌شود. اگر ثبت دسته‌ای خطا بدهد، هر الگو
+جدا ثبت می‌شود و فقط الگوی خراب (مثلاً با حساب حذف شده) تا فردا کنار می‌رود.
+"""
+
+import heapq
+import threading
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+from .money import Money
+from .periods import closed_through
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from .ledger import DatabaseManager, Transaction
+
+FREQUENCIES = {'daily': 'روزانه', 'weekly': 'هفتگی', 'monthly': 'ماهانه', 'yearly': 'سالانه'}
+UNITS = {'daily': 'روز', 'weekly': 'هفته', 'monthly': 'ماه', 'yearly': 'سال'}
+
+RECURRING_DDL = '''
+    CREATE TABLE IF NOT EXISTS recurring_templates (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        description TEXT,
+        type TEXT NOT NULL,
+        amount INTEGER NOT NULL,
+        debit_account_id INTEGER NOT NULL,
+        credit_account_id INTEGER NOT NULL,
+        frequency TEXT NOT NULL,
+        interval INTEGER NOT NULL DEFAULT 1,
+        start_date DATE NOT NULL,
+        end_date DATE,  -- NULL: بدون پایان
+        occurrences INTEGER NOT NULL DEFAULT 0,  -- موعدهای گذشته (ثبت یا رد شده)
+        next_date DATE,  -- NULL: تمام شده
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_recurring_next ON recurring_templates(next_date)
+    WHERE next_date IS NOT NULL;
+'''
+
+TEMPLATE_COLUMNS = '''id, description, type, amount, debit_account_id, credit_account_id,
+    frequency, interval, start_date, end_date, occurrences, next_date'''
+
+
+class RecurringError(Exception):
+    """الگوی تکرار نامعتبر است"""
+
+
+class RecurringTemplate(NamedTuple):
+    id: int
+    description: str
+    type: str
+    amount: Money
+    debit_account_id: int
+    credit_account_id: int
+    frequency: str
+    interval: int
+    start: date
+    end: Optional[date]
+    occurrences: int
+    next_date: Optional[date]
+    
+    @property
+    def label(self) -> str:
+        if self.interval == 1:
+            return FREQUENCIES[self.frequency]
+        return f"هر {self.interval} {UNITS[self.frequency]}"
+    
+    def occurrence(self, index: int) -> Optional[date]:
+        """موعد index ام (از صفر) یا None اگر بعد از end باشد"""
+        day = occurrence(self.start, self.frequency, self.interval, index)
+        return None if self.end is not None and day > self.end else day
+
+
+def create_recurring_tables(conn):
+    conn.executescript(RECURRING_DDL)
+    conn.commit()
+
+
+def occurrence(start: date, frequency: str, interval: int, index: int) -> date:
+    steps = interval * index
+    if frequency == 'daily':
+        return start + timedelta(days=steps)
+    if frequency == 'weekly':
+        return start + timedelta(weeks=steps)
+    import calendar  # فقط برای تکرار ماهانه و سالانه؛ هنگام import دفتر لازم نیست
+    months = start.month - 1 + steps * (12 if frequency == 'yearly' else 1)
+    year, month = start.year + months // 12, months % 12 + 1
+    return date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def _template(row) -> RecurringTemplate:
+    return RecurringTemplate(
+        row[0], row[1] or '', row[2], Money(row[3]), row[4], row[5], row[6], row[7],
+        date.fromisoformat(row[8]), row[9] and date.fromisoformat(row[9]), row[10],
+        row[11] and date.fromisoformat(row[11])
+    )
+
+
+# ====================== کلاس RecurringScheduler ======================
+
+class RecurringScheduler:
+    """صف موعد بعدی الگوها؛ بررسی موعد O(1) است و فقط الگوهای سررسید خوانده می‌شوند"""
+    
+    def __init__(self, db: 'DatabaseManager'):
+        self.db = db
+        self.lock = threading.Lock()
+        # (موعد بعدی، شناسه الگو)؛ ورودی‌هایی که با scheduled نخوانند کهنه‌اند و دور ریخته می‌شوند
+        self.heap = None
+        self.scheduled: Dict[int, date] = {}
+        # خطای آخرین ثبت الگوهایی که تا فردا کنار رفته‌اند
+        self.failed: Dict[int, str] = {}
+    
+    def invalidate(self):
+        """heap بار بعد از پایگاه داده ساخته می‌شود (مثلاً بعد از بازیابی پشتیبان)"""
+        with self.lock:
+            self.heap = None
+    
+    def ensure_loaded(self):
+        if self.heap is not None:
+            return
+        rows = self.db.execute_query(
+            "SELECT id, next_date FROM recurring_templates WHERE next_date IS NOT NULL"
+        )
+        with self.lock:
+            self.scheduled = {template_id: date.fromisoformat(day) for template_id, day in rows}
+            self.heap = [(day, template_id) for template_id, day in self.scheduled.items()]
+            heapq.heapify(self.heap)
+    
+    def schedule(self, template_id: int, next_date: Optional[date]):
+        """ثبت موعد بعدی الگو (lock باید گرفته شده باشد)"""
+        if next_date is None:
+            self.scheduled.pop(template_id, None)
+            return
+        self.scheduled[template_id] = next_date
+        if self.heap is not None:
+            heapq.heappush(self.heap, (next_date, template_id))
+    
+    def next_due(self) -> Optional[date]:
+        self.ensure_loaded()
+        with self.lock:
+            while self.heap and self.scheduled.get(self.heap[0][1]) != self.heap[0][0]:
+                heapq.heappop(self.heap)
+            return self.heap[0][0] if self.heap else None
+    
+    def templates(self) -> List[RecurringTemplate]:
+        return [_template(row) for row in self.db.cached_query(
+            f"SELECT {TEMPLATE_COLUMNS} FROM recurring_templates ORDER BY next_date IS NULL, next_date, id"
+        )]
+    
+    def add(self, transaction: 'Transaction', frequency: str, interval: int = 1,
+            end: date = None) -> int:
+        """الگوی تکرار از روی یک تراکنش (تاریخ آن اولین موعد است)؛ شناسه الگو"""
+        if frequency not in FREQUENCIES:
+            raise RecurringError(f"تکرار نامعتبر: {frequency}")
+        if interval < 1:
+            raise RecurringError("فاصله تکرار باید حداقل ۱ باشد")
+        if transaction.amount <= 0:
+            raise RecurringError("مبلغ باید بزرگتر از صفر باشد")
+        if transaction.debit_account_id == transaction.credit_account_id:
+            raise RecurringError("حساب‌ها نمی‌توانند یکسان باشند")
+        start = transaction.date.date()
+        if end is not None and end < start:
+            raise RecurringError("پایان تکرار قبل از اولین موعد است")
+        
+        def insert() -> int:
+            with self.db.get_connection() as conn:
+                cursor = conn.execute(
+                    '''INSERT INTO recurring_templates
+                       (description, type, amount, debit_account_id, credit_account_id,
+                        frequency, interval, start_date, end_date, next_date)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                    (transaction.description, transaction.type, transaction.amount,
+                     transaction.debit_account_id, transaction.credit_account_id, frequency, interval,
+                     start.isoformat(), end and end.isoformat(), start.isoformat())
+                )
+                conn.commit()
+            self.db.bump_revision()
+            return cursor.lastrowid
+        
+        template_id = self.db.writer.call(insert).result()
+        with self.lock:
+            self.schedule(template_id, start)
+        return template_id
+    
+    def remove(self, template_id: int) -> bool:
+        """حذف الگو؛ تراکنش‌های ثبت شده‌اش باقی می‌مانند"""
+        def delete() -> int:
+            count = self.db.execute_update("DELETE FROM recurring_templates WHERE id = ?", (template_id,))
+            with self.lock:
+                self.schedule(template_id, None)
+                self.failed.pop(template_id, None)
+            return count
+        return bool(self.db.writer.call(delete).result())
+    
+    def run_due(self, today: date = None) -> Optional['Future']:
+        """ثبت موعدهای رسیده در thread نویسنده؛ None اگر موعدی نرسیده باشد (بدون پرس‌وجو)"""
+        today = today or date.today()
+        due = self.next_due()
+        if due is None or due > today:
+            return None
+        return self.db.writer.call(self.materialize, today)
+    
+    def materialize(self, today: date) -> List['Transaction']:
+        """ثبت همه موعدهای تا today با یک commit؛ تراکنش‌های ثبت شده (در thread نویسنده)"""
+        from .ledger import Transaction  # ledger این ماژول را import می‌کند
+        self.ensure_loaded()
+        with self.lock:
+            due = []
+            while self.heap and self.heap[0][0] <= today:
+                day, template_id = heapq.heappop(self.heap)
+                if self.scheduled.get(template_id) == day:
+                    due.append(template_id)
+            if not due:
+                return []
+        
+        try:
+            rows = self.db.execute_query(
+                f"SELECT {TEMPLATE_COLUMNS} FROM recurring_templates "
+                f"WHERE id IN ({', '.join('?' * len(due))}) AND next_date <= ?",
+                (*due, today.isoformat())
+            )
+            closed = closed_through(self.db)
+        except Exception:
+            # الگوها در صف می‌مانند تا tick بعدی دوباره امتحان شوند
+            with self.lock:
+                for template_id in due:
+                    day = self.scheduled.get(template_id)
+                    if day is not None:
+                        self.schedule(template_id, day)
+            raise
+        
+        plans = {}
+        for template in map(_template, rows):
+            transactions, index, day = [], template.occurrences, template.next_date
+            while day is not None and day <= today:
+                if closed is None or day.isoformat() > closed:
+                    transaction = Transaction(
+                        datetime(day.year, day.month, day.day), template.description,
+                        template.amount, template.type,
+                        template.debit_account_id, template.credit_account_id
+                    )
+                    transaction.number = f"RC{template.id}-{index + 1}"
+                    transactions.append(transaction)
+                index += 1
+                day = template.occurrence(index)
+            plans[template.id] = (transactions, index, day)
+        
+        failed = {}
+        try:
+            posted = self.post(plans)
+        except Exception:
+            # یک الگوی خراب بقیه را در هر tick نگه ندارد؛ هر الگو در commit خودش
+            posted = []
+            for template_id, plan in plans.items():
+                try:
+                    posted += self.post({template_id: plan})
+                except Exception as e:
+                    failed[template_id] = str(e)
+        
+        with self.lock:
+            for template_id, (_, _, day) in plans.items():
+                if template_id not in failed:
+                    self.failed.pop(template_id, None)
+                    self.schedule(template_id, day)
+                elif template_id in self.scheduled:
+                    # next_date در پایگاه داده دست نخورده؛ فردا (یا بعد از بارگذاری دوباره) امتحان می‌شود
+                    self.failed[template_id] = failed[template_id]
+                    self.schedule(template_id, today + timedelta(days=1))
+            if len(plans) < len(due):
+                # الگو حذف شده یا از جای دیگری پیش رفته است؛ heap دوباره خوانده می‌شود
+                self.heap = None
+        for template_id, error in failed.items():
+            print(f"⚠️ الگوی تکرار {template_id}: {error}")
+        return posted
+    
+    def post(self, plans: Dict[int, tuple]) -> List['Transaction']:
+        """ثبت موعدهای الگوها و پیشروی آن‌ها در یک commit؛ خطا به فراخواننده می‌رسد"""
+        transactions = [t for legs, _, _ in plans.values() for t in legs]
+        
+        def advance(conn):
+            conn.executemany(
+                "UPDATE recurring_templates SET occurrences = ?, next_date = ? WHERE id = ?",
+                [(index, day and day.isoformat(), template_id)
+                 for template_id, (_, index, day) in plans.items()]
+            )
+        
+        if transactions:
+            self.db.post_transactions(transactions, prepare=advance)
+        elif plans:
+            with self.db.get_connection() as conn:
+                advance(conn)
+                conn.commit()
+            self.db.bump_revision()
+        return transactions
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""
+کلاینت سرویس دفتر (imanaccounting/server.py) با همان رابط DatabaseManager
+
+رابط کاربری با IMAN_SERVER=http://host:8750 (و در صورت نیاز IMAN_API_TOKEN)
+به جای فایل محلی به سرویس وصل می‌شود. ثبت حساب و تراکنش از مسیرهای POST
+سرویس می‌گذرد و خواندن‌های SQL (جستجو، فیلترها، گزارش‌ها) روی اتصال فقط
+خواندنی سرویس اجرا می‌شوند؛ بنابراین QueryEngine، search و گزارش‌ها بدون
+تغییر کار می‌کنند. با تغییر X-Ledger-Revision در هر پاسخ کش محلی باطل می‌شود
+و sync تغییرات کاربران دیگر را به صورت رویداد منتشر می‌کند.
+"""
+
+import http.client
+import json
+import threading
+from typing import Any, Callable, List
+from urllib.parse import urlencode, urlsplit
+
+from .events import AccountCreated, BalanceChanged, PostingCreated
+from .ledger import (
+    Account, DatabaseManager, Transaction, account_from_dict, transaction_dict, transaction_from_dict
+)
+from .money import Money
+
+
+class RemoteError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class RemoteLedger(DatabaseManager):
+    is_remote = True
+    
+    def __init__(self, url: str, token: str = None, autoload: bool = True, timeout: float = 10):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.token = token
+        self.timeout = timeout
+        # هر thread اتصال keep-alive خودش را دارد
+        self.local = threading.local()
+        self.server_revision = None
+        self.synced_revision = None
+        super().__init__(url, autoload=autoload)
+    
+    # ---------- HTTP ----------
+    
+    def request(self, method: str, path: str, payload: Any = None, params: dict = None) -> Any:
+        if params:
+            path += '?' + urlencode(params, doseq=True)
+        body = None if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        
+        for attempt in range(2):
+            conn = getattr(self.local, 'conn', None)
+            if conn is None:
+                conn = self.local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                conn.request(method, path, body, headers)
+                response = conn.getresponse()
+                data = json.loads(response.read() or b'null')
+                break
+            except (ConnectionError, http.client.HTTPException):
+                # اتصال keep-alive توسط سرور بسته شده؛ یک بار دوباره
+                conn.close()
+                self.local.conn = None
+                if attempt:
+                    raise
+        
+        revision = response.getheader('X-Ledger-Revision')
+        if revision != self.server_revision:
+            self.server_revision = revision
+            self.bump_revision()
+        if response.status != 200:
+            raise RemoteError(response.status, (data or {}).get('error', ''))
+        return data
+    
+    # ---------- رابط DatabaseManager ----------
+    
+    def get_connection(self):
+        raise RemoteError(501, "در حالت کلاینت اتصال مستقیم به پایگاه داده وجود ندارد")
+    
+    def init_database(self):
+        self.request('GET', '/health')
+    
+    def load_data(self):
+        self.accounts = [account_from_dict(a) for a in self.request('GET', '/accounts')]
+        self.transactions = [
+            transaction_from_dict(t)
+            for t in self.request('GET', '/transactions', params={'limit': 100})['transactions']
+        ]
+        self.synced_revision = self.server_revision
+        self.bump_revision()
+    
+    def execute_query(self, query: str, params: tuple = ()):
+        return [tuple(row) for row in self.request('POST', '/sql', {'sql': query, 'params': list(params)})]
+    
+    def execute_insert(self, query: str, params: tuple = ()):
+        raise RemoteError(501, "در حالت کلاینت نوشتن فقط از مسیرهای سرویس انجام می‌شود")
+    
+    execute_update = execute_insert
+    
+    def add_account(self, account: Account) -> bool:
+        try:
+            data = self.request('POST', '/accounts', {
+                'code': account.code, 'name': account.name,
+                'type': account.type, 'parent_id': account.parent_id,
+            })
+        except RemoteError:
+            return False
+        account.id = data['id']
+        self.accounts.append(account)
+        self.events.publish(AccountCreated(account))
+        return True
+    
+    def post_transactions(self, transactions: List[Transaction], prepare: Callable = None) -> int:
+        """ثبت دسته‌ای روی سرویس (همه یا هیچ‌کدام)؛ خطا به فراخواننده می‌رسد
+        
+        شماره تراکنش را سرور می‌دهد؛ شماره ساخته شده در هر کلاینت فقط تا ثانیه
+        یکتاست و ثبت همزمان دو کاربر در یک ثانیه با خطای UNIQUE رد می‌شد.
+        prepare به اتصال پایگاه داده نیاز دارد و در حالت کلاینت پشتیبانی نمی‌شود.
+        """
+        if prepare is not None:
+            raise RemoteError(501, "در حالت کلاینت نوشتن‌های وابسته (prepare) پشتیبانی نمی‌شوند")
+        items = [{key: value for key, value in transaction_dict(t).items() if key != 'number'}
+                 for t in transactions]
+        data = self.request('POST', '/transactions', items)
+        for transaction, posted in zip(transactions, data['transactions']):
+            transaction.id = posted['id']
+            transaction.number = posted['number']
+        with self.events.batch():
+            self.transactions[:0] = reversed(transactions)
+            self.apply_balances(data['balances'])
+            for transaction in transactions:
+                self.events.publish(PostingCreated(transaction))
+            # request پیش از به‌روز شدن حافظه revision را عوض کرده بود
+            self.bump_revision()
+        return len(transactions)
+    
+    def add_transaction(self, transaction: Transaction) -> bool:
+        try:
+            return self.post_transactions([transaction]) == 1
+        except (RemoteError, OSError) as e:
+            print(f"خطا: {e}")
+            return False
+    
+    def add_transactions(self, transactions: List[Transaction]) -> int:
+        with self.events.batch():
+            return sum(self.add_transaction(t) for t in transactions)
+    
+    def apply_balances(self, balances: dict):
+        """موجودی‌های سرویس ({id: موجودی}) با انتشار BalanceChanged برای حساب‌های تغییر کرده"""
+        for account_id, balance in balances.items():
+            account = self.get_account_by_id(int(account_id))
+            if account is not None and account.balance != balance:
+                delta = Money(balance) - account.balance
+                account.balance = Money(balance)
+                self.events.publish(BalanceChanged(account.id, delta, account.balance))
+    
+    def sync(self) -> bool:
+        """دریافت تغییرات کاربران دیگر؛ اگر دفتر تغییر کرده باشد True"""
+        self.request('GET', '/health')
+        if self.server_revision == self.synced_revision:
+            return False
+        self.synced_revision = self.server_revision
+        
+        accounts = self.request('GET', '/accounts')
+        recent = self.request('GET', '/transactions', params={'limit': 100})['transactions']
+        known = {t.id for t in self.transactions}
+        with self.events.batch():
+            for data in accounts:
+                if self.get_account_by_id(data['id']) is None:
+                    account = account_from_dict(data)
+                    self.accounts.append(account)
+                    self.events.publish(AccountCreated(account))
+            self.apply_balances({a['id']: a['balance'] for a in accounts})
+            added = [transaction_from_dict(t) for t in recent if t['id'] not in known]
+            self.transactions[:0] = added
+            for transaction in added:
+                self.events.publish(PostingCreated(transaction))
+        self.bump_revision()
+        return True
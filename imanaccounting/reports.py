@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+"""
+گزارش‌ها و خلاصه‌های تحلیلی دفتر (بدون وابستگی به Qt)
+"""
+
+from typing import Optional
+
+from .ledger import DatabaseManager
+
+
+def expense_forecast(db: DatabaseManager) -> Optional[dict]:
+    """خلاصه پیش‌بینی هزینه‌ها؛ اگر هزینه‌ای ثبت نشده باشد None"""
+    expenses = [t.amount for t in db.get_all_transactions() if t.type == "هزینه"]
+    if not expenses:
+        return None
+    
+    return {
+        'count': len(expenses),
+        'average': sum(expenses) / len(expenses),
+        'prediction': db.predict_next_expense(),
+        'trend': db.trend_analysis(),
+    }
+
+
+def count_suspicious(db: DatabaseManager, limit: int = 50) -> int:
+    """تعداد تراکنش‌های مشکوک در آخرین تراکنش‌ها"""
+    return sum(1 for t in db.get_all_transactions(limit) if db.detect_anomaly(t))
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+"""
+جستجوی متن کامل در شرح تراکنش‌ها با FTS5 (بدون وابستگی به Qt)
+
+جدول transactions_fts یک جدول FTS5 بدون محتوا (contentless) است که فقط
+نمایه شرح نرمال‌شده را نگه می‌دارد و با trigger همگام با transactions می‌ماند.
+نرمال‌سازی (ي/ى← ی، ك ← ک، نیم‌فاصله ← فاصله، ارقام فارسی/عربی ← لاتین) با
+تابع SQL به نام fa_normalize انجام می‌شود که DatabaseManager.get_connection
+روی هر اتصال ثبت می‌کند؛ همان تابع روی عبارت جستجو هم اجرا می‌شود.
+"""
+
+import re
+from typing import TYPE_CHECKING, List, NamedTuple, Optional
+
+from .instrument import timed
+
+if TYPE_CHECKING:
+    from .ledger import DatabaseManager, Transaction
+
+# جایگزینی نویسه‌ها برای یکسان‌سازی نوشتار فارسی و عربی
+NORMALIZE_MAP = {
+    'ي': 'ی', 'ى': 'ی', 'ئ': 'ی',
+    'ك': 'ک',
+    'ة': 'ه', 'ۀ': 'ه',
+    'أ': 'ا', 'إ': 'ا', 'ٱ': 'ا',
+    '‌': ' ', '‍': '', 'ـ': '',  # نیم‌فاصله، اتصال، کشیده
+    **{d: str(i) for i, d in enumerate('۰۱۲۳۴۵۶۷۸۹')},
+    **{d: str(i) for i, d in enumerate('٠١٢٣٤٥٦٧٨٩')},
+}
+
+_TRANSLATION = str.maketrans(NORMALIZE_MAP)
+_WORD = re.compile(r'\w+')
+
+
+def normalize(text: str) -> str:
+    # حروف بزرگ/کوچک را خود tokenizer یکسان می‌کند
+    return (text or '').translate(_TRANSLATION)
+
+
+def register_functions(conn):
+    """ثبت fa_normalize؛ trigger های نمایه روی اتصال بدون این تابع خطا می‌دهند"""
+    conn.create_function('fa_normalize', 1, normalize, deterministic=True)
+
+
+FTS_DDL = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+        description, content='', tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+    )
+'''
+
+FTS_TRIGGERS = '''
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description) VALUES (new.id, fa_normalize(new.description));
+    END;
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description)
+        VALUES ('delete', old.id, fa_normalize(old.description));
+    END;
+    CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE OF description ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description)
+        VALUES ('delete', old.id, fa_normalize(old.description));
+        INSERT INTO transactions_fts(rowid, description) VALUES (new.id, fa_normalize(new.description));
+    END;
+'''
+
+# بیش از این تعداد نتیجه، رتبه‌بندی bm25 (که باید همه نتایج را ببیند) کنار
+# گذاشته می‌شود و نتایج از جدیدترین مرتب می‌شوند که FTS5 با توقف زودهنگام می‌دهد
+RANK_LIMIT = 10_000
+
+RANKED_SQL = '''
+    WITH hits AS (
+        SELECT rowid AS id, rank FROM transactions_fts
+        WHERE transactions_fts MATCH ?
+        ORDER BY rank
+        LIMIT ? OFFSET ?
+    )
+    SELECT t.* FROM hits JOIN transactions t ON t.id = hits.id
+    ORDER BY hits.rank
+'''
+
+RECENT_SQL = '''
+    WITH hits AS (
+        SELECT rowid AS id FROM transactions_fts
+        WHERE transactions_fts MATCH ?
+        ORDER BY rowid DESC
+        LIMIT ? OFFSET ?
+    )
+    SELECT t.* FROM hits JOIN transactions t ON t.id = hits.id
+    ORDER BY t.id DESC
+'''
+
+COUNT_SQL = '''
+    SELECT COUNT(*) FROM (
+        SELECT 1 FROM transactions_fts WHERE transactions_fts MATCH ? LIMIT ?
+    )
+'''
+
+
+class SearchResult(NamedTuple):
+    query: str
+    total: int
+    exact: bool  # اگر False باشد total کران پایین است و نتایج از جدیدترین مرتب شده‌اند
+    offset: int
+    transactions: List['Transaction']
+
+
+def ensure_index(conn):
+    """ساخت جدول FTS و trigger ها؛ اگر جدول تازه ساخته شده باشد نمایه پر می‌شود"""
+    cursor = conn.cursor()
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'transactions_fts'"
+    ).fetchone()
+    cursor.execute(FTS_DDL)
+    cursor.executescript(FTS_TRIGGERS)
+    if not exists:
+        rebuild_index(conn)
+    conn.commit()
+
+
+def rebuild_index(conn):
+    cursor = conn.cursor()
+    cursor.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('delete-all')")
+    cursor.execute(
+        "INSERT INTO transactions_fts(rowid, description) "
+        "SELECT id, fa_normalize(description) FROM transactions"
+    )
+
+
+def reindex(db: 'DatabaseManager'):
+    """بازسازی کامل نمایه (مثلاً بعد از import خارج از برنامه)"""
+    with db.get_connection() as conn:
+        rebuild_index(conn)
+        conn.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('optimize')")
+        conn.commit()
+
+
+def build_match(query: str) -> Optional[str]:
+    """عبارت MATCH: همه کلمات (AND) و جستجوی پیشوندی برای تایپ تدریجی"""
+    words = _WORD.findall(normalize(query))
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search(db: 'DatabaseManager', query: str, limit: int = 50, offset: int = 0) -> SearchResult:
+    """جستجوی رتبه‌بندی‌شده (bm25) و صفحه‌بندی‌شده در شرح تراکنش‌ها"""
+    return db.cached(('search', query, limit, offset), lambda: _search(db, query, limit, offset))
+
+
+@timed('search.search')
+def _search(db: 'DatabaseManager', query: str, limit: int, offset: int) -> SearchResult:
+    match = build_match(query)
+    if match is None:
+        return SearchResult(query, 0, True, offset, [])
+    
+    # از طریق execute_query تا در حالت کلاینت (RemoteLedger) هم کار کند
+    total = db.execute_query(COUNT_SQL, (match, RANK_LIMIT + 1))[0][0]
+    exact = total <= RANK_LIMIT
+    sql = RANKED_SQL if exact else RECENT_SQL
+    rows = db.execute_query(sql, (match, limit, offset)) if total else []
+    return SearchResult(query, min(total, RANK_LIMIT), exact, offset,
+                        [db.row_to_transaction(row) for row in rows])
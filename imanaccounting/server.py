@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+
+"""
+سرویس محلی HTTP/JSON برای دسترسی چند کاربر به یک دفتر (بدون وابستگی به Qt)
+
+اجرا:
+    python -m imanaccounting --db iman_accounting.db serve [--host 127.0.0.1] [--port 8750]
+
+پایگاه داده در حالت WAL باز می‌شود تا خواندن‌ها همزمان با نوشتن انجام شوند:
+- خواندن‌ها روی یک thread pool اجرا می‌شوند و هر کدام اتصال جدای خود را دارند.
+- همه نوشتن‌ها از صف db.writer (imanaccounting/writer.py) می‌گذرند و
+  ثبت‌های همزمان با یک commit گروهی ثبت می‌شوند.
+- تراکنش‌های تکراری سررسید هر RECURRING_CHECK_S ثانیه در سرور ثبت می‌شوند
+  (کلاینت‌ها آن‌ها را ثبت نمی‌کنند).
+
+مسیرها:
+    GET  /health                     وضعیت و شماره بازبینی دفتر
+    GET  /accounts                   حساب‌ها با موجودی
+    POST /accounts                   ساخت حساب {code, name, type, parent_id}
+    GET  /transactions               فیلتر: type, account, from, to, min, max, text, limit, offset
+    POST /transactions               ثبت یک تراکنش یا لیستی از آن‌ها (لیست: همه یا هیچ)؛
+                                     بدون number شماره را سرور می‌دهد
+    GET  /facets                     تعداد به تفکیک نوع/حساب/ماه با همان فیلترها
+    GET  /search?q=                  جستجوی متن کامل
+    GET  /reports/<name>             balances, forecast, anomalies, profit
+    GET  /analytics                  پیش‌بینی و روند هزینه‌ها
+    GET  /analytics/anomaly?amount=  بررسی یک مبلغ
+    POST /sql                        اجرای SELECT روی اتصال فقط خواندنی (حالت کلاینت)؛
+                                     جز خواندن جدول‌های خود دفتر همه چیز رد می‌شود
+
+هر پاسخ سرآیند X-Ledger-Revision دارد که با هر نوشتن تغییر می‌کند. اگر
+توکن تعیین شده باشد، هر درخواست باید Authorization: Bearer <توکن> داشته باشد.
+"""
+
+import asyncio
+import hmac
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, quote, urlsplit
+
+from .cli import REPORTS
+from .instrument import timed
+from .ledger import (
+    Account, DatabaseManager, Transaction, account_dict, transaction_dict, transaction_from_dict
+)
+from .money import Money
+from .query import TRANSACTION_TYPES, TransactionFilter
+from .search import register_functions
+
+DEFAULT_PORT = 8750
+READER_THREADS = 4
+MAX_BODY = 64 * 2**20
+# فاصله بررسی موعد تراکنش‌های تکراری (imanaccounting/recurring.py)
+RECURRING_CHECK_S = 60
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+REASONS = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+           405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+
+# ====================== تبدیل ورودی ======================
+
+def parse_filter(params: Dict[str, List[str]]) -> TransactionFilter:
+    """TransactionFilter از پارامترهای URL (type و account می‌توانند تکرار شوند)"""
+    flt = TransactionFilter()
+    try:
+        if 'type' in params:
+            flt = flt.of_type(*params['type'])
+        if 'account' in params:
+            flt = flt.for_account(*(int(a) for a in params['account']))
+        if 'min' in params or 'max' in params:
+            flt = flt.amount_between(params.get('min', [None])[0], params.get('max', [None])[0])
+        if 'from' in params or 'to' in params:
+            flt = flt.between(*(
+                date.fromisoformat(params[key][0]) if key in params else None for key in ('from', 'to')
+            ))
+    except ValueError as e:
+        raise ApiError(400, f"فیلتر نامعتبر: {e}")
+    return flt.matching(params.get('text', [''])[0])
+
+
+def parse_posting(data: dict, db: DatabaseManager) -> Transaction:
+    """Transaction از بدنه JSON با ستون‌های transaction_dict (id نادیده گرفته می‌شود)"""
+    try:
+        transaction = transaction_from_dict({**data, 'id': None})
+    except (KeyError, TypeError, ValueError, OverflowError) as e:
+        raise ApiError(400, f"تراکنش نامعتبر: {e!r}")
+    if transaction.type not in TRANSACTION_TYPES:
+        raise ApiError(400, f"نوع نامعتبر: {transaction.type!r}")
+    if transaction.amount <= 0:
+        raise ApiError(400, "مبلغ باید مثبت باشد")
+    for account_id in (transaction.debit_account_id, transaction.credit_account_id):
+        if db.get_account_by_id(account_id) is None:
+            raise ApiError(400, f"حساب {account_id} وجود ندارد")
+    return transaction
+
+
+def int_param(params: Dict[str, List[str]], name: str, default: int) -> int:
+    try:
+        return int(params.get(name, [default])[0])
+    except ValueError:
+        raise ApiError(400, f"{name} باید عدد باشد")
+
+
+# ====================== سرور ======================
+
+class LedgerServer:
+    def __init__(self, db: DatabaseManager, token: str = None, readers: int = READER_THREADS):
+        self.db = db
+        self.token = token
+        self.boot = f"{int(time.time()):x}"
+        self.readers = ThreadPoolExecutor(readers, thread_name_prefix='ledger-reader')
+        self.server = None
+        self.recurring = None
+        self.routes: Dict[Tuple[str, str], Callable] = {
+            ('GET', '/health'): self.health,
+            ('GET', '/accounts'): self.accounts,
+            ('POST', '/accounts'): self.create_account,
+            ('GET', '/transactions'): self.transactions,
+            ('POST', '/transactions'): self.post,
+            ('GET', '/facets'): self.facets,
+            ('GET', '/search'): self.search,
+            ('GET', '/analytics'): self.analytics,
+            ('GET', '/analytics/anomaly'): self.anomaly,
+            ('POST', '/sql'): self.sql,
+        }
+    
+    @property
+    def revision(self) -> str:
+        return f"{self.boot}-{self.db.revision}"
+    
+    async def start(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT):
+        enable_wal(self.db)
+        self.server = await asyncio.start_server(self.handle, host, port)
+        self.recurring = asyncio.ensure_future(self.run_recurring())
+        return self.server.sockets[0].getsockname()[:2]
+    
+    async def close(self):
+        if self.recurring is not None:
+            self.recurring.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.readers.shutdown(wait=False)
+        self.db.close()
+    
+    async def run_recurring(self):
+        """ثبت تراکنش‌های تکراری سررسید؛ هر دور فقط موعد سر heap بررسی می‌شود"""
+        while True:
+            try:
+                future = self.db.recurring.run_due()
+                if future is not None:
+                    await asyncio.wrap_future(future)
+            except Exception as e:
+                print(f"⚠️ تراکنش‌های تکراری: {e}")
+            await asyncio.sleep(RECURRING_CHECK_S)
+    
+    # ---------- HTTP ----------
+    
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, version = line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY:
+                    self.respond(writer, 413, {'error': "بدنه درخواست خیلی بزرگ است"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self.dispatch(method, target, headers, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                self.respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+    
+    def respond(self, writer: asyncio.StreamWriter, status: int, payload, keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"X-Ledger-Revision: {self.revision}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+    
+    async def dispatch(self, method: str, target: str, headers: dict, body: bytes):
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        try:
+            if self.token and not hmac.compare_digest(
+                headers.get('authorization', '').encode(), f"Bearer {self.token}".encode()
+            ):
+                raise ApiError(401, "توکن نامعتبر")
+            handler = self.routes.get((method, url.path))
+            if handler is None and url.path.startswith('/reports/') and method == 'GET':
+                return 200, await self.read(self.report, url.path[len('/reports/'):], params)
+            if handler is None:
+                known = any(path == url.path for _, path in self.routes)
+                raise ApiError(405 if known else 404, f"{method} {url.path}")
+            data = json.loads(body) if body else None
+            with timed(f"api: {method} {url.path}"):
+                return 200, await handler(params, data)
+        except ApiError as e:
+            return e.status, {'error': str(e)}
+        except json.JSONDecodeError as e:
+            return 400, {'error': f"JSON نامعتبر: {e}"}
+        except Exception as e:
+            return 500, {'error': repr(e)}
+    
+    async def read(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.readers, func, *args)
+    
+    # ---------- مسیرها ----------
+    
+    async def health(self, params, data):
+        return {'status': 'ok', 'revision': self.revision}
+    
+    async def accounts(self, params, data):
+        return [account_dict(account) for account in self.db.get_all_accounts()]
+    
+    async def create_account(self, params, data):
+        try:
+            account = Account(data['code'], data['name'], data['type'], data.get('parent_id'))
+        except (KeyError, TypeError) as e:
+            raise ApiError(400, f"حساب نامعتبر: {e!r}")
+        if not await asyncio.wrap_future(self.db.writer.call(self.db.add_account, account)):
+            raise ApiError(409, f"حساب با کد {account.code} ساخته نشد")
+        return account_dict(account)
+    
+    async def transactions(self, params, data):
+        flt = parse_filter(params)
+        result = await self.read(
+            self.db.query.select, flt, int_param(params, 'limit', 50), int_param(params, 'offset', 0)
+        )
+        return {'total': result.total, 'exact': result.exact, 'offset': result.offset,
+                'transactions': [transaction_dict(t) for t in result.transactions]}
+    
+    async def post(self, params, data):
+        items = data if isinstance(data, list) else [data]
+        if not items or not all(isinstance(item, dict) for item in items):
+            raise ApiError(400, "بدنه باید یک تراکنش یا لیستی از تراکنش‌ها باشد")
+        transactions = [parse_posting(item, self.db) for item in items]
+        
+        try:
+            await asyncio.wrap_future(self.db.writer.submit(transactions))
+        except sqlite3.IntegrityError as e:
+            raise ApiError(409, str(e))
+        
+        accounts = {t.debit_account_id for t in transactions} | {t.credit_account_id for t in transactions}
+        return {
+            'transactions': [transaction_dict(t) for t in transactions],
+            'balances': {str(a): int(self.db.get_account_by_id(a).balance) for a in accounts},
+        }
+    
+    async def facets(self, params, data):
+        facets = await self.read(self.db.query.facets, parse_filter(params))
+        return facets._asdict()
+    
+    async def search(self, params, data):
+        from .search import search
+        result = await self.read(
+            search, self.db, params.get('q', [''])[0],
+            int_param(params, 'limit', 50), int_param(params, 'offset', 0)
+        )
+        return {'total': result.total, 'exact': result.exact, 'offset': result.offset,
+                'transactions': [transaction_dict(t) for t in result.transactions]}
+    
+    def report(self, name: str, params):
+        if name not in REPORTS:
+            raise ApiError(404, f"گزارش {name}")
+        args = SimpleNamespace(limit=int_param(params, 'limit', 1000),
+                               months=int_param(params, 'months', 12))
+        return REPORTS[name](self.db, args)
+    
+    async def analytics(self, params, data):
+        return {'prediction': float(self.db.predict_next_expense()),
+                'trend': self.db.trend_analysis(),
+                'anomaly_bounds': self.db.ai.anomaly_bounds(self.db.expenses())}
+    
+    async def anomaly(self, params, data):
+        amount = int_param(params, 'amount', 0)
+        return {'amount': amount, 'anomaly': self.db.detect_anomaly(SimpleNamespace(amount=Money(amount)))}
+    
+    async def sql(self, params, data):
+        if not isinstance(data, dict) or not isinstance(data.get('sql'), str):
+            raise ApiError(400, "بدنه باید {sql, params} باشد")
+        try:
+            return await self.read(read_only_query, self.db.db_path, data['sql'], data.get('params') or [])
+        except sqlite3.Error as e:
+            raise ApiError(400, str(e))
+
+
+# ====================== پایگاه داده ======================
+
+def enable_wal(db: DatabaseManager):
+    """WAL در خود فایل ذخیره می‌شود و برای همه اتصال‌های بعدی برقرار است"""
+    with db.get_connection() as conn:
+        conn.execute("PRAGMA journal_mode = WAL")
+
+
+# mode=ro و query_only جلوی ATTACH (ساخت یا خواندن فایل‌های دیگر) و PRAGMA را نمی‌گیرند
+READ_ONLY_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION,
+                     sqlite3.SQLITE_RECURSIVE}
+# FTS5 پیش از هر جستجو data_version را می‌خواند
+READ_ONLY_PRAGMAS = {'data_version'}
+
+
+def read_only_authorizer(tables: set):
+    """فقط SELECT و خواندن جدول‌ها و view های خود دفتر (نه sqlite_master یا فایل دیگر)"""
+    def authorize(action: int, name, value, database, source) -> int:
+        if action == sqlite3.SQLITE_PRAGMA:
+            return sqlite3.SQLITE_OK if name in READ_ONLY_PRAGMAS and value is None else sqlite3.SQLITE_DENY
+        if action not in READ_ONLY_ACTIONS:
+            return sqlite3.SQLITE_DENY
+        if action == sqlite3.SQLITE_READ and name not in tables:
+            return sqlite3.SQLITE_DENY
+        return sqlite3.SQLITE_OK
+    return authorize
+
+
+def read_only_query(path: str, sql: str, params: list) -> list:
+    conn = sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True)
+    try:
+        register_functions(conn)
+        conn.execute("PRAGMA query_only = 1")
+        tables, virtual = set(), []
+        for name, ddl in conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'"
+        ):
+            tables.add(name)
+            if ddl.upper().startswith('CREATE VIRTUAL TABLE'):
+                virtual.append(name)
+        # سازنده جدول مجازی (FTS5) sqlite_master را می‌خواند؛ پیش از authorizer ساخته شود
+        for name in virtual:
+            conn.execute(f'SELECT rowid FROM "{name}" LIMIT 0').fetchall()
+        conn.set_authorizer(read_only_authorizer(tables))
+        return [list(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+async def serve(db: DatabaseManager, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                token: str = None):
+    server = LedgerServer(db, token)
+    host, port = await server.start(host, port)
+    print(f"✅ {db.db_path} روی http://{host}:{port} ({datetime.now():%H:%M:%S})")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
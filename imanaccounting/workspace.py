@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+
+"""
+چند شرکت (دفتر) در یک پوشه کاری و گزارش‌های تلفیقی (بدون وابستگی به Qt)
+
+هر شرکت یک فایل پایگاه داده جداست؛ فهرست شرکت‌ها (کلید، نام نمایشی و مسیر
+فایل) در workspace.json پوشه کاری نگه داشته می‌شود. پوشه پیش‌فرض IMAN_WORKSPACE
+یا companies در پوشه جاری است.
+
+Workspace.open دفتر یک شرکت را در اولین درخواست باز می‌کند و حداکثر max_open
+دفتر باز (هر کدام با کش پرس‌وجو و thread های نویسنده و رویدادها) را با LRU نگه
+می‌دارد؛ برگشتن به شرکت‌های اخیر فوری است و با باز شدن دفتر تازه قدیمی‌ترین
+دفتر بسته می‌شود (on_close پیش از بستن خبر می‌دهد).
+
+گزارش‌های تلفیقی فایل شرکت‌ها را فقط خواندنی روی یک اتصال حافظه‌ای ATTACH
+می‌کنند و هر گروه ATTACH_LIMIT تایی را با یک پرس‌وجو می‌خوانند؛ پس تلفیق به
+خروجی گرفتن و ورود دوباره نیاز ندارد و شرکت‌های یک گروه از یک snapshot سازگار
+خوانده می‌شوند. حساب‌ها با کد حساب (نه id) تطبیق داده می‌شوند.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from .instrument import timed
+from .money import Money
+from .profit_sharing import INCOME_TYPES, Period
+
+if TYPE_CHECKING:
+    from .ledger import DatabaseManager
+
+DEFAULT_ROOT = 'companies'
+WORKSPACE_FILE = 'workspace.json'
+MAX_OPEN = 8
+# سقف پیش‌فرض SQLITE_MAX_ATTACHED
+ATTACH_LIMIT = 10
+
+KEY_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+CONSOLIDATED_BALANCES_SQL = '''
+    SELECT company, code, name, type, balance FROM ({branches})
+'''
+
+BALANCES_BRANCH = '''
+    SELECT {index} AS company, code, name, type, balance FROM {schema}.accounts WHERE is_active = 1
+'''
+
+# مثل profit_sharing.PERIOD_PROFIT_SQL ولی برای چند شرکت و هر جدول جدا
+CONSOLIDATED_PROFIT_SQL = '''
+    WITH periods(idx, start, end) AS (VALUES {values})
+    SELECT company, idx, COALESCE(SUM(amount * ((credit_type IN {types}) - (debit_type IN {types}))), 0)
+    FROM ({branches})
+    GROUP BY company, idx
+'''
+
+PROFIT_BRANCH = '''
+    SELECT {index} AS company, p.idx, t.amount, d.type AS debit_type, c.type AS credit_type
+    FROM periods p JOIN {schema}.{table} t ON t.date >= p.start AND t.date < p.end
+    LEFT JOIN {schema}.accounts d ON d.id = t.debit_account_id
+    LEFT JOIN {schema}.accounts c ON c.id = t.credit_account_id
+'''
+
+
+class WorkspaceError(Exception):
+    """شرکت ناشناخته، تکراری یا فایل دفتر ناموجود"""
+
+
+class Company(NamedTuple):
+    key: str
+    name: str
+    path: str
+
+
+class ConsolidatedBalance(NamedTuple):
+    code: str
+    name: str
+    type: str
+    balances: Dict[str, Money]  # کلید شرکت -> مانده
+    
+    @property
+    def total(self) -> Money:
+        return Money.sum(self.balances.values())
+
+
+def default_root() -> str:
+    return os.environ.get('IMAN_WORKSPACE') or DEFAULT_ROOT
+
+
+def open_ledger(path: str) -> 'DatabaseManager':
+    from .ledger import DatabaseManager
+    return DatabaseManager(path)
+
+
+class Workspace:
+    """فهرست شرکت‌ها، دفترهای باز (LRU) و گزارش‌های تلفیقی"""
+    
+    def __init__(self, root: str = None, max_open: int = MAX_OPEN,
+                 factory: Callable[[str], 'DatabaseManager'] = open_ledger,
+                 on_close: Callable[[str, 'DatabaseManager'], None] = None):
+        self.root = root or default_root()
+        self.max_open = max_open
+        # factory(path) دفتر را می‌سازد (رابط کاربری بدون بارگذاری می‌سازد و خودش بارگذاری می‌کند)
+        self.factory = factory
+        self.on_close = on_close
+        self.ledgers: 'OrderedDict[str, DatabaseManager]' = OrderedDict()
+        self.lock = threading.RLock()
+        self.registry: Dict[str, dict] = {}
+        self.last: Optional[str] = None
+        self.load()
+    
+    # ---------- فهرست شرکت‌ها ----------
+    
+    @property
+    def registry_path(self) -> str:
+        return os.path.join(self.root, WORKSPACE_FILE)
+    
+    def load(self):
+        try:
+            with open(self.registry_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            raise WorkspaceError(f"فایل {self.registry_path} خوانده نشد: {e}")
+        self.registry = data.get('companies', {})
+        self.last = data.get('last')
+    
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        partial = self.registry_path + '.partial'
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump({'companies': self.registry, 'last': self.last}, f, ensure_ascii=False, indent=1)
+        os.replace(partial, self.registry_path)
+    
+    def _company(self, key: str, entry: dict) -> Company:
+        # مسیرهای نسبی نسبت به پوشه کاری‌اند تا پوشه قابل جابه‌جایی باشد
+        return Company(key, entry['name'], os.path.join(self.root, entry['path']))
+    
+    def companies(self) -> List[Company]:
+        """شرکت‌ها به ترتیب ثبت"""
+        with self.lock:
+            return [self._company(key, entry) for key, entry in self.registry.items()]
+    
+    def company(self, key: str) -> Company:
+        with self.lock:
+            entry = self.registry.get(key)
+            if entry is None:
+                raise WorkspaceError(f"شرکت {key!r} در {self.root} ثبت نشده است")
+            return self._company(key, entry)
+    
+    def recent(self) -> Optional[Company]:
+        """آخرین شرکت باز شده (یا اولین شرکت ثبت شده)"""
+        with self.lock:
+            if self.last in self.registry:
+                return self.company(self.last)
+            companies = self.companies()
+            return companies[0] if companies else None
+    
+    def add(self, key: str, name: str, path: str = None) -> Company:
+        """ثبت شرکت؛ اگر فایل دفتر وجود نداشته باشد با حساب‌های پیش‌فرض ساخته می‌شود"""
+        from .ledger import DatabaseManager
+        if not KEY_PATTERN.match(key):
+            raise WorkspaceError(f"کلید نامعتبر: {key!r} (فقط حروف لاتین، رقم، - و _)")
+        with self.lock:
+            if key in self.registry:
+                raise WorkspaceError(f"شرکت {key!r} قبلاً ثبت شده است")
+            path = path or f"{key}.db"
+            if os.path.isabs(path):
+                path = os.path.relpath(path, self.root) if _inside(path, self.root) else path
+            os.makedirs(self.root, exist_ok=True)
+            DatabaseManager(os.path.join(self.root, path), autoload=False).init_database()
+            self.registry[key] = {'name': name, 'path': path}
+            self.save()
+            return self.company(key)
+    
+    def remove(self, key: str) -> Company:
+        """حذف شرکت از فهرست (فایل دفتر پاک نمی‌شود)"""
+        with self.lock:
+            company = self.company(key)
+            self.close(key)
+            del self.registry[key]
+            if self.last == key:
+                self.last = None
+            self.save()
+            return company
+    
+    # ---------- دفترهای باز ----------
+    
+    @timed('workspace.open')
+    def open(self, key: str) -> 'DatabaseManager':
+        """دفتر شرکت key؛ دفترهای باز اخیر دوباره استفاده می‌شوند"""
+        with self.lock:
+            db = self.ledgers.pop(key, None)
+            if db is None:
+                db = self.factory(self.company(key).path)
+            self.ledgers[key] = db
+            if self.last != key:
+                self.last = key
+                self.save()
+            while len(self.ledgers) > self.max_open:
+                self.close(next(iter(self.ledgers)))
+            return db
+    
+    def is_open(self, key: str) -> bool:
+        with self.lock:
+            return key in self.ledgers
+    
+    def close(self, key: str):
+        with self.lock:
+            db = self.ledgers.pop(key, None)
+        if db is None:
+            return
+        if self.on_close is not None:
+            self.on_close(key, db)
+        db.close()
+    
+    def close_all(self):
+        for key in list(self.ledgers):
+            self.close(key)
+    
+    # ---------- گزارش‌های تلفیقی ----------
+    
+    def selected(self, keys: Sequence[str] = None) -> List[Company]:
+        return [self.company(key) for key in keys] if keys else self.companies()
+    
+    @contextmanager
+    def attached(self, companies: Sequence[Company]) -> Iterator[sqlite3.Connection]:
+        """اتصال حافظه‌ای که فایل شرکت‌ها با نام‌های c0، c1، ... فقط خواندنی به آن ATTACH شده‌اند"""
+        if len(companies) > ATTACH_LIMIT:
+            raise ValueError(f"حداکثر {ATTACH_LIMIT} شرکت در یک اتصال")
+        conn = sqlite3.connect('file::memory:', uri=True)
+        try:
+            for index, company in enumerate(companies):
+                if not os.path.exists(company.path):
+                    raise WorkspaceError(f"فایل دفتر {company.name} ({company.path}) وجود ندارد")
+                uri = Path(os.path.abspath(company.path)).as_uri() + '?mode=ro'
+                conn.execute(f"ATTACH DATABASE ? AS c{index}", (uri,))
+            yield conn
+        finally:
+            conn.close()
+    
+    def groups(self, companies: Sequence[Company]) -> Iterator[Sequence[Company]]:
+        for start in range(0, len(companies), ATTACH_LIMIT):
+            yield companies[start:start + ATTACH_LIMIT]
+    
+    @timed('workspace.consolidated_balances')
+    def consolidated_balances(self, keys: Sequence[str] = None) -> List[ConsolidatedBalance]:
+        """مانده حساب‌های همه شرکت‌ها به تفکیک کد حساب، مرتب بر اساس کد"""
+        companies = self.selected(keys)
+        accounts: Dict[str, ConsolidatedBalance] = {}
+        for group in self.groups(companies):
+            branches = ' UNION ALL '.join(
+                BALANCES_BRANCH.format(index=index, schema=f"c{index}") for index in range(len(group))
+            )
+            with self.attached(group) as conn:
+                rows = conn.execute(CONSOLIDATED_BALANCES_SQL.format(branches=branches)).fetchall()
+            for index, code, name, type_, balance in rows:
+                account = accounts.get(code)
+                if account is None:
+                    account = accounts[code] = ConsolidatedBalance(code, name, type_, {})
+                balances = account.balances
+                key = group[index].key
+                balances[key] = Money(balances.get(key, 0) + (balance or 0))
+        return [accounts[code] for code in sorted(accounts)]
+    
+    @timed('workspace.consolidated_profits')
+    def consolidated_profits(self, periods: Sequence[Period],
+                             keys: Sequence[str] = None) -> Dict[str, List[Money]]:
+        """سود خالص هر دوره برای هر شرکت (کلید شرکت -> لیست هم‌ترتیب periods)"""
+        companies = self.selected(keys)
+        result = {company.key: [Money(0)] * len(periods) for company in companies}
+        if not periods:
+            return result
+        values = ', '.join('(?, ?, ?)' for _ in periods)
+        params = []
+        for i, period in enumerate(periods):
+            params += [i, period.start.strftime('%Y-%m-%d'), period.end.strftime('%Y-%m-%d')]
+        
+        for group in self.groups(companies):
+            with self.attached(group) as conn:
+                branches = []
+                for index in range(len(group)):
+                    schema = f"c{index}"
+                    # دفترهای نسخه‌های قبل جدول بایگانی ندارند
+                    tables = ['transactions'] + [row[0] for row in conn.execute(
+                        f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table' "
+                        f"AND name = 'transactions_archive'"
+                    )]
+                    branches += [PROFIT_BRANCH.format(index=index, schema=schema, table=table)
+                                 for table in tables]
+                sql = CONSOLIDATED_PROFIT_SQL.format(
+                    values=values, types=INCOME_TYPES, branches=' UNION ALL '.join(branches)
+                )
+                for index, idx, profit in conn.execute(sql, params):
+                    result[group[index].key][idx] = Money(profit)
+        return result
+
+
+def _inside(path: str, root: str) -> bool:
+    root = os.path.abspath(root)
+    return os.path.commonpath([os.path.abspath(path), root]) == root
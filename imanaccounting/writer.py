@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""
+صف نوشتن با commit گروهی (بدون وابستگی به Qt)
+
+ثبت‌هایی که از چند thread (import، پلاگین‌ها، رابط کاربری، سرویس HTTP)
+می‌رسند به جای commit جدا و رقابت روی قفل SQLite، در یک صف قرار می‌گیرند و
+یک thread نویسنده آن‌ها را دسته‌دسته با یک commit ثبت می‌کند. هر دسته حداکثر
+max_rows ردیف دارد. درخواست‌هایی که هنگام commit قبلی رسیده‌اند بدون انتظار
+به دسته بعد می‌روند؛ علاوه بر آن، دسته حداکثر max_delay_ms منتظر می‌ماند تا
+به اندازه دسته قبلی (تعداد نویسنده‌های همزمان اخیر) برسد. پس یک نویسنده تنها
+بدون تأخیر ثبت می‌شود.
+
+submit برای هر درخواست یک Future برمی‌گرداند. تراکنش‌های یک درخواست همه با
+هم ثبت می‌شوند یا هیچ‌کدام؛ اگر commit یک دسته خطا دهد درخواست‌های آن جدا
+ثبت می‌شوند تا خطای یکی به بقیه نرسد.
+"""
+
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, List, NamedTuple
+
+from .instrument import timed
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+MAX_ROWS = 500
+MAX_DELAY_MS = 5
+
+
+class WriteRequest(NamedTuple):
+    transactions: list
+    future: 'Future'
+
+
+class WriteCall(NamedTuple):
+    """عملیات نوشتن دیگر (مثلاً ساخت حساب) که به ترتیب صف در thread نویسنده اجرا می‌شود"""
+    func: Callable
+    args: tuple
+    future: 'Future'
+
+
+class WriterStats(NamedTuple):
+    requests: int
+    rows: int
+    commits: int
+    
+    @property
+    def rows_per_commit(self) -> float:
+        return self.rows / self.commits if self.commits else 0.0
+
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    def __init__(self, db: 'DatabaseManager', max_rows: int = MAX_ROWS,
+                 max_delay_ms: float = MAX_DELAY_MS):
+        self.db = db
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.last_group = 1  # تعداد درخواست‌های دسته قبلی
+        self.requests = self.rows = self.commits = 0
+    
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='ledger-writer', daemon=True)
+                self.thread.start()
+    
+    def submit(self, transactions: list) -> 'Future':
+        """ثبت یک یا چند تراکنش؛ نتیجه Future تعداد ثبت‌شده یا استثنای ثبت است"""
+        # concurrent.futures (و logging) فقط با اولین درخواست نوشتن بارگذاری می‌شود؛
+        # import عادی (نه lazy_import) چون اولین درخواست‌ها ممکن است همزمان از چند thread برسند
+        from concurrent.futures import Future
+        future = Future()
+        if not transactions:
+            future.set_result(0)
+            return future
+        self.start()
+        self.queue.put(WriteRequest(list(transactions), future))
+        return future
+    
+    def call(self, func: Callable, *args) -> 'Future':
+        from concurrent.futures import Future
+        future = Future()
+        self.start()
+        self.queue.put(WriteCall(func, args, future))
+        return future
+    
+    def close(self, wait: bool = True):
+        """پایان thread بعد از ثبت درخواست‌های صف شده"""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.queue.put(_STOP)
+            if wait:
+                thread.join()
+    
+    def stats(self) -> WriterStats:
+        return WriterStats(self.requests, self.rows, self.commits)
+    
+    # ---------- thread نویسنده ----------
+    
+    def run(self):
+        item = None
+        while True:
+            if item is None:
+                item = self.queue.get()
+            if item is _STOP:
+                return
+            if isinstance(item, WriteCall):
+                run_call(item)
+                item = None
+                continue
+            
+            group, item = self.collect(item)
+            self.commit(group)
+    
+    def collect(self, first: WriteRequest):
+        """دسته‌ای از درخواست‌ها که با first ثبت می‌شوند و اولین مورد بعدی که در دسته نیامد"""
+        group = [first]
+        rows = len(first.transactions)
+        deadline = time.monotonic() + self.max_delay
+        while rows < self.max_rows:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                timeout = deadline - time.monotonic()
+                if len(group) >= self.last_group or timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if not isinstance(item, WriteRequest):
+                return group, item
+            group.append(item)
+            rows += len(item.transactions)
+        return group, None
+    
+    @timed('writer.commit')
+    def commit(self, group: List[WriteRequest]):
+        self.last_group = len(group)
+        group = [request for request in group if request.future.set_running_or_notify_cancel()]
+        if not group:
+            return
+        
+        try:
+            self.db.post_transactions([t for request in group for t in request.transactions])
+            results = [len(request.transactions) for request in group]
+            self.commits += 1
+        except Exception as e:
+            if len(group) == 1:
+                results = [e]
+            else:
+                results = []
+                for request in group:
+                    try:
+                        results.append(self.db.post_transactions(request.transactions))
+                        self.commits += 1
+                    except Exception as e:
+                        results.append(e)
+        
+        for request, result in zip(group, results):
+            self.requests += 1
+            if isinstance(result, Exception):
+                request.future.set_exception(result)
+            else:
+                self.rows += result
+                request.future.set_result(result)
+
+
+def run_call(call: WriteCall):
+    if not call.future.set_running_or_notify_cancel():
+        return
+    try:
+        call.future.set_result(call.func(*call.args))
+    except Exception as e:
+        call.future.set_exception(e)
@@ -16,6 +16,8 @@ from PyQt5.QtGui import *
 import json
 from datetime import datetime
 
+from imanaccounting.profit_sharing import allocate, to_fraction
+
 
 class TahsimPlugin:
     """پلاگین محاسبه تسهیم"""
@@ -114,33 +116,50 @@ class TahsimPlugin:
         report.exec_()
     
     def generate_tahsim_report(self, data: dict = None):
-        """تولید گزارش تسهیم"""
+        """تولید گزارش تسهیم از سود خالص دفتر (همه دوره‌ها در یک فراخوانی هسته)"""
         if not data:
             data = self.get_default_data()
         
+        if self.core is not None:
+            distributions = self.core.distribute_profit(data['partners'], data.get('months', 1))
+        else:
+            # بدون هسته (اجرای مستقل): سود دستی data['total_profit']
+            profit = data.get('total_profit', 0)
+            weights = [p['weight'] for p in data['partners']]
+            total = sum(weights)
+            distributions = [{
+                'period': datetime.now().strftime('%Y/%m'),
+                'profit': profit,
+                'shares': [
+                    {'name': p['name'], 'percent': p['weight'] * 100 / total, 'share': share}
+                    for p, share in zip(data['partners'], allocate(profit, weights))
+                ]
+            }]
+        
         report_text = f"""
         📊 گزارش تسهیم سود و زیان
         ============================
         تاریخ: {datetime.now().strftime('%Y/%m/%d')}
-        
-        💰 کل سود: {data.get('total_profit', 0):,} ریال
-        
-        👥 تسهیم بین شرکا:
         """
         
-        for i, partner in enumerate(data.get('partners', []), 1):
-            report_text += f"\n        {i}. {partner['name']}: {partner['share']:,} ریال ({partner['percent']}%)"
+        for dist in distributions:
+            report_text += f"\n\n        📅 دوره {dist['period']} - 💰 سود خالص: {dist['profit']:,} ریال"
+            report_text += "\n        👥 تسهیم بین شرکا:"
+            for i, partner in enumerate(dist['shares'], 1):
+                report_text += (f"\n        {i}. {partner['name']}: {partner['share']:,} ریال "
+                                f"({partner['percent']:.2f}%)")
         
         return report_text
     
     def get_default_data(self):
-        """داده‌های پیش‌فرض برای تست"""
+        """شرکای پیش‌فرض و سه ماه آخر"""
         return {
+            'months': 3,
             'total_profit': 10000000,
             'partners': [
-                {'name': 'شریک اول', 'percent': 40, 'share': 4000000},
-                {'name': 'شریک دوم', 'percent': 35, 'share': 3500000},
-                {'name': 'شریک سوم', 'percent': 25, 'share': 2500000}
+                {'name': 'شریک اول', 'weight': 40},
+                {'name': 'شریک دوم', 'weight': 35},
+                {'name': 'شریک سوم', 'weight': 25}
             ]
         }
 
@@ -235,7 +254,7 @@ class TahsimDialog(QDialog):
                 left: 10px;
                 color: #27ae60;
             }
-            QLineEdit, QSpinBox {
+            QLineEdit, QSpinBox, QDoubleSpinBox {
                 padding: 8px;
                 border: 1px solid #dcdde1;
                 border-radius: 4px;
@@ -275,12 +294,22 @@ class TahsimDialog(QDialog):
         info_group = QGroupBox("💰 اطلاعات سود")
         info_layout = QFormLayout()
         
-        self.profit_spin = QSpinBox()
-        self.profit_spin.setRange(0, 1000000000)
+        profit_layout = QHBoxLayout()
+        self.profit_spin = QDoubleSpinBox()
+        self.profit_spin.setDecimals(0)
+        self.profit_spin.setRange(-999999999999, 999999999999)
         self.profit_spin.setValue(10000000)
         self.profit_spin.setSuffix(" ریال")
         self.profit_spin.setGroupSeparatorShown(True)
-        info_layout.addRow("کل سود:", self.profit_spin)
+        self.profit_spin.valueChanged.connect(self.refresh_table)
+        profit_layout.addWidget(self.profit_spin)
+        
+        ledger_btn = QPushButton("📥 سود این ماه از دفتر")
+        ledger_btn.setObjectName("addBtn")
+        ledger_btn.setEnabled(self.core is not None)
+        ledger_btn.clicked.connect(self.load_ledger_profit)
+        profit_layout.addWidget(ledger_btn)
+        info_layout.addRow("کل سود:", profit_layout)
         
         info_group.setLayout(info_layout)
         layout.addWidget(info_group)
@@ -296,8 +325,9 @@ class TahsimDialog(QDialog):
         self.name_edit.setPlaceholderText("نام شریک")
         add_layout.addWidget(self.name_edit)
         
-        self.percent_spin = QSpinBox()
-        self.percent_spin.setRange(1, 100)
+        self.percent_spin = QDoubleSpinBox()
+        self.percent_spin.setDecimals(2)
+        self.percent_spin.setRange(0.01, 100)
         self.percent_spin.setValue(20)
         self.percent_spin.setSuffix(" %")
         add_layout.addWidget(self.percent_spin)
@@ -355,6 +385,24 @@ class TahsimDialog(QDialog):
         ]
         self.refresh_table()
     
+    def load_ledger_profit(self):
+        """سود خالص ماه جاری از حساب‌های درآمد و هزینه دفتر"""
+        distribution = self.core.distribute_profit([{'name': '', 'weight': 1}], 1)[0]
+        self.profit_spin.setValue(distribution['profit'])
+    
+    def shares(self) -> list:
+        """سهم شرکا از سود با مخرج ثابت ۱۰۰ و گرد کردن بزرگ‌ترین باقیمانده
+        
+        تا وقتی جمع درصدها به ۱۰۰ نرسیده، باقی سود به عنوان «تقسیم نشده» کنار
+        می‌ماند و سهم شریک‌ها بزرگ نمی‌شود (شریک ۲۰٪ تنها، ۲۰٪ سود را می‌بیند).
+        """
+        if not self.partners:
+            return []
+        percents = [to_fraction(p['percent']) for p in self.partners]
+        undistributed = max(100 - sum(percents), 0)
+        shares = allocate(int(self.profit_spin.value()), percents + [undistributed])
+        return shares[:len(percents)]
+    
     def add_partner(self):
         """افزودن شریک جدید"""
         name = self.name_edit.text().strip()
@@ -366,8 +414,8 @@ class TahsimDialog(QDialog):
         
         # بررسی مجموع درصدها
         total_percent = sum(p['percent'] for p in self.partners) + percent
-        if total_percent > 100:
-            QMessageBox.warning(self, "خطا", f"مجموع درصدها نمی‌تواند از ۱۰۰ بیشتر باشد.\nدر حال حاضر: {total_percent - percent}% + {percent}% = {total_percent}%")
+        if round(total_percent, 2) > 100:
+            QMessageBox.warning(self, "خطا", f"مجموع درصدها نمی‌تواند از ۱۰۰ بیشتر باشد.\nدر حال حاضر: {total_percent - percent:g}% + {percent:g}% = {total_percent:g}%")
             return
         
         self.partners.append({'name': name, 'percent': percent})
@@ -384,14 +432,11 @@ class TahsimDialog(QDialog):
     def refresh_table(self):
         """بروزرسانی جدول"""
         self.table.setRowCount(len(self.partners))
-        profit = self.profit_spin.value()
         
-        for i, partner in enumerate(self.partners):
-            share = profit * partner['percent'] // 100
-            
+        for i, (partner, share) in enumerate(zip(self.partners, self.shares())):
             self.table.setItem(i, 0, QTableWidgetItem(partner['name']))
             
-            percent_item = QTableWidgetItem(f"{partner['percent']}%")
+            percent_item = QTableWidgetItem(f"{partner['percent']:g}%")
             percent_item.setTextAlignment(Qt.AlignCenter)
             self.table.setItem(i, 1, percent_item)
             
@@ -407,8 +452,8 @@ class TahsimDialog(QDialog):
             QMessageBox.warning(self, "خطا", "هیچ شریکی تعریف نشده")
             return
         
-        profit = self.profit_spin.value()
-        total_percent = sum(p['percent'] for p in self.partners)
+        profit = int(self.profit_spin.value())
+        total_percent = round(sum(p['percent'] for p in self.partners), 2)
         
         if total_percent != 100:
             QMessageBox.warning(self, "خطا", f"مجموع درصدها باید ۱۰۰ باشد.\nدر حال حاضر: {total_percent}%")
@@ -419,9 +464,8 @@ class TahsimDialog(QDialog):
         result += "📊 سهم شرکا:\n"
         result += "-" * 30 + "\n"
         
-        for partner in self.partners:
-            share = profit * partner['percent'] // 100
-            result += f"{partner['name']}: {share:,} ریال ({partner['percent']}%)\n"
+        for partner, share in zip(self.partners, self.shares()):
+            result += f"{partner['name']}: {share:,} ریال ({partner['percent']:g}%)\n"
         
         QMessageBox.information(self, "✅ نتیجه تسهیم", result)
     
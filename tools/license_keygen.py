@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ابزار آفلاین ساخت لایسنس - این فایل همراه برنامه توزیع نمی‌شود
+
+اجرا:
+    python tools/license_keygen.py init --key signing.key
+    python tools/license_keygen.py issue --key signing.key --hwid <HWID> --type PRO --days 365
+    python tools/license_keygen.py verify <TOKEN> [--pub <HEX>]
+
+init یک جفت کلید Ed25519 می‌سازد؛ کلید خصوصی در فایل --key می‌ماند و کلید
+عمومی چاپ شده باید در LICENSE_PUBLIC_KEY (imanaccounting/license.py) قرار
+بگیرد. کلید خصوصی هرگز نباید وارد مخزن شود.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Crypto.PublicKey import ECC
+from Crypto.Signature import eddsa
+
+from imanaccounting.license_token import (
+    TYPE_CODES, LicenseClaims, TokenVerifier, encode_token, pack_claims
+)
+
+# انواعی که انقضا ندارند
+PERMANENT_TYPES = ('ADMIN', 'SCHOOL')
+
+
+def load_signing_key(path: str):
+    with open(path, 'r') as f:
+        return eddsa.import_private_key(bytes.fromhex(f.read().strip()))
+
+
+def public_key_hex(key) -> str:
+    return key.public_key().export_key(format='raw').hex()
+
+
+def issue_token(key, hwid: str, license_type: str, days: int = 365) -> str:
+    now = datetime.now().replace(microsecond=0)
+    claims = LicenseClaims(
+        license_type,
+        os.urandom(4),
+        now,
+        None if license_type in PERMANENT_TYPES else now + timedelta(days=days),
+        hwid,
+    )
+    payload = pack_claims(claims)
+    return encode_token(payload, eddsa.new(key, 'rfc8032').sign(payload))
+
+
+def cmd_init(args) -> int:
+    if os.path.exists(args.key):
+        print(f"❌ {args.key} وجود دارد؛ کلید قبلی بازنویسی نمی‌شود", file=sys.stderr)
+        return 1
+    key = ECC.generate(curve='Ed25519')
+    fd = os.open(args.key, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(key.seed.hex())
+    print(public_key_hex(key))
+    return 0
+
+
+def cmd_issue(args) -> int:
+    key = load_signing_key(args.key)
+    if len(args.hwid) != 32:
+        print("❌ شناسه سخت‌افزار باید ۳۲ کاراکتر hex باشد", file=sys.stderr)
+        return 1
+    print(issue_token(key, args.hwid.lower(), args.type, args.days))
+    return 0
+
+
+def cmd_verify(args) -> int:
+    if args.pub:
+        public_key = bytes.fromhex(args.pub)
+    else:
+        from imanaccounting.license import LICENSE_PUBLIC_KEY
+        public_key = LICENSE_PUBLIC_KEY
+    try:
+        claims = TokenVerifier(public_key).verify(args.token)
+    except ValueError as e:
+        print(f"❌ نامعتبر: {e}", file=sys.stderr)
+        return 1
+    print(f"✅ {claims.type} hwid={claims.hwid} serial={claims.serial.hex()} "
+          f"issued={claims.issued:%Y-%m-%d} expiry={claims.expiry or '-'}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="ساخت و بررسی لایسنس ایمان حسابداری")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    init = commands.add_parser('init', help="ساخت جفت کلید امضا")
+    init.add_argument('--key', required=True)
+    init.set_defaults(func=cmd_init)
+    
+    issue = commands.add_parser('issue', help="صدور لایسنس برای یک کامپیوتر")
+    issue.add_argument('--key', required=True)
+    issue.add_argument('--hwid', required=True)
+    issue.add_argument('--type', choices=sorted(TYPE_CODES), default='PRO')
+    issue.add_argument('--days', type=int, default=365)
+    issue.set_defaults(func=cmd_issue)
+    
+    verify = commands.add_parser('verify', help="بررسی امضای یک لایسنس")
+    verify.add_argument('token')
+    verify.add_argument('--pub', help="کلید عمومی hex (پیش‌فرض: کلید برنامه)")
+    verify.set_defaults(func=cmd_verify)
+    
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())